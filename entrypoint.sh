@@ -30,6 +30,23 @@ if [ -w /app/logs ]; then
     chown -R appuser:appuser /app/logs 2>/dev/null || true
 fi
 
+# RUN_MODE=daemon replaces cron with one long-running process that polls
+# internally (see `--daemon` in raindrop_to_bluesky.py). If it exits, the
+# container exits and `restart: unless-stopped` is the supervisor.
+RUN_MODE="${RUN_MODE:-cron}"
+if [ "$RUN_MODE" = "daemon" ]; then
+    echo "Run mode: daemon (cron disabled)"
+    exec su -s /bin/bash appuser << 'EOSU'
+cd /app
+while IFS= read -r line || [[ -n "$line" ]]; do
+    line="${line%$'\r'}"
+    [[ -z "$line" || "$line" =~ ^[[:space:]]*# ]] && continue
+    export "$line"
+done < /app/.env
+exec /usr/local/bin/python /app/raindrop_to_bluesky.py --daemon
+EOSU
+fi
+
 # Create crontab for the appuser
 # Run every 10 minutes
 CRON_SCHEDULE="${CRON_SCHEDULE:-*/10 * * * *}"
@@ -58,7 +75,14 @@ done < /app/.env
 # src/utils/warnings_setup.py. PYTHONWARNINGS env var doesn't work here
 # because Python parses it before user packages are importable.
 
-/usr/local/bin/python /app/raindrop_to_bluesky.py >> /app/logs/cron.log 2>&1
+# PROFILE_RUN=1 in .env profiles every cron run into /app/logs/profiles/
+# (see src/utils/profiling.py); leave it unset normally.
+PROFILE_ARGS=()
+if [ "${PROFILE_RUN:-}" = "1" ]; then
+    PROFILE_ARGS=(--profile)
+fi
+
+/usr/local/bin/python /app/raindrop_to_bluesky.py "${PROFILE_ARGS[@]}" >> /app/logs/cron.log 2>&1
 EOF
 
 chmod +x /app/run_script.sh
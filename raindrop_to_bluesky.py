@@ -1,78 +1,362 @@
 # raindrop_to_bluesky.py
 
-# Suppress pydantic deprecation warnings from atproto BEFORE importing
-# anything that pulls in atproto. Must come before src.bluesky_handler.
-from src.utils import warnings_setup  # noqa: F401
+# atproto (with its pydantic models) and Pillow are not imported here: most
+# polls find nothing to post, so src.bluesky_handler and src.post_formatter
+# load on the first postable item (see format_bluesky_post_from_raindrop and
+# post_content_to_bluesky below). scripts/test_import_budget.py guards this.
 
-from src.raindrop_handler import get_latest_raindrop_to_skeet, remove_toskeet_tag
-from src.bluesky_handler import post_content_to_bluesky
-from src.post_formatter import format_bluesky_post_from_raindrop
+import argparse
+import signal
+import threading
+import time
+
+from src.raindrop_handler import DEFAULT_MAX_PAGES, get_pending_raindrops, remove_tag_bulk
 from src.utils.error_handler import send_error_alert
-from src.utils.config import load_config
-from src.utils.logging_config import setup_logging, get_logger
+from src.utils import alerting, circuit_breaker, metrics, retry
+from src.utils.config import load_config, load_tenants
+from src.utils.logging_config import get_logger, new_run_id, setup_logging
 from src.utils.posted_tracker import mark_as_posted, cleanup_old_entries
-from src.utils.file_lock import script_lock
+from src.utils.file_lock import STALE_LOCK_SECONDS, refresh_lock, script_lock, tenant_lock_file
+from src.utils.http_client import close_session
+from src.utils.tenant_pool import PollFailed, TenantPool
 
 # Initialize logging once at startup
 setup_logging()
 logger = get_logger(__name__)
 
+# Set by SIGTERM/SIGINT in --daemon mode; the poll loop and the spacing between
+# batch posts wait on it so a stop request interrupts those sleeps immediately.
+_stop_event = threading.Event()
+
+# A batch restamps its locks at least this often (see _wait_between_posts)
+LOCK_REFRESH_SECONDS = STALE_LOCK_SECONDS / 4
+
+
+def format_bluesky_post_from_raindrop(raindrop):
+    """Format a Raindrop for Bluesky, importing post_formatter on first use."""
+    from src.post_formatter import format_bluesky_post_from_raindrop as format_post
+    return format_post(raindrop)
+
+
+def post_content_to_bluesky(identifier, password, content, facets, embed):
+    """Post to Bluesky, importing bluesky_handler (atproto) on first use."""
+    from src.bluesky_handler import post_content_to_bluesky as post_content
+    return post_content(identifier, password, content, facets, embed)
+
+
+def post_raindrop(config, raindrop):
+    """Post one Raindrop to Bluesky and record it as posted.
+
+    Tag removal is left to the caller so a batch can strip the trigger tag
+    from every posted item in one bulk request (see remove_posted_tags).
+
+    Returns:
+        True if the Bluesky post succeeded, False if posting failed.
+    """
+    raindrop_id = raindrop['_id']
+    tenant = _tenant_prefix(config)
+    formatted_text, facets, embed = format_bluesky_post_from_raindrop(raindrop)
+    logger.debug("Embed structure before posting: %s", embed)
+
+    result = post_content_to_bluesky(
+        config['BLUESKY_IDENTIFIER'],
+        config['BLUESKY_PASSWORD'],
+        formatted_text,
+        facets,
+        embed
+    )
+
+    metrics.count('posts', outcome='ok' if result else 'failed')
+    if not result:
+        error_msg = f"{tenant}Failed to post Raindrop {raindrop_id} to Bluesky"
+        logger.error(error_msg)
+        send_error_alert(error_msg)
+        return False
+
+    # Extract the Bluesky post URI if available
+    bluesky_uri = result.uri if hasattr(result, 'uri') else str(result)
+    logger.info(f"{tenant}Successfully posted to Bluesky: {bluesky_uri}")
+
+    # IMPORTANT: Mark as posted BEFORE attempting tag removal
+    # This prevents double-posting even if tag removal fails
+    mark_as_posted(raindrop_id, bluesky_uri, namespace=config.get('TENANT'))
+    return True
+
+
+def remove_posted_tags(config, posted):
+    """Remove the trigger tag from every posted Raindrop, alerting on failures."""
+    tag = config['RAINDROP_TAG']
+    results = remove_tag_bulk(config['RAINDROP_TOKEN'], posted, tag=tag)
+    failed = [raindrop_id for raindrop_id, removed in results.items() if not removed]
+    if len(failed) < len(results):
+        logger.info(f"{_tenant_prefix(config)}Removed '{tag}' tag from {len(results) - len(failed)} Raindrop(s)")
+    if failed:
+        # Tag removal failed, but posts are tracked - won't double-post
+        error_msg = f"{_tenant_prefix(config)}Failed to remove '{tag}' tag from Raindrop(s) {', '.join(map(str, failed))}. Post was successful and tracked - will not double-post."
+        logger.warning(error_msg)
+        send_error_alert(error_msg)
+
+
+def _refresh_locks(config):
+    """Restamp the script lock and this tenant's lock so a long batch never looks stale."""
+    refresh_lock()
+    if config.get('TENANT'):
+        refresh_lock(tenant_lock_file(config['TENANT']))
+
+
+def _wait_between_posts(config):
+    """Wait POST_SPACING_SECONDS, restamping the locks meanwhile.
+
+    A batch has no upper bound on run time (MAX_POSTS_PER_RUN posts, each
+    spaced out), so without a restamp its locks would pass STALE_LOCK_SECONDS
+    and the next cron run would take them and post the same items.
+
+    Returns:
+        True if a stop was requested during the wait.
+    """
+    remaining = config['POST_SPACING_SECONDS']
+    while True:
+        step = min(remaining, LOCK_REFRESH_SECONDS)
+        if _stop_event.wait(step):
+            return True
+        remaining -= step
+        _refresh_locks(config)
+        if remaining <= 0:
+            return False
+
+
+def _tenant_prefix(config):
+    """Log/alert prefix naming the tenant in multi-tenant mode ("" otherwise)."""
+    return f"[{config['TENANT']}] " if config.get('TENANT') else ""
+
+
+def run_tenants(config):
+    """Poll every tenant in TENANTS_FILE once on a bounded worker pool.
+
+    Returns:
+        The number of Raindrops posted across all tenants.
+    """
+    pool = TenantPool(load_tenants(config), main, max_workers=config['TENANT_WORKERS'])
+    metrics.register_collector('tenant', pool.stats, label='tenant')
+    try:
+        pool.run_round()
+    finally:
+        pool.shutdown()
+    return sum(row["posted"] for row in pool.stats().values())
+
+
+def main(config=None):
+    """Post up to MAX_POSTS_PER_RUN pending Raindrops for one account.
+
+    Returns:
+        The number of Raindrops posted.
+    Raises:
+        PollFailed for a tenant (config['TENANT'], run by a TenantPool)
+        whose poll failed, after the error has been logged and alerted.
+    """
+    # Daemon mode passes its already-loaded config; cron runs load it here.
+    if config is None:
+        config = load_config()
+
+    # TENANTS_FILE without a tenant selected: serve every tenant
+    if config.get('TENANTS_FILE') and not config.get('TENANT'):
+        return run_tenants(config)
+
+    # Retries and rate-limit waits across the whole poll stop at the deadline,
+    # not only each call's own retry budget
+    with retry.run_deadline(config.get('RUN_DEADLINE_SECONDS')):
+        namespace = config.get('TENANT')
+        if namespace is None:
+            return _poll_account(config)
+
+        # A tenant poll that overran its daemon round is still running after the
+        # script lock was released; a cron run must not poll that tenant as well
+        with script_lock(tenant_lock_file(namespace)) as acquired:
+            if not acquired:
+                logger.warning(f"{_tenant_prefix(config)}Previous poll still running in another process - skipping this tenant")
+                return 0
+            return _poll_account(config)
+
+
+def _poll_account(config):
+    """One poll of one account: fetch pending Raindrops, post them, untag them (see main)."""
+    namespace = config.get('TENANT')
+    tenant = _tenant_prefix(config)
 
-def main():
-    config = load_config()
-    
     # Cleanup old entries from the posted tracker periodically
-    cleanup_old_entries()
-    
+    cleanup_old_entries(namespace=namespace)
+
+    # An endpoint known to be down for this account: skip the poll quietly
+    # until its breaker lets a probe through, instead of timing out and
+    # alerting every run. Other tenants' breakers don't stop this one.
+    for api, account in (('raindrop', config['RAINDROP_TOKEN']), ('bluesky', config['BLUESKY_IDENTIFIER'])):
+        wait = circuit_breaker.seconds_until_probe(circuit_breaker.endpoint_for(api, account))
+        if wait > 0:
+            logger.warning(f"{tenant}{api} circuit is open - skipping this poll (next probe in {wait:.0f}s)")
+            return 0
+
     try:
-        raindrop = get_latest_raindrop_to_skeet(config['RAINDROP_TOKEN'], tag=config['RAINDROP_TAG'])
-        if raindrop:
-            raindrop_id = raindrop['_id']
-            formatted_text, facets, embed = format_bluesky_post_from_raindrop(raindrop)
-            logger.debug(f"Embed structure before posting: {embed}")
-            
-            result = post_content_to_bluesky(
-                config['BLUESKY_IDENTIFIER'],
-                config['BLUESKY_PASSWORD'],
-                formatted_text,
-                facets,
-                embed
-            )
-            
-            if result:
-                # Extract the Bluesky post URI if available
-                bluesky_uri = result.uri if hasattr(result, 'uri') else str(result)
-                logger.info(f"Successfully posted to Bluesky: {bluesky_uri}")
-                
-                # IMPORTANT: Mark as posted BEFORE attempting tag removal
-                # This prevents double-posting even if tag removal fails
-                mark_as_posted(raindrop_id, bluesky_uri)
-                
-                if remove_toskeet_tag(config['RAINDROP_TOKEN'], raindrop_id, tag=config['RAINDROP_TAG']):
-                    logger.info(f"Removed '{config['RAINDROP_TAG']}' tag from Raindrop")
-                else:
-                    # Tag removal failed, but post is tracked - won't double-post
-                    error_msg = f"Failed to remove '{config['RAINDROP_TAG']}' tag from Raindrop {raindrop_id}. Post was successful and tracked - will not double-post."
-                    logger.warning(error_msg)
-                    send_error_alert(error_msg)
-            else:
-                error_msg = "Failed to post to Bluesky"
-                logger.error(error_msg)
-                send_error_alert(error_msg)
-        else:
-            logger.info("No new content to post")
+        # One lazy listing walk for the whole batch; the Bluesky client is
+        # cached by bluesky_handler, so the batch also shares one session.
+        raindrops = get_pending_raindrops(
+            config['RAINDROP_TOKEN'],
+            tag=config['RAINDROP_TAG'],
+            limit=config['MAX_POSTS_PER_RUN'],
+            perpage=config.get('RAINDROP_PERPAGE'),
+            max_pages=config.get('RAINDROP_MAX_PAGES', DEFAULT_MAX_PAGES),
+            watermark_max_age=config.get('WATERMARK_MAX_AGE_SECONDS'),
+            namespace=namespace
+        )
+        if not raindrops:
+            logger.info(f"{tenant}No new content to post")
+            return 0
+
+        logger.info(f"{tenant}Posting {len(raindrops)} pending Raindrop(s)")
+        posted = []
+        try:
+            for index, raindrop in enumerate(raindrops):
+                if index and _wait_between_posts(config):
+                    logger.info(f"{tenant}Stop requested - leaving {len(raindrops) - index} Raindrop(s) for the next run")
+                    break
+                if not post_raindrop(config, raindrop):
+                    # Bluesky is failing; the rest of the batch would only fail the same way
+                    logger.warning(f"{tenant}Stopping batch after a failed post; {len(raindrops) - index - 1} Raindrop(s) left for the next run")
+                    break
+                posted.append(raindrop)
+        finally:
+            # Even if the batch was cut short, untag whatever did get posted
+            if posted:
+                remove_posted_tags(config, posted)
+        return len(posted)
+    except circuit_breaker.CircuitOpenError as e:
+        logger.warning(f"{tenant}Poll cut short: {e}")
+        return 0
     except Exception as e:
-        error_msg = f"An unexpected error occurred: {str(e)}"
+        error_msg = f"{tenant}An unexpected error occurred: {str(e)}"
         logger.exception(error_msg)
         send_error_alert(error_msg)
+        if namespace is not None:
+            # Let the pool count the failure against this tenant
+            raise PollFailed(error_msg) from e
+        return 0
 
 
-if __name__ == "__main__":
+def run_once(config=None, pool=None, timeout=None):
+    """Run a single poll under the script lock.
+
+    The lock is taken per poll (not for the daemon's lifetime) so a cron run
+    and a daemon sharing the same logs/ directory still never overlap, and
+    the daemon's lock never ages past STALE_LOCK_SECONDS.
+
+    With a TenantPool, the poll is one round over all tenants, waiting at
+    most `timeout` seconds; a tenant still busy after that keeps running
+    outside the script lock and sits out rounds until it finishes. Its own
+    tenant lock (see main) makes other processes skip it meanwhile.
+    """
+    # Every record of this poll carries the same run_id (LOG_FORMAT=json)
+    new_run_id()
     with script_lock() as acquired:
         if not acquired:
-            logger.warning("Another instance is already running - exiting")
-        else:
-            try:
-                main()
-            except Exception as e:
-                logger.exception(f"Unexpected error occurred in main script: {str(e)}")
+            logger.warning("Another instance is already running - skipping this poll")
+            return
+        try:
+            with metrics.timed('poll'):
+                if pool is not None:
+                    pool.run_round(timeout)
+                else:
+                    main(config)
+        except Exception as e:
+            logger.exception(f"Unexpected error occurred in main script: {str(e)}")
+
+
+def _handle_stop_signal(signum, frame):
+    logger.info(f"Received {signal.Signals(signum).name} - stopping after the current poll")
+    _stop_event.set()
+    # Don't sit out a retry backoff or rate-limit wait on the way out
+    retry.cancel_sleeps()
+
+
+def run_daemon(interval=None):
+    """Poll Raindrop in a loop inside one long-running process.
+
+    Imports, config and logging are set up once instead of on every cron
+    tick. SIGTERM/SIGINT finish the in-flight poll and then exit cleanly.
+    With TENANTS_FILE, every round polls all tenants on one long-lived pool.
+    With METRICS_PORT, Prometheus metrics are served on /metrics meanwhile.
+    """
+    config = load_config()
+    if interval is None:
+        interval = config['POLL_INTERVAL_SECONDS']
+    pool = None
+    if config.get('TENANTS_FILE'):
+        tenants = load_tenants(config)
+        pool = TenantPool(tenants, main, max_workers=config['TENANT_WORKERS'])
+        metrics.register_collector('tenant', pool.stats, label='tenant')
+        logger.info(f"Serving {len(tenants)} tenant(s) on up to {config['TENANT_WORKERS']} worker(s)")
+    metrics_server = metrics.start_server()
+
+    signal.signal(signal.SIGTERM, _handle_stop_signal)
+    signal.signal(signal.SIGINT, _handle_stop_signal)
+
+    logger.info(f"Starting daemon mode (poll interval: {interval}s)")
+    while not _stop_event.is_set():
+        started = time.monotonic()
+        run_once(config, pool=pool, timeout=interval)
+        # Errors held back by alert dedup go out as a digest once their interval passes
+        alerting.flush_due()
+        # Interval is measured start-to-start so a slow poll doesn't drift the schedule
+        _stop_event.wait(max(0.0, interval - (time.monotonic() - started)))
+    if pool is not None:
+        pool.shutdown()
+        pool.log_summary()
+    if metrics_server is not None:
+        metrics_server.shutdown()
+    alerting.shutdown()
+    close_session()
+    logger.info("Daemon stopped")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Post tagged Raindrop.io bookmarks to Bluesky.")
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run continuously, polling every POLL_INTERVAL_SECONDS, instead of once per invocation",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=None,
+        help="Override POLL_INTERVAL_SECONDS for --daemon mode",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile this run (cProfile, tracemalloc, stack samples) into logs/profiles/",
+    )
+    args = parser.parse_args(argv)
+    if args.profile and args.daemon:
+        parser.error("--profile profiles a single run and can't be combined with --daemon")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.daemon:
+        try:
+            run_daemon(args.interval)
+        except Exception as e:
+            logger.exception(f"Unexpected error occurred in daemon: {str(e)}")
+            raise SystemExit(1)
+    elif args.profile:
+        # Imported only here so an unprofiled run pays nothing for it
+        from src.utils import profiling
+        with profiling.profiled('run'):
+            run_once()
+        alerting.shutdown()
+        metrics.write_textfile()
+    else:
+        run_once()
+        # Deliver queued alerts (and digests now due) before the process exits
+        alerting.shutdown()
+        metrics.write_textfile()
@@ -0,0 +1,270 @@
+"""Benchmark suite for the formatter hot path, on a generated bookmark corpus.
+
+Generates a reproducible corpus of raindrop dicts (multilingual and
+emoji-heavy titles, `[skeet_content:...]` notes, long and tracking-laden
+URLs, non-ASCII paths) and times each formatter stage on its own:
+
+  strip_tracking_params      every link
+  count_graphemes            every title and note
+  extract_skeet_content      every note
+  format_text                format_bluesky_post_from_raindrop, cover removed
+  image_embed                create_image_embed against an in-process stub
+                             image host (separate: decode/resize/JPEG encode,
+                             no network, image cache disabled)
+
+Each stage runs --repeat times; the best per-item time is reported. The
+URL-normalizer and grapheme-segmenter result caches are cleared before every
+timed pass, so the passes measure the work itself rather than cache hits (the
+warm-up pass only pays for imports and regex compilation). Results
+are printed and, with --output, written as JSON. --baseline compares against
+an earlier --output file and exits 1 if any stage got slower than
+--tolerance (default 25%), so the suite can gate formatter changes.
+
+Run from the repo root:
+    .venv/bin/python scripts/bench_formatter.py [--size 5000] [--output results.json]
+    .venv/bin/python scripts/bench_formatter.py --baseline results.json
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+from src.utils import graphemes, url_rules
+from src.post_formatter import (
+    count_graphemes,
+    create_image_embed,
+    extract_skeet_content,
+    format_bluesky_post_from_raindrop,
+    strip_tracking_params,
+)
+
+TITLES = {
+    "en": ["Microsoft in Talks to Ax Key Energy Pledge Amid Data Center Boom",
+           "The Best Way to Learn Rust in 2026: A Practical Guide for Python Developers",
+           "Why SQLite Is So Great for the Edge", "Ask HN: What are you working on?",
+           "Release notes: faster builds, a new plugin API and Windows ARM support"],
+    "fr": ["Les élèves ont présenté leur café préféré à l'école",
+           "Une enquête sur les habitudes de consommation des lycéens français"],
+    "de": ["Straßenbahnhaltestellenüberdachungsförderprogramm: Warum Länge zählt"],
+    "ja": ["東京の新しいカフェ文化：若者が集まる理由と都市計画の変化",
+           "地方との比較や海外の事例も交えながら、これからの街づくりを考える"],
+    "zh": ["人工智能如何改变软件开发：一份来自一线工程师的长篇报告"],
+    "ko": ["서울의 새로운 카페 문화와 도시 계획의 변화에 대한 심층 보고서"],
+    "hi": ["क्षत्रिय और श्रीमान ने नमस्ते कहा: हिन्दी पत्रकारिता के सौ साल"],
+    "ar": ["كيف يغير الذكاء الاصطناعي تطوير البرمجيات"],
+    "ru": ["Почему SQLite так хорош для периферийных вычислений"],
+}
+EMOJI = ["🚀", "🎉", "👨‍👩‍👧‍👦", "🇺🇸", "🇯🇵", "👍🏽", "❤️‍🔥", "🧵", "1️⃣", "🏳️‍🌈"]
+HOSTS = ["www.bloomberg.com", "example.substack.com", "news.ycombinator.com", "www.nytimes.com",
+         "github.com", "www.youtube.com", "www.amazon.com", "arxiv.org", "www.lemonde.fr", "例え.jp"]
+TRACKING = ["utm_source=newsletter", "utm_medium=email", "utm_campaign=daily", "cmpid=BBD050626",
+            "fbclid=IwAR0abc123", "gclid=Cj0KCQ", "mc_cid=abc", "_hsenc=p2ANqtz"]
+PARAMS = ["id=123456", "page=2", "q=rust+python", "sort=desc", "ref=homepage", "lang=en", "v=dQw4w9WgXcQ"]
+WORDS = "data center energy pledge python rust edge latency cache graph layout unicode ".split()
+
+
+def make_title(rng: random.Random) -> str:
+    lang = rng.choice(list(TITLES))
+    parts = [rng.choice(TITLES[lang]) for _ in range(rng.choice([1, 1, 1, 2, 4]))]
+    title = " — ".join(parts)
+    if rng.random() < 0.3:
+        title = f"{rng.choice(EMOJI)} {title} {''.join(rng.choices(EMOJI, k=rng.randint(1, 6)))}"
+    return title
+
+
+def make_link(rng: random.Random) -> str:
+    host = rng.choice(HOSTS)
+    slug = "-".join(rng.choices(WORDS, k=rng.randint(2, 40)))
+    path = f"/{rng.randint(2019, 2026)}/{rng.randint(1, 12):02d}/{slug}"
+    if rng.random() < 0.1:
+        path += "/記事/über"
+    params = rng.sample(PARAMS, rng.randint(0, 3)) + rng.sample(TRACKING, rng.randint(0, 6))
+    rng.shuffle(params)
+    query = f"?{'&'.join(params)}" if params else ""
+    return f"https://{host}{path}{query}"
+
+
+def make_note(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.4:
+        return ""
+    if roll < 0.55:
+        return " ".join(rng.choices(WORDS, k=rng.randint(5, 200)))
+    skeet = " ".join(rng.choices(WORDS + EMOJI, k=rng.randint(3, 60)))
+    prefix = "My notes:\n" * rng.randint(0, 3)
+    suffix = " [unclosed" if roll > 0.95 else ""
+    return f"{prefix}[skeet_content: {skeet}]{suffix}"
+
+
+def generate_corpus(size: int, seed: int) -> list:
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        corpus.append({
+            "_id": 1_000_000 + i,
+            "title": make_title(rng),
+            "link": make_link(rng) if rng.random() > 0.02 else "https://example.com/" + "x" * rng.randint(300, 600),
+            "note": make_note(rng),
+            "excerpt": " ".join(rng.choices(WORDS, k=rng.randint(0, 80))),
+            "cover": f"https://img.example.com/{i}.jpg" if rng.random() < 0.8 else "",
+        })
+    return corpus
+
+
+class StubImageSession:
+    """Serves an in-memory JPEG for every URL, streamed in 64 KiB chunks."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def get(self, url, headers=None, **kwargs):
+        return StubResponse(self.data)
+
+
+class StubResponse:
+    status_code = 200
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.headers = {"Content-Length": str(len(data))}
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.data), chunk_size):
+            yield self.data[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+def make_jpeg(width: int, height: int) -> bytes:
+    base = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    noise = Image.effect_noise((width, height), 24).convert("RGB")
+    buf = io.BytesIO()
+    Image.blend(base, noise, 0.3).save(buf, format="JPEG", quality=90)
+    return buf.getvalue()
+
+
+def clear_caches() -> None:
+    """Forget memoized normalizer and segmenter results so a pass can't just replay them."""
+    url_rules._current().normalize.cache_clear()
+    graphemes.grapheme_boundaries.cache_clear()
+
+
+def time_stage(fn, items: list, repeat: int) -> dict:
+    for item in items:  # warm-up: lazy imports, regex compilation
+        fn(item)
+    samples = []
+    for _ in range(repeat):
+        clear_caches()
+        started = time.perf_counter()
+        for item in items:
+            fn(item)
+        samples.append(time.perf_counter() - started)
+    best = min(samples)  # least disturbed by other load, as timeit does
+    return {
+        "items": len(items),
+        "per_item_us": round(best / len(items) * 1e6, 2),
+        "items_per_s": round(len(items) / best, 1),
+        "total_s": round(best, 4),
+    }
+
+
+def run(size: int, seed: int, repeat: int, image_items: int) -> dict:
+    corpus = generate_corpus(size, seed)
+    text_only = [{**r, "cover": ""} for r in corpus]
+    texts = [r["title"] for r in corpus] + [r["note"] for r in corpus if r["note"]]
+
+    results = {
+        "strip_tracking_params": time_stage(strip_tracking_params, [r["link"] for r in corpus], repeat),
+        "count_graphemes": time_stage(count_graphemes, texts, repeat),
+        "extract_skeet_content": time_stage(extract_skeet_content, [r["note"] for r in corpus], repeat),
+        "format_text": time_stage(format_bluesky_post_from_raindrop, text_only, repeat),
+    }
+
+    if image_items:
+        session = StubImageSession(make_jpeg(1600, 900))
+        covers = [r for r in corpus if r["cover"]][:image_items]
+        results["image_embed"] = time_stage(
+            lambda r: create_image_embed(r["cover"], r, session=session), covers, max(1, repeat // 2)
+        )
+
+    return {
+        "corpus": {
+            "size": size,
+            "seed": seed,
+            "title_graphemes_mean": round(statistics.mean(count_graphemes(r["title"]) for r in corpus), 1),
+            "link_chars_mean": round(statistics.mean(len(r["link"]) for r in corpus), 1),
+            "with_skeet_content": sum("[skeet_content:" in r["note"] for r in corpus),
+        },
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list:
+    """Stages whose per-item time regressed by more than `tolerance`."""
+    regressions = []
+    for stage, row in current["results"].items():
+        before = baseline.get("results", {}).get(stage)
+        if not before:
+            continue
+        ratio = row["per_item_us"] / before["per_item_us"]
+        status = "REGRESSED" if ratio > 1 + tolerance else "ok"
+        print(f"{stage:>22}: {before['per_item_us']:9.2f} -> {row['per_item_us']:9.2f} us/item (x{ratio:.2f}) {status}")
+        if status != "ok":
+            regressions.append(stage)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=5000, help="Raindrops in the generated corpus")
+    parser.add_argument("--seed", type=int, default=1, help="Corpus RNG seed")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed passes per stage (best reported)")
+    parser.add_argument("--image-items", type=int, default=40, help="Covers for the image stage (0 skips it)")
+    parser.add_argument("--output", type=Path, help="Write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="Compare with an earlier --output file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    # Measure formatting, not log I/O (the "link too long" warning fires on purpose)
+    logging.disable(logging.WARNING)
+    os.environ["IMAGE_CACHE_MAX_BYTES"] = "0"
+    try:
+        summary = run(args.size, args.seed, args.repeat, args.image_items)
+    finally:
+        os.environ.pop("IMAGE_CACHE_MAX_BYTES", None)
+
+    for stage, row in summary["results"].items():
+        print(f"{stage:>22}: {row['per_item_us']:9.2f} us/item  {row['items_per_s']:10.1f} items/s  "
+              f"({row['items']} items)")
+
+    exit_code = 0
+    if args.baseline:
+        regressions = compare(summary, json.loads(args.baseline.read_text()), args.tolerance)
+        summary["regressions"] = regressions
+        if regressions:
+            print(f"[FAIL] slower than baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+            exit_code = 1
+    if args.output:
+        args.output.write_text(json.dumps(summary, indent=2) + "\n")
+        print(f"Wrote {args.output}")
+    print(json.dumps(summary))
+    raise SystemExit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark: grapheme counting/truncation, per-character loop vs UAX #29 segmenter.
+
+The legacy path (copied here as it was in post_formatter) walked the string
+calling unicodedata.category() per character, once for every count and again
+for every truncation. The segmenter computes cluster boundaries once per
+string, with a fast path for ASCII. The workload mirrors the former
+_build_post_with_retries: count the text, truncate it, count the result.
+
+Each sample clears the segmenter's boundary cache first, so cached repeats
+don't flatter the new path. Note the legacy path is also *wrong* for flags
+and ZWJ emoji (it counts each code point); the counts are reported too.
+
+Run from the repo root:
+    .venv/bin/python scripts/bench_graphemes.py [--repeat 2000]
+"""
+import argparse
+import json
+import sys
+import timeit
+import unicodedata
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils import graphemes
+
+CORPUS = {
+    "ascii": "Why the new release matters for small teams: faster builds, fewer flaky tests, "
+             "and a much simpler deploy story. " * 3,
+    "latin_accents": "Les élèves ont présenté leur café préféré à l'école — très réussi, n'est-ce pas? " * 3,
+    "cjk_hangul": "新しいリリースの概要とその影響について。한국어 텍스트도 포함되어 있습니다. " * 4,
+    "emoji_heavy": "Launch day 🚀🎉 with the team 👨‍👩‍👧‍👦 from 🇺🇸🇬🇧🇯🇵 — thumbs up 👍🏽👍🏿 and ❤️‍🔥 " * 3,
+    "devanagari": "क्षत्रिय और श्रीमान ने नमस्ते कहा, हिन्दी पाठ का उदाहरण। " * 4,
+}
+
+
+def legacy_count(text: str) -> int:
+    count = 0
+    i = 0
+    while i < len(text):
+        count += 1
+        i += 1
+        while i < len(text) and unicodedata.category(text[i]) in ('Mn', 'Mc', 'Me'):
+            i += 1
+    return count
+
+
+def legacy_truncate(text: str, limit: int, suffix: str = "…") -> str:
+    if legacy_count(text) <= limit:
+        return text
+    effective_limit = limit - legacy_count(suffix)
+    result = []
+    grapheme_count = 0
+    i = 0
+    while i < len(text) and grapheme_count < effective_limit:
+        result.append(text[i])
+        i += 1
+        while i < len(text) and unicodedata.category(text[i]) in ('Mn', 'Mc', 'Me'):
+            result.append(text[i])
+            i += 1
+        grapheme_count += 1
+    return ''.join(result) + suffix
+
+
+def legacy_workload(text: str) -> int:
+    legacy_count(text)
+    return legacy_count(legacy_truncate(text, 200))
+
+
+def segmenter_workload(text: str) -> int:
+    graphemes.grapheme_boundaries.cache_clear()
+    graphemes.count_graphemes(text)
+    return graphemes.count_graphemes(graphemes.truncate_graphemes(text, 200, "…"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000, help="Workload runs per sample")
+    args = parser.parse_args()
+
+    results = {}
+    for name, text in CORPUS.items():
+        row = {"chars": len(text)}
+        for mode, fn in (("legacy", legacy_workload), ("segmenter", segmenter_workload)):
+            best = min(timeit.repeat(lambda: fn(text), number=args.repeat, repeat=5))
+            row[f"{mode}_us"] = round(best / args.repeat * 1e6, 2)
+        row["speedup"] = round(row["legacy_us"] / row["segmenter_us"], 2)
+        row["legacy_count"] = legacy_count(text)
+        row["uax29_count"] = graphemes.count_graphemes(text)
+        results[name] = row
+        print(f"{name:>14} ({row['chars']:4d} chars): legacy {row['legacy_us']:8.2f} us  "
+              f"segmenter {row['segmenter_us']:8.2f} us  x{row['speedup']:<6} "
+              f"count {row['legacy_count']} -> {row['uax29_count']}")
+    print(json.dumps({"unicode_version": graphemes.UNICODE_VERSION, "results": results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Benchmark: worst-case cover latency, sequential fallback vs hedged fetch.
+
+Worst case: the cover host accepts the connection but never answers, so the
+cover request runs into the full timeout, and the rdl.ink render is itself
+slow (just under the timeout). Sequentially that costs ~2x the timeout; with
+the hedge, the render starts after IMAGE_HEDGE_DELAY_SECONDS and the total
+is ~1x the timeout.
+
+Two local stub servers stand in for the image host and rdl.ink; the image
+cache is disabled and no real network is used.
+
+Run from the repo root:
+    .venv/bin/python scripts/bench_hedged_fetch.py [--timeout 1.0] [--runs 3]
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+from src import post_formatter
+from src.utils import http_client
+
+
+def make_jpeg() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (800, 450), (40, 140, 90)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+JPEG = make_jpeg()
+
+
+def stub_server(delay: float, stop: threading.Event) -> ThreadingHTTPServer:
+    """Serve JPEG after `delay` seconds (or hang until `stop` if delay is None)."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if delay is None:
+                stop.wait()
+                return
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(JPEG)))
+            self.end_headers()
+            self.wfile.write(JPEG)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(cover_url: str, timeout: float, hedge_delay: str, runs: int) -> list:
+    os.environ["IMAGE_HEDGE_DELAY_SECONDS"] = hedge_delay
+    samples = []
+    for _ in range(runs):
+        http_client.close_session()  # no warm connections between runs
+        started = time.perf_counter()
+        embed = post_formatter.create_image_embed(cover_url, {"link": "https://example.com/a"}, timeout=timeout)
+        samples.append(time.perf_counter() - started)
+        if embed is None:
+            raise SystemExit("[FAIL] no image from either source")
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timeout", type=float, default=1.0, help="Per-request timeout (seconds)")
+    parser.add_argument("--hedge-delay", type=float, default=0.2)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    stop = threading.Event()
+    hanging = stub_server(None, stop)
+    render = stub_server(args.timeout * 0.8, stop)
+    orig_rdl_base = post_formatter.RDL_RENDER_BASE
+    os.environ["IMAGE_CACHE_MAX_BYTES"] = "0"
+    try:
+        post_formatter.RDL_RENDER_BASE = f"http://127.0.0.1:{render.server_address[1]}/render/"
+        cover_url = f"http://127.0.0.1:{hanging.server_address[1]}/cover.jpg"
+        results = {
+            "sequential": run(cover_url, args.timeout, "-1", args.runs),
+            "hedged": run(cover_url, args.timeout, str(args.hedge_delay), args.runs),
+        }
+    finally:
+        post_formatter.RDL_RENDER_BASE = orig_rdl_base
+        for var in ("IMAGE_CACHE_MAX_BYTES", "IMAGE_HEDGE_DELAY_SECONDS"):
+            os.environ.pop(var, None)
+        stop.set()
+        for server in (hanging, render):
+            server.shutdown()
+            server.server_close()
+        http_client.close_session()
+
+    summary = {}
+    for mode, samples in results.items():
+        median = statistics.median(samples)
+        summary[mode] = {"median_s": round(median, 3), "x_timeout": round(median / args.timeout, 2)}
+        print(f"{mode:>10}: median {median:6.3f}s ({median / args.timeout:4.2f}x timeout of {args.timeout}s)")
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Benchmark: CPU and wall time of an idle poll, cron mode vs --daemon mode.
+
+An "idle poll" is the common case — Raindrop returns no tagged items. Cron
+mode pays interpreter startup, imports, .env parsing and logging setup on
+every tick; daemon mode pays them once. (atproto, pydantic and Pillow only
+load once something is postable, so neither mode imports them here.)
+
+The Raindrop listing call is replaced by an in-process fake returning an empty
+page, so the numbers exclude network time and isolate per-process overhead.
+Run state (logs, lock, tracker) goes to a temp copy of the app, not the repo.
+
+Run from the repo root:
+    .venv/bin/python scripts/bench_idle_poll.py [--polls 10]
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+DUMMY_ENV = {
+    "RAINDROP_TOKEN": "bench-token",
+    "BLUESKY_IDENTIFIER": "bench.test",
+    "BLUESKY_PASSWORD": "bench-password",
+    "ADMIN_EMAIL": "bench@example.com",
+    "SMTP_LOGIN": "bench@example.com",
+    "SMTP_PASSWORD": "bench",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "465",
+    "LOG_LEVEL": "WARNING",
+}
+
+# Installed before the app is imported: every Raindrop listing comes back empty.
+FAKE_RAINDROP = """
+import json, requests
+
+class _EmptyResponse:
+    status_code = 200
+    headers = {}
+    text = '{"items": [], "count": 0}'
+    def raise_for_status(self):
+        pass
+    def json(self):
+        return json.loads(self.text)
+
+def _fake_request(self, method, url, *args, **kwargs):
+    return _EmptyResponse()
+
+requests.Session.request = _fake_request
+requests.get = lambda url, *a, **k: _EmptyResponse()
+requests.put = lambda url, *a, **k: _EmptyResponse()
+"""
+
+CRON_CHILD = FAKE_RAINDROP + """
+import raindrop_to_bluesky as app
+app.run_once()
+"""
+
+DAEMON_CHILD = FAKE_RAINDROP + """
+import sys, time, json
+import raindrop_to_bluesky as app
+config = app.load_config()
+polls = int(sys.argv[1])
+samples = []
+for _ in range(polls):
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    app.run_once(config)
+    samples.append({"wall": time.perf_counter() - wall, "cpu": time.process_time() - cpu})
+print(json.dumps(samples))
+"""
+
+
+def make_sandbox() -> Path:
+    """Copy the app into a temp dir so logs/ and state never land in the repo."""
+    sandbox = Path(tempfile.mkdtemp(prefix="bench_idle_poll_"))
+    shutil.copy2(REPO_ROOT / "raindrop_to_bluesky.py", sandbox)
+    shutil.copytree(REPO_ROOT / "src", sandbox / "src", ignore=shutil.ignore_patterns("__pycache__"))
+    return sandbox
+
+
+def child_env() -> dict:
+    env = {**os.environ, **DUMMY_ENV}
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    return env
+
+
+def bench_cron(sandbox: Path, polls: int) -> list:
+    """One fresh interpreter per poll, as cron runs it."""
+    samples = []
+    # Warm the bytecode cache first so we measure steady-state cron ticks
+    subprocess.run([sys.executable, "-c", CRON_CHILD], cwd=sandbox, env=child_env(), check=True)
+    for _ in range(polls):
+        before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        wall = time.perf_counter()
+        subprocess.run([sys.executable, "-c", CRON_CHILD], cwd=sandbox, env=child_env(), check=True)
+        wall = time.perf_counter() - wall
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu = (after.ru_utime - before.ru_utime) + (after.ru_stime - before.ru_stime)
+        samples.append({"wall": wall, "cpu": cpu})
+    return samples
+
+
+def bench_daemon(sandbox: Path, polls: int) -> list:
+    """One warm interpreter running every poll in-process."""
+    out = subprocess.run(
+        [sys.executable, "-c", DAEMON_CHILD, str(polls)],
+        cwd=sandbox, env=child_env(), check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: list) -> dict:
+    return {
+        key: {
+            "median_ms": round(statistics.median(s[key] for s in samples) * 1000, 2),
+            "max_ms": round(max(s[key] for s in samples) * 1000, 2),
+        }
+        for key in ("wall", "cpu")
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=10)
+    args = parser.parse_args()
+
+    sandbox = make_sandbox()
+    try:
+        results = {
+            "cron": summarize(bench_cron(sandbox, args.polls)),
+            "daemon": summarize(bench_daemon(sandbox, args.polls)),
+        }
+    finally:
+        shutil.rmtree(sandbox, ignore_errors=True)
+
+    for mode, stats in results.items():
+        print(
+            f"{mode:>6}: wall median {stats['wall']['median_ms']:8.2f} ms (max {stats['wall']['max_ms']:8.2f})  "
+            f"cpu median {stats['cpu']['median_ms']:8.2f} ms (max {stats['cpu']['max_ms']:8.2f})"
+        )
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
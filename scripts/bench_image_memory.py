@@ -0,0 +1,156 @@
+"""Benchmark: peak RSS of processing one cover image, by image size.
+
+Compares the old path (whole body via `response.content`, full Pillow decode
+unless thumbnail() happens to draft it) with the bounded path in
+post_formatter (streamed download with a byte cap, JPEG draft decode, pixel
+budget). Each measurement runs in a fresh interpreter and reports its peak
+RSS (VmHWM), so one case's allocations can't hide another's.
+
+Images are generated once into a temp dir and "downloaded" from disk in
+64 KiB chunks; no network, and nothing is written to the repo (the image
+cache is disabled).
+
+Run from the repo root:
+    .venv/bin/python scripts/bench_image_memory.py [--sizes 2,12,40] [--formats JPEG,PNG]
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+PEAK_RSS = """
+def peak_rss_mb():
+    # VmHWM is reset by execve, unlike ru_maxrss, which a child inherits
+    # from the (possibly much larger) process that spawned it.
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+"""
+
+CHILD = PEAK_RSS + """
+import io, json, os, sys
+sys.path.insert(0, os.getcwd())
+from PIL import Image
+from src import post_formatter
+
+mode, path = sys.argv[1], sys.argv[2]
+
+class FileResponse:
+    status_code = 200
+    def __init__(self, path):
+        self.path = path
+        self.headers = {"Content-Length": str(os.path.getsize(path))}
+    def raise_for_status(self):
+        pass
+    @property
+    def content(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+    def iter_content(self, chunk_size=1):
+        with open(self.path, "rb") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+    def close(self):
+        pass
+
+class FileSession:
+    def get(self, url, headers=None, **kwargs):
+        return FileResponse(path)
+
+baseline_mb = peak_rss_mb()
+ok = True
+if mode == "legacy":
+    image = Image.open(io.BytesIO(FileSession().get(path).content))
+    image.thumbnail((1000, 1000))
+    if image.mode in ("RGBA", "P"):
+        image = image.convert("RGB")
+    out = io.BytesIO()
+    image.save(out, format="JPEG", quality=85)
+else:
+    try:
+        post_formatter._fetch_processed_image(path, FileSession(), {})
+    except ValueError:
+        ok = False  # rejected by the byte cap or pixel budget
+print(json.dumps({"baseline_mb": baseline_mb, "peak_mb": peak_rss_mb(), "ok": ok}))
+"""
+
+# Width:height of generated images (typical hero artwork)
+ASPECT = (3, 2)
+
+
+MAKE_IMAGE = """
+import sys
+from PIL import Image
+fmt, megapixels, path, aspect_w, aspect_h = sys.argv[1], float(sys.argv[2]), sys.argv[3], int(sys.argv[4]), int(sys.argv[5])
+height = int((megapixels * 1_000_000 * aspect_h / aspect_w) ** 0.5)
+width = int(height * aspect_w / aspect_h)
+# Smooth gradient + noise: compresses like a photo, not like a flat fill
+base = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+noise = Image.effect_noise((width, height), 24).convert("RGB")
+Image.blend(base, noise, 0.3).save(path, format=fmt, **({"quality": 90} if fmt == "JPEG" else {}))
+"""
+
+
+def make_image(directory: Path, fmt: str, megapixels: float) -> Path:
+    """Generate the test image in a subprocess so this process stays small."""
+    path = directory / f"{megapixels:g}mp.{fmt.lower()}"
+    subprocess.run(
+        [sys.executable, "-c", MAKE_IMAGE, fmt, str(megapixels), str(path), str(ASPECT[0]), str(ASPECT[1])],
+        check=True,
+    )
+    return path
+
+
+def measure(mode: str, path: Path) -> dict:
+    env = {**os.environ, "IMAGE_CACHE_MAX_BYTES": "0"}
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, mode, str(path)],
+        cwd=REPO_ROOT, env=env, check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="2,12,40", help="Comma-separated megapixel sizes")
+    parser.add_argument("--formats", default="JPEG,PNG", help="Comma-separated Pillow formats")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_image_memory_"))
+    results = []
+    try:
+        for fmt in args.formats.split(","):
+            for megapixels in (float(s) for s in args.sizes.split(",")):
+                path = make_image(workdir, fmt, megapixels)
+                row = {"format": fmt, "megapixels": megapixels, "file_mb": round(path.stat().st_size / 1e6, 2)}
+                for mode in ("legacy", "bounded"):
+                    sample = measure(mode, path)
+                    row[mode] = {
+                        "peak_mb": round(sample["peak_mb"], 1),
+                        "over_baseline_mb": round(sample["peak_mb"] - sample["baseline_mb"], 1),
+                        "ok": sample["ok"],
+                    }
+                results.append(row)
+                print(
+                    f"{fmt:>4} {megapixels:5g} MP ({row['file_mb']:6.2f} MB file): "
+                    f"legacy +{row['legacy']['over_baseline_mb']:7.1f} MB   "
+                    f"bounded +{row['bounded']['over_baseline_mb']:7.1f} MB"
+                    f"{'' if row['bounded']['ok'] else ' (rejected -> rdl.ink fallback)'}"
+                )
+                path.unlink()
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Benchmark: per-call cost of a log call, old direct handlers vs the queued pipeline.
+
+The caller-side cost is what a poll pays; the listener thread's file and
+console I/O happen off the hot path. Scenarios:
+
+  direct_text         FileHandler + StreamHandler on the root logger (the old
+                      setup_logging): the caller formats and writes each record
+  queued_text         setup_logging(): QueueHandler + QueueListener, rotating file
+  queued_json         the same with LOG_FORMAT=json
+  debug_off_fstring   logger.debug(f"...{payload}") with DEBUG off: the payload
+                      (a Raindrop listing page) is rendered anyway
+  debug_off_lazy      logger.debug("... %s", payload) with DEBUG off
+
+Each scenario runs --calls log calls, --repeat times; the best per-call time
+is reported. The console stream goes to /dev/null and the log file to a temp
+dir, so the repo's logs/ is untouched.
+
+Run from the repo root:
+    .venv/bin/python scripts/bench_logging.py [--calls 20000] [--repeat 5]
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils import logging_config
+
+logger = logging.getLogger("bench.logging")
+
+# Roughly one Raindrop listing page, as logged at DEBUG by raindrop_handler
+PAYLOAD = {
+    "result": True,
+    "count": 25,
+    "items": [
+        {"_id": 1000 + i, "title": f"Bookmark {i} " + "words " * 12, "link": f"https://example.com/article/{i}",
+         "tags": ["toskeet", "reading"], "excerpt": "An excerpt " * 20, "lastUpdate": "2026-01-01T00:00:00.000Z"}
+        for i in range(25)
+    ],
+}
+
+
+def reset_root():
+    logging_config.shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    for key in ('LOG_FORMAT', 'LOG_ROTATION'):
+        os.environ.pop(key, None)
+
+
+def quiet_console(handlers):
+    for handler in handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setStream(open(os.devnull, "w"))
+
+
+def direct(tmpdir):
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    formatter = logging.Formatter(logging_config.TEXT_FORMAT)
+    file_handler = logging.FileHandler(os.path.join(tmpdir, "direct.log"))
+    console_handler = logging.StreamHandler(open(os.devnull, "w"))
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+
+
+def queued(tmpdir, log_format="text"):
+    os.environ["LOG_FORMAT"] = log_format
+    logging_config._logging_configured = False
+    logging_config.setup_logging(level=logging.INFO, log_file=os.path.join(tmpdir, f"queued-{log_format}.log"))
+    quiet_console(logging_config._listener.handlers)
+
+
+def call_info(i):
+    logger.info("Posting %d pending Raindrop(s) for %s", i, "alice.test")
+
+
+def call_debug_fstring(i):
+    logger.debug(f"Response from Raindrop API: {PAYLOAD}")
+
+
+def call_debug_lazy(i):
+    logger.debug("Response from Raindrop API: %s", PAYLOAD)
+
+
+SCENARIOS = {
+    "direct_text": (direct, call_info),
+    "queued_text": (queued, call_info),
+    "queued_json": (lambda tmpdir: queued(tmpdir, "json"), call_info),
+    "debug_off_fstring": (queued, call_debug_fstring),
+    "debug_off_lazy": (queued, call_debug_lazy),
+}
+
+
+def run(name, calls, repeat, tmpdir):
+    setup, call = SCENARIOS[name]
+    best = float("inf")
+    for _ in range(repeat):
+        setup(tmpdir)
+        try:
+            started = time.perf_counter()
+            for i in range(calls):
+                call(i)
+            best = min(best, (time.perf_counter() - started) / calls)
+        finally:
+            reset_root()
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # The benchmark installs its own handlers
+    logging_config._logging_configured = True
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for name in SCENARIOS:
+            results[name] = round(run(name, args.calls, args.repeat, tmpdir) * 1e6, 3)
+
+    for name, micros in results.items():
+        print(f"{name:>18}: {micros:8.3f} us/call")
+    print(json.dumps({"calls": args.calls, "repeat": args.repeat, "us_per_call": results}))
+
+
+if __name__ == "__main__":
+    main()
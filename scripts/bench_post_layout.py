@@ -0,0 +1,148 @@
+"""Benchmark: post layout, build-measure-shrink loop vs single-pass layout.
+
+Runs a corpus of real-world bookmark titles and URLs (news, newsletters,
+long slugs, non-Latin titles, emoji) through the legacy
+_build_post_with_retries loop (copied here as it was in post_formatter) and
+through post_layout.layout_post, both counting graphemes with the UAX #29
+segmenter so only the layout strategy differs. Reports TextBuilder builds
+per post, time per post, how much of the 300-grapheme budget is used, and
+how often the title survives.
+
+Run from the repo root:
+    .venv/bin/python scripts/bench_post_layout.py [--repeat 200]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from atproto import client_utils
+from src.post_formatter import BLUESKY_CHAR_LIMIT, count_graphemes, strip_tracking_params, truncate_to_grapheme_limit
+from src.utils import post_layout
+
+CORPUS = [
+    ("Microsoft in Talks to Ax Key Energy Pledge Amid Data Center Boom",
+     "https://www.bloomberg.com/news/articles/2026-05-06/microsoft-clean-power-target-on-chopping-block-over-data-center-boom"
+     "?cmpid=BBD050626_GREENDAILY&utm_campaign=greendaily&utm_medium=email&utm_source=newsletter"),
+    ("The Best Way to Learn Rust in 2026: A Practical Guide for Python Developers Who Want Systems-Level Performance "
+     "Without Giving Up Readability, With Worked Examples, Benchmarks and a Reading List",
+     "https://blog.example.dev/posts/2026/learn-rust-practical-guide-python-developers-systems-performance-readability"),
+    ("Why SQLite Is So Great for the Edge",
+     "https://example.substack.com/p/why-sqlite-is-so-great-for-the-edge?r=2abcd&utm_campaign=post&utm_medium=web&triedRedirect=true"),
+    ("Ask HN: What are you working on (October 2026)?", "https://news.ycombinator.com/item?id=41234567"),
+    ("東京の新しいカフェ文化：若者が集まる理由と、その背景にある都市計画の変化について詳しく解説します。"
+     "地方との比較や海外の事例も交えながら、これからの街づくりを考える長編レポートです。" * 2,
+     "https://www.example.co.jp/articles/2026/10/tokyo-cafe-culture-urban-planning"),
+    ("Les élèves ont présenté leur café préféré à l'école — une enquête sur les habitudes de consommation des "
+     "lycéens français, de Lille à Marseille, et ce qu'elle révèle de la société",
+     "https://www.lemonde.fr/societe/article/2026/10/12/les-eleves-et-le-cafe_6123456_3224.html"),
+    ("🚀 Launch week recap 🎉 — everything we shipped 👨‍👩‍👧‍👦 for teams in 🇺🇸🇬🇧🇯🇵 plus 👍🏽 feedback from the community, "
+     "what's next on the roadmap, and a thank-you to every early adopter ❤️‍🔥",
+     "https://example.com/blog/launch-week-recap"),
+    ("Stable Diffusion 4 technical report",
+     "https://arxiv.org/abs/2610.01234"),
+    ("A very long URL from a CMS that puts everything in the query string",
+     "https://shop.example.com/catalog/product/view?id=123456&category=outdoor&subcategory=tents&color=green"
+     "&size=4p&ref=homepage_carousel_slot_3&session=abcdef0123456789abcdef0123456789&variant=ultralight-2026"
+     "&currency=USD&locale=en-US&affiliate=partner-network-7"),
+    ("Short", "https://t.co/abc"),
+    ("Release notes: version 3.2.0 brings faster builds, a new plugin API, Windows ARM support, and dozens of fixes "
+     "across the CLI, the language server and the documentation site — upgrade guide inside",
+     "https://github.com/example/project/releases/tag/v3.2.0"),
+    ("क्षत्रिय और श्रीमान ने नमस्ते कहा: हिन्दी पत्रकारिता के सौ साल, एक लंबी रिपोर्ट जो भाषा, समाज और मीडिया के बदलते रिश्तों को देखती है, "
+     "और आगे की चुनौतियों पर चर्चा करती है",
+     "https://www.example.in/hindi/article/2026/10/hindi-journalism-100-years"),
+    ("Tight budget: a title next to a URL that leaves almost no room",
+     "https://example.com/" + "deep-path-segment/" * 15 + "index.h"),
+    ("Hopeless: the link alone is over the limit",
+     "https://example.com/" + "x" * 320),
+]
+
+
+class CountingTextBuilder(client_utils.TextBuilder):
+    builds = 0
+
+    def build_text(self) -> str:
+        CountingTextBuilder.builds += 1
+        return super().build_text()
+
+
+def legacy_layout(full_text: str, link: str):
+    """post_formatter's pre-layout path: edge-case check + build/measure/shrink loop."""
+    if BLUESKY_CHAR_LIMIT - count_graphemes(link) - 2 <= 0:
+        tb = CountingTextBuilder()
+        tb.link(link, link)
+        return tb.build_text(), tb.build_facets()
+    available_for_text = BLUESKY_CHAR_LIMIT - count_graphemes(link) - 2
+    if count_graphemes(full_text) > available_for_text:
+        body_text = truncate_to_grapheme_limit(full_text, available_for_text - 1)
+    else:
+        body_text = full_text
+    for _ in range(3):
+        tb = CountingTextBuilder()
+        tb.text(body_text)
+        tb.text("\n")
+        tb.link(link, link)
+        formatted_text = tb.build_text()
+        facets = tb.build_facets()
+        overage = count_graphemes(formatted_text) - BLUESKY_CHAR_LIMIT
+        if overage <= 0:
+            return formatted_text, facets
+        body_text = truncate_to_grapheme_limit(body_text, max(count_graphemes(body_text) - overage - 1, 1))
+    tb = CountingTextBuilder()
+    tb.link(link, link)
+    return tb.build_text(), tb.build_facets()
+
+
+def single_pass_layout(full_text: str, link: str):
+    CountingTextBuilder.builds += 1  # layout_post assembles the text exactly once
+    return post_layout.layout_post(full_text, link, BLUESKY_CHAR_LIMIT)
+
+
+def measure(layout, repeat: int) -> dict:
+    posts = [(title, strip_tracking_params(link)) for title, link in CORPUS]
+    CountingTextBuilder.builds = 0
+    used, kept = [], 0
+    for title, link in posts:
+        text, _ = layout(title, link)
+        used.append(count_graphemes(text))
+        kept += text.startswith(title[:1])
+    builds_per_post = CountingTextBuilder.builds / len(posts)
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for title, link in posts:
+            layout(title, link)
+    per_post_us = (time.perf_counter() - started) / (repeat * len(posts)) * 1e6
+    postable = [u for u in used if u <= BLUESKY_CHAR_LIMIT]
+    return {
+        "builds_per_post": round(builds_per_post, 2),
+        "us_per_post": round(per_post_us, 1),
+        "title_kept": f"{kept}/{len(posts)}",
+        "mean_graphemes": round(statistics.mean(postable), 1),
+        "over_limit": len(used) - len(postable),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="Timed passes over the corpus")
+    args = parser.parse_args()
+
+    results = {
+        "legacy": measure(legacy_layout, args.repeat),
+        "single_pass": measure(single_pass_layout, args.repeat),
+    }
+    for mode, row in results.items():
+        print(f"{mode:>12}: {row['builds_per_post']:.2f} builds/post, {row['us_per_post']:7.1f} us/post, "
+              f"title kept {row['title_kept']}, mean {row['mean_graphemes']} graphemes, "
+              f"{row['over_limit']} over limit")
+    print(json.dumps({"posts": len(CORPUS), "results": results}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Generate src/utils/_grapheme_data.py from the Unicode Character Database.
+
+The grapheme segmenter (src/utils/graphemes.py) needs, per code point, the
+Grapheme_Cluster_Break property plus Extended_Pictographic and the
+Indic_Conjunct_Break (InCB) values used by rules GB9c and GB11. This script
+reads them from the UCD text files and writes one compact range table, and
+vendors the matching GraphemeBreakTest.txt for
+scripts/test_grapheme_conformance.py.
+
+Files are downloaded from unicode.org for --version, or read from --ucd-dir
+(a directory holding the four files below, flat).
+
+Run from the repo root:
+    .venv/bin/python scripts/gen_grapheme_data.py [--version 18.0.0] [--ucd-dir DIR]
+"""
+import argparse
+import re
+import shutil
+import sys
+import tempfile
+import urllib.request
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+OUTPUT = REPO_ROOT / "src" / "utils" / "_grapheme_data.py"
+TEST_DATA = REPO_ROOT / "scripts" / "data" / "GraphemeBreakTest.txt"
+
+UCD_URL = "https://www.unicode.org/Public/{version}/ucd/{path}"
+UCD_FILES = {
+    "GraphemeBreakProperty.txt": "auxiliary/GraphemeBreakProperty.txt",
+    "GraphemeBreakTest.txt": "auxiliary/GraphemeBreakTest.txt",
+    "emoji-data.txt": "emoji/emoji-data.txt",
+    "DerivedCoreProperties.txt": "DerivedCoreProperties.txt",
+}
+
+# Must match the constants in src/utils/graphemes.py
+GCB_CODES = {
+    "Other": 0, "CR": 1, "LF": 2, "Control": 3, "Extend": 4, "ZWJ": 5,
+    "Regional_Indicator": 6, "Prepend": 7, "SpacingMark": 8,
+    "L": 9, "V": 10, "T": 11, "LV": 12, "LVT": 13,
+}
+EXT_PICT = 0x10
+INCB_FLAGS = {"Consonant": 0x20, "Extend": 0x40, "Linker": 0x80}
+
+LINE = re.compile(r"^([0-9A-F]+)(?:\.\.([0-9A-F]+))?\s*;\s*([^#]+?)\s*(?:#|$)")
+
+
+def fetch(version: str, ucd_dir: Path | None, workdir: Path) -> dict:
+    paths = {}
+    for name, remote in UCD_FILES.items():
+        if ucd_dir is not None:
+            paths[name] = ucd_dir / name
+            continue
+        url = UCD_URL.format(version=version, path=remote)
+        print(f"Downloading {url}")
+        target = workdir / name
+        with urllib.request.urlopen(url, timeout=60) as response, open(target, "wb") as f:
+            shutil.copyfileobj(response, f)
+        paths[name] = target
+    return paths
+
+
+def file_version(path: Path) -> str:
+    """Unicode version from a UCD file header, e.g. '# GraphemeBreakProperty-18.0.0.txt'."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            match = re.search(r"-(\d+\.\d+\.\d+)\.txt", line) or re.search(r"Version: (\d+\.\d+\.\d+)", line)
+            if match:
+                return match.group(1)
+            if not line.startswith("#"):
+                break
+    return "unknown"
+
+
+def parse(path: Path):
+    """Yield (first, last, fields) for each data line of a UCD property file."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            match = LINE.match(line)
+            if match:
+                first = int(match.group(1), 16)
+                last = int(match.group(2) or match.group(1), 16)
+                yield first, last, [field.strip() for field in match.group(3).split(";")]
+
+
+def build_values(paths: dict) -> list:
+    values = [0] * 0x110000
+    for first, last, fields in parse(paths["GraphemeBreakProperty.txt"]):
+        code = GCB_CODES[fields[0]]
+        for cp in range(first, last + 1):
+            values[cp] = code
+    for first, last, fields in parse(paths["emoji-data.txt"]):
+        if fields[0] == "Extended_Pictographic":
+            for cp in range(first, last + 1):
+                values[cp] |= EXT_PICT
+    for first, last, fields in parse(paths["DerivedCoreProperties.txt"]):
+        if fields[0] == "InCB" and fields[1] in INCB_FLAGS:
+            for cp in range(first, last + 1):
+                values[cp] |= INCB_FLAGS[fields[1]]
+    return values
+
+
+def ranges(values: list) -> tuple:
+    starts, codes = [], []
+    for cp, value in enumerate(values):
+        if not codes or codes[-1] != value:
+            starts.append(cp)
+            codes.append(value)
+    return starts, codes
+
+
+def format_table(name: str, numbers: list, fmt: str, per_line: int) -> str:
+    lines = [f"{name} = ("]
+    for i in range(0, len(numbers), per_line):
+        lines.append("    " + ", ".join(fmt.format(n) for n in numbers[i:i + per_line]) + ",")
+    lines.append(")")
+    return "\n".join(lines)
+
+
+def render(version: str, starts: list, codes: list) -> str:
+    return f'''"""Grapheme segmentation tables — generated, do not edit.
+
+Generated by scripts/gen_grapheme_data.py from Unicode {version}:
+GraphemeBreakProperty.txt, emoji-data.txt (Extended_Pictographic) and
+DerivedCoreProperties.txt (InCB). Copyright (c) Unicode, Inc.; see
+https://www.unicode.org/terms_of_use.html
+
+RANGE_STARTS[i] is the first code point of a run whose value is
+RANGE_VALUES[i]: the Grapheme_Cluster_Break code in the low 4 bits, plus
+EXT_PICT and INCB_* flag bits (constants in src/utils/graphemes.py).
+"""
+
+UNICODE_VERSION = "{version}"
+
+{format_table("RANGE_STARTS", starts, "0x{:X}", 10)}
+
+{format_table("RANGE_VALUES", codes, "{}", 20)}
+'''
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--version", default="18.0.0", help="Unicode version to download")
+    parser.add_argument("--ucd-dir", type=Path, help="Read the UCD files from this directory instead")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = fetch(args.version, args.ucd_dir, Path(tmp))
+        version = file_version(paths["GraphemeBreakProperty.txt"])
+        test_version = file_version(paths["GraphemeBreakTest.txt"])
+        if version != test_version:
+            sys.exit(f"Version mismatch: property data {version}, test data {test_version}")
+
+        starts, codes = ranges(build_values(paths))
+        OUTPUT.write_text(render(version, starts, codes), encoding="utf-8")
+        TEST_DATA.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(paths["GraphemeBreakTest.txt"], TEST_DATA)
+
+    print(f"Wrote {OUTPUT.relative_to(REPO_ROOT)} (Unicode {version}, {len(starts)} ranges)")
+    print(f"Wrote {TEST_DATA.relative_to(REPO_ROOT)}")
+
+
+if __name__ == "__main__":
+    main()
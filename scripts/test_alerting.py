@@ -0,0 +1,281 @@
+"""Tests for deduplicated, queued admin alerts (src/utils/alerting.py) — no network.
+
+send_error_alert() used to call load_config(), readlines() the whole log and
+open a fresh SMTP_SSL connection synchronously for every failure. Verifies
+against a local SMTP stub that:
+1. The log tail is read backwards from EOF: the last N lines, exactly,
+   without reading a large log front to back.
+2. Repeats of an error (numbers masked) within ALERT_INTERVAL_SECONDS are
+   held back, survive into the next process via the state file, and go out
+   as one digest once the interval has passed.
+3. send_error_alert() returns at once while the worker delivers; a burst
+   of alerts shares one email, and emails share one SMTP connection.
+4. A dropped connection is reopened; a dead server is logged, not raised.
+5. shutdown() drains the queue before the process exits.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_alerting.py
+"""
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from email import message_from_bytes
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils import alerting, email_handler
+from src.utils.error_handler import send_error_alert
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+class SMTPStub(socketserver.ThreadingTCPServer):
+    """Just enough ESMTP for smtplib: EHLO, AUTH, MAIL/RCPT/DATA, NOOP, QUIT."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), SMTPStubHandler)
+        self.connections = 0
+        self.messages = []
+        self.data_delay = 0.0
+        self.drop_after_message = False
+        self.received = threading.Condition()
+
+
+class SMTPStubHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply("220 stub ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith("EHLO"):
+                self.wfile.write(b"250-stub\r\n250 AUTH PLAIN LOGIN\r\n")
+            elif command.startswith("AUTH"):
+                self.reply("235 2.7.0 Authentication successful")
+            elif command.startswith(("MAIL", "RCPT", "RSET")):
+                self.reply("250 OK")
+            elif command == "NOOP":
+                self.reply("250 OK")
+            elif command == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if chunk in (b".\r\n", b""):
+                        break
+                    data.append(chunk[1:] if chunk.startswith(b"..") else chunk)
+                time.sleep(server.data_delay)
+                with server.received:
+                    server.messages.append(message_from_bytes(b"".join(data)))
+                    server.received.notify_all()
+                self.reply("250 OK queued")
+                if server.drop_after_message:
+                    return
+            elif command == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+def wait_for_messages(server, count, timeout=5.0):
+    with server.received:
+        server.received.wait_for(lambda: len(server.messages) >= count, timeout)
+    return len(server.messages)
+
+
+def body_of(message):
+    return message.get_payload()[0].get_payload(decode=True).decode()
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+# --- 1. Tail-seek log capture ---
+with tempfile.TemporaryDirectory() as tmpdir:
+    log = os.path.join(tmpdir, "big.log")
+    with open(log, "w") as f:
+        for i in range(200_000):
+            f.write(f"2026-01-01 00:00:00 - app - INFO - line {i}\n")
+        f.write("x" * 20_000 + "\n")
+        f.write("last line\n")
+    tail = email_handler.tail_lines(log, 3)
+    if tail.splitlines() != ["2026-01-01 00:00:00 - app - INFO - line 199999", "x" * 20_000, "last line"]:
+        fail(f"expected the last three lines, got {tail[:200]!r}")
+    if email_handler.tail_lines(log, 50).count("\n") != 50:
+        fail("tail_lines should return exactly the requested number of lines")
+    small = os.path.join(tmpdir, "small.log")
+    Path(small).write_text("only\ntwo")
+    if email_handler.tail_lines(small, 50) != "only\ntwo":
+        fail("a short file should come back whole")
+
+    reads = []
+    orig_open = open
+
+    class CountingFile:
+        def __init__(self, f):
+            self.f = f
+
+        def read(self, size=-1):
+            data = self.f.read(size)
+            reads.append(len(data))
+            return data
+
+        def __getattr__(self, name):
+            return getattr(self.f, name)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self.f.close()
+
+    email_handler.open = lambda *a, **k: CountingFile(orig_open(*a, **k))
+    try:
+        email_handler.tail_lines(log, 50)
+    finally:
+        del email_handler.open
+    if sum(reads) > 64 * 1024:
+        fail(f"tailing 50 lines of a {os.path.getsize(log)} byte log read {sum(reads)} bytes")
+print("[OK ] log tail read backwards from EOF; exact line count; bounded reads on a large log")
+
+# --- Stub server and sandboxed state for the rest ---
+smtp = SMTPStub()
+threading.Thread(target=smtp.serve_forever, daemon=True).start()
+tmpdir = tempfile.TemporaryDirectory()
+clock = Clock()
+env = {
+    "SMTP_SERVER": "127.0.0.1", "SMTP_PORT": str(smtp.server_address[1]), "SMTP_SECURITY": "none",
+    "SMTP_LOGIN": "bot@example.com", "SMTP_PASSWORD": "pw", "ADMIN_EMAIL": "admin@example.com",
+    "ALERT_INTERVAL_SECONDS": "3600", "ALERT_BATCH_SECONDS": "0.3",
+}
+orig = (alerting.ALERT_STATE_FILE, alerting._clock, email_handler.LOG_FILE)
+orig_env = {key: os.environ.get(key) for key in env}
+os.environ.update(env)
+alerting.ALERT_STATE_FILE = os.path.join(tmpdir.name, "alert_state.json")
+alerting._clock = clock
+email_handler.LOG_FILE = os.path.join(tmpdir.name, "bluesky_raindrops.log")
+Path(email_handler.LOG_FILE).write_text("earlier line\nERROR - boom\n")
+try:
+    # --- 2. Dedup and digests ---
+    alerting.reset()
+    if not alerting.alert("Failed to post Raindrop 101 to Bluesky"):
+        fail("the first occurrence should be mailed")
+    if alerting.alert("Failed to post Raindrop 102 to Bluesky") or alerting.alert("Failed to post Raindrop 103 to Bluesky"):
+        fail("repeats within the interval should be held back")
+    if not alerting.alert("Failed to remove 'toskeet' tag from Raindrop(s) 7"):
+        fail("a different error is mailed on its own")
+    if not alerting.shutdown(timeout=5) or wait_for_messages(smtp, 1) != 1:
+        fail(f"the two alerts should go out together, got {len(smtp.messages)} email(s)")
+    first = body_of(smtp.messages[0])
+    if "Raindrop 101" not in first or "Raindrop(s) 7" not in first or "Raindrop 102" in first:
+        fail(f"unexpected first email:\n{first}")
+    if "ERROR - boom" not in first or "(2 errors)" not in smtp.messages[0]["Subject"]:
+        fail("the email should carry the log tail and count the errors in its subject")
+
+    clock.now += 1800
+    alerting._worker = None  # a new process: nothing in memory
+    if alerting.alert("Failed to post Raindrop 104 to Bluesky"):
+        fail("the held-back count should survive into the next process")
+    alerting.shutdown(timeout=5)
+    if len(smtp.messages) != 1:
+        fail("nothing is due yet")
+    clock.now += 1801
+    if alerting.flush_due() != 1 or not alerting.shutdown(timeout=5) or wait_for_messages(smtp, 2) != 2:
+        fail("held-back repeats should go out as one digest once the interval has passed")
+    digest = body_of(smtp.messages[1])
+    if "3 similar error(s) held back" not in digest or "Raindrop 102" not in digest or "Raindrop 104" not in digest:
+        fail(f"the digest should count and list the held-back errors:\n{digest}")
+    if alerting.flush_due() != 0:
+        fail("a digest is sent once")
+    print("[OK ] repeats held back across processes and mailed as one digest after ALERT_INTERVAL_SECONDS")
+
+    # --- 3. Non-blocking delivery, one connection ---
+    alerting.reset()
+    smtp.connections = 0
+    smtp.data_delay = 0.5
+    started = time.monotonic()
+    send_error_alert("Unexpected error A")
+    elapsed = time.monotonic() - started
+    if elapsed > 0.2:
+        fail(f"send_error_alert should not wait for SMTP, took {elapsed:.2f}s")
+    send_error_alert("Unexpected error B")
+    send_error_alert("Unexpected error C")
+    if wait_for_messages(smtp, 3) != 3:
+        fail("queued alerts should be delivered in the background")
+    smtp.data_delay = 0.0
+    time.sleep(0.1)
+    send_error_alert("Unexpected error D")
+    if wait_for_messages(smtp, 4) != 4:
+        fail("a later alert should be delivered too")
+    alerting.shutdown(timeout=5)
+    stats = alerting.stats()
+    if smtp.connections != 1 or stats["connections"] != 1:
+        fail(f"emails should reuse one SMTP connection, opened {smtp.connections}")
+    if stats["emails"] != 2 or stats["queued"] != 4 or "Unexpected error C" not in body_of(smtp.messages[2]):
+        fail(f"the burst A-C should share an email, D get its own: {stats}")
+    print("[OK ] send_error_alert returns at once; a burst shares an email; one SMTP connection")
+
+    # --- 4. Reconnect, and a dead server ---
+    smtp.connections = 0
+    smtp.drop_after_message = True
+    send_error_alert("Unexpected error E")
+    wait_for_messages(smtp, 5)
+    time.sleep(0.1)
+    send_error_alert("Unexpected error F")
+    if wait_for_messages(smtp, 6) != 6 or smtp.connections != 2:
+        fail(f"a dropped connection should be reopened, connections: {smtp.connections}")
+    alerting.shutdown(timeout=5)
+    smtp.drop_after_message = False
+    os.environ["SMTP_PORT"] = "1"  # nothing listens there
+    send_error_alert("Unexpected error G")
+    if not alerting.shutdown(timeout=10) or alerting.stats()["failed"] != 1:
+        fail(f"an unreachable server should be counted as a failed delivery: {alerting.stats()}")
+    os.environ["SMTP_PORT"] = env["SMTP_PORT"]
+    print("[OK ] dropped connections are reopened; an unreachable server is logged, not raised")
+
+    # --- 5. shutdown() drains the queue ---
+    smtp.data_delay = 0.3
+    send_error_alert("Unexpected error H")
+    send_error_alert("Unexpected error I")
+    if not alerting.shutdown(timeout=5) or alerting.stats()["pending"]:
+        fail("shutdown should wait for the queue to drain")
+    if "Unexpected error I" not in "".join(body_of(m) for m in smtp.messages):
+        fail("everything queued before shutdown should be delivered")
+    print("[OK ] shutdown() delivers everything queued before returning")
+finally:
+    smtp.data_delay = 0.0
+    alerting.shutdown(timeout=5)
+    alerting.ALERT_STATE_FILE, alerting._clock, email_handler.LOG_FILE = orig
+    alerting.reset()
+    for key, value in orig_env.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+    smtp.shutdown()
+    smtp.server_close()
+    tmpdir.cleanup()
+
+print("All alerting checks passed.")
@@ -0,0 +1,216 @@
+"""Tests for batch posting — no network.
+
+main() used to post at most one bookmark per run, so tagging 30 articles took
+5 hours of cron ticks to drain. It now posts up to MAX_POSTS_PER_RUN pending
+items from one listing, spaced by POST_SPACING_SECONDS. Verifies that:
+1. get_pending_raindrops returns unposted items in '-created' order from a
+   single listing request, capped at `limit`.
+2. main() posts the whole batch in order, waits between (not before) posts,
+   and makes exactly one Raindrop fetch.
+3. A failed Bluesky post stops the batch — the rest is left for the next run,
+   but whatever was posted is still untagged (in one bulk request).
+4. A batch running longer than STALE_LOCK_SECONDS keeps its lock fresh, so
+   another run can't take it as stale and post the same items.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_batch_mode.py
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Don't let importing the entry point create logs/ in the repo.
+from src.utils import logging_config
+logging_config._logging_configured = True
+
+import raindrop_to_bluesky as app
+from src import raindrop_handler
+from src.utils import file_lock
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+        self.text = json.dumps(payload)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Stands in for the shared pooled HTTP session."""
+    def __init__(self, get=None, put=None):
+        self.get = get
+        self.put = put
+
+
+# --- 1. One listing request returns every pending item, newest first ---
+
+def run_pending_check():
+    items = [{"_id": i} for i in (5, 4, 3, 2, 1)]  # API returns -created order
+    calls = []
+
+    def fake_get(url, headers=None, params=None, timeout=None):
+        calls.append(params)
+        return FakeResponse({"items": items})
+
+    orig_get_session = raindrop_handler.get_session
+    orig_already = raindrop_handler.is_already_posted_many
+    orig_remove = raindrop_handler.remove_toskeet_tag
+    try:
+        raindrop_handler.get_session = lambda: FakeSession(get=fake_get)
+        raindrop_handler.is_already_posted_many = lambda ids, namespace=None: {rid for rid in ids if rid == 4}
+        raindrop_handler.remove_toskeet_tag = lambda token, rid, tag="toskeet", **kwargs: True
+        pending = raindrop_handler.get_pending_raindrops("fake-token", limit=3)
+    finally:
+        raindrop_handler.get_session = orig_get_session
+        raindrop_handler.is_already_posted_many = orig_already
+        raindrop_handler.remove_toskeet_tag = orig_remove
+
+    ids = [r["_id"] for r in pending]
+    if ids != [5, 3, 2]:
+        fail(f"expected pending [5, 3, 2] (posted 4 skipped, capped at 3), got {ids}")
+    if len(calls) != 1:
+        fail(f"expected one listing request, got {len(calls)}")
+    if calls[0]["perpage"] < 3:
+        fail(f"perpage {calls[0]['perpage']} can't hold a batch of 3")
+    print("[OK ] get_pending_raindrops: one request, '-created' order, capped at limit")
+
+
+run_pending_check()
+
+
+# --- 2/3. main() posts the batch with spacing; stops after a failed post ---
+
+CONFIG = {
+    "RAINDROP_TOKEN": "fake-token",
+    "RAINDROP_TAG": "toskeet",
+    "BLUESKY_IDENTIFIER": "user.test",
+    "BLUESKY_PASSWORD": "password",
+    "MAX_POSTS_PER_RUN": 3,
+    "POST_SPACING_SECONDS": 30,
+}
+
+
+class PostResult:
+    def __init__(self, uri):
+        self.uri = uri
+
+
+def run_main(pending, failing_ids=(), config=None, on_post=None):
+    events = []
+
+    def fake_pending(token, tag="toskeet", limit=1, **kwargs):
+        events.append(("fetch", limit))
+        return pending[:limit]
+
+    def fake_format(raindrop):
+        return raindrop["title"], [], None
+
+    def fake_post(identifier, password, text, facets, embed):
+        events.append(("post", text))
+        if on_post is not None:
+            on_post()
+        return None if text in failing_ids else PostResult(f"at://{text}")
+
+    def fake_remove_bulk(token, raindrops, tag="toskeet"):
+        events.append(("untag", [r["_id"] for r in raindrops]))
+        return {r["_id"]: True for r in raindrops}
+
+    class FakeStopEvent:
+        def wait(self, timeout):
+            events.append(("wait", timeout))
+            return False
+
+    patches = {
+        "get_pending_raindrops": fake_pending,
+        "format_bluesky_post_from_raindrop": fake_format,
+        "post_content_to_bluesky": fake_post,
+        "mark_as_posted": lambda rid, uri=None, namespace=None: events.append(("mark", rid)),
+        "remove_tag_bulk": fake_remove_bulk,
+        "cleanup_old_entries": lambda namespace=None: None,
+        "send_error_alert": lambda msg: events.append(("alert", msg)),
+        "_stop_event": FakeStopEvent(),
+    }
+    originals = {name: getattr(app, name) for name in patches}
+    try:
+        for name, value in patches.items():
+            setattr(app, name, value)
+        app.main(dict(config or CONFIG))
+    finally:
+        for name, value in originals.items():
+            setattr(app, name, value)
+    return events
+
+
+pending = [{"_id": i, "title": f"item{i}"} for i in (9, 8, 7, 6)]
+
+events = run_main(pending)
+fetches = [e for e in events if e[0] == "fetch"]
+posts = [e[1] for e in events if e[0] == "post"]
+waits = [e[1] for e in events if e[0] == "wait"]
+if fetches != [("fetch", 3)]:
+    fail(f"expected one fetch with limit=MAX_POSTS_PER_RUN, got {fetches}")
+if posts != ["item9", "item8", "item7"]:
+    fail(f"expected batch posted newest-first and capped at 3, got {posts}")
+if waits != [30, 30]:
+    fail(f"expected a 30s gap between each pair of posts, got waits {waits}")
+if events.index(("wait", 30)) < events.index(("post", "item9")):
+    fail("must not wait before the first post")
+untags = [e[1] for e in events if e[0] == "untag"]
+if untags != [[9, 8, 7]]:
+    fail(f"expected one bulk tag removal for the whole batch, got {untags}")
+if events.index(("mark", 7)) > events.index(("untag", [9, 8, 7])):
+    fail("every item must be marked as posted before its tag is removed")
+print("[OK ] main posts the batch in order with spacing between posts, one fetch")
+print("[OK ] posted items are untagged together after being marked as posted")
+
+events = run_main(pending, failing_ids={"item8"})
+posts = [e[1] for e in events if e[0] == "post"]
+if posts != ["item9", "item8"]:
+    fail(f"expected the batch to stop after the failed post, got {posts}")
+if not any(e[0] == "alert" for e in events):
+    fail("a failed post must still send an alert")
+if [e[1] for e in events if e[0] == "untag"] != [[9]]:
+    fail("items posted before the failure must still be untagged")
+print("[OK ] a failed post stops the batch and alerts")
+
+# --- 4. A batch longer than the stale-lock window keeps its lock ---
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    orig_lock = (file_lock.LOCK_FILE, file_lock.STALE_LOCK_SECONDS)
+    file_lock.LOCK_FILE = os.path.join(tmpdir, "raindrop_bot.lock")
+    file_lock.STALE_LOCK_SECONDS = 0.3
+    stolen = []
+
+    def slow_post():
+        time.sleep(0.2)
+        # What the next cron tick does while this batch is still posting
+        stolen.append(file_lock.acquire_lock())
+
+    try:
+        with file_lock.script_lock() as acquired:
+            if not acquired:
+                fail("setup: could not take the script lock")
+            events = run_main(pending, config={**CONFIG, "MAX_POSTS_PER_RUN": 4, "POST_SPACING_SECONDS": 0},
+                              on_post=slow_post)
+    finally:
+        file_lock.LOCK_FILE, file_lock.STALE_LOCK_SECONDS = orig_lock
+if len([e for e in events if e[0] == "post"]) != 4 or any(stolen):
+    fail(f"a batch outlasting the stale window lost its lock to another run: {stolen}")
+print("[OK ] a batch longer than the stale-lock window keeps its lock fresh")
+
+print("All batch-mode checks passed.")
@@ -9,7 +9,9 @@ must use the response status code instead, and must not false-positive on
 Run from the repo root:
     .venv/bin/python scripts/test_bluesky_retry.py
 """
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -17,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 from atproto_client.exceptions import InvokeTimeoutError, RequestException
 from atproto_client.request import Response
 from src import bluesky_handler
+from src.utils import retry, session_store
 
 
 def fail(msg: str) -> None:
@@ -40,7 +43,7 @@ def run_case(name: str, login_errors: list, expect_result: bool, expect_attempts
     attempts = {"count": 0}
 
     class FakeClient:
-        def __init__(self):
+        def __init__(self, request=None):
             attempts["count"] += 1
             self._error = (
                 login_errors[attempts["count"] - 1]
@@ -48,7 +51,10 @@ def run_case(name: str, login_errors: list, expect_result: bool, expect_attempts
                 else None
             )
 
-        def login(self, identifier, password):
+        def on_session_change(self, callback):
+            pass
+
+        def login(self, identifier=None, password=None, session_string=None):
             if self._error is not None:
                 raise self._error
 
@@ -56,16 +62,23 @@ def run_case(name: str, login_errors: list, expect_result: bool, expect_attempts
             return SENT_POST
 
     orig_client = bluesky_handler.Client
-    orig_sleep = bluesky_handler.time.sleep
+    orig_sleep = retry.sleep
+    orig_session_file = session_store.SESSION_FILE
     try:
         bluesky_handler.Client = FakeClient
-        bluesky_handler.time.sleep = lambda s: None
-        result = bluesky_handler.post_content_to_bluesky(
-            "user.test", "password", "hello", [], None
-        )
+        retry.sleep = lambda seconds, cancel=None: False
+        # Start every case logged out: no cached client, no stored session
+        bluesky_handler._clients.clear()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            session_store.SESSION_FILE = os.path.join(tmpdir, "bluesky_session.json")
+            result = bluesky_handler.post_content_to_bluesky(
+                "user.test", "password", "hello", [], None
+            )
     finally:
         bluesky_handler.Client = orig_client
-        bluesky_handler.time.sleep = orig_sleep
+        retry.sleep = orig_sleep
+        session_store.SESSION_FILE = orig_session_file
+        bluesky_handler._clients.clear()
 
     got_result = result is SENT_POST
     if got_result != expect_result:
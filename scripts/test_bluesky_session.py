@@ -0,0 +1,158 @@
+"""Tests for Bluesky session reuse — no network.
+
+Every post used to build a fresh Client and call login() (a createSession
+round trip) on every retry, which eats Bluesky's strict createSession rate
+limit. Sessions are now cached per process and persisted between runs.
+Verifies that:
+1. A password login saves the session; later posts in the same process and
+   in a new process (stored session) do not log in with the password again.
+2. A stored session whose refresh fails falls back to one password login.
+3. A session rejected mid-post is dropped and the post retried with a fresh login.
+4. A bad password is not retried against createSession.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_bluesky_session.py
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from atproto import SessionEvent
+from atproto_client.exceptions import BadRequestError, UnauthorizedError
+from atproto_client.models.common import XrpcError
+from atproto_client.request import Response
+from src import bluesky_handler
+from src.utils import retry, session_store
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+SENT_POST = object()
+
+
+def expired_token_error() -> BadRequestError:
+    return BadRequestError(Response(
+        success=False, status_code=400, headers={},
+        content=XrpcError(error="ExpiredToken", message="Token has expired"),
+    ))
+
+
+class FakeSession:
+    def __init__(self, value):
+        self.value = value
+
+    def encode(self):
+        return self.value
+
+
+class FakeClient:
+    """Records password logins and session resumes; behavior set per test."""
+    password_logins = 0
+    resumes = 0
+    resume_error = None
+    send_errors: list = []
+    password_error = None
+
+    def __init__(self, request=None):
+        self._callbacks = []
+
+    def on_session_change(self, callback):
+        self._callbacks.append(callback)
+
+    def login(self, identifier=None, password=None, session_string=None):
+        if session_string:
+            FakeClient.resumes += 1
+            if FakeClient.resume_error is not None:
+                raise FakeClient.resume_error
+            return
+        FakeClient.password_logins += 1
+        if FakeClient.password_error is not None:
+            raise FakeClient.password_error
+        for callback in self._callbacks:
+            callback(SessionEvent.CREATE, FakeSession(f"session-{FakeClient.password_logins}"))
+
+    def send_post(self, text, facets=None, embed=None):
+        if FakeClient.send_errors:
+            raise FakeClient.send_errors.pop(0)
+        return SENT_POST
+
+
+def reset(resume_error=None, send_errors=(), password_error=None, new_process=True):
+    FakeClient.password_logins = 0
+    FakeClient.resumes = 0
+    FakeClient.resume_error = resume_error
+    FakeClient.send_errors = list(send_errors)
+    FakeClient.password_error = password_error
+    if new_process:
+        bluesky_handler._clients.clear()
+
+
+def post():
+    return bluesky_handler.post_content_to_bluesky("user.test", "password", "hello", [], None)
+
+
+orig_client = bluesky_handler.Client
+orig_sleep = retry.sleep
+orig_session_file = session_store.SESSION_FILE
+tmpdir = tempfile.TemporaryDirectory()
+try:
+    bluesky_handler.Client = FakeClient
+    retry.sleep = lambda seconds, cancel=None: False
+    session_store.SESSION_FILE = os.path.join(tmpdir.name, "bluesky_session.json")
+
+    # --- 1. Login once, then reuse in-process and across processes ---
+    reset()
+    if post() is not SENT_POST or FakeClient.password_logins != 1:
+        fail(f"first post should log in once, got {FakeClient.password_logins} logins")
+    if session_store.load_session("user.test") != "session-1":
+        fail("password login did not persist the session")
+    if oct(os.stat(session_store.SESSION_FILE).st_mode & 0o777) != oct(0o600):
+        fail("session file must be readable by the owner only")
+    print("[OK ] password login persists the session (mode 600)")
+
+    reset(new_process=False)
+    for _ in range(3):
+        post()
+    if FakeClient.password_logins or FakeClient.resumes:
+        fail(f"in-process posts re-authenticated ({FakeClient.password_logins} logins, {FakeClient.resumes} resumes)")
+    print("[OK ] later posts in the same process reuse the cached client")
+
+    reset()
+    if post() is not SENT_POST or FakeClient.password_logins != 0 or FakeClient.resumes != 1:
+        fail(f"new process should resume, got {FakeClient.password_logins} logins, {FakeClient.resumes} resumes")
+    print("[OK ] a new process resumes the stored session without a password login")
+
+    # --- 2. Failed refresh falls back to a password login ---
+    reset(resume_error=expired_token_error())
+    if post() is not SENT_POST or FakeClient.password_logins != 1:
+        fail(f"expired stored session should fall back to one login, got {FakeClient.password_logins}")
+    print("[OK ] expired stored session falls back to one password login")
+
+    # --- 3. Session rejected mid-post: drop it, log in again, post ---
+    reset(send_errors=[UnauthorizedError()])
+    if post() is not SENT_POST:
+        fail("post should succeed after re-login when the session is rejected")
+    if FakeClient.password_logins != 1:
+        fail(f"expected one re-login after session rejection, got {FakeClient.password_logins}")
+    print("[OK ] rejected session is dropped and the post retried after one login")
+
+    # --- 4. A bad password is not retried ---
+    session_store.clear_session("user.test")
+    reset(password_error=UnauthorizedError())
+    if post() is not None or FakeClient.password_logins != 1:
+        fail(f"bad password must not be retried, got {FakeClient.password_logins} logins")
+    print("[OK ] bad password is not retried against createSession")
+finally:
+    bluesky_handler.Client = orig_client
+    retry.sleep = orig_sleep
+    session_store.SESSION_FILE = orig_session_file
+    bluesky_handler._clients.clear()
+    tmpdir.cleanup()
+
+print("All bluesky-session checks passed.")
@@ -0,0 +1,156 @@
+"""Tests for bulk trigger-tag removal — no network.
+
+remove_toskeet_tag makes a GET and a PUT per item even though the listing
+already carries each item's tags. remove_tag_bulk uses those tags:
+trigger-only items are cleared in one multi-item update, items with other
+tags get one PUT each, and anything that fails falls back to the per-item
+GET+PUT path. Verifies request counts and per-ID results, and that tags
+from a listing fetched before the batch was posted are re-read (one listing
+request) so tags the user added meanwhile aren't overwritten.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_bulk_tag_removal.py
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+from src import raindrop_handler
+from src.utils import retry
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.text = json.dumps(payload)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code}", response=self)
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Records every request; `bulk_status` controls the multi-item endpoint."""
+
+    def __init__(self, bulk_status=200, item_tags=None, listing=None):
+        self.calls = []
+        self.bulk_status = bulk_status
+        self.item_tags = item_tags or {}
+        self.listing = listing or []
+
+    def get(self, url, headers=None, params=None):
+        path = url.rsplit("/rest/v1", 1)[1]
+        self.calls.append(("GET", path, params))
+        if path == "/raindrops/0":
+            return FakeResponse({"items": self.listing, "count": len(self.listing)})
+        raindrop_id = int(url.rsplit("/", 1)[1])
+        return FakeResponse({"item": {"tags": list(self.item_tags.get(raindrop_id, []))}})
+
+    def put(self, url, headers=None, json=None):
+        path = url.rsplit("/rest/v1", 1)[1]
+        self.calls.append(("PUT", path, json))
+        if path == "/raindrops/0":
+            return FakeResponse({"result": self.bulk_status == 200}, self.bulk_status)
+        return FakeResponse({"result": True})
+
+
+# --- 1. Mixed batch: one bulk request + one PUT per multi-tag item ---
+
+session = FakeSession()
+results = raindrop_handler.remove_tag_bulk("fake-token", [
+    {"_id": 1, "tags": ["toskeet"]},
+    {"_id": 2, "tags": ["toskeet"]},
+    {"_id": 3, "tags": ["toskeet"]},
+    {"_id": 4, "tags": ["toskeet", "python", "web"]},
+    {"_id": 5, "tags": ["python"]},
+], session=session, fresh=True)
+
+if results != {1: True, 2: True, 3: True, 4: True, 5: True}:
+    fail(f"unexpected results {results}")
+bulk = [c for c in session.calls if c[1] == "/raindrops/0"]
+if bulk != [("PUT", "/raindrops/0", {"ids": [1, 2, 3], "tags": []})]:
+    fail(f"expected one bulk clear for trigger-only items, got {bulk}")
+if ("PUT", "/raindrop/4", {"tags": ["python", "web"]}) not in session.calls:
+    fail("multi-tag item should get one PUT with its other tags preserved")
+if any(c[0] == "GET" for c in session.calls):
+    fail("known tags from the listing must not be re-fetched")
+if len(session.calls) != 2:
+    fail(f"expected 2 requests for 5 items (vs 10 per-item), got {session.calls}")
+print("[OK ] 5 items untagged in 2 requests; other tags preserved; no GETs")
+
+
+# --- 2. A listing from before the batch was posted is re-read first ---
+
+# Since the listing: the user tagged 2 'later', and 3 lost its trigger tag elsewhere
+session = FakeSession(item_tags={3: ["python"]}, listing=[
+    {"_id": 1, "tags": ["toskeet"]},
+    {"_id": 2, "tags": ["toskeet", "later"]},
+    {"_id": 9, "tags": ["toskeet"]},
+])
+results = raindrop_handler.remove_tag_bulk("fake-token", [
+    {"_id": 1, "tags": ["toskeet"]},
+    {"_id": 2, "tags": ["toskeet"]},
+    {"_id": 3, "tags": ["toskeet"]},
+], session=session)
+
+if results != {1: True, 2: True, 3: True}:
+    fail(f"unexpected results {results}")
+listings = [c for c in session.calls if c[1] == "/raindrops/0" and c[0] == "GET"]
+if len(listings) != 1 or listings[0][2]["perpage"] != raindrop_handler.MAX_PERPAGE:
+    fail(f"expected one full-page listing request to re-read tags, got {listings}")
+if ("PUT", "/raindrops/0", {"ids": [1], "tags": []}) not in session.calls:
+    fail("only items still tagged with just the trigger tag may be bulk-cleared")
+if ("PUT", "/raindrop/2", {"tags": ["later"]}) not in session.calls:
+    fail("a tag added after the listing must be kept")
+if [c[:2] for c in session.calls if c[1] == "/raindrop/3"] != [("GET", "/raindrop/3")]:
+    fail("an item missing from the fresh listing should be checked per-item, not overwritten")
+print("[OK ] stale listing tags are re-read in one request; tags added meanwhile survive")
+
+
+# --- 3. Bulk endpoint failure falls back to per-item GET+PUT ---
+
+orig_sleep = retry.sleep
+try:
+    retry.sleep = lambda seconds, cancel=None: False
+    session = FakeSession(bulk_status=400, item_tags={1: ["toskeet"], 2: ["toskeet"]})
+    results = raindrop_handler.remove_tag_bulk("fake-token", [
+        {"_id": 1, "tags": ["toskeet"]},
+        {"_id": 2, "tags": ["toskeet"]},
+    ], session=session, fresh=True)
+finally:
+    retry.sleep = orig_sleep
+
+if results != {1: True, 2: True}:
+    fail(f"fallback should still report per-ID success, got {results}")
+per_item = [c[:2] for c in session.calls if c[1] != "/raindrops/0"]
+if per_item != [("GET", "/raindrop/1"), ("PUT", "/raindrop/1"), ("GET", "/raindrop/2"), ("PUT", "/raindrop/2")]:
+    fail(f"expected per-item GET+PUT fallback, got {per_item}")
+print("[OK ] failed bulk request falls back to per-item removal")
+
+
+# --- 4. Bare IDs take the per-item path; per-ID failures are reported ---
+
+session = FakeSession(item_tags={7: ["toskeet"]})
+orig_remove = raindrop_handler.remove_toskeet_tag
+try:
+    raindrop_handler.remove_toskeet_tag = lambda token, rid, tag="toskeet", session=None: rid == 7
+    results = raindrop_handler.remove_tag_bulk("fake-token", [7, 8], session=session)
+finally:
+    raindrop_handler.remove_toskeet_tag = orig_remove
+if results != {7: True, 8: False}:
+    fail(f"expected per-ID results {{7: True, 8: False}}, got {results}")
+print("[OK ] bare IDs use the per-item path and failures are reported per ID")
+
+print("All bulk tag-removal checks passed.")
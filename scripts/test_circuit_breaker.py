@@ -0,0 +1,221 @@
+"""Tests for the persisted circuit breakers (src/utils/circuit_breaker.py) — no network.
+
+With Bluesky down, every cron run still logged in, timed out, walked the
+whole retry ladder and sent an alert. Verifies that:
+1. Consecutive timeouts/5xx open an endpoint's circuit at the threshold; an
+   answer from the server (success or 4xx) resets the count.
+2. An open circuit refuses calls at once, and the state lives in the file,
+   so the next process sees it.
+3. After the cool-down one probe goes through; its success closes the
+   circuit, its failure opens it again for another cool-down.
+4. Raindrop requests and Bluesky XRPC calls feed and obey their account's
+   breakers.
+5. main() skips the poll quietly (no fetch, no alert) while one of its
+   account's circuits is open, and still polls a tenant whose own
+   circuits are closed.
+6. A 413 from uploadBlob (atproto raises it as NetworkError) is neither
+   retried nor counted against the circuit.
+7. CIRCUIT_FAILURE_THRESHOLD=0 disables the breakers.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_circuit_breaker.py
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Don't let importing the entry point create logs/ in the repo.
+from src.utils import logging_config
+logging_config._logging_configured = True
+
+import httpx
+import requests
+from atproto import Client
+from atproto_client.exceptions import RequestException
+import raindrop_to_bluesky as app
+from src import bluesky_handler, raindrop_handler
+from src.utils import circuit_breaker, file_lock, retry
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+def refused(endpoint) -> bool:
+    try:
+        circuit_breaker.check(endpoint)
+    except circuit_breaker.CircuitOpenError:
+        return True
+    return False
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+clock = Clock()
+orig = (circuit_breaker.BREAKER_FILE, circuit_breaker._clock, retry.sleep, file_lock.LOCK_FILE)
+tmpdir = tempfile.TemporaryDirectory()
+circuit_breaker.BREAKER_FILE = os.path.join(tmpdir.name, "circuit_breakers.json")
+file_lock.LOCK_FILE = os.path.join(tmpdir.name, "raindrop_bot.lock")
+circuit_breaker._clock = clock
+retry.sleep = lambda seconds, cancel=None: False
+os.environ["CIRCUIT_FAILURE_THRESHOLD"] = "3"
+os.environ["CIRCUIT_COOLDOWN_SECONDS"] = "300"
+try:
+    # --- 1. Threshold of consecutive failures ---
+    circuit_breaker.record("bluesky", "timeout")
+    circuit_breaker.record("bluesky", "server")
+    circuit_breaker.record("bluesky", "http")  # the server answered
+    circuit_breaker.record("bluesky", "timeout")
+    circuit_breaker.record("bluesky", "network")
+    if refused("bluesky"):
+        fail("an answer from the server should reset the failure count")
+    circuit_breaker.record("bluesky", "timeout", TimeoutError("read timed out"))
+    if not refused("bluesky"):
+        fail("the third consecutive failure should open the circuit")
+    if refused("raindrop"):
+        fail("endpoints have separate breakers")
+    print("[OK ] consecutive failures open the circuit; server answers reset the count")
+
+    # --- 2. Refused at once; persisted for the next process ---
+    with open(circuit_breaker.BREAKER_FILE) as f:
+        stored = json.load(f)["bluesky"]
+    if stored["state"] != "open" or "read timed out" not in stored["last_error"]:
+        fail(f"the open state should be written to the breaker file: {stored}")
+    circuit_breaker.reset()  # a new process: no in-memory state
+    if circuit_breaker.seconds_until_probe("bluesky") != 300 or not refused("bluesky"):
+        fail("a new process should read the open circuit from the file")
+    print("[OK ] open circuit refuses calls and is read back from logs/ by the next run")
+
+    # --- 3. Half-open probe after the cool-down ---
+    clock.now += 301
+    if circuit_breaker.seconds_until_probe("bluesky") != 0:
+        fail("the cool-down should have passed")
+    if refused("bluesky"):
+        fail("the first call after the cool-down is the probe")
+    if not refused("bluesky"):
+        fail("other calls wait while the probe is out")
+    circuit_breaker.record("bluesky", "timeout")
+    if not refused("bluesky") or circuit_breaker.seconds_until_probe("bluesky") != 300:
+        fail("a failed probe should reopen the circuit for a full cool-down")
+    clock.now += 301
+    refused("bluesky")
+    circuit_breaker.record("bluesky")
+    if refused("bluesky") or circuit_breaker.stats()["bluesky"]["state"] != "closed":
+        fail("a successful probe should close the circuit")
+    row = circuit_breaker.stats()["bluesky"]
+    if (row["trips"], row["probes"]) != (1, 2) or row["rejected"] < 3:
+        fail(f"unexpected counters {row}")
+    print("[OK ] half-open: one probe after the cool-down; success closes, failure reopens")
+
+    # --- 4. Transport integration ---
+    class TimeoutSession:
+        def __init__(self):
+            self.calls = 0
+
+        def get(self, url, headers=None, **kwargs):
+            self.calls += 1
+            raise requests.exceptions.ReadTimeout("read timed out")
+
+        put = get
+
+    session = TimeoutSession()
+    for _ in range(2):
+        raindrop_handler.remove_toskeet_tag("tok", 1, session=session)
+    if session.calls != 3 or not refused(circuit_breaker.endpoint_for("raindrop", "tok")):
+        fail(f"three Raindrop timeouts should open its circuit (calls: {session.calls})")
+    if raindrop_handler.remove_toskeet_tag("tok", 1, session=session) or session.calls != 3:
+        fail("an open Raindrop circuit must refuse the request without sending it")
+
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        return httpx.Response(503, json={"error": "Unavailable"})
+
+    transport = bluesky_handler._RateLimitedRequest("alice.test", transport=httpx.MockTransport(handler))
+    for _ in range(4):
+        try:
+            transport.post("https://bsky.social/xrpc/com.atproto.server.createSession", json={})
+        except (RequestException, circuit_breaker.CircuitOpenError):
+            pass
+    if len(seen) != 3 or not refused(circuit_breaker.endpoint_for("bluesky", "alice.test")):
+        fail(f"three 503s should open the Bluesky circuit and stop further calls, sent {len(seen)}")
+    if refused(circuit_breaker.endpoint_for("raindrop", "other-tok")) or \
+            refused(circuit_breaker.endpoint_for("bluesky", "bob.test")):
+        fail("one account's failures must not open another account's circuit")
+    print("[OK ] Raindrop and Bluesky transports feed their account's breakers and stop calling when open")
+
+    # --- 5. main() skips quietly while a circuit is open ---
+    events = []
+    patches = {
+        "get_pending_raindrops": lambda *a, **k: events.append("fetch") or [],
+        "cleanup_old_entries": lambda namespace=None: None,
+        "send_error_alert": lambda msg: events.append(("alert", msg)),
+    }
+    originals = {name: getattr(app, name) for name in patches}
+    try:
+        for name, value in patches.items():
+            setattr(app, name, value)
+        posted = app.main({"RAINDROP_TOKEN": "tok", "RAINDROP_TAG": "toskeet", "MAX_POSTS_PER_RUN": 1,
+                           "BLUESKY_IDENTIFIER": "alice.test", "BLUESKY_PASSWORD": "pw"})
+        if posted != 0 or events:
+            fail(f"an open circuit should skip the poll without fetching or alerting, got {events}")
+        app.main({"TENANT": "bob", "RAINDROP_TOKEN": "other-tok", "RAINDROP_TAG": "toskeet",
+                  "MAX_POSTS_PER_RUN": 1, "BLUESKY_IDENTIFIER": "bob.test", "BLUESKY_PASSWORD": "pw"})
+        if events != ["fetch"]:
+            fail(f"another tenant's open circuits must not skip this tenant's poll, got {events}")
+    finally:
+        for name, value in originals.items():
+            setattr(app, name, value)
+    print("[OK ] main() skips the poll only while its own account's circuit is open")
+
+    # --- 6. Predictable rejections don't count ---
+    circuit_breaker.reset()
+    os.remove(circuit_breaker.BREAKER_FILE)
+    uploads = []
+
+    def too_large(request):
+        uploads.append(request.url.path)
+        return httpx.Response(413, json={"error": "PayloadTooLarge", "message": "blob too big"})
+
+    client = Client(request=bluesky_handler._RateLimitedRequest("alice.test", transport=httpx.MockTransport(too_large)))
+    bluesky_handler._clients["alice.test"] = client
+    try:
+        for posts in range(1, 4):
+            embed = {"image_file": io.BytesIO(b"\xff" * 16), "article_url": "https://example.com",
+                     "title": "t", "description": "d"}
+            if bluesky_handler.post_content_to_bluesky("alice.test", "pw", "hello", [], embed) is not None:
+                fail("a rejected upload should fail the post")
+            if len(uploads) != posts:
+                fail(f"a 413 from uploadBlob must not be retried, sent {len(uploads)} uploads for {posts} post(s)")
+    finally:
+        bluesky_handler._clients.clear()
+    if refused("bluesky"):
+        fail("413 rejections are answers from the server and must not open the circuit")
+    print("[OK ] a 413 from uploadBlob is not retried and does not count toward the circuit")
+
+    # --- 7. Disabled ---
+    os.environ["CIRCUIT_FAILURE_THRESHOLD"] = "0"
+    if refused("bluesky") or circuit_breaker.seconds_until_probe("raindrop"):
+        fail("a threshold of 0 should disable the breakers")
+    print("[OK ] CIRCUIT_FAILURE_THRESHOLD=0 disables the breakers")
+finally:
+    circuit_breaker.BREAKER_FILE, circuit_breaker._clock, retry.sleep, file_lock.LOCK_FILE = orig
+    circuit_breaker.reset()
+    os.environ.pop("CIRCUIT_FAILURE_THRESHOLD", None)
+    os.environ.pop("CIRCUIT_COOLDOWN_SECONDS", None)
+    tmpdir.cleanup()
+
+print("All circuit-breaker checks passed.")
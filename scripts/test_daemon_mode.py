@@ -0,0 +1,117 @@
+"""Tests for --daemon mode — no network.
+
+The daemon keeps one process (imports, config, sessions) warm and runs the
+poll loop internally instead of relying on cron to spawn a fresh interpreter
+every tick. Verifies that:
+1. Config is loaded once for the lifetime of the daemon, not once per poll.
+2. SIGTERM interrupts the sleep between polls and the loop exits cleanly.
+3. One failing poll doesn't kill the daemon.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_daemon_mode.py
+"""
+import os
+import signal
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Don't let importing the entry point create logs/ in the repo.
+from src.utils import logging_config
+logging_config._logging_configured = True
+
+import raindrop_to_bluesky as app
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+FAKE_CONFIG = {
+    "RAINDROP_TOKEN": "fake-token",
+    "RAINDROP_TAG": "toskeet",
+    "BLUESKY_IDENTIFIER": "user.test",
+    "BLUESKY_PASSWORD": "password",
+    "POLL_INTERVAL_SECONDS": 600,
+}
+
+config_loads = []
+polls = []
+
+
+def fake_load_config():
+    config_loads.append(1)
+    return dict(FAKE_CONFIG)
+
+
+def fake_main(config=None):
+    polls.append(config)
+    if len(polls) == 1:
+        raise RuntimeError("simulated poll crash")
+
+
+@contextmanager
+def fake_script_lock():
+    yield True
+
+
+def send_sigterm_after_polls(n: int) -> None:
+    deadline = time.monotonic() + 5
+    while len(polls) < n and time.monotonic() < deadline:
+        time.sleep(0.01)
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+def run_daemon_until_polls(n: int, interval: float) -> float:
+    """Run the real daemon loop with main()/lock/config faked; return wall time."""
+    orig = (app.load_config, app.main, app.script_lock)
+    orig_sigterm = signal.getsignal(signal.SIGTERM)
+    orig_sigint = signal.getsignal(signal.SIGINT)
+    try:
+        app.load_config = fake_load_config
+        app.main = fake_main
+        app.script_lock = fake_script_lock
+        threading.Thread(target=send_sigterm_after_polls, args=(n,), daemon=True).start()
+        started = time.monotonic()
+        app.run_daemon(interval=interval)
+        return time.monotonic() - started
+    finally:
+        app.load_config, app.main, app.script_lock = orig
+        signal.signal(signal.SIGTERM, orig_sigterm)
+        signal.signal(signal.SIGINT, orig_sigint)
+        app._stop_event.clear()
+
+
+elapsed = run_daemon_until_polls(3, interval=0.05)
+
+if len(polls) < 3:
+    fail(f"expected the daemon to keep polling after a failed poll, got {len(polls)} polls")
+print(f"[OK ] daemon survived a failing poll ({len(polls)} polls)")
+
+if len(config_loads) != 1:
+    fail(f"expected config to be loaded once, got {len(config_loads)} loads")
+if any(c is None or c["RAINDROP_TOKEN"] != "fake-token" for c in polls):
+    fail("polls did not receive the daemon's config")
+print("[OK ] config loaded once and reused for every poll")
+
+if elapsed > 5:
+    fail(f"daemon took {elapsed:.1f}s to stop after SIGTERM")
+print(f"[OK ] SIGTERM stopped the daemon cleanly ({elapsed:.2f}s)")
+
+
+# --- A long interval must not delay shutdown ---
+
+polls.clear()
+config_loads.clear()
+elapsed = run_daemon_until_polls(1, interval=3600)
+
+if elapsed > 5:
+    fail(f"SIGTERM did not interrupt the sleep between polls ({elapsed:.1f}s)")
+print(f"[OK ] SIGTERM interrupts the wait between polls ({elapsed:.2f}s)")
+
+print("All daemon-mode checks passed.")
@@ -0,0 +1,105 @@
+"""Conformance tests for the UAX #29 grapheme segmenter.
+
+Runs every case in scripts/data/GraphemeBreakTest.txt (the Unicode test file
+for the same version as src/utils/_grapheme_data.py) through
+grapheme_boundaries(), then checks the formatter-facing helpers:
+1. Every official test case segments exactly as specified.
+2. ASCII fast path agrees with the full segmenter.
+3. Flags, ZWJ emoji, skin tones, Hangul and Devanagari conjuncts count once.
+4. truncate_graphemes / truncate_to_grapheme_limit never split a cluster.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_grapheme_conformance.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.post_formatter import count_graphemes as formatter_count, truncate_to_grapheme_limit
+from src.utils import graphemes
+from src.utils._grapheme_data import UNICODE_VERSION
+
+TEST_DATA = Path(__file__).resolve().parent / "data" / "GraphemeBreakTest.txt"
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+def parse_case(line: str) -> tuple:
+    """'÷ 0061 × 0308 ÷ 0062 ÷' -> ('äb', (2, 3))"""
+    chars, ends = [], []
+    for token in line.split():
+        if token == "÷":
+            if chars:
+                ends.append(len(chars))
+        elif token != "×":
+            chars.append(chr(int(token, 16)))
+    return "".join(chars), tuple(ends)
+
+
+# --- 1. Official GraphemeBreakTest cases ---
+header = TEST_DATA.read_text(encoding="utf-8").splitlines()[0]
+if UNICODE_VERSION not in header:
+    fail(f"test data {header!r} does not match table version {UNICODE_VERSION}")
+
+cases = 0
+for lineno, raw in enumerate(TEST_DATA.read_text(encoding="utf-8").splitlines(), 1):
+    line = raw.split("#", 1)[0].strip()
+    if not line:
+        continue
+    text, expected = parse_case(line)
+    got = graphemes._segment(text)
+    if got != expected:
+        fail(f"line {lineno}: {line!r} expected ends {expected}, got {got}\n  {raw.split('#', 1)[1].strip()}")
+    if graphemes.grapheme_boundaries(text) != expected or graphemes.count_graphemes(text) != len(expected):
+        fail(f"line {lineno}: cached/counting path disagrees with _segment for {line!r}")
+    cases += 1
+if cases < 500:
+    fail(f"only {cases} test cases parsed from {TEST_DATA.name}")
+print(f"[OK ] {cases} GraphemeBreakTest-{UNICODE_VERSION} cases")
+
+# --- 2. ASCII fast path ---
+for text in ["", "a", "hello world", "line\r\nbreak", "\r\r\n\n", "tab\tand\x7fdel", "x" * 500]:
+    slow = graphemes._segment(text) if text else ()
+    if graphemes.grapheme_boundaries(text) != slow or graphemes.count_graphemes(text) != len(slow):
+        fail(f"ASCII fast path disagrees for {text!r}")
+print("[OK ] ASCII fast path matches the full segmenter")
+
+# --- 3. Real-world clusters ---
+samples = {
+    "flag pair": ("🇺🇸🇬🇧", 2),
+    "odd regional indicator": ("🇺🇸🇬", 2),
+    "ZWJ family": ("👨‍👩‍👧‍👦", 1),
+    "skin tone": ("👍🏽", 1),
+    "keycap": ("1️⃣", 1),
+    "Hangul jamo": ("각", 1),
+    "Devanagari conjunct": ("क्ष", 1),
+    "combining accents": ("é̂", 1),
+    "mixed": ("Café 👩🏾‍💻 ok", 9),
+}
+for name, (text, expected) in samples.items():
+    for counter in (graphemes.count_graphemes, formatter_count):
+        if counter(text) != expected:
+            fail(f"{name}: {counter.__module__}.count_graphemes gave {counter(text)}, expected {expected}")
+print(f"[OK ] {len(samples)} emoji/Hangul/Indic samples count as expected")
+
+# --- 4. Truncation keeps clusters whole ---
+text = "Flags 🇺🇸🇬🇧🇫🇷 and family 👨‍👩‍👧 end"
+ends = graphemes.grapheme_boundaries(text)
+for limit in range(1, len(ends) + 2):
+    cut = truncate_to_grapheme_limit(text, limit)
+    if formatter_count(cut) > limit:
+        fail(f"limit {limit}: {cut!r} has {formatter_count(cut)} graphemes")
+    body = cut[:-1] if cut.endswith("…") and cut != text else cut
+    if not text.startswith(body) or (body and len(body) not in ends):
+        fail(f"limit {limit}: {cut!r} splits a grapheme cluster")
+if truncate_to_grapheme_limit(text, len(ends)) != text:
+    fail("text within the limit should be returned unchanged")
+if graphemes.truncate_graphemes("🇺🇸🇬🇧", 1) != "🇺🇸":
+    fail("truncate_graphemes should keep the first flag whole")
+print("[OK ] truncation never splits a cluster")
+
+print("All grapheme conformance checks passed.")
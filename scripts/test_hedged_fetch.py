@@ -0,0 +1,154 @@
+"""Tests for the hedged cover/rdl.ink image fetch — no network.
+
+The rdl.ink render used to be requested only after the cover request had
+failed or timed out. It now starts in parallel once the cover is slower than
+IMAGE_HEDGE_DELAY_SECONDS, and the first valid image wins. Verifies that:
+1. A fast cover never triggers the fallback.
+2. A slow cover is overtaken by the fallback, and the cover download is
+   cancelled between chunks.
+3. A cover that fails outright starts the fallback without waiting.
+4. A slow cover that finishes first still wins; both failing returns None.
+5. A negative delay disables hedging.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_hedged_fetch.py
+"""
+import io
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+from PIL import Image
+from src import post_formatter
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+def jpeg(color) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (300, 200), color).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+COVER = jpeg((200, 0, 0))
+RENDER = jpeg((0, 0, 200))
+
+
+class SlowResponse:
+    """Delivers `content` in 1 KiB chunks, `delay` seconds before the first
+    and `chunk_delay` seconds before each of the rest."""
+
+    def __init__(self, content, delay, status_code=200, chunk_delay=0.01):
+        self.content = content
+        self.delay = delay
+        self.chunk_delay = chunk_delay
+        self.status_code = status_code
+        self.headers = {}
+        self.chunks_sent = 0
+        self.closed = False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code}", response=self)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), 1024):
+            time.sleep(self.delay if start == 0 else self.chunk_delay)
+            self.chunks_sent += 1
+            yield self.content[start:start + 1024]
+
+    def close(self):
+        self.closed = True
+
+
+class HedgeSession:
+    def __init__(self, cover, render):
+        self.responses = {"cover": cover, "render": render}
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def get(self, url, headers=None, stream=False, **kwargs):
+        source = "render" if url.startswith(post_formatter.RDL_RENDER_BASE) else "cover"
+        with self.lock:
+            self.requested.append(source)
+        response = self.responses[source]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+RAINDROP = {"link": "https://example.com/article"}
+
+
+def run(cover, render, delay="0.1"):
+    os.environ["IMAGE_HEDGE_DELAY_SECONDS"] = delay
+    session = HedgeSession(cover, render)
+    started = time.monotonic()
+    embed = post_formatter.create_image_embed("https://example.com/cover.jpg", RAINDROP, session=session)
+    elapsed = time.monotonic() - started
+    color = Image.open(embed["image_file"]).getpixel((10, 10)) if embed else None
+    return color, session, elapsed
+
+
+def is_red(color):
+    return color is not None and color[0] > 150 and color[2] < 80
+
+
+def is_blue(color):
+    return color is not None and color[2] > 150 and color[0] < 80
+
+
+try:
+    os.environ["IMAGE_CACHE_MAX_BYTES"] = "0"
+
+    # --- 1. Fast cover: no fallback request ---
+    color, session, _ = run(SlowResponse(COVER, 0), SlowResponse(RENDER, 0))
+    if not is_red(color) or session.requested != ["cover"]:
+        fail(f"fast cover should win alone, got {color} / {session.requested}")
+    print("[OK ] fast cover: fallback never requested")
+
+    # --- 2. Slow cover: fallback overtakes, cover cancelled ---
+    slow_cover = SlowResponse(COVER * 20, 0.05, chunk_delay=0.05)  # many chunks -> cancellable mid-stream
+    color, session, elapsed = run(slow_cover, SlowResponse(RENDER, 0))
+    if not is_blue(color) or sorted(session.requested) != ["cover", "render"]:
+        fail(f"fallback should win over a slow cover, got {color} / {session.requested}")
+    time.sleep(0.2)
+    total_chunks = -(-len(slow_cover.content) // 1024)
+    if slow_cover.chunks_sent >= total_chunks or not slow_cover.closed:
+        fail(f"losing cover download should be cancelled, sent {slow_cover.chunks_sent}/{total_chunks} chunks")
+    print(f"[OK ] slow cover overtaken by fallback in {elapsed:.2f}s; cover cancelled after "
+          f"{slow_cover.chunks_sent}/{total_chunks} chunks")
+
+    # --- 3. Cover fails fast: fallback starts without waiting for the delay ---
+    color, session, elapsed = run(requests.exceptions.ConnectionError("refused"), SlowResponse(RENDER, 0), delay="5")
+    if not is_blue(color) or elapsed > 1:
+        fail(f"failed cover should fall back immediately, got {color} after {elapsed:.2f}s")
+    print("[OK ] failed cover falls back immediately")
+
+    # --- 4. Slow cover finishing first still wins; both failing -> None ---
+    color, session, _ = run(SlowResponse(COVER, 0.3), SlowResponse(RENDER, 1.0))
+    if not is_red(color) or sorted(session.requested) != ["cover", "render"]:
+        fail(f"cover finishing first should win the hedge, got {color} / {session.requested}")
+    color, session, _ = run(SlowResponse(COVER, 0.2, status_code=500), SlowResponse(RENDER, 0, status_code=404))
+    if color is not None:
+        fail("both sources failing should return None")
+    print("[OK ] first valid image wins either way; both failing returns None")
+
+    # --- 5. Negative delay: sequential, no hedge ---
+    color, session, _ = run(SlowResponse(COVER, 0.3), SlowResponse(RENDER, 0), delay="-1")
+    if not is_red(color) or session.requested != ["cover"]:
+        fail(f"hedging disabled should wait for the cover, got {color} / {session.requested}")
+    print("[OK ] negative IMAGE_HEDGE_DELAY_SECONDS disables hedging")
+finally:
+    for var in ("IMAGE_CACHE_MAX_BYTES", "IMAGE_HEDGE_DELAY_SECONDS"):
+        os.environ.pop(var, None)
+
+print("All hedged-fetch checks passed.")
@@ -0,0 +1,172 @@
+"""Handshake-count test for the shared pooled HTTP session — local stub server only.
+
+raindrop_handler and post_formatter used module-level requests.get/put, so
+every call (listing, per-item tag GET, tag PUT, cover download, rdl.ink
+fallback) paid a new TCP (+TLS) handshake. All of them now go through one
+keep-alive session. A local HTTP/1.1 stub stands in for api.raindrop.io, the
+image host and rdl.ink, and counts accepted connections.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_http_pooling.py
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+from src import post_formatter, raindrop_handler
+from src.utils import http_client
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+def make_jpeg() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 48), (200, 40, 40)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+JPEG = make_jpeg()
+stats = {"connections": 0, "requests": 0, "user_agents": {}}
+stats_lock = threading.Lock()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def setup(self):
+        super().setup()
+        with stats_lock:
+            stats["connections"] += 1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/json"):
+        with stats_lock:
+            stats["requests"] += 1
+            stats["user_agents"][self.path.split("?")[0]] = self.headers.get("User-Agent", "")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.startswith("/rest/v1/raindrops/0"):
+            items = [{"_id": 1, "title": "t", "link": "https://example.com/a", "tags": ["toskeet"]}]
+            self._send(200, json.dumps({"items": items}).encode())
+        elif self.path.startswith("/rest/v1/raindrop/"):
+            self._send(200, json.dumps({"item": {"tags": ["toskeet", "keep"]}}).encode())
+        elif self.path == "/cover-missing.jpg":
+            self._send(404, b"not found", "text/plain")
+        elif self.path.startswith("/render/") or self.path == "/cover.jpg":
+            self._send(200, JPEG, "image/jpeg")
+        else:
+            self._send(404, b"{}")
+
+    def do_PUT(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send(200, json.dumps({"result": True}).encode())
+
+
+server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+base = f"http://127.0.0.1:{server.server_address[1]}"
+
+orig_api_base = raindrop_handler.RAINDROP_API_BASE
+orig_rdl_base = post_formatter.RDL_RENDER_BASE
+orig_already = raindrop_handler.is_already_posted_many
+cache_dir = tempfile.TemporaryDirectory()
+os.environ["IMAGE_CACHE_DIR"] = cache_dir.name
+try:
+    raindrop_handler.RAINDROP_API_BASE = f"{base}/rest/v1"
+    post_formatter.RDL_RENDER_BASE = f"{base}/render/"
+    raindrop_handler.is_already_posted_many = lambda ids, namespace=None: set()
+    http_client.close_session()
+
+    # One full run's worth of traffic: listing, tag GET + PUT, cover download,
+    # then a failed cover that falls back to rdl.ink.
+    pending = raindrop_handler.get_pending_raindrops("fake-token")
+    if [r["_id"] for r in pending] != [1]:
+        fail(f"stub listing not parsed: {pending!r}")
+    if not raindrop_handler.remove_toskeet_tag("fake-token", 1):
+        fail("tag removal against the stub failed")
+    if post_formatter.create_image_embed(f"{base}/cover.jpg", pending[0]) is None:
+        fail("cover download from the stub failed")
+    if post_formatter.create_image_embed(f"{base}/cover-missing.jpg", pending[0]) is None:
+        fail("rdl.ink fallback against the stub failed")
+finally:
+    raindrop_handler.RAINDROP_API_BASE = orig_api_base
+    post_formatter.RDL_RENDER_BASE = orig_rdl_base
+    raindrop_handler.is_already_posted_many = orig_already
+    http_client.close_session()
+    server.shutdown()
+    server.server_close()
+    os.environ.pop("IMAGE_CACHE_DIR", None)
+    cache_dir.cleanup()
+
+if stats["requests"] != 6:
+    fail(f"expected 6 requests (listing, GET, PUT, cover, missing cover, rdl.ink), got {stats['requests']}")
+if stats["connections"] != 1:
+    fail(f"expected 1 connection (handshake) for {stats['requests']} requests, got {stats['connections']}")
+print(f"[OK ] {stats['requests']} requests to one host used {stats['connections']} connection")
+
+api_ua = stats["user_agents"]["/rest/v1/raindrops/0"]
+image_ua = stats["user_agents"]["/cover.jpg"]
+if api_ua != http_client.DEFAULT_USER_AGENT:
+    fail(f"API requests should identify the project, got User-Agent {api_ua!r}")
+if image_ua not in http_client.BROWSER_USER_AGENTS:
+    fail(f"image downloads should use a browser User-Agent, got {image_ua!r}")
+print("[OK ] User-Agent policy: project UA for APIs, browser UA for images")
+
+
+# --- Default timeout is applied to every request ---
+
+captured = {}
+session = http_client.create_session(timeout=7)
+orig_request = http_client.requests.Session.request
+try:
+    http_client.requests.Session.request = lambda self, method, url, **kw: captured.update(kw)
+    session.get("http://127.0.0.1:1/")
+finally:
+    http_client.requests.Session.request = orig_request
+if captured.get("timeout") != 7:
+    fail(f"default timeout not applied, got {captured.get('timeout')!r}")
+print("[OK ] session applies its default timeout")
+
+
+# --- Multi-tenant: one connection per tenant worker, without waiting ---
+
+def pool_size(**env):
+    saved = {key: os.environ.pop(key, None) for key in ("HTTP_POOL_MAXSIZE", "TENANTS_FILE", "TENANT_WORKERS")}
+    try:
+        os.environ.update(env)
+        adapter = http_client.create_session().get_adapter("https://api.raindrop.io/")
+        return adapter._pool_maxsize
+    finally:
+        for key, value in saved.items():
+            os.environ.pop(key, None)
+            if value is not None:
+                os.environ[key] = value
+
+
+if pool_size() != http_client.DEFAULT_POOL_MAXSIZE or pool_size(TENANT_WORKERS="12") != http_client.DEFAULT_POOL_MAXSIZE:
+    fail("TENANT_WORKERS alone (no TENANTS_FILE) should not change the pool size")
+if pool_size(TENANTS_FILE="tenants.json", TENANT_WORKERS="12") != 12:
+    fail("the per-host pool should hold a connection for every tenant worker")
+if pool_size(TENANTS_FILE="tenants.json", TENANT_WORKERS="2", HTTP_POOL_MAXSIZE="8") != 8:
+    fail("a larger HTTP_POOL_MAXSIZE should be kept")
+print("[OK ] pool sized to at least TENANT_WORKERS in multi-tenant mode")
+
+print("All HTTP pooling checks passed.")
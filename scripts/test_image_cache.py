@@ -0,0 +1,156 @@
+"""Tests for the on-disk processed-image cache — no network.
+
+create_image_embed used to download, decode, thumbnail and re-encode the
+cover on every call. Processed JPEG bytes are now cached under
+IMAGE_CACHE_DIR, keyed by the normalized URL. Verifies that:
+1. A second embed of the same cover (even with a differently-ordered query
+   or a fragment) makes no request and skips decoding.
+2. A stale entry is revalidated with If-None-Match; a 304 reuses the bytes.
+3. A stale entry whose revalidation request fails is still served.
+4. The directory is bounded by IMAGE_CACHE_MAX_BYTES with LRU eviction.
+5. IMAGE_CACHE_MAX_BYTES=0 disables the cache.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_image_cache.py
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+from PIL import Image
+from src import post_formatter
+from src.utils import image_cache
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+def make_png(width, height, seed) -> bytes:
+    buf = io.BytesIO()
+    Image.effect_noise((width, height), 40 + seed).convert("RGB").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code}", response=self)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class ImageSession:
+    """Serves PNGs by path with ETags; honours If-None-Match."""
+
+    def __init__(self, images):
+        self.images = images
+        self.calls = []
+        self.down = False
+
+    def get(self, url, headers=None, **kwargs):
+        self.calls.append((url, dict(headers or {})))
+        if self.down:
+            raise requests.exceptions.ConnectionError("host unreachable")
+        path = url.split("example.com", 1)[1].split("?")[0]
+        if path not in self.images:
+            return FakeResponse(404)
+        etag = f'"{path}-v1"'
+        if (headers or {}).get("If-None-Match") == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.images[path], {"ETag": etag})
+
+
+RAINDROP = {"link": "https://example.com/article"}
+decodes = []
+
+cache_dir = tempfile.TemporaryDirectory()
+orig_process = post_formatter._process_image
+try:
+    os.environ["IMAGE_CACHE_DIR"] = cache_dir.name
+    post_formatter._process_image = lambda content: decodes.append(1) or orig_process(content)
+    session = ImageSession({"/a.png": make_png(1600, 900, 1), "/b.png": make_png(1200, 1200, 2),
+                            "/c.png": make_png(1200, 1200, 3)})
+
+    # --- 1. Second embed is served from disk with no request and no decode ---
+    first = post_formatter.create_image_embed("https://example.com/a.png?x=1&y=2", RAINDROP, session=session)
+    second = post_formatter.create_image_embed("https://EXAMPLE.com:443/a.png?y=2&x=1#top", RAINDROP, session=session)
+    if first is None or second is None:
+        fail("embed failed")
+    if first["image_file"].getvalue() != second["image_file"].getvalue():
+        fail("cached bytes differ from the processed image")
+    if len(session.calls) != 1 or len(decodes) != 1:
+        fail(f"expected 1 request and 1 decode, got {len(session.calls)} / {len(decodes)}")
+    stats = image_cache.stats()
+    if (stats["misses"], stats["hits"]) != (1, 1):
+        fail(f"unexpected counters {stats}")
+    print("[OK ] repeat cover (normalized URL) served from cache: no request, no decode")
+
+    # --- 2. Stale entry revalidates with If-None-Match; 304 reuses bytes ---
+    os.environ["IMAGE_CACHE_FRESH_SECONDS"] = "0"
+    session.calls.clear()
+    third = post_formatter.create_image_embed("https://example.com/a.png?x=1&y=2", RAINDROP, session=session)
+    if session.calls[0][1].get("If-None-Match") != '"/a.png-v1"':
+        fail(f"stale entry should send If-None-Match, got {session.calls}")
+    if len(decodes) != 1 or third["image_file"].getvalue() != first["image_file"].getvalue():
+        fail("304 should reuse cached bytes without decoding")
+    if image_cache.stats()["revalidated"] != 1:
+        fail(f"revalidation not counted: {image_cache.stats()}")
+    print("[OK ] stale entry revalidated with a conditional GET; 304 reuses the bytes")
+
+    # --- 3. Revalidation request fails: stale copy still served ---
+    session.down = True
+    if post_formatter.create_image_embed("https://example.com/a.png?x=1&y=2", RAINDROP, session=session) is None:
+        fail("stale entry should be served when revalidation fails")
+    session.down = False
+    print("[OK ] stale entry served when the origin is unreachable")
+
+    # --- 4. Size cap evicts least-recently-used entries ---
+    sizes = {k: len(orig_process(io.BytesIO(v))[0]) for k, v in session.images.items()}
+    # Room for any two entries, not three
+    os.environ["IMAGE_CACHE_MAX_BYTES"] = str(sum(sizes.values()) - min(sizes.values()) + 1)
+    post_formatter.create_image_embed("https://example.com/b.png", RAINDROP, session=session)
+    time.sleep(0.02)
+    image_cache.get("https://example.com/a.png?x=1&y=2")  # a is now more recent than b
+    time.sleep(0.02)
+    post_formatter.create_image_embed("https://example.com/c.png", RAINDROP, session=session)
+    cached = {p.name for p in Path(cache_dir.name).glob("*.jpg")}
+    if len(cached) != 2 or image_cache.get("https://example.com/b.png") is not None:
+        fail(f"expected b (least recent) to be evicted, cache holds {len(cached)} entries")
+    if image_cache.get("https://example.com/a.png?y=2&x=1") is None:
+        fail("recently used entry a was evicted")
+    print("[OK ] size cap evicts the least-recently-used entry")
+
+    # --- 5. Cache disabled ---
+    os.environ["IMAGE_CACHE_MAX_BYTES"] = "0"
+    os.environ.pop("IMAGE_CACHE_FRESH_SECONDS")
+    session.calls.clear()
+    for _ in range(2):
+        post_formatter.create_image_embed("https://example.com/c.png", RAINDROP, session=session)
+    if len(session.calls) != 2:
+        fail(f"disabled cache should fetch every time, got {len(session.calls)} requests")
+    print("[OK ] IMAGE_CACHE_MAX_BYTES=0 disables the cache")
+finally:
+    post_formatter._process_image = orig_process
+    for var in ("IMAGE_CACHE_DIR", "IMAGE_CACHE_MAX_BYTES", "IMAGE_CACHE_FRESH_SECONDS"):
+        os.environ.pop(var, None)
+    cache_dir.cleanup()
+
+print("All image-cache checks passed.")
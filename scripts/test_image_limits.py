@@ -0,0 +1,122 @@
+"""Tests for bounded cover downloads and decodes — no network.
+
+create_image_embed used to read the whole response into memory and let
+Pillow decode it at full size, so one huge cover could exceed the container's
+memory limit. Verifies that:
+1. A declared Content-Length over IMAGE_MAX_BYTES is rejected before any of
+   the body is read, and the rdl.ink fallback is used instead.
+2. A body without Content-Length is cut off once it passes the cap.
+3. A JPEG larger than the pixel budget still works (reduced-scale decode),
+   while a PNG of the same size is rejected before decoding.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_image_limits.py
+"""
+import io
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+from src import post_formatter
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+def encode(fmt, width, height) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), (30, 120, 200)).save(buf, format=fmt)
+    return buf.getvalue()
+
+
+SMALL_JPEG = encode("JPEG", 320, 200)
+
+
+class StreamedResponse:
+    def __init__(self, content, declare_length=True):
+        self.status_code = 200
+        self.content = content
+        self.headers = {"Content-Length": str(len(content))} if declare_length else {}
+        self.chunks_read = 0
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            self.chunks_read += 1
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+class CoverSession:
+    """Serves `cover` for the primary URL and a small JPEG for rdl.ink."""
+
+    def __init__(self, cover, declare_length=True):
+        self.cover = StreamedResponse(cover, declare_length)
+        self.urls = []
+
+    def get(self, url, headers=None, stream=False, **kwargs):
+        self.urls.append(url)
+        if not stream:
+            fail("image downloads must be streamed")
+        if url.startswith(post_formatter.RDL_RENDER_BASE):
+            return StreamedResponse(SMALL_JPEG)
+        return self.cover
+
+
+RAINDROP = {"link": "https://example.com/article"}
+
+
+def embed(session):
+    result = post_formatter.create_image_embed("https://example.com/cover", RAINDROP, session=session)
+    if result is None:
+        fail("embed failed entirely")
+    return Image.open(result["image_file"])
+
+
+try:
+    os.environ["IMAGE_CACHE_MAX_BYTES"] = "0"
+    os.environ["IMAGE_MAX_BYTES"] = "100000"
+    os.environ["IMAGE_MAX_PIXELS"] = "5000000"
+    big = os.urandom(300_000)
+
+    # --- 1. Declared Content-Length over the cap: nothing read, fallback used ---
+    session = CoverSession(big)
+    image = embed(session)
+    if session.cover.chunks_read != 0:
+        fail(f"oversized body should be rejected before reading, read {session.cover.chunks_read} chunks")
+    if len(session.urls) != 2 or image.size != (320, 200):
+        fail(f"expected the rdl.ink fallback after rejection, got {session.urls}")
+    print("[OK ] declared oversize body rejected before download; fallback used")
+
+    # --- 2. No Content-Length: cut off once the cap is passed ---
+    session = CoverSession(big, declare_length=False)
+    image = embed(session)
+    read = session.cover.chunks_read * post_formatter.DOWNLOAD_CHUNK_BYTES
+    if read > 100_000 + post_formatter.DOWNLOAD_CHUNK_BYTES or image.size != (320, 200):
+        fail(f"unsized body should stop at the cap, read ~{read} bytes")
+    print("[OK ] unsized body cut off at IMAGE_MAX_BYTES")
+
+    # --- 3. Pixel budget: big JPEG decodes at reduced scale, big PNG rejected ---
+    os.environ["IMAGE_MAX_BYTES"] = str(20 * 1024 * 1024)
+    image = embed(CoverSession(encode("JPEG", 4800, 3200)))  # 15.4 MP > 5 MP budget
+    if image.size != (1000, 667):
+        fail(f"large JPEG should decode via draft and thumbnail to 1000x667, got {image.size}")
+    session = CoverSession(encode("PNG", 4800, 3200))
+    image = embed(session)
+    if image.size != (320, 200):
+        fail(f"PNG over the pixel budget should be rejected (fallback), got {image.size}")
+    print("[OK ] JPEG over the pixel budget decodes at reduced scale; PNG is rejected")
+finally:
+    for var in ("IMAGE_CACHE_MAX_BYTES", "IMAGE_MAX_BYTES", "IMAGE_MAX_PIXELS"):
+        os.environ.pop(var, None)
+
+print("All image-limit checks passed.")
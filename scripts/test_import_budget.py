@@ -0,0 +1,124 @@
+"""Import-time budget for the idle path — no network.
+
+raindrop_to_bluesky.py imported src.bluesky_handler (atproto and its pydantic
+models) and src.post_formatter (Pillow) up front, and warnings_setup imported
+pydantic, before knowing whether anything was tagged. On an idle poll (most
+cron ticks) that was ~1.5s of the run. Verifies that:
+1. Importing the entry point loads none of atproto, pydantic or Pillow, and
+   its cumulative `-X importtime` stays under IMPORT_BUDGET_MS (default 500).
+2. An idle poll (nothing tagged) still hasn't loaded them when it returns.
+3. The first postable item loads the formatter, with the pydantic warning
+   filter registered before atproto.
+
+Each check runs in a fresh interpreter; the bytecode cache is warmed first.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_import_budget.py
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Top-level packages that must stay off the idle path
+HEAVY = ('atproto', 'atproto_client', 'pydantic', 'PIL', 'src.bluesky_handler', 'src.post_formatter')
+
+BUDGET_MS = float(os.getenv('IMPORT_BUDGET_MS', '500'))
+
+# Keep the entry point from configuring logging into the repo's logs/
+PRELUDE = """
+import sys
+from src.utils import logging_config
+logging_config._logging_configured = True
+"""
+
+IMPORT_CHILD = PRELUDE + """
+import raindrop_to_bluesky
+"""
+
+IDLE_CHILD = PRELUDE + """
+import json, os, tempfile
+import raindrop_to_bluesky as app
+from src.utils import circuit_breaker
+tmpdir = tempfile.mkdtemp()
+circuit_breaker.BREAKER_FILE = os.path.join(tmpdir, "circuit_breakers.json")
+app.get_pending_raindrops = lambda *a, **k: []
+app.cleanup_old_entries = lambda namespace=None: None
+posted = app.main({"RAINDROP_TOKEN": "tok", "RAINDROP_TAG": "toskeet", "MAX_POSTS_PER_RUN": 1,
+                   "BLUESKY_IDENTIFIER": "alice.test", "BLUESKY_PASSWORD": "pw"})
+loaded_idle = sorted(m for m in sys.modules if m.split('.')[0] in ("atproto", "atproto_client", "pydantic", "PIL")
+                     or m in ("src.bluesky_handler", "src.post_formatter"))
+text, facets, embed = app.format_bluesky_post_from_raindrop(
+    {"_id": 1, "title": "Hello", "link": "https://example.com/a", "note": "", "cover": ""})
+import warnings
+from pydantic import PydanticDeprecatedSince20
+filtered = any(f[0] == "ignore" and f[2] is PydanticDeprecatedSince20 for f in warnings.filters)
+print(json.dumps({"posted": posted, "loaded_idle": loaded_idle, "text": text,
+                  "formatter_loaded": "src.post_formatter" in sys.modules, "filtered": filtered}))
+"""
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+def run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, "LOG_LEVEL": "WARNING"}
+    return subprocess.run([sys.executable, *flags, "-c", code], cwd=REPO_ROOT, env=env,
+                          capture_output=True, text=True, timeout=120)
+
+
+def parse_importtime(stderr: str) -> dict:
+    """{module: cumulative microseconds} from `-X importtime` output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def is_heavy(module: str) -> bool:
+    return any(module == name or module.startswith(name + '.') for name in HEAVY)
+
+
+# Warm the bytecode cache so compile time isn't charged to the budget
+warm = run(IMPORT_CHILD)
+if warm.returncode != 0:
+    fail(f"importing the entry point failed:\n{warm.stderr}")
+
+# --- 1. Entry-point imports ---
+result = run(IMPORT_CHILD, "-X", "importtime")
+times = parse_importtime(result.stderr)
+if "raindrop_to_bluesky" not in times:
+    fail(f"no importtime record for the entry point:\n{result.stderr[-2000:]}")
+heavy = sorted(name for name in times if is_heavy(name))
+if heavy:
+    fail(f"the entry point should not import {heavy[:10]}")
+total_ms = times["raindrop_to_bluesky"] / 1000
+if total_ms > BUDGET_MS:
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:8]
+    fail(f"importing the entry point took {total_ms:.0f}ms (budget {BUDGET_MS:.0f}ms); slowest: {slowest}")
+print(f"[OK ] entry point imports in {total_ms:.0f}ms (budget {BUDGET_MS:.0f}ms) without atproto, pydantic or Pillow")
+
+# --- 2. and 3. Idle poll, then the first post ---
+result = run(IDLE_CHILD)
+if result.returncode != 0:
+    fail(f"the idle-poll child failed:\n{result.stderr[-2000:]}")
+report = json.loads(result.stdout.strip().splitlines()[-1])
+if report["posted"] != 0 or report["loaded_idle"]:
+    fail(f"an idle poll should not load the posting stack, loaded {report['loaded_idle'][:10]}")
+print("[OK ] an idle poll returns without loading the posting stack")
+if not report["formatter_loaded"] or not report["text"].startswith("Hello"):
+    fail(f"the first postable item should load the formatter: {report}")
+if not report["filtered"]:
+    fail("the pydantic deprecation filter should be registered once atproto loads")
+print("[OK ] the first postable item loads the formatter, with the pydantic filter in place")
+
+print("All import-budget checks passed.")
@@ -0,0 +1,94 @@
+"""Tests for the size-targeted JPEG encoder — no network.
+
+Covers used to be saved at a fixed quality=85 with no size check, so a busy
+image could exceed Bluesky's 1,000,000-byte blob limit and fail every upload
+attempt. Verifies that:
+1. An image that already fits is encoded once, at full quality, progressive.
+2. An oversized encode is brought under the target by a bounded quality search.
+3. When minimum quality still overshoots, the image is downscaled, and the
+   shrunk image is encoded at minimum quality first instead of re-running a
+   full search from the maximum.
+4. An impossible target raises after one search plus one encode per
+   downscale instead of looping, and any mode encodes.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_jpeg_encoder.py
+"""
+import io
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from PIL import Image
+from src.utils import jpeg_encoder
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+def noisy(width, height) -> Image.Image:
+    return Image.effect_noise((width, height), 80).convert("RGB")
+
+
+# --- 1. Fits already: one pass at max quality, progressive ---
+data, params = jpeg_encoder.encode_jpeg(Image.new("RGB", (1000, 600), (10, 90, 160)))
+if params["passes"] != 1 or params["quality"] != jpeg_encoder.DEFAULT_MAX_QUALITY:
+    fail(f"a small encode should take one pass at max quality, got {params}")
+if not Image.open(io.BytesIO(data)).info.get("progressive"):
+    fail("output should be progressive by default")
+print(f"[OK ] fitting image: 1 pass at quality {params['quality']}, progressive ({params['bytes']} bytes)")
+
+# --- 2. Oversized: quality search lands under the target ---
+image = noisy(1000, 1000)
+full_size = len(jpeg_encoder._encode(image, jpeg_encoder.DEFAULT_MAX_QUALITY, True))
+target = full_size * 2 // 3
+data, params = jpeg_encoder.encode_jpeg(image, target=target)
+if len(data) > target or params["bytes"] != len(data):
+    fail(f"encode over target: {len(data)} > {target}")
+if not (jpeg_encoder.DEFAULT_MIN_QUALITY <= params["quality"] < jpeg_encoder.DEFAULT_MAX_QUALITY):
+    fail(f"expected a reduced quality, got {params}")
+if params["passes"] > 1 + jpeg_encoder.MAX_QUALITY_PASSES or (params["width"], params["height"]) != (1000, 1000):
+    fail(f"quality search should stay bounded and keep full size, got {params}")
+print(f"[OK ] oversized image: quality {params['quality']} in {params['passes']} passes ({len(data)} <= {target} bytes)")
+
+# --- 3. Min quality still too big: downscale ---
+floor_size = len(jpeg_encoder._encode(image, jpeg_encoder.DEFAULT_MIN_QUALITY, True))
+target = floor_size // 3
+data, params = jpeg_encoder.encode_jpeg(image, target=target)
+if len(data) > target or params["width"] >= 1000:
+    fail(f"expected a downscaled encode under {target} bytes, got {params}")
+# One search at full size; after the last downscale, the minimum quality
+# plus at most one upward search (earlier downscales cost one encode each)
+downscales = jpeg_encoder.stats()["downscales"]
+if params["passes"] > 1 + 2 * jpeg_encoder.MAX_QUALITY_PASSES + 1 + downscales:
+    fail(f"downscaling should not restart the search from max quality, took {params['passes']} passes")
+print(f"[OK ] min quality overshoots: downscaled to {params['width']}x{params['height']} ({len(data)} <= {target} bytes)")
+
+# --- 4. Impossible target raises; other modes encode ---
+encodes = []
+orig_encode = jpeg_encoder._encode
+try:
+    jpeg_encoder._encode = lambda *args: encodes.append(args[1]) or orig_encode(*args)
+    jpeg_encoder.encode_jpeg(image, target=100)
+    fail("an impossible target should raise ValueError")
+except ValueError:
+    pass
+finally:
+    jpeg_encoder._encode = orig_encode
+if len(encodes) > 1 + jpeg_encoder.MAX_QUALITY_PASSES + jpeg_encoder.MAX_DOWNSCALES:
+    fail(f"an overshooting minimum quality should stop the search early, took {len(encodes)} encodes: {encodes}")
+if encodes[-jpeg_encoder.MAX_DOWNSCALES:] != [jpeg_encoder.DEFAULT_MIN_QUALITY] * jpeg_encoder.MAX_DOWNSCALES:
+    fail(f"each downscale should be tried once, at minimum quality: {encodes}")
+for mode in ("RGBA", "LA", "P", "CMYK", "L"):
+    data, _ = jpeg_encoder.encode_jpeg(Image.new(mode, (50, 50)))
+    if Image.open(io.BytesIO(data)).format != "JPEG":
+        fail(f"{mode} image did not encode as JPEG")
+counters = jpeg_encoder.stats()
+if counters["downscales"] < 1 or counters["quality_searches"] < 2:
+    fail(f"encoder counters not updated: {counters}")
+print(f"[OK ] impossible target raises after {len(encodes)} encodes; RGBA/LA/P/CMYK/L all encode; counters updated")
+
+print("All JPEG encoder checks passed.")
@@ -0,0 +1,242 @@
+"""Tests for the asynchronous, rotating log pipeline (src/utils/logging_config.py) — no network.
+
+setup_logging() attached a FileHandler and a StreamHandler straight to the
+root logger: every call wrote to disk on the hot path, the log grew without
+limit, and large debug payloads were formatted even with DEBUG off.
+Verifies that:
+1. The root logger only queues records; the listener thread writes them,
+   and shutdown_logging() drains the queue (later records still get out).
+2. LOG_MAX_BYTES / LOG_BACKUP_COUNT rotate the file by size; LOG_ROTATION=time
+   rotates on LOG_ROTATION_WHEN.
+3. LOG_FORMAT=json writes one object per line with a run_id shared by all
+   threads of a poll, a new one per poll, and the traceback kept separate;
+   a tenant poll still running after its round keeps that round's run_id.
+4. %-style payloads are formatted once, in the calling thread, and never
+   below the configured level; the Raindrop response body isn't decoded
+   unless DEBUG is on.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_logging_pipeline.py
+"""
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src import raindrop_handler
+from src.utils import circuit_breaker, logging_config, posted_tracker
+from src.utils.tenant_pool import TenantPool
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+SETTINGS = ('LOG_ROTATION', 'LOG_MAX_BYTES', 'LOG_BACKUP_COUNT', 'LOG_ROTATION_WHEN', 'LOG_FORMAT')
+
+
+def configure(log_file, level=logging.INFO, **env):
+    for key in SETTINGS:
+        os.environ.pop(key, None)
+    os.environ.update(env)
+    logging_config._logging_configured = False
+    logging_config.setup_logging(level=level, log_file=log_file)
+    # Keep the console quiet while testing
+    for handler in logging_config._listener.handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setStream(open(os.devnull, "w"))
+
+
+def teardown():
+    logging_config.shutdown_logging()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    for key in SETTINGS:
+        os.environ.pop(key, None)
+    logging_config._logging_configured = True
+
+
+class Payload:
+    """Counts how often it is rendered."""
+
+    def __init__(self):
+        self.renders = 0
+        self.value = "before"
+
+    def __str__(self):
+        self.renders += 1
+        return f"payload {self.value}"
+
+
+logger = logging.getLogger("test.pipeline")
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    # --- 1. Records are queued; the listener writes them ---
+    log_file = os.path.join(tmpdir, "app.log")
+    configure(log_file)
+    try:
+        root = logging.getLogger()
+        if [type(h).__name__ for h in root.handlers] != ["_QueueHandler"]:
+            fail(f"the root logger should only queue records, has {root.handlers}")
+        for i in range(100):
+            logger.info("line %d", i)
+        logging_config.shutdown_logging()
+        logger.warning("after the listener stopped")
+    finally:
+        teardown()
+    lines = Path(log_file).read_text().splitlines()
+    if len(lines) != 101 or not lines[0].endswith("test.pipeline - INFO - line 0"):
+        fail(f"expected 100 text lines plus the late record, got {len(lines)}: {lines[:2]}")
+    if "after the listener stopped" not in lines[-1]:
+        fail("records logged after shutdown_logging() should still be written")
+    print("[OK ] root logger only queues; listener writes; shutdown drains and late records still land")
+
+    # --- 2. Rotation ---
+    log_file = os.path.join(tmpdir, "rotating.log")
+    configure(log_file, LOG_MAX_BYTES="2000", LOG_BACKUP_COUNT="2")
+    try:
+        for i in range(300):
+            logger.info("rotation filler line %04d %s", i, "x" * 40)
+    finally:
+        teardown()
+    names = sorted(name for name in os.listdir(tmpdir) if name.startswith("rotating"))
+    if names != ["rotating.log", "rotating.log.1", "rotating.log.2"]:
+        fail(f"size rotation should keep LOG_BACKUP_COUNT backups, got {names}")
+    if any(os.path.getsize(os.path.join(tmpdir, name)) > 2000 for name in names):
+        fail("no file should exceed LOG_MAX_BYTES")
+    if "line 0299" not in Path(log_file).read_text():
+        fail("the newest records should be in the current file")
+
+    configure(os.path.join(tmpdir, "timed.log"), LOG_ROTATION="time", LOG_ROTATION_WHEN="H", LOG_BACKUP_COUNT="3")
+    try:
+        handler = logging_config._listener.handlers[0]
+        if not isinstance(handler, logging.handlers.TimedRotatingFileHandler) or (handler.when, handler.backupCount) != ("H", 3):
+            fail(f"LOG_ROTATION=time should rotate hourly here, got {handler}")
+    finally:
+        teardown()
+    print("[OK ] size rotation honours LOG_MAX_BYTES/LOG_BACKUP_COUNT; LOG_ROTATION=time uses LOG_ROTATION_WHEN")
+
+    # --- 3. JSON lines with a run_id ---
+    log_file = os.path.join(tmpdir, "json.log")
+    configure(log_file, LOG_FORMAT="json")
+    try:
+        first_run = logging_config.new_run_id()
+        logger.info("main thread says %s", "hi")
+        worker = threading.Thread(target=lambda: logger.info("tenant worker"), name="tenant-1")
+        worker.start()
+        worker.join()
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("it failed")
+        second_run = logging_config.new_run_id()
+        logger.info("next poll")
+    finally:
+        teardown()
+    records = [json.loads(line) for line in Path(log_file).read_text().splitlines()]
+    if [r["message"] for r in records] != ["main thread says hi", "tenant worker", "it failed", "next poll"]:
+        fail(f"unexpected JSON records {records}")
+    if {r["run_id"] for r in records[:3]} != {first_run} or records[3]["run_id"] != second_run or first_run == second_run:
+        fail("all threads of a poll should share its run_id, and the next poll get a new one")
+    if records[1]["thread"] != "tenant-1" or records[0]["level"] != "INFO" or records[0]["logger"] != "test.pipeline":
+        fail(f"records should carry thread, level and logger: {records[1]}")
+    if "ValueError: boom" not in records[2].get("exception", "") or "Traceback" in records[2]["message"]:
+        fail("the traceback should be its own field")
+
+    log_file = os.path.join(tmpdir, "tenants.log")
+    configure(log_file, LOG_FORMAT="json")
+    release = threading.Event()
+
+    def tenant_poll(tenant):
+        logger.info("%s started", tenant["TENANT"])
+        if tenant["TENANT"] == "slow":
+            release.wait(5)
+            logger.info("slow finished")
+        return 0
+
+    pool = TenantPool([{"TENANT": "slow"}, {"TENANT": "fast"}], tenant_poll, max_workers=2)
+    try:
+        first_run = logging_config.new_run_id()
+        pool.run_round(timeout=0.2)
+        second_run = logging_config.new_run_id()
+        pool.run_round(timeout=0.2)
+        release.set()
+        pool._in_flight["slow"].result(timeout=5)
+    finally:
+        release.set()
+        pool.shutdown()
+        teardown()
+    run_ids = {}
+    for line in Path(log_file).read_text().splitlines():
+        record = json.loads(line)
+        run_ids.setdefault(record["message"], []).append(record["run_id"])
+    if run_ids["slow finished"] != [first_run]:
+        fail(f"a tenant still running into the next round should keep its round's run_id: {run_ids}")
+    if run_ids["fast started"] != [first_run, second_run]:
+        fail(f"each round's tenant polls should carry that round's run_id: {run_ids}")
+    print("[OK ] LOG_FORMAT=json: one object per line, run_id per poll across threads and tenants, exception field")
+
+    # --- 4. Lazy payloads ---
+    log_file = os.path.join(tmpdir, "lazy.log")
+    configure(log_file, level=logging.INFO)
+    payload = Payload()
+    try:
+        logger.debug("big payload: %s", payload)
+        if payload.renders:
+            fail("a payload below the configured level must not be rendered")
+        logging.getLogger().setLevel(logging.DEBUG)
+        logger.debug("big payload: %s", payload)
+        payload.value = "after"  # mutated before the listener gets to it
+    finally:
+        teardown()
+    if payload.renders != 1 or "payload before" not in Path(log_file).read_text():
+        fail(f"payloads should be rendered once, in the calling thread (rendered {payload.renders}x)")
+
+    class Response:
+        status_code = 200
+        headers = {}
+        decoded = 0
+
+        @property
+        def text(self):
+            Response.decoded += 1
+            return "{}"
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"items": []}
+
+    class Session:
+        def get(self, url, headers=None, params=None, **kwargs):
+            return Response()
+
+    orig = (circuit_breaker.BREAKER_FILE, posted_tracker.DB_FILE)
+    circuit_breaker.BREAKER_FILE = os.path.join(tmpdir, "circuit_breakers.json")
+    posted_tracker.DB_FILE = os.path.join(tmpdir, "posted.db")
+    configure(os.path.join(tmpdir, "handler.log"), level=logging.INFO)
+    try:
+        list(raindrop_handler.iter_pending_raindrops("tok", max_pages=1, session=Session()))
+        if Response.decoded:
+            fail("the Raindrop response body should not be decoded for the log at INFO")
+        logging.getLogger().setLevel(logging.DEBUG)
+        list(raindrop_handler.iter_pending_raindrops("tok", max_pages=1, session=Session()))
+        if Response.decoded != 1:
+            fail("at DEBUG the response body should be logged")
+    finally:
+        teardown()
+        posted_tracker.close()
+        circuit_breaker.BREAKER_FILE, posted_tracker.DB_FILE = orig
+    print("[OK ] large debug payloads are formatted lazily and only at DEBUG")
+
+print("All logging-pipeline checks passed.")
@@ -0,0 +1,246 @@
+"""Tests for per-stage metrics and the Prometheus exports (src/utils/metrics.py) — no network.
+
+A run used to leave nothing but free-text log lines. Verifies that:
+1. timed() records a stage's latency in a histogram labelled by outcome
+   ('error' when it raises, or what the block sets), also as a decorator.
+2. render() is valid Prometheus text: cumulative buckets, _sum/_count,
+   counters, escaped labels.
+3. The counters other modules keep (retry, circuit breakers, registered
+   tenant pools) are exported as labelled gauges.
+4. The handlers are instrumented: a post records bluesky_login and
+   send_post, and an empty listing records raindrop_fetch as 'empty'.
+5. write_textfile() writes METRICS_TEXTFILE atomically (cron), and
+   start_server() serves /metrics over HTTP (daemon).
+
+Run from the repo root:
+    .venv/bin/python scripts/test_metrics.py
+"""
+import os
+import re
+import sys
+import tempfile
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+from src import bluesky_handler, raindrop_handler
+from src.utils import metrics, posted_tracker, retry, session_store
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{(?:[a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*",?)*\})? (\S+)$')
+
+
+def parse(text):
+    """{(name, labels string): value}; fails on any line that isn't valid exposition format."""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith('# HELP ') or line.startswith('# TYPE '):
+            continue
+        match = SAMPLE.match(line)
+        if not match:
+            fail(f"invalid exposition line: {line!r}")
+        samples[(match.group(1), match.group(2) or '')] = float(match.group(3))
+    return samples
+
+
+def stage_count(samples, stage, outcome):
+    key = ("raindrops_stage_duration_seconds_count", f'{{stage="{stage}",outcome="{outcome}"}}')
+    return samples.get(key, 0)
+
+
+# --- 1. timed(): latency by stage and outcome ---
+metrics.reset()
+ticks = iter([0.0, 0.3, 1.0, 1.02, 2.0, 2.5])
+orig_clock = metrics._clock
+metrics._clock = lambda: next(ticks)
+try:
+    with metrics.timed('demo'):
+        pass
+    try:
+        with metrics.timed('demo'):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    with metrics.timed('demo') as timer:
+        timer.outcome = 'cache_hit'
+finally:
+    metrics._clock = orig_clock
+
+
+@metrics.timed('decorated')
+def decorated():
+    return 42
+
+
+if decorated() != 42 or decorated() != 42:
+    fail("the decorator must pass the return value through")
+samples = parse(metrics.render())
+if (stage_count(samples, 'demo', 'ok'), stage_count(samples, 'demo', 'error'),
+        stage_count(samples, 'demo', 'cache_hit'), stage_count(samples, 'decorated', 'ok')) != (1, 1, 1, 2):
+    fail(f"unexpected stage counts: {samples}")
+print("[OK ] timed() records latency per stage and outcome; works as a decorator")
+
+# --- 2. Exposition format ---
+ok_buckets = {labels: value for (name, labels), value in samples.items()
+              if name == "raindrops_stage_duration_seconds_bucket" and 'stage="demo",outcome="ok"' in labels}
+if ok_buckets.get('{stage="demo",outcome="ok",le="0.25"}') != 0 or ok_buckets.get('{stage="demo",outcome="ok",le="0.5"}') != 1:
+    fail(f"a 0.3s observation belongs in le=0.5 and above: {ok_buckets}")
+if ok_buckets.get('{stage="demo",outcome="ok",le="+Inf"}') != 1:
+    fail("the +Inf bucket should equal the count")
+if abs(samples[("raindrops_stage_duration_seconds_sum", '{stage="demo",outcome="ok"}')] - 0.3) > 1e-9:
+    fail("the _sum should hold the observed seconds")
+metrics.count('posts', outcome='ok')
+metrics.count('posts', outcome='ok')
+metrics.count('weird', label='say "hi"\nback\\slash')
+text = metrics.render()
+samples = parse(text)
+if samples.get(("raindrops_posts_total", '{outcome="ok"}')) != 2:
+    fail("counters should accumulate")
+if '{label="say \\"hi\\"\\nback\\\\slash"}' not in text:
+    fail("label values must be escaped")
+if "# TYPE raindrops_stage_duration_seconds histogram" not in text or "# TYPE raindrops_posts_total counter" not in text:
+    fail("metric types should be declared")
+print("[OK ] render(): cumulative buckets, _sum/_count, counters and escaped labels")
+
+# --- 3. Other modules' counters ---
+retry.reset()
+orig_sleep = retry.sleep
+retry.sleep = lambda seconds, cancel=None: False
+try:
+    attempts = []
+    policy = retry.RetryPolicy('metrics-test', {'server': 3})
+
+    class FakeResponse:
+        status_code = 503
+        headers = {}
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise requests.exceptions.HTTPError("503", response=FakeResponse())
+        return "ok"
+
+    retry.call(flaky, policy)
+finally:
+    retry.sleep = orig_sleep
+metrics.register_collector('tenant', lambda: {"alice": {"polls": 3, "posted": 2, "last_seconds": None}}, label='tenant')
+samples = parse(metrics.render())
+metrics.unregister_collector('tenant')
+if samples.get(("raindrops_retry_retries", '{policy="metrics-test"}')) != 1:
+    fail(f"retry counters should be exported per policy: {[k for k in samples if 'retry' in k[0]]}")
+if samples.get(("raindrops_retry_errors", '{policy="metrics-test",error_class="server"}')) != 1:
+    fail("retry errors should be labelled by error class")
+if samples.get(("raindrops_tenant_posted", '{tenant="alice"}')) != 2:
+    fail("registered collectors should be exported with their row label")
+if any(name == "raindrops_tenant_last_seconds" for name, _ in samples):
+    fail("None values should be left out")
+print("[OK ] retry and registered tenant counters exported as labelled gauges")
+
+# --- 4. Handler instrumentation ---
+metrics.reset()
+
+
+class FakeClient:
+    def __init__(self, request=None):
+        pass
+
+    def on_session_change(self, callback):
+        pass
+
+    def login(self, identifier=None, password=None, session_string=None):
+        pass
+
+    def send_post(self, text, facets=None, embed=None):
+        return "posted"
+
+
+class FakeListing:
+    status_code = 200
+    headers = {}
+    text = "{}"
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {"items": [], "count": 0}
+
+
+class FakeSession:
+    def get(self, url, headers=None, params=None, **kwargs):
+        return FakeListing()
+
+
+orig_client = bluesky_handler.Client
+orig_session_file = session_store.SESSION_FILE
+orig_db = posted_tracker.DB_FILE
+tmpdir = tempfile.TemporaryDirectory()
+try:
+    bluesky_handler.Client = FakeClient
+    bluesky_handler._clients.clear()
+    session_store.SESSION_FILE = os.path.join(tmpdir.name, "bluesky_session.json")
+    posted_tracker.DB_FILE = os.path.join(tmpdir.name, "posted.db")
+    if bluesky_handler.post_content_to_bluesky("user.test", "pw", "hello", [], None) != "posted":
+        fail("the fake post should succeed")
+    raindrop_handler.get_pending_raindrops("tok", limit=1, session=FakeSession())
+finally:
+    bluesky_handler.Client = orig_client
+    bluesky_handler._clients.clear()
+    session_store.SESSION_FILE = orig_session_file
+    posted_tracker.close()
+    posted_tracker.DB_FILE = orig_db
+    tmpdir.cleanup()
+samples = parse(metrics.render())
+for stage, outcome in (('bluesky_login', 'password'), ('send_post', 'ok'), ('raindrop_fetch', 'empty')):
+    if stage_count(samples, stage, outcome) != 1:
+        fail(f"expected one {stage}/{outcome} observation, got {[k for k in samples if stage in k[1]]}")
+print("[OK ] handlers record login, send_post and Raindrop fetch stages")
+
+# --- 5. Textfile and HTTP exports ---
+with tempfile.TemporaryDirectory() as tmpdir:
+    path = os.path.join(tmpdir, "textfile", "raindrops.prom")
+    os.environ.pop("METRICS_TEXTFILE", None)
+    if metrics.write_textfile():
+        fail("nothing should be written without METRICS_TEXTFILE")
+    os.environ["METRICS_TEXTFILE"] = path
+    try:
+        if not metrics.write_textfile():
+            fail("the textfile should be written")
+    finally:
+        os.environ.pop("METRICS_TEXTFILE")
+    with open(path) as f:
+        parse(f.read())
+    if os.listdir(os.path.dirname(path)) != ["raindrops.prom"]:
+        fail("no temporary file should be left behind")
+
+server = metrics.start_server(port=0)
+if server is None:
+    fail("the metrics server should start on an ephemeral port")
+try:
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    with urllib.request.urlopen(f"{base}/metrics", timeout=5) as response:
+        if not response.headers["Content-Type"].startswith("text/plain; version=0.0.4"):
+            fail(f"unexpected content type {response.headers['Content-Type']}")
+        samples = parse(response.read().decode("utf-8"))
+    if stage_count(samples, 'send_post', 'ok') != 1:
+        fail("the endpoint should serve the current metrics")
+    try:
+        urllib.request.urlopen(f"{base}/other", timeout=5)
+        fail("only /metrics should be served")
+    except urllib.error.HTTPError as e:
+        if e.code != 404:
+            fail(f"expected 404, got {e.code}")
+finally:
+    server.shutdown()
+    server.server_close()
+print("[OK ] METRICS_TEXTFILE written atomically; /metrics served over HTTP")
+
+print("All metrics checks passed.")
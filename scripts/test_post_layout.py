@@ -0,0 +1,105 @@
+"""Tests for the single-pass post layout (src/utils/post_layout.py) — no network.
+
+Verifies that:
+1. Text and facets match what atproto's TextBuilder would build, including
+   UTF-8 byte offsets after multibyte titles.
+2. A body that doesn't fit is cut once, to exactly the limit, at a word
+   boundary when there is one nearby.
+3. Text without spaces (CJK) and emoji are cut on grapheme boundaries.
+4. A tight budget keeps the start of the title instead of going link-only;
+   only a link that leaves no room at all is posted alone.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_post_layout.py
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from atproto import client_utils
+from src.utils import post_layout
+from src.utils.graphemes import count_graphemes, grapheme_boundaries
+
+LIMIT = 300
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+def textbuilder(body: str, link: str) -> tuple:
+    tb = client_utils.TextBuilder()
+    if body:
+        tb.text(body)
+        tb.text("\n")
+    tb.link(link, link)
+    return tb.build_text(), tb.build_facets()
+
+
+def check_facet(text: str, facets: list, link: str) -> None:
+    if len(facets) != 1:
+        fail(f"expected one facet, got {len(facets)}")
+    index = facets[0].index
+    covered = text.encode("utf-8")[index.byte_start:index.byte_end].decode("utf-8")
+    if covered != link or facets[0].features[0].uri != link:
+        fail(f"facet covers {covered!r}, expected the link {link!r}")
+
+
+# --- 1. Same output as TextBuilder when the body fits ---
+for body, link in [
+    ("Plain title", "https://example.com/a"),
+    ("Café — naïve résumé 🇫🇷", "https://example.com/ü?q=ß&x=1"),
+    ("東京の新しいカフェ 👨‍👩‍👧\nWorth a read", "https://example.jp/記事"),
+]:
+    text, facets = post_layout.layout_post(body, link, LIMIT)
+    tb_text, tb_facets = textbuilder(body, link)
+    if text != tb_text:
+        fail(f"text differs from TextBuilder: {text!r} vs {tb_text!r}")
+    if facets[0].index != tb_facets[0].index:
+        fail(f"byte range {facets[0].index} differs from TextBuilder's {tb_facets[0].index}")
+    check_facet(text, facets, link)
+print("[OK ] text and facet byte offsets match TextBuilder")
+
+# --- 2. Long body: one cut, at a word boundary, filling the limit ---
+link = "https://example.com/" + "p" * 150
+body = " ".join(["word"] * 100)
+text, facets = post_layout.layout_post(body, link, LIMIT)
+check_facet(text, facets, link)
+kept = text.split("\n")[0]
+if count_graphemes(text) > LIMIT or count_graphemes(text) < LIMIT - 5:
+    fail(f"expected a post just under {LIMIT} graphemes, got {count_graphemes(text)}")
+if not kept.endswith("word…"):
+    fail(f"cut should fall on a word boundary, got {kept[-12:]!r}")
+print(f"[OK ] long body cut at a word boundary ({count_graphemes(text)} graphemes)")
+
+# --- 3. No spaces / emoji: grapheme cuts, nothing split ---
+for body in ["東京" * 200, "🇺🇸🇬🇧👨‍👩‍👧" * 100, "Supercalifragilistic" * 20]:
+    text, facets = post_layout.layout_post(body, link, LIMIT)
+    check_facet(text, facets, link)
+    kept = text.split("\n")[0][:-1]
+    if count_graphemes(text) != LIMIT:
+        fail(f"grapheme cut should fill the limit exactly, got {count_graphemes(text)}")
+    if len(kept) not in grapheme_boundaries(body):
+        fail(f"cut splits a grapheme cluster: {kept[-6:]!r}")
+print("[OK ] CJK/emoji bodies cut on grapheme boundaries to exactly the limit")
+
+# --- 4. Tight budgets keep the title; only a hopeless link goes alone ---
+title = "Microsoft in Talks to Ax Key Energy Pledge"
+for room in (2, 3, 10):
+    tight_link = "https://example.com/" + "x" * (LIMIT - len("https://example.com/") - 1 - room)
+    text, facets = post_layout.layout_post(title, tight_link, LIMIT)
+    check_facet(text, facets, tight_link)
+    body_part = text[:-len(tight_link) - 1]
+    if count_graphemes(text) > LIMIT or not body_part or not title.startswith(body_part.rstrip("…")):
+        fail(f"room for {room} graphemes should keep part of the title, got {body_part!r}")
+before = post_layout.stats()["link_only"]
+hopeless = "https://example.com/" + "x" * LIMIT
+text, facets = post_layout.layout_post(title, hopeless, LIMIT)
+if text != hopeless or post_layout.stats()["link_only"] != before + 1:
+    fail("a link over the limit should be posted alone")
+check_facet(text, facets, hopeless)
+print("[OK ] tight budgets keep the title; over-limit link posted alone")
+
+print("All post-layout checks passed.")
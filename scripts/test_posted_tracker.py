@@ -8,18 +8,25 @@ Covers two bugs found in the 2026-06-12 code review:
 2. _save_tracker wrote the JSON in place; a crash mid-write truncated the
    file and erased the posted history. Now writes are atomic (temp + replace).
 
+Also covers the SQLite backend that replaced the JSON file as the default:
+one-time migration, batch lookups and indexed retention cleanup, and that a
+skipped already-posted item is logged once per poll, not by both the lookup
+and the listing.
+
 Run from the repo root:
     .venv/bin/python scripts/test_posted_tracker.py
 """
 import json
+import logging
 import os
 import sys
 import tempfile
+from datetime import datetime, timedelta
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-from src.utils import posted_tracker
+from src.utils import circuit_breaker, posted_tracker, state_file
 from src import raindrop_handler
 
 
@@ -40,6 +47,13 @@ class FakeResponse:
         return self._payload
 
 
+class FakeSession:
+    """Stands in for the shared pooled HTTP session."""
+    def __init__(self, get=None, put=None):
+        self.get = get
+        self.put = put
+
+
 # --- 1a. Skip path re-attempts tag removal (self-healing) ---
 
 removal_attempts = []
@@ -50,20 +64,20 @@ def run_skip_path_check():
         {"_id": 222, "title": "fresh item"},
     ]
 
-    orig_get = raindrop_handler.requests.get
-    orig_already = raindrop_handler.is_already_posted
+    orig_get_session = raindrop_handler.get_session
+    orig_already = raindrop_handler.is_already_posted_many
     orig_remove = raindrop_handler.remove_toskeet_tag
     try:
-        raindrop_handler.requests.get = lambda *a, **k: FakeResponse({"items": items})
-        raindrop_handler.is_already_posted = lambda rid: rid == 111
+        raindrop_handler.get_session = lambda: FakeSession(get=lambda *a, **k: FakeResponse({"items": items}))
+        raindrop_handler.is_already_posted_many = lambda ids, namespace=None: {rid for rid in ids if rid == 111}
         raindrop_handler.remove_toskeet_tag = (
-            lambda token, rid, tag="toskeet": removal_attempts.append(rid) or True
+            lambda token, rid, tag="toskeet", **kwargs: removal_attempts.append(rid) or True
         )
 
         result = raindrop_handler.get_latest_raindrop_to_skeet("fake-token")
     finally:
-        raindrop_handler.requests.get = orig_get
-        raindrop_handler.is_already_posted = orig_already
+        raindrop_handler.get_session = orig_get_session
+        raindrop_handler.is_already_posted_many = orig_already
         raindrop_handler.remove_toskeet_tag = orig_remove
 
     if result is None or result["_id"] != 222:
@@ -85,11 +99,12 @@ if posted_tracker.RETENTION_DAYS < 90:
 print(f"[OK ] retention is {posted_tracker.RETENTION_DAYS} days")
 
 
-# --- 2. A failed save must not destroy the existing tracker file ---
+# --- 2. A failed save must not destroy the existing tracker file (JSON backend) ---
 
 with tempfile.TemporaryDirectory() as tmpdir:
     orig_tracker_file = posted_tracker.TRACKER_FILE
     posted_tracker.TRACKER_FILE = os.path.join(tmpdir, "posted_raindrops.json")
+    os.environ["TRACKER_BACKEND"] = "json"
     try:
         posted_tracker.mark_as_posted(12345, "at://did:plc:x/app.bsky.feed.post/y")
         before = posted_tracker._load_tracker()
@@ -97,18 +112,18 @@ with tempfile.TemporaryDirectory() as tmpdir:
             fail("setup: initial mark_as_posted did not persist")
 
         # Simulate a crash mid-serialization on the next save
-        orig_dump = posted_tracker.json.dump
+        orig_dump = state_file.json.dump
 
         def exploding_dump(*args, **kwargs):
             raise IOError("disk full mid-write")
 
-        posted_tracker.json.dump = exploding_dump
+        state_file.json.dump = exploding_dump
         try:
             posted_tracker.mark_as_posted(67890)
         except Exception:
             pass  # save failure may be swallowed or raised; either way file must survive
         finally:
-            posted_tracker.json.dump = orig_dump
+            state_file.json.dump = orig_dump
 
         after = posted_tracker._load_tracker()
         if "12345" not in after.get("posted", {}):
@@ -116,5 +131,93 @@ with tempfile.TemporaryDirectory() as tmpdir:
         print("[OK ] failed save leaves existing tracker file intact")
     finally:
         posted_tracker.TRACKER_FILE = orig_tracker_file
+        del os.environ["TRACKER_BACKEND"]
+
+
+# --- 3. SQLite backend: JSON migration, batch lookups, indexed cleanup ---
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    orig_tracker_file = posted_tracker.TRACKER_FILE
+    orig_db_file = posted_tracker.DB_FILE
+    posted_tracker.TRACKER_FILE = os.path.join(tmpdir, "posted_raindrops.json")
+    posted_tracker.DB_FILE = os.path.join(tmpdir, "posted_raindrops.db")
+    try:
+        old = (datetime.utcnow() - timedelta(days=posted_tracker.RETENTION_DAYS + 1)).isoformat()
+        recent = datetime.utcnow().isoformat()
+        with open(posted_tracker.TRACKER_FILE, "w") as f:
+            json.dump({"posted": {
+                "1": {"posted_at": recent, "bluesky_uri": "at://one"},
+                "2": {"posted_at": old, "bluesky_uri": "at://two"},
+                "3": {"posted_at": "not-a-date", "bluesky_uri": None},
+            }}, f)
+
+        if posted_tracker.is_already_posted_many([1, 2, 3, 4]) != {1, 2, 3}:
+            fail("JSON entries were not migrated into SQLite")
+        if os.path.exists(posted_tracker.TRACKER_FILE):
+            fail("JSON tracker should be set aside after migration")
+        if not os.path.exists(posted_tracker.TRACKER_FILE + ".migrated"):
+            fail("migrated JSON tracker should be kept as a .migrated backup")
+        print("[OK ] JSON tracker migrated once into SQLite (malformed date kept)")
+
+        conn = posted_tracker._connect()
+        if conn.execute("PRAGMA journal_mode").fetchone()[0].lower() != "wal":
+            fail("tracker database is not in WAL mode")
+        plan = " ".join(str(row) for row in conn.execute(
+            "EXPLAIN QUERY PLAN DELETE FROM posted WHERE posted_at < ?", (recent,)))
+        if "idx_posted_posted_at" not in plan:
+            fail(f"cleanup does not use the posted_at index: {plan}")
+        print("[OK ] WAL mode; cleanup is an indexed range delete")
+
+        posted_tracker.mark_as_posted(5, "at://five")
+        if posted_tracker.is_already_posted_many(["5", 6]) != {"5"}:
+            fail("batch lookup should return matches in the caller's ID type")
+        if not posted_tracker.is_already_posted(5) or posted_tracker.is_already_posted(6):
+            fail("is_already_posted disagrees with the database")
+        print("[OK ] mark_as_posted + batch/single lookups")
+
+        class Capture(logging.Handler):
+            def __init__(self):
+                super().__init__(logging.INFO)
+                self.messages = []
+
+            def emit(self, record):
+                self.messages.append(record.getMessage())
+
+        capture = Capture()
+        loggers = [logging.getLogger(m.__name__) for m in (posted_tracker, raindrop_handler)]
+        orig_levels = [lg.level for lg in loggers]
+        orig_bulk, orig_breaker_file = raindrop_handler.remove_tag_bulk, circuit_breaker.BREAKER_FILE
+        listing = FakeSession(get=lambda *a, **k: FakeResponse({"items": [{"_id": 5}, {"_id": 7}], "count": 2}))
+        try:
+            for lg in loggers:
+                lg.setLevel(logging.INFO)
+                lg.addHandler(capture)
+            raindrop_handler.remove_tag_bulk = lambda token, raindrops, **kwargs: {r["_id"]: True for r in raindrops}
+            circuit_breaker.BREAKER_FILE = os.path.join(tmpdir, "circuit_breakers.json")
+            raindrop_handler.get_pending_raindrops("fake-token", limit=5, session=listing)
+        finally:
+            for lg, level in zip(loggers, orig_levels):
+                lg.removeHandler(capture)
+                lg.setLevel(level)
+            raindrop_handler.remove_tag_bulk, circuit_breaker.BREAKER_FILE = orig_bulk, orig_breaker_file
+        skips = [m for m in capture.messages if "Raindrop 5" in m and "already posted" in m]
+        if len(skips) != 1:
+            fail(f"an already-posted item should be logged once per poll, got {skips}")
+        print("[OK ] already-posted skip logged once per poll")
+
+        posted_tracker.cleanup_old_entries()
+        if posted_tracker.is_already_posted_many([1, 2, 3, 5]) != {1, 3, 5}:
+            fail("cleanup should drop only entries older than RETENTION_DAYS")
+        print("[OK ] cleanup removes only expired entries")
+
+        # A fresh process must not re-import the (now renamed) JSON file
+        posted_tracker.close()
+        if posted_tracker.is_already_posted_many([2]):
+            fail("expired entry came back after reconnecting")
+        print("[OK ] migration runs only once")
+    finally:
+        posted_tracker.close()
+        posted_tracker.TRACKER_FILE = orig_tracker_file
+        posted_tracker.DB_FILE = orig_db_file
 
 print("All posted_tracker checks passed.")
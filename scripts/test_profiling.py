@@ -0,0 +1,148 @@
+"""Tests for --profile mode (src/utils/profiling.py) — no network.
+
+A slow production run left nothing to look at but log timestamps. Verifies that:
+1. profiled() writes a loadable cProfile dump, a summary with the top
+   functions and allocation sites, and a collapsed-stack file that includes
+   other threads' stacks.
+2. PROFILE_SAMPLE_INTERVAL_MS=0 turns the sampler (and its file) off.
+3. Old runs are pruned to PROFILE_KEEP runs and PROFILE_MAX_MB in total.
+4. Without --profile, nothing profiling-related is imported or running;
+   --profile can't be combined with --daemon.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_profiling.py
+"""
+import os
+import pstats
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils import profiling
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+def burn_cpu():
+    total = 0
+    deadline = time.perf_counter() + 0.15
+    while time.perf_counter() < deadline:
+        total += sum(range(1000))
+    return total
+
+
+def allocate():
+    return [bytearray(1024) for _ in range(2000)]
+
+
+def waiting_worker(stop):
+    stop.wait(5)
+
+
+# --- 1. Reports ---
+with tempfile.TemporaryDirectory() as tmpdir:
+    os.environ["PROFILE_SAMPLE_INTERVAL_MS"] = "5"
+    stop = threading.Event()
+    worker = threading.Thread(target=waiting_worker, args=(stop,), name="tenant-worker")
+    try:
+        with profiling.profiled('unit', directory=tmpdir) as paths:
+            worker.start()
+            burn_cpu()
+            kept = allocate()
+    finally:
+        stop.set()
+        worker.join()
+        os.environ.pop("PROFILE_SAMPLE_INTERVAL_MS")
+    if sorted(paths) != ['collapsed', 'prof', 'txt'] or not all(os.path.exists(p) for p in paths.values()):
+        fail(f"expected .prof, .txt and .collapsed files, got {paths}")
+    if not re.search(r'\d{8}-\d{6}-\d{6}-unit\.prof$', paths['prof']):
+        fail(f"profiles should be named <stamp>-<name>: {paths['prof']}")
+    functions = {func[2] for func in pstats.Stats(paths['prof']).stats}
+    if 'burn_cpu' not in functions:
+        fail("the cProfile dump should include the profiled block's functions")
+    summary = Path(paths['txt']).read_text()
+    if "functions by cumulative time" not in summary or "burn_cpu" not in summary:
+        fail("the summary should list the top functions")
+    if "test_profiling.py" not in summary.split("allocation sites")[1]:
+        fail("the summary should list the block's allocation sites")
+    lines = Path(paths['collapsed']).read_text().splitlines()
+    if not lines or not all(re.match(r'^\S.*;.* \d+$', line) for line in lines):
+        fail(f"collapsed stacks should be 'frame;frame count' lines: {lines[:3]}")
+    if not any(line.startswith("MainThread;") and "burn_cpu" in line for line in lines):
+        fail("the sampler should see the main thread burning CPU")
+    if not any(line.startswith("tenant-worker;") and "waiting_worker" in line for line in lines):
+        fail("the sampler should see other threads too")
+    if any(line.startswith("profile-sampler;") for line in lines):
+        fail("the sampler should not sample itself")
+    del kept
+print("[OK ] profiled(): cProfile dump, top functions/allocations summary, collapsed stacks of all threads")
+
+# --- 2. Sampler off ---
+with tempfile.TemporaryDirectory() as tmpdir:
+    os.environ["PROFILE_SAMPLE_INTERVAL_MS"] = "0"
+    try:
+        with profiling.profiled('nosampler', directory=tmpdir) as paths:
+            burn_cpu()
+    finally:
+        os.environ.pop("PROFILE_SAMPLE_INTERVAL_MS")
+    if 'collapsed' in paths or any(name.endswith('.collapsed') for name in os.listdir(tmpdir)):
+        fail("PROFILE_SAMPLE_INTERVAL_MS=0 should disable the sampler")
+print("[OK ] PROFILE_SAMPLE_INTERVAL_MS=0 disables the stack sampler")
+
+# --- 3. Retention ---
+with tempfile.TemporaryDirectory() as tmpdir:
+    for day in range(1, 7):
+        for suffix in ('.prof', '.txt', '.collapsed'):
+            Path(tmpdir, f"2026010{day}-120000-000000-run{suffix}").write_bytes(b"x" * 100_000)
+    Path(tmpdir, "notes.md").write_text("not a profile")
+    os.environ["PROFILE_KEEP"] = "4"
+    try:
+        if profiling.prune(tmpdir) != 6:
+            fail("two runs (six files) beyond PROFILE_KEEP should be removed")
+        if sorted(os.listdir(tmpdir))[0] != "20260103-120000-000000-run.collapsed":
+            fail("the oldest runs should go first")
+        os.environ["PROFILE_MAX_MB"] = "0.5"
+        profiling.prune(tmpdir)
+        left = sorted(name for name in os.listdir(tmpdir) if name != "notes.md")
+        if {name.split('-run')[0] for name in left} != {"20260106-120000-000000"}:
+            fail(f"PROFILE_MAX_MB should keep only the newest runs that fit: {left}")
+        os.environ["PROFILE_MAX_MB"] = "0"
+        profiling.prune(tmpdir)
+        if len(os.listdir(tmpdir)) != 4:
+            fail("the newest run is always kept")
+    finally:
+        os.environ.pop("PROFILE_KEEP")
+        os.environ.pop("PROFILE_MAX_MB", None)
+print("[OK ] old runs pruned to PROFILE_KEEP and PROFILE_MAX_MB, newest first")
+
+# --- 4. Off by default ---
+child = """
+import sys, tracemalloc
+from src.utils import logging_config
+logging_config._logging_configured = True
+import raindrop_to_bluesky as app
+app.parse_args([])
+loaded = [m for m in ('cProfile', 'src.utils.profiling') if m in sys.modules]
+print(loaded, tracemalloc.is_tracing(), sys.getprofile())
+"""
+result = subprocess.run([sys.executable, "-c", child], cwd=REPO_ROOT, capture_output=True, text=True, timeout=60)
+if result.returncode != 0 or result.stdout.strip() != "[] False None":
+    fail(f"an unprofiled run should not load or start any profiler: {result.stdout}{result.stderr[-500:]}")
+result = subprocess.run([sys.executable, "-c", child.replace("parse_args([])", "parse_args(['--profile', '--daemon'])")],
+                        cwd=REPO_ROOT, capture_output=True, text=True, timeout=60)
+if result.returncode != 2 or "--daemon" not in result.stderr:
+    fail("--profile with --daemon should be rejected")
+print("[OK ] nothing profiling-related is loaded without --profile; --profile --daemon is rejected")
+
+print("All profiling checks passed.")
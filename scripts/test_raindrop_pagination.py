@@ -0,0 +1,130 @@
+"""Tests for the lazy paginated Raindrop fetch — no network.
+
+The fetch used to ask for a single `perpage: 5` page. With five or more stuck
+items (already posted, tag removal failing) on that page, a new item on page 2
+was never reached. Verifies that:
+1. Pages are walked until a postable item is found — and no further.
+2. Stuck items found along the way are self-healed after the hunt, not
+   before the next page is requested.
+3. The page cap bounds the walk, and a short page ends it.
+4. A failing later page keeps the items already found.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_raindrop_pagination.py
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+from src import raindrop_handler
+from src.utils import circuit_breaker
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.text = json.dumps(payload)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code}", response=self)
+
+    def json(self):
+        return self._payload
+
+
+class PagedSession:
+    """Serves `pages` (lists of items) by the `page` param and logs events."""
+
+    def __init__(self, pages, events, failing_pages=()):
+        self.pages = pages
+        self.events = events
+        self.failing_pages = set(failing_pages)
+
+    def get(self, url, headers=None, params=None):
+        page = params["page"]
+        self.events.append(("page", page))
+        if page in self.failing_pages:
+            return FakeResponse({}, status_code=503)
+        items = self.pages[page] if page < len(self.pages) else []
+        count = sum(len(p) for p in self.pages)
+        return FakeResponse({"items": items, "count": count})
+
+
+STUCK = {101, 102, 103, 104, 105}
+
+
+def run(pages, limit=1, perpage=5, max_pages=10, failing_pages=()):
+    events = []
+    session = PagedSession(pages, events, failing_pages)
+
+    def fake_remove_bulk(token, raindrops, tag="toskeet", session=None, fresh=False):
+        events.append(("heal", [r["_id"] for r in raindrops]))
+        return {r["_id"]: True for r in raindrops}
+
+    orig_already = raindrop_handler.is_already_posted_many
+    orig_bulk = raindrop_handler.remove_tag_bulk
+    orig_breaker_file = circuit_breaker.BREAKER_FILE
+    tmpdir = tempfile.TemporaryDirectory()
+    try:
+        raindrop_handler.is_already_posted_many = lambda ids, namespace=None: {rid for rid in ids if rid in STUCK}
+        raindrop_handler.remove_tag_bulk = fake_remove_bulk
+        circuit_breaker.BREAKER_FILE = os.path.join(tmpdir.name, "circuit_breakers.json")
+        pending = raindrop_handler.get_pending_raindrops(
+            "fake-token", limit=limit, session=session, perpage=perpage, max_pages=max_pages
+        )
+    finally:
+        raindrop_handler.is_already_posted_many = orig_already
+        raindrop_handler.remove_tag_bulk = orig_bulk
+        circuit_breaker.BREAKER_FILE = orig_breaker_file
+        tmpdir.cleanup()
+    return [r["_id"] for r in pending], events
+
+
+page0 = [{"_id": i} for i in sorted(STUCK, reverse=True)]   # five stuck items
+page1 = [{"_id": 7}, {"_id": 6}, {"_id": 5}, {"_id": 4}, {"_id": 3}]
+page2 = [{"_id": 2}, {"_id": 1}]
+
+# --- 1/2. New item behind a full page of stuck items is found; walk stops there ---
+ids, events = run([page0, page1, page2])
+if ids != [7]:
+    fail(f"expected the first new item (7) from the second page, got {ids}")
+if [e for e in events if e[0] == "page"] != [("page", 0), ("page", 1)]:
+    fail(f"expected exactly pages 0 and 1 to be fetched, got {events}")
+if events[-1] != ("heal", [105, 104, 103, 102, 101]):
+    fail(f"stuck items should be self-healed once, after the hunt; got {events}")
+print("[OK ] item behind five stuck items is found; third page never fetched; heal runs last")
+
+# --- batch fills across pages ---
+ids, events = run([page0, page1, page2], limit=6)
+if ids != [7, 6, 5, 4, 3, 2]:
+    fail(f"expected the batch to fill across pages, got {ids}")
+print("[OK ] a batch fills across pages in '-created' order")
+
+# --- 3. Page cap bounds the walk; short page ends it ---
+ids, events = run([page0, page1, page2], max_pages=1)
+if ids or [e for e in events if e[0] == "page"] != [("page", 0)]:
+    fail(f"max_pages=1 should stop after page 0, got {ids} / {events}")
+ids, events = run([page2], limit=5)
+if [e for e in events if e[0] == "page"] != [("page", 0)]:
+    fail(f"a short page should end the walk, got {events}")
+print("[OK ] page cap and short pages end the walk")
+
+# --- 4. A failing later page keeps what was already found ---
+ids, events = run([page1, page2], limit=10, failing_pages={1})
+if ids != [7, 6, 5, 4, 3]:
+    fail(f"items from page 0 should survive a page-1 failure, got {ids}")
+print("[OK ] a failed later page keeps the items already found")
+
+print("All pagination checks passed.")
@@ -34,6 +34,13 @@ class FakeResponse:
         return self._payload
 
 
+class FakeSession:
+    """Stands in for the shared pooled HTTP session."""
+    def __init__(self, get=None, put=None):
+        self.get = get
+        self.put = put
+
+
 # --- 1. Custom tag is used in the Raindrop search query ---
 
 def run_search_uses_tag(tag, expected_val):
@@ -43,18 +50,18 @@ def run_search_uses_tag(tag, expected_val):
         captured["params"] = params
         return FakeResponse({"items": []})
 
-    orig_get = raindrop_handler.requests.get
-    orig_already = raindrop_handler.is_already_posted
+    orig_get_session = raindrop_handler.get_session
+    orig_already = raindrop_handler.is_already_posted_many
     try:
-        raindrop_handler.requests.get = fake_get
-        raindrop_handler.is_already_posted = lambda rid: False
+        raindrop_handler.get_session = lambda: FakeSession(get=fake_get)
+        raindrop_handler.is_already_posted_many = lambda ids, namespace=None: set()
         if tag is None:
             raindrop_handler.get_latest_raindrop_to_skeet("fake-token")
         else:
             raindrop_handler.get_latest_raindrop_to_skeet("fake-token", tag=tag)
     finally:
-        raindrop_handler.requests.get = orig_get
-        raindrop_handler.is_already_posted = orig_already
+        raindrop_handler.get_session = orig_get_session
+        raindrop_handler.is_already_posted_many = orig_already
 
     search = captured.get("params", {}).get("search", "")
     if f'"val": "{expected_val}"' not in search and f'"val":"{expected_val}"' not in search:
@@ -78,18 +85,15 @@ def run_remove_uses_tag(tag, present_tags, expected_remaining):
         put_body["tags"] = json["tags"]
         return FakeResponse({"result": True})
 
-    orig_get = raindrop_handler.requests.get
-    orig_put = raindrop_handler.requests.put
+    orig_get_session = raindrop_handler.get_session
     try:
-        raindrop_handler.requests.get = fake_get
-        raindrop_handler.requests.put = fake_put
+        raindrop_handler.get_session = lambda: FakeSession(get=fake_get, put=fake_put)
         if tag is None:
             ok = raindrop_handler.remove_toskeet_tag("fake-token", 123)
         else:
             ok = raindrop_handler.remove_toskeet_tag("fake-token", 123, tag=tag)
     finally:
-        raindrop_handler.requests.get = orig_get
-        raindrop_handler.requests.put = orig_put
+        raindrop_handler.get_session = orig_get_session
 
     if not ok:
         fail(f"remove_toskeet_tag returned False for tag {tag!r}")
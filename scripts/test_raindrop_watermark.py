@@ -0,0 +1,182 @@
+"""Tests for the idle-poll watermark — no network.
+
+Every poll used to run the full tag search and walk its items even when
+nothing had changed. A one-page probe (count + digest of every item's ID
+and lastUpdate) is now compared with the mark left by the last fetch that
+found nothing to post.
+Verifies that:
+1. An empty tag search costs one probe request and nothing else.
+2. An idle full fetch (only stuck items) saves a mark; the next unchanged
+   poll is a single probe with no listing walk and no self-heal.
+3. Tagging a new item changes the probe, so the full fetch runs and the
+   mark is cleared while items are pending.
+4. Untagging one item and tagging an older one (same count, same newest
+   item) still changes the probe.
+5. A stale mark, a failed probe or more items than one probe page falls
+   back to the full fetch.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_raindrop_watermark.py
+"""
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+from src import raindrop_handler
+from src.utils import circuit_breaker, state_file, watermark
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+        self.text = json.dumps(payload)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code}", response=self)
+
+    def json(self):
+        return self._payload
+
+
+class TaggedSession:
+    """Serves the tag search over `items`; records probe vs listing requests."""
+
+    def __init__(self, items, probe_status=200):
+        self.items = items
+        self.probe_status = probe_status
+        self.calls = []
+
+    def get(self, url, headers=None, params=None):
+        if params["sort"] != "-created":
+            fail(f"undocumented sort {params['sort']!r}")
+        if params["perpage"] == raindrop_handler.MAX_PERPAGE:
+            self.calls.append("probe")
+            return FakeResponse({"items": self.items[:params["perpage"]], "count": len(self.items)},
+                                self.probe_status)
+        self.calls.append("listing")
+        start = params["page"] * params["perpage"]
+        page = self.items[start:start + params["perpage"]]
+        return FakeResponse({"items": page, "count": len(self.items)})
+
+
+STUCK = {100}
+heals = []
+
+
+def poll(session, max_age=3600):
+    return [r["_id"] for r in raindrop_handler.get_pending_raindrops(
+        "fake-token", limit=5, session=session, watermark_max_age=max_age
+    )]
+
+
+orig_file = watermark.WATERMARK_FILE
+orig_breaker_file = circuit_breaker.BREAKER_FILE
+orig_already = raindrop_handler.is_already_posted_many
+orig_bulk = raindrop_handler.remove_tag_bulk
+tmpdir = tempfile.TemporaryDirectory()
+try:
+    watermark.WATERMARK_FILE = os.path.join(tmpdir.name, "raindrop_watermark.json")
+    circuit_breaker.BREAKER_FILE = os.path.join(tmpdir.name, "circuit_breakers.json")
+    raindrop_handler.is_already_posted_many = lambda ids, namespace=None: {rid for rid in ids if rid in STUCK}
+    # Stuck tag removal keeps failing, so the stuck item stays in the search
+    raindrop_handler.remove_tag_bulk = lambda token, raindrops, tag="toskeet", session=None, fresh=False: (
+        heals.append([r["_id"] for r in raindrops]) or {r["_id"]: False for r in raindrops}
+    )
+
+    # --- 1. Empty tag search: one probe, nothing else ---
+    session = TaggedSession([])
+    if poll(session) != [] or session.calls != ["probe"]:
+        fail(f"empty search should cost one probe, got {session.calls}")
+    print("[OK ] empty tag search costs a single probe request")
+
+    # --- 2. Idle fetch saves a mark; the next unchanged poll is probe-only ---
+    stuck_item = {"_id": 100, "lastUpdate": "2026-01-01T00:00:00Z", "tags": ["toskeet"]}
+    session = TaggedSession([stuck_item])
+    if poll(session) != [] or session.calls != ["probe", "listing"] or heals != [[100]]:
+        fail(f"first poll should probe, list and self-heal, got {session.calls} / {heals}")
+    if watermark.load_watermark("toskeet")["count"] != 1:
+        fail("idle full fetch did not save a watermark")
+
+    session.calls.clear()
+    heals.clear()
+    for _ in range(3):
+        poll(session)
+    if session.calls != ["probe"] * 3 or heals:
+        fail(f"unchanged polls should be probe-only, got {session.calls} / {heals}")
+    print("[OK ] unchanged polls skip the listing walk and self-heal")
+
+    # --- 3. A newly tagged item changes the probe ---
+    session.items.insert(0, {"_id": 200, "lastUpdate": "2026-01-02T00:00:00Z", "tags": ["toskeet"]})
+    session.calls.clear()
+    if poll(session) != [200] or session.calls != ["probe", "listing"]:
+        fail(f"new item should trigger the full fetch, got {session.calls}")
+    if watermark.load_watermark("toskeet") is not None:
+        fail("mark must be cleared while items are pending")
+    print("[OK ] a newly tagged item triggers the full fetch and clears the mark")
+
+    # --- 4. Untag one item, tag an older one: same count, same newest item ---
+    STUCK.update({300, 400})
+    newest = {"_id": 300, "lastUpdate": "2026-01-05T00:00:00Z", "tags": ["toskeet"]}
+    untagged = {"_id": 400, "lastUpdate": "2026-01-03T00:00:00Z", "tags": ["toskeet"]}
+    session = TaggedSession([newest, untagged])
+    poll(session)
+    session.calls.clear()
+    poll(session)
+    if session.calls != ["probe"]:
+        fail(f"setup: unchanged poll should be probe-only, got {session.calls}")
+    # Tagging bumps the older item's lastUpdate, but not past the newest one
+    session.items = [newest, {"_id": 500, "lastUpdate": "2026-01-04T00:00:00Z", "tags": ["toskeet"]}]
+    session.calls.clear()
+    if poll(session) != [500] or session.calls != ["probe", "listing"]:
+        fail(f"untag-one/tag-another should trigger the full fetch, got {session.calls}")
+    print("[OK ] untagging one item and tagging an older one triggers the full fetch")
+
+    # --- 5. Stale mark / failed probe / oversized set fall back to the full fetch ---
+    session = TaggedSession([stuck_item])
+    poll(session)
+    with state_file.update(watermark.WATERMARK_FILE, 'watermark') as marks:
+        marks["toskeet"]["saved_at"] = (datetime.utcnow() - timedelta(hours=2)).isoformat()
+    session.calls.clear()
+    poll(session)
+    if session.calls != ["probe", "listing"]:
+        fail(f"stale mark should force a full fetch, got {session.calls}")
+
+    session = TaggedSession([stuck_item], probe_status=503)
+    if poll(session) != [] or session.calls != ["probe", "listing"]:
+        fail(f"failed probe should fall back to the full fetch, got {session.calls}")
+
+    many = [{"_id": 1000 + i, "lastUpdate": "2026-01-01T00:00:00Z", "tags": ["toskeet"]}
+            for i in range(raindrop_handler.MAX_PERPAGE + 1)]
+    count, signature = raindrop_handler.probe_tagged("fake-token", session=TaggedSession(many))
+    if count != len(many) or signature is not None:
+        fail(f"a set larger than one probe page should have no signature, got {signature!r}")
+    watermark.save_watermark("toskeet", count, None)
+    if watermark.is_unchanged("toskeet", count, None, 3600):
+        fail("a probe without a signature must never match a mark")
+
+    session = TaggedSession([stuck_item])
+    poll(session, max_age=0)
+    if session.calls != ["listing"]:
+        fail(f"watermark_max_age=0 should disable the probe, got {session.calls}")
+    print("[OK ] stale mark, failed probe, oversized set and disabled watermark all run the full fetch")
+finally:
+    watermark.WATERMARK_FILE = orig_file
+    circuit_breaker.BREAKER_FILE = orig_breaker_file
+    raindrop_handler.is_already_posted_many = orig_already
+    raindrop_handler.remove_tag_bulk = orig_bulk
+    tmpdir.cleanup()
+
+print("All watermark checks passed.")
@@ -0,0 +1,198 @@
+"""Tests for the rate-limit scheduler (src/utils/rate_limiter.py) — no network.
+
+Neither handler used to read rate-limit headers: a 429 was just another
+transient error followed by a blind exponential sleep. Verifies that:
+1. Calls are paced by a token bucket per key: a burst goes out at once,
+   then calls are spaced at the steady rate; keys don't share budgets.
+2. X-RateLimit-Remaining/Reset caps the bucket and spreads what's left over
+   the window; an exhausted budget waits for the reset (epoch or delta).
+3. Retry-After (seconds or HTTP-date) blocks the key; waits are capped.
+4. Raindrop requests go through the limiter keyed by token, and a 429 with
+   Retry-After paces the next request instead of failing into a sleep.
+5. Bluesky XRPC calls go through the limiter via the atproto transport.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_rate_limiter.py
+"""
+import json
+import sys
+import time
+from email.utils import formatdate
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx
+from atproto_client.exceptions import RateLimitExceededError
+from src import bluesky_handler, raindrop_handler
+from src.utils import rate_limiter, retry
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+class FakeClock:
+    """Stands in for time.monotonic/time.sleep: sleeping advances the clock."""
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+clock = FakeClock()
+orig = (rate_limiter._clock, rate_limiter._sleep)
+rate_limiter._clock, rate_limiter._sleep = clock.monotonic, clock.sleep
+
+try:
+    # --- 1. Token bucket pacing ---
+    rate_limiter.reset()
+    waits = [rate_limiter.acquire("raindrop:a") for _ in range(22)]  # 120/min: burst of 20, then 0.5s apart
+    if any(waits[:20]) or waits[20:] != [0.5, 0.5]:
+        fail(f"expected a 20-call burst then 0.5s spacing, got {waits}")
+    if rate_limiter.acquire("raindrop:b") != 0.0:
+        fail("another key must not share the first key's budget")
+    clock.now += 60
+    if any(rate_limiter.acquire("raindrop:a") for _ in range(20)):
+        fail("the bucket should refill over time")
+    print("[OK ] token bucket: burst, then steady spacing; per-key budgets; refill")
+
+    # --- 2. Learning from X-RateLimit-* ---
+    rate_limiter.reset()
+    rate_limiter.observe("raindrop:a", 200, {"X-RateLimit-Limit": "120", "X-RateLimit-Remaining": "5",
+                                             "X-RateLimit-Reset": str(int(time.time()) + 50)})
+    waits = [round(rate_limiter.acquire("raindrop:a")) for _ in range(3)]
+    if waits != [10, 10, 10]:
+        fail(f"5 calls left for 50s should be spread 10s apart, got {waits}")
+    clock.now += 60
+    if any(rate_limiter.acquire("raindrop:a") for _ in range(10)):
+        fail("after the reset the steady rate applies again")
+
+    rate_limiter.reset()
+    rate_limiter.observe("bluesky:x", 200, {"ratelimit-remaining": "0", "ratelimit-reset": "30"})
+    if rate_limiter.acquire("bluesky:x") != 30:
+        fail("an exhausted budget should wait for the reset (delta seconds)")
+    if any(rate_limiter.acquire("bluesky:x") for _ in range(20)):
+        fail("the budget is back after the reset: the next burst goes out at once")
+
+    rate_limiter.reset()
+    rate_limiter.observe("raindrop:a", 200, {"X-RateLimit-Remaining": "500", "X-RateLimit-Reset": "60"})
+    if any(rate_limiter.acquire("raindrop:a") for _ in range(20)):
+        fail("a comfortable budget must not slow the burst down")
+    print("[OK ] remaining/reset headers cap the budget and spread it over the window")
+
+    # --- 3. Retry-After and the wait cap ---
+    rate_limiter.reset()
+    rate_limiter.observe("raindrop:a", 429, {"Retry-After": "7"})
+    if rate_limiter.acquire("raindrop:a") != 7:
+        fail("Retry-After seconds should block the key")
+    rate_limiter.observe("raindrop:a", 429, {"Retry-After": formatdate(time.time() + 20, usegmt=True)})
+    if not 18 <= rate_limiter.acquire("raindrop:a") <= 21:
+        fail("Retry-After HTTP-date should block the key")
+    if rate_limiter.parse_retry_after("soon") is not None:
+        fail("a malformed Retry-After should be ignored")
+    rate_limiter.observe("raindrop:a", 429, {"Retry-After": "3600"})
+    if rate_limiter.acquire("raindrop:a") != rate_limiter.DEFAULT_MAX_WAIT_SECONDS:
+        fail("a single wait should be capped at RATE_LIMIT_MAX_WAIT_SECONDS")
+    if rate_limiter.stats()["throttled"] < 3 or rate_limiter.stats()["capped_waits"] < 1:
+        fail(f"429s and capped waits should be counted: {rate_limiter.stats()}")
+    print("[OK ] Retry-After (seconds and HTTP-date) blocks the key; long waits are capped")
+
+    # --- 4. Raindrop handler integration ---
+    class FakeResponse:
+        def __init__(self, status_code, payload, headers=None):
+            self.status_code = status_code
+            self._payload = payload
+            self.headers = headers or {}
+            self.text = json.dumps(payload)
+
+        def raise_for_status(self):
+            if self.status_code >= 400:
+                raise raindrop_handler.requests.exceptions.HTTPError(str(self.status_code), response=self)
+
+        def json(self):
+            return self._payload
+
+    responses = [
+        FakeResponse(429, {}, {"Retry-After": "12"}),
+        FakeResponse(200, {"item": {"tags": ["toskeet"]}}),
+        FakeResponse(200, {"result": True}, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "40"}),
+    ]
+    calls = []
+
+    class FakeSession:
+        def get(self, url, headers=None, params=None):
+            calls.append(("get", clock.now))
+            return responses.pop(0)
+
+        def put(self, url, headers=None, json=None):
+            calls.append(("put", clock.now))
+            return responses.pop(0)
+
+    rate_limiter.reset()
+    clock.sleeps.clear()
+    orig_sleep = retry.sleep
+    retry.sleep = lambda seconds, cancel=None: clock.sleep(seconds)
+    try:
+        removed = raindrop_handler.remove_toskeet_tag("tok", 1, session=FakeSession())
+    finally:
+        retry.sleep = orig_sleep
+    if not removed or [c[0] for c in calls] != ["get", "get", "put"]:
+        fail(f"tag removal should retry after the 429, got {calls}")
+    if calls[1][1] - calls[0][1] != 12:
+        fail(f"the retry should wait exactly Retry-After, not a blind backoff: {clock.sleeps}")
+    key = rate_limiter.key_for("raindrop", "Bearer tok")
+    if rate_limiter.acquire(key) != 40:
+        fail("the next request for this token should wait for the advertised reset")
+    if rate_limiter.acquire(rate_limiter.key_for("raindrop", "Bearer other")) != 0:
+        fail("another tenant's token must not be slowed down")
+    blocked = rate_limiter.key_for("raindrop", "Bearer blocked")
+    rate_limiter.observe(blocked, 429, {"Retry-After": "60"})
+    with retry.run_deadline(5):
+        waited = rate_limiter.acquire(blocked)
+    if not 0 < waited <= 5:
+        fail(f"a rate-limit wait should end at the run deadline, waited {waited}s")
+    print("[OK ] Raindrop requests paced per token; 429 Retry-After replaces the blind backoff")
+
+    # --- 5. Bluesky transport ---
+    rate_limiter.reset()
+    seen = []
+
+    def handler(request):
+        seen.append(request.url.path)
+        if len(seen) == 1:
+            return httpx.Response(429, json={"error": "RateLimitExceeded", "message": "slow down"},
+                                  headers={"ratelimit-remaining": "0", "ratelimit-reset": str(int(time.time()) + 25)})
+        return httpx.Response(200, json={"ok": True})
+
+    transport = bluesky_handler._RateLimitedRequest("alice.test", transport=httpx.MockTransport(handler))
+    url = "https://bsky.social/xrpc/com.atproto.repo.createRecord"
+    try:
+        transport.post(url, json={})
+        fail("a 429 should still raise RateLimitExceededError")
+    except RateLimitExceededError:
+        pass
+    started = clock.now
+    transport.post(url, json={})
+    if not 24 <= clock.now - started <= 26:
+        fail(f"the next createRecord should wait for the reset, waited {clock.now - started}s")
+    other = "https://bsky.social/xrpc/app.bsky.feed.getTimeline"
+    started = clock.now
+    transport.get(other)
+    if clock.now != started:
+        fail("other XRPC methods keep their own budget")
+    if type(transport.clone()) is not bluesky_handler._RateLimitedRequest:
+        fail("cloned transports (proxy/labeler clients) must stay rate limited")
+    print("[OK ] Bluesky XRPC calls paced per account and method from RateLimit-* headers")
+finally:
+    rate_limiter._clock, rate_limiter._sleep = orig
+    rate_limiter.reset()
+
+print("All rate-limiter checks passed.")
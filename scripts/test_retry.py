@@ -0,0 +1,274 @@
+"""Tests for the shared retry engine (src/utils/retry.py) — no network.
+
+remove_toskeet_tag and post_content_to_bluesky each hand-rolled the same
+MAX_RETRIES loop with RETRY_DELAY_SECONDS * 2**attempt and time.sleep, and
+the image fetch didn't retry at all. Verifies that:
+1. Errors are sorted into classes and each class has its own attempt limit;
+   unlisted classes are never retried.
+2. Backoff is full jitter under a doubling cap bounded by max_delay.
+3. Retry-After (or a 429's RateLimit-Reset) replaces the backoff, and a wait
+   past the time budget gives up with the last error. Under run_deadline()
+   the waits of successive calls share one deadline for the whole run.
+4. Waits end early on the caller's cancel Event and on cancel_sleeps().
+5. Hooks see retries, recoveries and give-ups; stats() counts them.
+6. A dropped connection on an image fetch is retried once.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_retry.py
+"""
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import requests
+from PIL import Image
+from src import post_formatter
+from src.utils import retry
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None, content=b""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.content = content
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code}", response=self)
+
+    def iter_content(self, chunk_size=1):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+
+def http_error(status_code, headers=None):
+    return requests.exceptions.HTTPError(str(status_code), response=FakeResponse(status_code, headers))
+
+
+def failing(*errors, result="ok"):
+    """A callable raising `errors` in turn, then returning `result`."""
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+    return fn, calls
+
+
+POLICY = retry.RetryPolicy('test', {'timeout': 3, 'server': 3, 'rate_limited': 3, 'network': 2},
+                           base_delay=2, max_delay=5, budget_seconds=60)
+
+slept = []
+orig_sleep = retry.sleep
+retry.sleep = lambda seconds, cancel=None: slept.append(round(seconds, 3)) or False
+try:
+    # --- 1. Error classes and per-class attempt limits ---
+    cases = {
+        'timeout': requests.exceptions.ReadTimeout(),
+        'network': requests.exceptions.ConnectionError(),
+        'rate_limited': http_error(429),
+        'server': http_error(503),
+        'http': http_error(404),
+        'other': ValueError("bad json"),
+    }
+    for expected, error in cases.items():
+        if retry.classify_error(error) != expected:
+            fail(f"{error!r} should be classified as {expected}, got {retry.classify_error(error)}")
+    if retry.classify_error(TimeoutError()) != 'timeout':
+        fail("stdlib timeouts are timeouts")
+
+    retry.reset()
+    fn, calls = failing(http_error(503), requests.exceptions.Timeout())
+    if retry.call(fn, POLICY) != "ok" or len(calls) != 3:
+        fail(f"transient errors should be retried until success, got {len(calls)} calls")
+    fn, calls = failing(http_error(404))
+    try:
+        retry.call(fn, POLICY)
+        fail("a 404 must be raised")
+    except requests.exceptions.HTTPError:
+        pass
+    if len(calls) != 1:
+        fail("unlisted classes must not be retried")
+    fn, calls = failing(*[requests.exceptions.ConnectionError()] * 5)
+    try:
+        retry.call(fn, POLICY)
+        fail("exhausted attempts must raise the last error")
+    except requests.exceptions.ConnectionError:
+        pass
+    if len(calls) != 2:
+        fail(f"'network' allows 2 attempts, got {len(calls)}")
+    seen = []
+    fn, calls = failing(http_error(502))
+    retry.call(fn, POLICY, on_retry=lambda e, error_class, attempt: seen.append((error_class, attempt)))
+    if seen != [('server', 1)]:
+        fail(f"on_retry should see each retry, got {seen}")
+    print("[OK ] error classes; per-class attempt limits; unlisted classes raise at once; on_retry")
+
+    # --- 2. Full jitter under a doubling, capped ceiling ---
+    ceilings = []
+    orig_jitter = retry._jitter
+    retry._jitter = lambda low, high: ceilings.append((low, high)) or high / 2
+    try:
+        slept.clear()
+        policy = retry.RetryPolicy('jitter', {'server': 5}, base_delay=2, max_delay=5, budget_seconds=60)
+        fn, calls = failing(*[http_error(503)] * 4)
+        retry.call(fn, policy)
+    finally:
+        retry._jitter = orig_jitter
+    if ceilings != [(0, 2), (0, 4), (0, 5), (0, 5)]:
+        fail(f"backoff ceilings should double from base_delay up to max_delay, got {ceilings}")
+    if slept != [1, 2, 2.5, 2.5]:
+        fail(f"the jittered value should be slept, got {slept}")
+    delays = [retry._next_delay(policy, http_error(503), 'server', 3, time.monotonic() + 60, None)[0]
+              for _ in range(200)]
+    if not all(0 <= d <= 5 for d in delays) or len(set(delays)) < 100:
+        fail("real jitter should spread waits over [0, cap]")
+    print("[OK ] full jitter: uniform in [0, min(max_delay, base * 2**retry)]")
+
+    # --- 3. Retry-After, RateLimit-Reset and the time budget ---
+    slept.clear()
+    fn, calls = failing(http_error(429, {"Retry-After": "7"}), http_error(503, {"retry-after": "3"}))
+    retry.call(fn, POLICY)
+    if slept != [7, 3]:
+        fail(f"Retry-After should replace the backoff, got {slept}")
+    slept.clear()
+    fn, calls = failing(http_error(429, {"RateLimit-Reset": str(int(time.time()) + 20)}))
+    retry.call(fn, POLICY)
+    if not slept or not 18 <= slept[0] <= 21:
+        fail(f"a 429 without Retry-After should wait for RateLimit-Reset, got {slept}")
+    slept.clear()
+    fn, calls = failing(http_error(429, {"Retry-After": "3600"}))
+    try:
+        retry.call(fn, POLICY)
+        fail("a wait past the budget must raise")
+    except requests.exceptions.HTTPError:
+        pass
+    if slept or len(calls) != 1:
+        fail("nothing should be slept when the wait would overrun the budget")
+    if retry.stats()['test']['give_up_reasons'].get('budget') != 1:
+        fail(f"budget give-ups should be counted: {retry.stats()}")
+    print("[OK ] Retry-After / RateLimit-Reset replace the backoff; waits past the budget give up")
+
+    clock = [1000.0]
+    orig_clock = retry._clock
+    retry._clock = lambda: clock[0]
+    retry.sleep = lambda seconds, cancel=None: slept.append(seconds) or clock.__setitem__(0, clock[0] + seconds)
+    try:
+        slept.clear()
+        with retry.run_deadline(10):
+            fn, calls = failing(http_error(503, {"Retry-After": "6"}))
+            retry.call(fn, POLICY)
+            if retry.remaining() != 4:
+                fail(f"the run deadline should count time across calls, {retry.remaining()}s left")
+            fn, calls = failing(http_error(503, {"Retry-After": "6"}))
+            try:
+                retry.call(fn, POLICY)
+                fail("a wait past the run deadline must raise, even inside the call's budget")
+            except requests.exceptions.HTTPError:
+                pass
+        if slept != [6] or len(calls) != 1:
+            fail(f"nothing should be slept past the run deadline, slept {slept}")
+        if retry.stats()['test']['give_up_reasons'].get('run_deadline') != 1:
+            fail(f"run-deadline give-ups should be counted: {retry.stats()}")
+        if retry.remaining() is not None:
+            fail("the run deadline must end with its block")
+    finally:
+        retry._clock = orig_clock
+    print("[OK ] run_deadline() bounds the retry waits of every call in the run")
+finally:
+    retry.sleep = orig_sleep
+
+# --- 4. Cancellable waits ---
+cancel = threading.Event()
+threading.Timer(0.05, cancel.set).start()
+started = time.monotonic()
+if not retry.sleep(10, cancel) or time.monotonic() - started > 2:
+    fail("a wait should end when its cancel Event is set")
+if retry.sleep(0.01, threading.Event()):
+    fail("an uncancelled wait should report it ran to the end")
+
+threading.Timer(0.05, retry.cancel_sleeps).start()
+started = time.monotonic()
+fn, calls = failing(*[http_error(503, {"Retry-After": "10"})] * 3)
+try:
+    retry.call(fn, POLICY)
+    fail("a cancelled wait should raise the last error")
+except requests.exceptions.HTTPError:
+    pass
+if time.monotonic() - started > 2 or len(calls) != 1:
+    fail("shutdown should cut the retry wait short and stop retrying")
+if retry.stats()['test']['give_up_reasons'].get('cancelled') != 1:
+    fail(f"cancelled retries should be counted: {retry.stats()}")
+retry.reset()
+print("[OK ] waits end early on the caller's cancel Event and on shutdown")
+
+# --- 5. Hooks and stats ---
+events = []
+hook = lambda event, policy, error_class, attempt, delay: events.append((event, policy, error_class, attempt))
+retry.add_hook(hook)
+retry.add_hook(lambda *args: 1 / 0)  # a broken hook must not break the call
+orig_sleep = retry.sleep
+retry.sleep = lambda seconds, cancel=None: False
+try:
+    fn, calls = failing(requests.exceptions.Timeout())
+    retry.call(fn, POLICY)
+    fn, calls = failing(*[http_error(502)] * 3)
+    try:
+        retry.call(fn, POLICY)
+    except requests.exceptions.HTTPError:
+        pass
+finally:
+    retry.sleep = orig_sleep
+    retry._hooks.clear()
+expected = [('retry', 'test', 'timeout', 1), ('recovered', 'test', None, 2),
+            ('retry', 'test', 'server', 1), ('retry', 'test', 'server', 2), ('give_up', 'test', 'server', 3)]
+if events != expected:
+    fail(f"unexpected hook events {events}")
+row = retry.stats()['test']
+if (row['calls'], row['retries'], row['recovered'], row['gave_up']) != (2, 3, 1, 1):
+    fail(f"unexpected counters {row}")
+if row['errors'] != {'timeout': 1, 'server': 3} or row['give_up_reasons'] != {'attempts': 1}:
+    fail(f"unexpected per-class counters {row}")
+print("[OK ] hooks see retry/recovered/give_up; stats() counts per policy and class")
+
+# --- 6. Image fetch retries a dropped connection ---
+buf = io.BytesIO()
+Image.new("RGB", (400, 300), "navy").save(buf, format="PNG")
+
+
+class FlakySession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, headers=None, **kwargs):
+        self.calls += 1
+        if self.calls == 1:
+            raise requests.exceptions.ConnectionError("connection reset")
+        return FakeResponse(200, content=buf.getvalue())
+
+
+with tempfile.TemporaryDirectory() as cache_dir:
+    os.environ["IMAGE_CACHE_DIR"] = cache_dir
+    session = FlakySession()
+    img_bytes = post_formatter._fetch_processed_image("https://example.com/cover.png", session, {})
+if not img_bytes or session.calls != 2:
+    fail(f"the image fetch should retry a dropped connection, got {session.calls} call(s)")
+print("[OK ] image fetch retries a dropped connection")
+
+print("All retry checks passed.")
@@ -0,0 +1,107 @@
+"""Tests for state_file, the shared JSON state-file helper.
+
+Watermarks, Bluesky sessions, circuit breakers, alert dedup and the JSON
+posted tracker each carried their own copy of load / atomic save / lock.
+They now share state_file; this checks the behaviour they rely on:
+missing or corrupt files read as empty, a failed write keeps the old file,
+concurrent updates of one file lose nothing, unchanged data is not
+rewritten and private files are owner-only.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_state_file.py
+"""
+import os
+import stat
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.utils import state_file
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    path = os.path.join(tmpdir, 'nested', 'state.json')
+
+    # --- 1. Missing and corrupt files read as empty ---
+    if state_file.load(path, 'test') != {}:
+        fail("missing file did not read as {}")
+    os.makedirs(os.path.dirname(path))
+    with open(path, 'w') as f:
+        f.write('{"truncated": ')
+    if state_file.load(path, 'test') != {}:
+        fail("corrupt file did not read as {}")
+    with open(path, 'w') as f:
+        f.write('[1, 2]')
+    if state_file.load(path, 'test') != {}:
+        fail("non-object JSON did not read as {}")
+    print("[OK ] missing, corrupt and non-object files read as empty")
+
+    # --- 2. A failed write keeps the old file and leaves no temp file ---
+    state_file.save(path, {"a": 1}, 'test')
+    orig_dump = state_file.json.dump
+
+    def exploding_dump(*args, **kwargs):
+        raise IOError("disk full mid-write")
+
+    state_file.json.dump = exploding_dump
+    try:
+        ok = state_file.save(path, {"a": 2}, 'test')
+    finally:
+        state_file.json.dump = orig_dump
+    if ok:
+        fail("failed save reported success")
+    if state_file.load(path, 'test') != {"a": 1}:
+        fail("failed save destroyed the existing file")
+    if os.path.exists(path + '.tmp'):
+        fail("failed save left its temp file behind")
+    print("[OK ] failed save keeps the existing file")
+
+    # --- 3. Concurrent updates of one file lose nothing ---
+    def bump(worker: int) -> None:
+        for i in range(25):
+            with state_file.update(path, 'test') as data:
+                data[f"{worker}-{i}"] = i
+
+    threads = [threading.Thread(target=bump, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if len(state_file.load(path, 'test')) != 1 + 8 * 25:
+        fail("concurrent updates lost entries")
+    print("[OK ] concurrent updates keep every entry")
+
+    # --- 4. An unchanged or failed update does not write ---
+    before = os.stat(path).st_mtime_ns
+    os.utime(path, ns=(before - 10**9, before - 10**9))
+    with state_file.update(path, 'test') as data:
+        data["a"] = 1  # same value
+    try:
+        with state_file.update(path, 'test') as data:
+            data["b"] = 2
+            raise RuntimeError("abandon")
+    except RuntimeError:
+        pass
+    if os.stat(path).st_mtime_ns != before - 10**9:
+        fail("unchanged or abandoned update rewrote the file")
+    if "b" in state_file.load(path, 'test'):
+        fail("abandoned update was saved")
+    print("[OK ] unchanged and abandoned updates are not written")
+
+    # --- 5. Private files are owner-only ---
+    secret = os.path.join(tmpdir, 'secret.json')
+    with state_file.update(secret, 'test', private=True) as data:
+        data["token"] = "x"
+    if stat.S_IMODE(os.stat(secret).st_mode) != 0o600:
+        fail(f"private file mode is {oct(stat.S_IMODE(os.stat(secret).st_mode))}")
+    print("[OK ] private files are created 0600")
+
+print("\nAll state_file checks passed.")
@@ -0,0 +1,336 @@
+"""Tests for multi-tenant mode (TENANTS_FILE) — no network.
+
+One process serves several Raindrop/Bluesky account pairs on a bounded worker
+pool. Verifies that:
+1. load_tenants builds one config per tenant: own credentials and tag,
+   "${VAR}" values read from the environment, global settings as defaults;
+   bad entries are rejected. load_config no longer needs the single-account
+   vars when TENANTS_FILE is set.
+2. A slow or failing tenant doesn't hold up the others; a tenant still busy
+   is skipped for the next round; per-tenant counters and latency are kept.
+3. Each tenant gets its own posted tracker and watermark namespace.
+4. main() with TENANTS_FILE polls every tenant with its own credentials and
+   namespace.
+5. A tenant whose main() fails (logged and alerted there) is counted as an
+   error by the pool, not as a successful poll with 0 posts.
+6. A tenant still polling in another process (a daemon round that overran
+   its timeout) is skipped by main(); its lock is released afterwards.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_tenant_pool.py
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Don't let importing the entry point create logs/ in the repo.
+from src.utils import logging_config
+logging_config._logging_configured = True
+
+import raindrop_to_bluesky as app
+from src.utils import config as config_module
+from src.utils import file_lock, posted_tracker, watermark
+from src.utils.tenant_pool import TenantPool
+
+# Tenant polls take per-tenant lock files; keep them out of the repo's logs/
+lock_dir = tempfile.TemporaryDirectory()
+file_lock.LOCK_FILE = os.path.join(lock_dir.name, "raindrop_bot.lock")
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+BASE_CONFIG = {
+    "RAINDROP_TOKEN": None,
+    "BLUESKY_IDENTIFIER": None,
+    "BLUESKY_PASSWORD": None,
+    "RAINDROP_TAG": "toskeet",
+    "MAX_POSTS_PER_RUN": 5,
+    "POST_SPACING_SECONDS": 30.0,
+    "RAINDROP_PERPAGE": None,
+    "RAINDROP_MAX_PAGES": 10,
+    "WATERMARK_MAX_AGE_SECONDS": 0,
+    "TENANT_WORKERS": 4,
+}
+
+TENANTS = {"tenants": [
+    {"name": "alice", "raindrop_token": "tok-a", "bluesky_identifier": "alice.test",
+     "bluesky_password": "${TEST_TENANT_ALICE_PASSWORD}"},
+    {"name": "bob", "raindrop_token": "tok-b", "bluesky_identifier": "bob.test",
+     "bluesky_password": "pw-b", "tag": "share", "max_posts_per_run": 2, "post_spacing_seconds": 0},
+]}
+
+
+def write_tenants(tmpdir: str, data) -> str:
+    path = os.path.join(tmpdir, "tenants.json")
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return path
+
+
+# --- 1. Tenant configs ---
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    os.environ["TEST_TENANT_ALICE_PASSWORD"] = "pw-a"
+    try:
+        tenants = config_module.load_tenants({**BASE_CONFIG, "TENANTS_FILE": write_tenants(tmpdir, TENANTS)})
+        alice, bob = tenants
+        if (alice["TENANT"], alice["RAINDROP_TOKEN"], alice["BLUESKY_PASSWORD"], alice["RAINDROP_TAG"]) != \
+                ("alice", "tok-a", "pw-a", "toskeet"):
+            fail(f"alice should get her own credentials and the global tag, got {alice}")
+        if (bob["RAINDROP_TAG"], bob["MAX_POSTS_PER_RUN"], bob["POST_SPACING_SECONDS"]) != ("share", 2, 0.0):
+            fail(f"bob's overrides were not applied: {bob}")
+        if config_module.load_tenants(dict(BASE_CONFIG, TENANTS_FILE=None)) != []:
+            fail("no TENANTS_FILE should mean no tenants")
+        print("[OK ] load_tenants: per-tenant credentials/tag, ${VAR} from env, global defaults")
+
+        bad_entries = [
+            {"tenants": []},
+            {"tenants": [{"name": "../etc", "raindrop_token": "t", "bluesky_identifier": "i", "bluesky_password": "p"}]},
+            {"tenants": [{"name": "a", "raindrop_token": "t", "bluesky_identifier": "i"}]},
+            {"tenants": [{"name": "a", "raindrop_token": "t", "bluesky_identifier": "i", "bluesky_password": "p",
+                          "tags": "typo"}]},
+            {"tenants": [TENANTS["tenants"][1], TENANTS["tenants"][1]]},
+            {"tenants": [{**TENANTS["tenants"][1], "bluesky_password": "${TEST_TENANT_UNSET_VAR}"}]},
+        ]
+        for data in bad_entries:
+            try:
+                config_module.load_tenants({**BASE_CONFIG, "TENANTS_FILE": write_tenants(tmpdir, data)})
+            except ValueError:
+                continue
+            fail(f"expected ValueError for tenants file {data}")
+        print("[OK ] empty list, unsafe names, missing credentials, unknown keys and duplicates are rejected")
+
+        env = {"ADMIN_EMAIL": "a@example.com", "SMTP_LOGIN": "l", "SMTP_PASSWORD": "p", "SMTP_SERVER": "s",
+               "SMTP_PORT": "465", "LOG_LEVEL": "INFO", "TENANTS_FILE": write_tenants(tmpdir, TENANTS)}
+        saved = {k: os.environ.get(k) for k in list(env) + list(config_module.ACCOUNT_VARS)}
+        orig_load_dotenv = config_module.load_dotenv
+        try:
+            config_module.load_dotenv = lambda: None
+            for key in config_module.ACCOUNT_VARS:
+                os.environ.pop(key, None)
+            os.environ.update(env)
+            loaded = config_module.load_config()
+        finally:
+            config_module.load_dotenv = orig_load_dotenv
+            for key, value in saved.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+        if loaded["TENANTS_FILE"] != env["TENANTS_FILE"] or loaded["RAINDROP_TOKEN"] is not None:
+            fail("load_config should accept TENANTS_FILE in place of the single-account vars")
+        print("[OK ] load_config: account vars optional with TENANTS_FILE")
+    finally:
+        os.environ.pop("TEST_TENANT_ALICE_PASSWORD", None)
+
+
+# --- 2. Isolation: slow and failing tenants don't block the rest ---
+
+release_slow = threading.Event()
+
+
+def fake_poll(tenant):
+    name = tenant["TENANT"]
+    if name == "slow":
+        release_slow.wait(5)
+        return 1
+    if name == "broken":
+        raise RuntimeError("simulated API outage")
+    return 2
+
+
+pool = TenantPool([{"TENANT": n} for n in ("slow", "broken", "fast")], fake_poll, max_workers=3)
+try:
+    started = time.monotonic()
+    submitted = pool.run_round(timeout=0.3)
+    elapsed = time.monotonic() - started
+    stats = pool.stats()
+    if submitted != 3 or elapsed > 2:
+        fail(f"round should return after the timeout, not wait for the slow tenant ({elapsed:.2f}s)")
+    if stats["fast"]["polls"] != 1 or stats["fast"]["posted"] != 2:
+        fail(f"fast tenant should have finished its poll: {stats['fast']}")
+    if stats["broken"]["errors"] != 1 or stats["broken"]["polls"] != 1:
+        fail(f"broken tenant's exception should be counted, not raised: {stats['broken']}")
+    if stats["slow"]["polls"] != 0:
+        fail("slow tenant should still be running")
+    print(f"[OK ] slow and failing tenants isolated (round returned in {elapsed:.2f}s)")
+
+    submitted = pool.run_round(timeout=0.3)
+    stats = pool.stats()
+    if submitted != 2 or stats["slow"]["skipped"] != 1 or stats["fast"]["polls"] != 2:
+        fail(f"busy tenant should be skipped, the others polled again: {stats}")
+    release_slow.set()
+    pool._in_flight["slow"].result(timeout=5)
+    pool.run_round()
+    stats = pool.stats()
+    if stats["slow"]["polls"] != 2 or stats["slow"]["max_seconds"] < 0.3:
+        fail(f"slow tenant's latency should be recorded: {stats['slow']}")
+    if stats["fast"]["posted"] != 6 or not stats["fast"]["posts_per_hour"] > 0 or stats["fast"]["mean_seconds"] is None:
+        fail(f"throughput and mean latency should be reported: {stats['fast']}")
+    print("[OK ] busy tenant skipped, not queued twice; per-tenant posts, latency and posts/h reported")
+finally:
+    release_slow.set()
+    pool.shutdown()
+
+
+# --- 3. Tracker and watermark namespaces ---
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    orig = (posted_tracker.TRACKER_FILE, posted_tracker.DB_FILE, watermark.WATERMARK_FILE)
+    posted_tracker.TRACKER_FILE = os.path.join(tmpdir, "posted_raindrops.json")
+    posted_tracker.DB_FILE = os.path.join(tmpdir, "posted_raindrops.db")
+    watermark.WATERMARK_FILE = os.path.join(tmpdir, "raindrop_watermark.json")
+    try:
+        posted_tracker.mark_as_posted(1, "at://a", namespace="alice")
+        posted_tracker.mark_as_posted(2, "at://default")
+        if posted_tracker.is_already_posted_many([1, 2], namespace="alice") != {1}:
+            fail("alice should only see her own posted IDs")
+        if posted_tracker.is_already_posted_many([1, 2], namespace="bob") or \
+                posted_tracker.is_already_posted_many([1, 2]) != {2}:
+            fail("namespaces must not share posted history")
+        if not os.path.exists(os.path.join(tmpdir, "tenants", "alice", "posted_raindrops.db")):
+            fail("tenant database should live under logs/tenants/<name>/")
+        posted_tracker.cleanup_old_entries(namespace="alice")
+
+        watermark.save_watermark("toskeet", 3, "2026-01-01", namespace="alice")
+        if watermark.load_watermark("toskeet", namespace="bob") or watermark.load_watermark("toskeet"):
+            fail("watermarks must be kept per tenant")
+        if not watermark.is_unchanged("toskeet", 3, "2026-01-01", 60, namespace="alice"):
+            fail("alice's watermark should match her probe")
+        print("[OK ] posted tracker and watermark namespaced per tenant")
+    finally:
+        posted_tracker.close()
+        posted_tracker.TRACKER_FILE, posted_tracker.DB_FILE, watermark.WATERMARK_FILE = orig
+
+
+# --- 4. main() with TENANTS_FILE serves every tenant ---
+
+class PostResult:
+    def __init__(self, uri):
+        self.uri = uri
+
+
+with tempfile.TemporaryDirectory() as tmpdir:
+    os.environ["TEST_TENANT_ALICE_PASSWORD"] = "pw-a"
+    events = []
+    lock = threading.Lock()
+
+    def record(*event):
+        with lock:
+            events.append(event)
+
+    def fake_pending(token, tag="toskeet", limit=1, namespace=None, **kwargs):
+        record("fetch", namespace, token, tag, limit)
+        return [{"_id": f"{namespace}-{i}", "title": f"{namespace}-{i}"} for i in range(limit)]
+
+    patches = {
+        "get_pending_raindrops": fake_pending,
+        "format_bluesky_post_from_raindrop": lambda raindrop: (raindrop["title"], [], None),
+        "post_content_to_bluesky": lambda ident, pw, text, facets, embed: record("post", ident, pw) or PostResult(text),
+        "mark_as_posted": lambda rid, uri=None, namespace=None: record("mark", namespace, rid),
+        "remove_tag_bulk": lambda token, raindrops, tag="toskeet": {r["_id"]: True for r in raindrops},
+        "cleanup_old_entries": lambda namespace=None: record("cleanup", namespace),
+        "send_error_alert": lambda msg: record("alert", msg),
+        "_stop_event": threading.Event(),
+    }
+    originals = {name: getattr(app, name) for name in patches}
+    try:
+        for name, value in patches.items():
+            setattr(app, name, value)
+        posted = app.main({**BASE_CONFIG, "POST_SPACING_SECONDS": 0,
+                           "TENANTS_FILE": write_tenants(tmpdir, TENANTS)})
+    finally:
+        for name, value in originals.items():
+            setattr(app, name, value)
+        os.environ.pop("TEST_TENANT_ALICE_PASSWORD", None)
+
+    fetches = sorted(e[1:] for e in events if e[0] == "fetch")
+    if fetches != [("alice", "tok-a", "toskeet", 5), ("bob", "tok-b", "share", 2)]:
+        fail(f"each tenant should fetch with its own token, tag and limit: {fetches}")
+    if sorted({e[1:] for e in events if e[0] == "post"}) != [("alice.test", "pw-a"), ("bob.test", "pw-b")]:
+        fail("each tenant should post with its own Bluesky credentials")
+    marks = [e for e in events if e[0] == "mark"]
+    if any(not rid.startswith(ns) for _, ns, rid in marks) or len(marks) != 7:
+        fail(f"posts should be marked in their tenant's namespace: {marks}")
+    if sorted(e[1] for e in events if e[0] == "cleanup") != ["alice", "bob"]:
+        fail("tracker cleanup should run per tenant namespace")
+    if posted != 7:
+        fail(f"main should return the posts across tenants, got {posted}")
+    print("[OK ] main() with TENANTS_FILE polls every tenant with its own credentials and namespace")
+
+
+# --- 5. A failure handled inside main() still counts against the tenant ---
+
+alerts = []
+
+
+def failing_pending(token, namespace=None, **kwargs):
+    if namespace == "broken":
+        raise RuntimeError("simulated Raindrop outage")
+    return []
+
+
+patches = {
+    "get_pending_raindrops": failing_pending,
+    "cleanup_old_entries": lambda namespace=None: None,
+    "send_error_alert": alerts.append,
+}
+originals = {name: getattr(app, name) for name in patches}
+pool = TenantPool([{**BASE_CONFIG, "TENANT": name, "RAINDROP_TOKEN": f"tok-{name}",
+                    "BLUESKY_IDENTIFIER": f"{name}.test"} for name in ("broken", "idle")],
+                  app.main, max_workers=2)
+try:
+    for name, value in patches.items():
+        setattr(app, name, value)
+    pool.run_round()
+    stats = pool.stats()
+finally:
+    pool.shutdown()
+    for name, value in originals.items():
+        setattr(app, name, value)
+if stats["broken"]["errors"] != 1 or stats["idle"]["errors"] != 0:
+    fail(f"a poll failing inside main() should count as the tenant's error: {stats}")
+if len(alerts) != 1 or "[broken]" not in alerts[0]:
+    fail(f"the failure should be alerted once, by main(): {alerts}")
+print("[OK ] a failure handled inside main() is counted as the tenant's error")
+
+
+# --- 6. A tenant busy in another process is skipped ---
+
+fetched = []
+patches = {
+    "get_pending_raindrops": lambda token, namespace=None, **kwargs: fetched.append(namespace) or [],
+    "cleanup_old_entries": lambda namespace=None: None,
+}
+originals = {name: getattr(app, name) for name in patches}
+busy = {**BASE_CONFIG, "TENANT": "busy", "RAINDROP_TOKEN": "tok-busy", "BLUESKY_IDENTIFIER": "busy.test"}
+busy_lock = file_lock.tenant_lock_file("busy")
+try:
+    for name, value in patches.items():
+        setattr(app, name, value)
+    # The parent process (alive) holds the tenant's lock, as an overrunning daemon poll would
+    os.makedirs(os.path.dirname(busy_lock), exist_ok=True)
+    with open(busy_lock, "w") as f:
+        f.write(f"{os.getppid()}:{time.time()}")
+    if app.main(busy) != 0 or fetched:
+        fail(f"a tenant polling in another process must be skipped, fetched {fetched}")
+    os.remove(busy_lock)
+    app.main(busy)
+    if fetched != ["busy"] or os.path.exists(busy_lock):
+        fail(f"a free tenant should be polled and its lock released, fetched {fetched}")
+finally:
+    for name, value in originals.items():
+        setattr(app, name, value)
+    lock_dir.cleanup()
+print("[OK ] a tenant still polling in another process is skipped")
+
+print("All tenant-pool checks passed.")
@@ -0,0 +1,131 @@
+"""Tests for the per-domain URL rule engine (src/utils/url_rules.py) — no network.
+
+Verifies that:
+1. The bundled rules strip Amazon ref=, YouTube si=, Substack referral
+   params and rewrite AMP URLs to their canonical pages, but keep params that
+   change what the page shows (Substack token=, Amazon search keywords=).
+2. A URL no rule changes comes back as the same string, and kept params are
+   never re-encoded.
+3. Domain rules apply to subdomains but not to look-alike hosts.
+4. URL_RULES_FILE replaces the bundled rules; a broken file falls back to them.
+5. Hundreds of rules compile into per-host tables; results are memoized.
+
+Run from the repo root:
+    .venv/bin/python scripts/test_url_rules.py
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.post_formatter import strip_tracking_params
+from src.utils import url_rules
+
+
+def fail(msg: str) -> None:
+    print(f"[FAIL] {msg}")
+    raise SystemExit(1)
+
+
+def expect(url: str, expected: str) -> None:
+    got = url_rules.normalize_url(url)
+    if got != expected:
+        fail(f"{url}\n  expected {expected}\n  got      {got}")
+
+
+try:
+    url_rules.load_rules(url_rules.DEFAULT_RULES_FILE)
+
+    # --- 1. Bundled per-domain rules ---
+    expect("https://www.amazon.com/Some-Book/dp/B0123/ref=sr_1_1?crid=X&keywords=foo&qid=1&sr=8-1&th=1",
+           "https://www.amazon.com/Some-Book/dp/B0123?keywords=foo&th=1")
+    expect("https://www.amazon.com/s?k=rust&keywords=rust+book&crid=X&sprefix=rus",
+           "https://www.amazon.com/s?k=rust&keywords=rust+book")
+    expect("https://www.amazon.co.uk/dp/B0123?pf_rd_p=abc&pd_rd_w=def&tag=aff-21",
+           "https://www.amazon.co.uk/dp/B0123")
+    expect("https://www.youtube.com/watch?v=abc&si=XYZ&feature=share", "https://www.youtube.com/watch?v=abc")
+    expect("https://youtu.be/abc?si=xyz&t=30", "https://youtu.be/abc?t=30")
+    expect("https://foo.substack.com/p/post?r=2ab&utm_campaign=post&triedRedirect=true",
+           "https://foo.substack.com/p/post")
+    expect("https://foo.substack.com/p/post?token=eyJ1c2VyX2lkIjo&r=2ab&utm_source=email",
+           "https://foo.substack.com/p/post?token=eyJ1c2VyX2lkIjo")
+    expect("https://foo.substack.com/p/post?open=false&s=r#comments", "https://foo.substack.com/p/post?open=false&s=r#comments")
+    expect("https://www.google.com/amp/s/www.bbc.co.uk/news/world-123.amp", "https://www.bbc.co.uk/news/world-123")
+    expect("https://www-bbc-co-uk.cdn.ampproject.org/c/s/www.bbc.co.uk/news/world-123.amp?amp=1",
+           "https://www.bbc.co.uk/news/world-123")
+    expect("https://amp.theguardian.com/world/2026/oct/01/story", "https://www.theguardian.com/world/2026/oct/01/story")
+    expect("https://amp.cnn.com/cnn/2026/10/01/politics/x/index.html",
+           "https://www.cnn.com/2026/10/01/politics/x/index.html")
+    print("[OK ] Amazon, YouTube, Substack and AMP rules")
+
+    # --- 2. Byte-identical when nothing matches; kept params not re-encoded ---
+    for url in [
+        "https://example.com/a?q=rust%20python&x=caf%C3%A9&&flag",
+        "https://example.com/p;params?a=1#frag",
+        "https://example.com/story/amp",  # AMP suffix rules are per-domain only
+        "https://www.youtube.com/watch?v=abc",
+        "not a url at all",
+    ]:
+        if url_rules.normalize_url(url) != url:
+            fail(f"unmatched URL changed: {url!r} -> {url_rules.normalize_url(url)!r}")
+    expect("https://example.com/a?q=rust+python&utm%5Fsource=x&b=%7E", "https://example.com/a?q=rust+python&b=%7E")
+    if strip_tracking_params("https://example.com/search?q=python&utm_source=newsletter") != \
+            "https://example.com/search?q=python":
+        fail("strip_tracking_params should delegate to the rule engine")
+    print("[OK ] unmatched URLs unchanged; kept params keep their encoding")
+
+    # --- 3. Subdomains inherit; look-alikes don't ---
+    expect("https://smile.amazon.com/dp/B0123?ref_=abc", "https://smile.amazon.com/dp/B0123")
+    expect("https://notamazon.com/dp/B0123?ref_=abc", "https://notamazon.com/dp/B0123?ref_=abc")
+    expect("https://WWW.YouTube.COM/watch?v=abc&si=1", "https://WWW.YouTube.COM/watch?v=abc")
+    print("[OK ] rules apply to subdomains, not look-alike hosts")
+
+    # --- 4. URL_RULES_FILE override and fallback ---
+    with tempfile.TemporaryDirectory() as tmp:
+        custom = Path(tmp) / "rules.json"
+        custom.write_text(json.dumps({
+            "global": {"strip": ["session"]},
+            "domains": [{"name": "news", "hosts": ["news.example"], "strip": ["from"]}],
+        }))
+        os.environ["URL_RULES_FILE"] = str(custom)
+        url_rules._engine = None
+        expect("https://news.example/a?from=rss&session=1&id=2", "https://news.example/a?id=2")
+        expect("https://example.com/a?utm_source=x", "https://example.com/a?utm_source=x")  # bundled rules replaced
+
+        custom.write_text('{"domains": [{"name": "broken", "hosts": ["x.example"], "strip_typo": ["a"]}]}')
+        url_rules._engine = None
+        expect("https://example.com/a?utm_source=x", "https://example.com/a")
+        if url_rules._current().source != url_rules.DEFAULT_RULES_FILE:
+            fail("a broken URL_RULES_FILE should fall back to the bundled rules")
+    print("[OK ] URL_RULES_FILE overrides the bundled rules; a broken file falls back")
+
+    # --- 5. Hundreds of rules, per-host tables, memoization ---
+    with tempfile.TemporaryDirectory() as tmp:
+        big = Path(tmp) / "big.json"
+        big.write_text(json.dumps({
+            "global": {"strip_prefixes": ["utm_", "mc_", "pk_"], "strip": [f"g{i}" for i in range(300)]},
+            "domains": [{"name": f"site{i}", "hosts": [f"site{i}.example"], "strip": [f"p{i}_{j}" for j in range(20)]}
+                        for i in range(500)],
+        }))
+        engine = url_rules.load_rules(str(big))
+        if len(engine.tables) != 500:
+            fail(f"expected 500 host tables, got {len(engine.tables)}")
+        table = engine.for_host("www.site42.example")
+        if not isinstance(table.strip, frozenset) or len(table.prefixes) > 3 or "p42_7" not in table.strip:
+            fail("per-host table should be a frozenset plus prefix groups by length")
+        if "p41_7" in table.strip:
+            fail("another domain's rules leaked into this host's table")
+        expect("https://www.site42.example/a?p42_7=1&g299=2&pk_x=3&keep=4", "https://www.site42.example/a?keep=4")
+        before = url_rules.stats()["cache_hits"]
+        url_rules.normalize_url("https://www.site42.example/a?p42_7=1&g299=2&pk_x=3&keep=4")
+        if url_rules.stats()["cache_hits"] != before + 1:
+            fail("repeated URL should be served from the LRU cache")
+    print("[OK ] 500 domain rules compile to per-host tables; repeats hit the cache")
+finally:
+    os.environ.pop("URL_RULES_FILE", None)
+    url_rules._engine = None
+
+print("All URL-rule checks passed.")
@@ -2,39 +2,193 @@
 """
 Handle posting content to Bluesky via the AT Protocol.
 
-Includes retry logic for transient failures and proper timeout handling.
+Transient failures are retried by the shared `retry` engine (jittered
+backoff, Retry-After, a time budget) and timeouts are handled explicitly.
+Sessions are persisted via `session_store` and clients are cached per
+identifier, so a post normally costs zero `createSession` calls. Every XRPC
+call is paced by `rate_limiter` per account and method, learning from
+Bluesky's RateLimit-* headers, and guarded by the "bluesky" circuit breaker.
 """
-import time
-from atproto import Client, models
-from atproto_client.exceptions import InvokeTimeoutError, RequestException
+# Suppress atproto's pydantic deprecation warnings before atproto loads
+from src.utils import warnings_setup  # noqa: F401
+from atproto import Client, SessionEvent, models
+from atproto_client.exceptions import (
+    BadRequestError,
+    InvokeTimeoutError,
+    LoginRequiredError,
+    NetworkError,
+    RequestErrorBase,
+    RequestException,
+    UnauthorizedError,
+)
+from atproto_client.request import Request
+from src.utils import circuit_breaker, metrics, rate_limiter, retry
 from src.utils.logging_config import get_logger
+from src.utils.session_store import load_session, save_session, clear_session
 
 logger = get_logger(__name__)
 
 # Retry configuration
 MAX_RETRIES = 3
-RETRY_DELAY_SECONDS = 2  # Base delay, will use exponential backoff
+RETRY_DELAY_SECONDS = 2  # Base delay for jittered exponential backoff
+RETRY_BUDGET_SECONDS = 120
 
-# HTTP status codes worth retrying
-TRANSIENT_STATUS_CODES = (429, 502, 503, 504)
+# XRPC error names meaning the session itself is dead (expired/revoked refresh
+# token) — the only case where we fall back to a password login.
+SESSION_ERROR_NAMES = ('ExpiredToken', 'InvalidToken', 'AuthenticationRequired', 'AuthMissing')
 
+# Logged-in clients by identifier. Kept for the life of the process so
+# --daemon mode and batch posting reuse one session across posts.
+_clients: dict = {}
 
-def _is_transient_request_error(e) -> bool:
-    """Decide retryability from the response status code, not str(e) —
-    substring matching false-positives on codes appearing in error bodies."""
-    response = getattr(e, 'response', None)
-    status_code = getattr(response, 'status_code', None)
-    if status_code is not None:
-        return status_code in TRANSIENT_STATUS_CODES
-    # No response attached (network-level failure) — fall back to text match
-    return any(code in str(e) for code in ('502', '503', '504', '429', 'timeout'))
+
+class _SessionRejected(Exception):
+    """The logged-in session was refused mid-post; wraps the original error."""
+
+    def __init__(self, error):
+        super().__init__(repr(error))
+        self.error = error
+
+
+def _classify_error(e) -> str:
+    """Error class for RETRY_POLICY. Retryability comes from the response
+    status code, not str(e) — substring matching false-positives on codes
+    appearing in error bodies."""
+    if isinstance(e, _SessionRejected):
+        return 'session'
+    if isinstance(e, InvokeTimeoutError):
+        return 'timeout'
+    # atproto raises NetworkError for real 409/413/502 responses too, so the
+    # status code decides first; only a NetworkError without one is 'network'
+    error_class = retry.classify_error(e)
+    if error_class != 'other':
+        return error_class
+    if isinstance(e, NetworkError) and getattr(e, 'response', None) is None:
+        return 'network'
+    if isinstance(e, RequestException) and getattr(e, 'response', None) is None:
+        # No response attached (network-level failure) — fall back to text match
+        if any(code in str(e) for code in ('502', '503', '504', '429', 'timeout')):
+            return 'network'
+    return error_class
+
+
+RETRY_POLICY = retry.RetryPolicy(
+    'bluesky',
+    {'timeout': MAX_RETRIES, 'network': MAX_RETRIES, 'rate_limited': MAX_RETRIES,
+     'server': MAX_RETRIES, 'session': 2},
+    base_delay=RETRY_DELAY_SECONDS,
+    budget_seconds=RETRY_BUDGET_SECONDS,
+    classify=_classify_error,
+)
+
+
+def _is_session_error(e) -> bool:
+    """True if `e` means the stored session is unusable and a fresh login is needed."""
+    if isinstance(e, (UnauthorizedError, LoginRequiredError)):
+        return True
+    if isinstance(e, BadRequestError):
+        content = getattr(getattr(e, 'response', None), 'content', None)
+        return getattr(content, 'error', None) in SESSION_ERROR_NAMES
+    return False
+
+
+class _RateLimitedRequest(Request):
+    """atproto transport that paces each XRPC method per account and learns
+    the budget from response headers (including those of error responses).
+    Every call's outcome feeds the account's "bluesky" circuit breaker, and
+    an open circuit refuses calls (login included) with CircuitOpenError."""
+
+    def __init__(self, identifier, **kwargs):
+        super().__init__(**kwargs)
+        self._identifier = identifier
+        self._endpoint = circuit_breaker.endpoint_for("bluesky", identifier)
+
+    def _new_instance(self):
+        return type(self)(self._identifier, **self._client_kwargs)
+
+    def _send_request(self, method, url, **kwargs):
+        # Bluesky limits per method (createSession and writes are far tighter
+        # than reads), so each XRPC method gets its own bucket
+        circuit_breaker.check(self._endpoint)
+        key = rate_limiter.key_for("bluesky", self._identifier, url.rsplit('/', 1)[-1])
+        rate_limiter.acquire(key)
+        try:
+            response = super()._send_request(method, url, **kwargs)
+        except RequestErrorBase as e:
+            if e.response is not None:
+                rate_limiter.observe(key, e.response.status_code, e.response.headers)
+            circuit_breaker.record(self._endpoint, _classify_error(e), e)
+            raise
+        rate_limiter.observe(key, response.status_code, response.headers)
+        circuit_breaker.record(self._endpoint)
+        return response
+
+
+def _new_client(identifier):
+    """Create a Client that persists its session whenever it is created or refreshed."""
+    client = Client(request=_RateLimitedRequest(identifier))
+
+    def on_session_change(event, session):
+        # IMPORT is us loading the stored string — nothing new to save
+        if event in (SessionEvent.CREATE, SessionEvent.REFRESH):
+            save_session(identifier, session.encode())
+
+    client.on_session_change(on_session_change)
+    return client
+
+
+def get_client(identifier, password):
+    """
+    Return a logged-in Client for `identifier`, logging in only when necessary.
+
+    Order of preference: the client cached in this process, then the session
+    stored by a previous run (atproto refreshes it if the access token has
+    expired), then a password login.
+
+    Raises:
+        atproto exceptions from the password login; callers decide on retries.
+    """
+    client = _clients.get(identifier)
+    if client is not None:
+        return client
+
+    session_string = load_session(identifier)
+    if session_string:
+        client = _new_client(identifier)
+        try:
+            with metrics.timed('bluesky_login') as timer:
+                timer.outcome = 'resumed'
+                client.login(session_string=session_string)
+            logger.info(f"Resumed saved Bluesky session for identifier: {identifier}")
+            _clients[identifier] = client
+            return client
+        except Exception as e:
+            if not _is_session_error(e):
+                raise
+            logger.warning(f"Saved Bluesky session could not be refreshed ({e!r}); logging in with password")
+            clear_session(identifier)
+
+    client = _new_client(identifier)
+    with metrics.timed('bluesky_login') as timer:
+        timer.outcome = 'password'
+        client.login(identifier, password)
+    logger.info(f"Logged into Bluesky successfully with identifier: {identifier}")
+    _clients[identifier] = client
+    return client
+
+
+def invalidate_client(identifier):
+    """Drop the cached client and stored session so the next call logs in afresh."""
+    _clients.pop(identifier, None)
+    clear_session(identifier)
 
 
 def post_content_to_bluesky(identifier, password, content, facets, embed):
     """
     Post content to Bluesky with optional media embedding and hyperlink facets.
     
-    Includes retry logic with exponential backoff for transient failures.
+    Transient failures are retried under RETRY_POLICY; a session rejected
+    after login is dropped and the post retried after a fresh login.
     
     Args:
         identifier: Bluesky handle or DID.
@@ -46,87 +200,80 @@ def post_content_to_bluesky(identifier, password, content, facets, embed):
     Returns:
         Post response object on success, None on failure.
     """
-    
-    for attempt in range(MAX_RETRIES):
+
+    def attempt():
+        # Reuses the cached/stored session; logs in only if there is none.
+        # A failed login propagates as-is: a bad password must not be
+        # retried against createSession.
+        client = get_client(identifier, password)
         try:
-            # Create fresh client for each attempt (session may be stale after timeout)
-            client = Client()
-            
-            # Log in to the Bluesky client
-            client.login(identifier, password)
-            logger.info(f"Logged into Bluesky successfully with identifier: {identifier}")
-
-            # Upload the image blob if an embed is provided
-            thumb_blob = None
-            if embed:
-                logger.debug(f"Embed object before upload_blob: {embed}")
-                # Ensure image_file is readable and reset pointer (important for retries)
-                if hasattr(embed.get("image_file"), 'seek'):
-                    embed["image_file"].seek(0)
-                binary_data = embed["image_file"].read()
-                logger.debug(f"Binary data size: {len(binary_data)} bytes")
-                thumb_blob = client.upload_blob(binary_data)
-                logger.info(f"Image uploaded successfully: {thumb_blob}")
-
-            # Prepare the post embed structure if a blob was uploaded
-            embed_structure = None
-            if embed and thumb_blob:
-                try:
-                    embed_structure = models.AppBskyEmbedExternal.Main(
-                        external=models.AppBskyEmbedExternal.External(
-                            uri=embed["article_url"],
-                            title=embed["title"],
-                            description=embed["description"],
-                            thumb=thumb_blob.blob
-                        )
-                    )
-                    logger.debug(f"Post embed structure created: {embed_structure}")
-                except AttributeError as e:
-                    logger.error(f"Error creating embed structure: {e}")
-                    # Continue without embed rather than failing completely
-                    embed_structure = None
-
-            # Publish the post with facets (for the clickable hyperlink)
-            logger.info(f"Posting content to Bluesky: {content[:100]}...")
-            response = client.send_post(
-                text=content,
-                facets=facets,
-                embed=embed_structure
-            )
-            logger.info(f"Successfully posted to Bluesky: {response}")
-            return response  # Return the response object (contains URI, CID)
-
-        except InvokeTimeoutError as e:
-            delay = RETRY_DELAY_SECONDS * (2 ** attempt)
-            if attempt < MAX_RETRIES - 1:
-                logger.warning(
-                    f"Timeout posting to Bluesky (attempt {attempt + 1}/{MAX_RETRIES}): {e}. "
-                    f"Retrying in {delay}s..."
-                )
-                time.sleep(delay)
-                continue
-            else:
-                logger.exception(f"Timeout posting to Bluesky after {MAX_RETRIES} attempts: {str(e)}")
-                return None
-                
-        except RequestException as e:
-            # Check if this is a transient error worth retrying
-            delay = RETRY_DELAY_SECONDS * (2 ** attempt)
-            is_transient = _is_transient_request_error(e)
-            
-            if is_transient and attempt < MAX_RETRIES - 1:
-                logger.warning(
-                    f"Transient error posting to Bluesky (attempt {attempt + 1}/{MAX_RETRIES}): {e}. "
-                    f"Retrying in {delay}s..."
-                )
-                time.sleep(delay)
-                continue
-            else:
-                logger.exception(f"Error posting to Bluesky: {str(e)}")
-                return None
-                
+            return _send(client, content, facets, embed)
         except Exception as e:
-            logger.exception(f"Unexpected error posting to Bluesky: {str(e)}")
-            return None
+            # Session revoked or refresh token expired mid-run: nothing was
+            # posted, so the post can be retried after a password login
+            if _is_session_error(e):
+                raise _SessionRejected(e) from e
+            raise
+
+    def on_retry(error, error_class, attempt_number):
+        if error_class == 'session':
+            invalidate_client(identifier)
+
+    try:
+        return retry.call(attempt, RETRY_POLICY, on_retry=on_retry, describe="Posting to Bluesky")
+    except circuit_breaker.CircuitOpenError as e:
+        logger.warning(f"Not posting to Bluesky: {e}")
+    except InvokeTimeoutError as e:
+        logger.exception(f"Timeout posting to Bluesky: {str(e)}")
+    except RequestException as e:
+        logger.exception(f"Error posting to Bluesky: {str(e)}")
+    except _SessionRejected as e:
+        logger.exception(f"Unexpected error posting to Bluesky: {e.error!r}")
+    except Exception as e:
+        logger.exception(f"Unexpected error posting to Bluesky: {str(e)}")
+    return None
+
+
+def _send(client, content, facets, embed):
+    """Upload the embed image (if any) and publish the post; one attempt."""
+    # Upload the image blob if an embed is provided
+    thumb_blob = None
+    if embed:
+        logger.debug("Embed object before upload_blob: %s", embed)
+        # Ensure image_file is readable and reset pointer (important for retries)
+        if hasattr(embed.get("image_file"), 'seek'):
+            embed["image_file"].seek(0)
+        binary_data = embed["image_file"].read()
+        logger.debug(f"Binary data size: {len(binary_data)} bytes")
+        with metrics.timed('upload_blob'):
+            thumb_blob = client.upload_blob(binary_data)
+        logger.info(f"Image uploaded successfully: {thumb_blob}")
+
+    # Prepare the post embed structure if a blob was uploaded
+    embed_structure = None
+    if embed and thumb_blob:
+        try:
+            embed_structure = models.AppBskyEmbedExternal.Main(
+                external=models.AppBskyEmbedExternal.External(
+                    uri=embed["article_url"],
+                    title=embed["title"],
+                    description=embed["description"],
+                    thumb=thumb_blob.blob
+                )
+            )
+            logger.debug("Post embed structure created: %s", embed_structure)
+        except AttributeError as e:
+            logger.error(f"Error creating embed structure: {e}")
+            # Continue without embed rather than failing completely
+            embed_structure = None
 
-    return None
\ No newline at end of file
+    # Publish the post with facets (for the clickable hyperlink)
+    logger.info(f"Posting content to Bluesky: {content[:100]}...")
+    with metrics.timed('send_post'):
+        response = client.send_post(
+            text=content,
+            facets=facets,
+            embed=embed_structure
+        )
+    logger.info(f"Successfully posted to Bluesky: {response}")
+    return response  # Return the response object (contains URI, CID)
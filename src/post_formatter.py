@@ -3,17 +3,20 @@
 Format Raindrop bookmarks for posting to Bluesky.
 
 Uses Bluesky's official 300 grapheme character limit.
-Uses atproto's TextBuilder for proper facet (rich text) handling.
+Builds the post text and its link facet (UTF-8 byte ranges) directly, in one pass.
 """
+import logging
+import os
+import queue
 import re
-import requests
-import unicodedata
-import random
+import threading
 import io
-from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+from urllib.parse import urlparse
+import requests
 from PIL import Image
-from atproto import client_utils
 from typing import Dict, Optional, Tuple, Any
+from src.utils import graphemes, image_cache, jpeg_encoder, metrics, post_layout, retry, url_rules
+from src.utils.http_client import browser_headers, get_session
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -22,41 +25,48 @@ logger = get_logger(__name__)
 # See: https://docs.bsky.app/docs/advanced-guides/intent-links
 BLUESKY_CHAR_LIMIT = 300
 
-# Headroom rebuilds tolerate URL expansion that atproto's TextBuilder applies
-# during build_text() (e.g. percent-encoding `&` -> `%26` in display text).
-MAX_TRUNCATION_RETRIES = 3
+# Raindrop's (undocumented) rendered-preview service, used when the cover fails
+RDL_RENDER_BASE = "https://rdl.ink/render/"
+
+# Embed images are thumbnailed to fit this box
+MAX_IMAGE_SIZE = (1000, 1000)
+
+# Download/decode limits (IMAGE_MAX_BYTES / IMAGE_MAX_PIXELS override them).
+# A cover is streamed with a hard byte cap, JPEGs decode at reduced scale, and
+# anything still above the pixel budget is rejected before it is decoded —
+# a full-size decode of a huge PNG would otherwise blow the container's memory.
+DEFAULT_MAX_IMAGE_BYTES = 20 * 1024 * 1024
+DEFAULT_MAX_IMAGE_PIXELS = 24_000_000
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
 
-USER_AGENTS = [
-    'Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1'
-]
+# If the cover hasn't arrived after this long, request the rdl.ink render in
+# parallel instead of waiting out the full timeout first (IMAGE_HEDGE_DELAY_SECONDS).
+DEFAULT_HEDGE_DELAY_SECONDS = 2.0
 
-# Query parameters stripped from posted URLs — tracking only, never load-bearing.
-# `utm_*` is matched by prefix; everything else is exact-match.
-TRACKING_PARAM_PREFIXES = ('utm_',)
-TRACKING_PARAM_NAMES = frozenset({
-    'cmpid', 'gclid', 'fbclid', 'msclkid', 'dclid', 'yclid',
-    'igshid', 'igsh', 'mc_cid', 'mc_eid',
-    '_hsenc', '_hsmi', '_hsfp',
-    'ocid', 'ncid', 'icid', 'iclid',
-    'vero_conv', 'vero_id',
-})
+# One quick retry for a dropped connection, timeout or 429/5xx; the hedged
+# fallback is already running by then, so a longer wait would buy nothing
+IMAGE_RETRY_POLICY = retry.RetryPolicy(
+    'image',
+    {'timeout': 2, 'network': 2, 'rate_limited': 2, 'server': 2},
+    base_delay=0.5,
+    max_delay=2.0,
+    budget_seconds=5.0,
+)
+
+
+class ImageFetchCancelled(Exception):
+    """The other side of a hedged image fetch already won."""
 
 
 def strip_tracking_params(url: str) -> str:
-    """Remove common tracking query parameters from a URL.
+    """Remove tracking query parameters and apply per-domain URL rules.
 
-    Returns the original URL unchanged if parsing fails or there is no query string.
+    Rules (utm_*, Amazon ref=, YouTube si=, AMP-to-canonical, ...) come from
+    src/utils/url_rules.json or URL_RULES_FILE; see src/utils/url_rules.py.
+    Returns the original URL unchanged if parsing fails or no rule matches.
     """
     try:
-        parts = urlparse(url)
-        if not parts.query:
-            return url
-        kept = [
-            (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
-            if not (k.startswith(TRACKING_PARAM_PREFIXES) or k in TRACKING_PARAM_NAMES)
-        ]
-        new_query = urlencode(kept) if kept else ''
-        return urlunparse(parts._replace(query=new_query))
+        return url_rules.normalize_url(url)
     except Exception as e:
         logger.warning(f"Failed to strip tracking params from {url!r}: {e}")
         return url
@@ -67,18 +77,10 @@ def count_graphemes(text: str) -> int:
     Count the number of grapheme clusters in a string.
     
     This is the correct way to count characters for Bluesky's limit,
-    as it properly handles emoji and combined characters.
+    as it properly handles emoji and combined characters (UAX #29, see
+    src/utils/graphemes.py).
     """
-    # Normalize and count grapheme clusters
-    count = 0
-    i = 0
-    while i < len(text):
-        # Skip over combining characters
-        count += 1
-        i += 1
-        while i < len(text) and unicodedata.category(text[i]) in ('Mn', 'Mc', 'Me'):
-            i += 1
-    return count
+    return graphemes.count_graphemes(text)
 
 
 def truncate_to_grapheme_limit(text: str, limit: int, suffix: str = "…") -> str:
@@ -91,38 +93,18 @@ def truncate_to_grapheme_limit(text: str, limit: int, suffix: str = "…") -> st
         suffix: String to append when truncating (default: ellipsis).
         
     Returns:
-        Truncated text within the grapheme limit.
+        Truncated text within the grapheme limit. Grapheme clusters (flags,
+        ZWJ emoji, conjuncts) are never split.
     """
-    if count_graphemes(text) <= limit:
-        return text
-    
-    # Reserve space for the suffix
-    effective_limit = limit - count_graphemes(suffix)
-    
-    # Build string up to limit
-    result = []
-    grapheme_count = 0
-    i = 0
-    
-    while i < len(text) and grapheme_count < effective_limit:
-        char = text[i]
-        result.append(char)
-        i += 1
-        # Skip combining characters (they're part of the same grapheme)
-        while i < len(text) and unicodedata.category(text[i]) in ('Mn', 'Mc', 'Me'):
-            result.append(text[i])
-            i += 1
-        grapheme_count += 1
-    
-    return ''.join(result) + suffix
+    return graphemes.truncate_graphemes(text, limit, suffix)
 
 
 def format_bluesky_post_from_raindrop(raindrop: dict) -> Tuple[str, list, Optional[dict]]:
     """
     Format a Raindrop bookmark for posting to Bluesky.
     
-    Uses atproto's TextBuilder for proper facet handling.
-    Respects Bluesky's 300 grapheme character limit.
+    Lays out `body\nlink` in one pass (src/utils/post_layout.py) with a
+    link facet, within Bluesky's 300 grapheme character limit.
     
     Args:
         raindrop: The Raindrop bookmark data.
@@ -150,24 +132,19 @@ def format_bluesky_post_from_raindrop(raindrop: dict) -> Tuple[str, list, Option
     # Build the text portion (title + optional skeet_content)
     full_text = f"{title}\n{skeet_content}" if skeet_content else title
 
-    # Edge case: if the link alone exceeds the limit, just post the link.
-    link_display_length = count_graphemes(link)
-    if BLUESKY_CHAR_LIMIT - link_display_length - 2 <= 0:
-        logger.warning(f"Link is very long ({link_display_length} graphemes), posting link only")
-        text_builder = client_utils.TextBuilder()
-        text_builder.link(link, link)
-        formatted_text = text_builder.build_text()
-        facets = text_builder.build_facets()
-    else:
-        formatted_text, facets = _build_post_with_retries(full_text, link)
+    # Body is cut (word boundary preferred) so body + "\n" + link fits in one build;
+    # a link too long to leave room for any body is posted alone.
+    with metrics.timed('format'):
+        formatted_text, facets = post_layout.layout_post(full_text, link, BLUESKY_CHAR_LIMIT)
 
-    logger.debug(f"Formatted text ({count_graphemes(formatted_text)} graphemes): {formatted_text[:100]}...")
-    logger.debug(f"Created facets: {facets}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Formatted text (%s graphemes): %s...", count_graphemes(formatted_text), formatted_text[:100])
+    logger.debug("Created facets: %s", facets)
 
     # Prepare embed for the image/link card
     embed = None
     if cover:
-        embed = create_image_embed(cover, raindrop, timeout=15)
+        embed = create_image_embed(cover, raindrop)
         if embed:
             embed['article_url'] = link
             embed['title'] = title
@@ -177,111 +154,258 @@ def format_bluesky_post_from_raindrop(raindrop: dict) -> Tuple[str, list, Option
     return formatted_text, facets, embed
 
 
-def _build_post_with_retries(full_text: str, link: str) -> Tuple[str, list]:
-    """Build a `body\\nlink` post, re-truncating if the rendered text exceeds the limit.
-
-    `client_utils.TextBuilder` may percent-encode the displayed URL on `build_text()`,
-    so the rendered length can exceed our pre-build estimate. After each build we
-    measure the actual grapheme count and shrink the body if needed.
-    """
-    available_for_text = BLUESKY_CHAR_LIMIT - count_graphemes(link) - 2  # -2 for "\n" and ellipsis room
-    if count_graphemes(full_text) > available_for_text:
-        body_text = truncate_to_grapheme_limit(full_text, available_for_text - 1)
-    else:
-        body_text = full_text
-
-    formatted_text = ""
-    facets: list = []
-    for attempt in range(MAX_TRUNCATION_RETRIES):
-        tb = client_utils.TextBuilder()
-        tb.text(body_text)
-        tb.text("\n")
-        tb.link(link, link)
-        formatted_text = tb.build_text()
-        facets = tb.build_facets()
-
-        overage = count_graphemes(formatted_text) - BLUESKY_CHAR_LIMIT
-        if overage <= 0:
-            return formatted_text, facets
-
-        new_limit = max(count_graphemes(body_text) - overage - 1, 1)
-        logger.warning(
-            f"Post exceeded limit by {overage} graphemes on attempt {attempt + 1}; "
-            f"shrinking body to {new_limit} graphemes and rebuilding"
-        )
-        body_text = truncate_to_grapheme_limit(body_text, new_limit)
-
-    logger.error(
-        f"Post still exceeds limit after {MAX_TRUNCATION_RETRIES} retries; falling back to link-only"
-    )
-    tb = client_utils.TextBuilder()
-    tb.link(link, link)
-    return tb.build_text(), tb.build_facets()
-
-
 def extract_skeet_content(note: str) -> str:
     """Extract custom content from the [skeet_content:...] tag in notes."""
     match = re.search(r'\[skeet_content:(.*?)\]', note, re.DOTALL)
     return match.group(1).strip() if match else ''
 
 
-def create_image_embed(image_url: str, raindrop: dict, timeout: int = 10) -> Optional[dict]:
+def create_image_embed(image_url: str, raindrop: dict, timeout: Optional[float] = None, session=None) -> Optional[dict]:
     """
     Download and process an image for embedding in a Bluesky post.
     
     Falls back to Raindrop's cached screenshot if the original fails.
+    Processed images are served from the on-disk image cache when possible.
     
     Args:
         image_url: URL of the cover image.
         raindrop: The Raindrop data (for fallback URL).
-        timeout: Request timeout in seconds.
+        timeout: Request timeout in seconds (default: the session's HTTP_TIMEOUT_SECONDS).
+        session: HTTP session to use (default: the shared pooled session).
         
     Returns:
         Dict with image data or None if image processing fails.
     """
     logger.debug(f"Starting image embedding process for URL: {image_url}")
-    headers = {'User-Agent': random.choice(USER_AGENTS)}
-    
-    try:
-        # First, try to download the image from the original URL
-        response = requests.get(image_url, timeout=timeout, headers=headers)
-        response.raise_for_status()
-
-        image = Image.open(io.BytesIO(response.content))
-        logger.debug(f"Original image opened. Dimensions: {image.width}x{image.height}")
+    session = session or get_session()
+    request_kwargs = {'timeout': timeout} if timeout is not None else {}
 
-    except Exception as e:
-        logger.warning(f"Failed to download or process image from URL: {str(e)}")
-        
-        # Fallback to the Raindrop cached image (note: rdl.ink is undocumented)
-        cache_url = f"https://rdl.ink/render/{urlparse(raindrop['link']).geturl()}"
-        logger.info(f"Falling back to Raindrop cached image: {cache_url}")
-        try:
-            response = requests.get(cache_url, timeout=timeout, headers=headers)
-            response.raise_for_status()
-            image = Image.open(io.BytesIO(response.content))
-            logger.debug(f"Cached image opened. Dimensions: {image.width}x{image.height}")
-        except Exception as cache_error:
-            logger.error(f"Failed to retrieve cached image: {str(cache_error)}")
-            return None
+    # Fallback to the Raindrop cached image (note: rdl.ink is undocumented)
+    cache_url = f"{RDL_RENDER_BASE}{urlparse(raindrop['link']).geturl()}"
+    with metrics.timed('image_embed') as timer:
+        img_bytes = _hedged_fetch(image_url, cache_url, session, request_kwargs, _hedge_delay())
+        if img_bytes is None:
+            timer.outcome = 'failed'
+    if img_bytes is None:
+        return None
 
-    # Process the image (resize if necessary)
-    max_size = (1000, 1000)
-    image.thumbnail(max_size)
-    logger.debug(f"Image processed. New dimensions: {image.width}x{image.height}")
-
-    # Convert image to RGB (required for JPEG)
-    if image.mode in ('RGBA', 'P'):
-        image = image.convert('RGB')
-
-    # Convert image to bytes
-    img_byte_arr = io.BytesIO()
-    image.save(img_byte_arr, format='JPEG', quality=85)
-    img_bytes = img_byte_arr.getvalue()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Image cache stats: %s", image_cache.stats())
 
     return {
         'image_file': io.BytesIO(img_bytes),
         'alt_text': 'Image from article',
         'mime_type': 'image/jpeg',
         'size': len(img_bytes)
-    }
\ No newline at end of file
+    }
+
+
+def _hedge_delay() -> float:
+    return float(os.getenv('IMAGE_HEDGE_DELAY_SECONDS', str(DEFAULT_HEDGE_DELAY_SECONDS)))
+
+
+def _hedged_fetch(image_url: str, cache_url: str, session, request_kwargs: dict,
+                  hedge_delay: float) -> Optional[bytes]:
+    """Fetch the cover, hedging with the rdl.ink render if it is slow.
+
+    The cover request starts first. If it hasn't produced an image within
+    `hedge_delay` seconds, the fallback starts alongside it and whichever
+    valid image arrives first wins; the other is told to stop at its next
+    chunk. A cover that fails outright starts the fallback immediately, as
+    before. A negative delay disables hedging (fallback only after failure).
+
+    Attempts run on daemon threads so a loser stuck in a connect can't hold
+    up process exit; it ends at its own request timeout.
+
+    Returns:
+        JPEG bytes, or None if both sources failed.
+    """
+    results = queue.Queue()
+    cancel = threading.Event()
+
+    def attempt(source, url):
+        try:
+            results.put((source, _fetch_processed_image(url, session, request_kwargs, cancel), None))
+        except Exception as e:
+            results.put((source, None, e))
+
+    def start(source, url):
+        threading.Thread(target=attempt, args=(source, url), daemon=True,
+                         name=f"image-fetch-{source}").start()
+
+    start('cover', image_url)
+    pending = 1
+    fallback_started = False
+    while pending:
+        wait = hedge_delay if not fallback_started and hedge_delay >= 0 else None
+        try:
+            source, img_bytes, error = results.get(timeout=wait)
+        except queue.Empty:
+            logger.info(f"No cover image after {hedge_delay}s; starting Raindrop cached image in parallel: {cache_url}")
+            start('fallback', cache_url)
+            fallback_started = True
+            pending += 1
+            continue
+        pending -= 1
+
+        if error is None:
+            cancel.set()
+            if fallback_started and pending:
+                logger.info(f"Hedged image fetch won by the {source} image")
+            return img_bytes
+
+        if source == 'cover':
+            logger.warning(f"Failed to download or process image from URL: {str(error)}")
+            if not fallback_started:
+                logger.info(f"Falling back to Raindrop cached image: {cache_url}")
+                start('fallback', cache_url)
+                fallback_started = True
+                pending += 1
+        else:
+            logger.error(f"Failed to retrieve cached image: {str(error)}")
+    return None
+
+
+def _fetch_processed_image(url: str, session, request_kwargs: dict, cancel=None) -> bytes:
+    """Return embed-ready JPEG bytes for `url`, using the image cache.
+
+    A fresh cache entry is returned without a request; a stale one is
+    revalidated with a conditional GET. The request is retried briefly under
+    IMAGE_RETRY_POLICY; if it still fails, stale bytes are still better than
+    a fallback image.
+
+    `cancel` (a threading.Event) stops a download between chunks or a retry
+    wait, for the losing side of a hedged fetch.
+
+    Raises:
+        Exception if the image can't be downloaded or decoded, or was cancelled.
+    """
+    entry = image_cache.get(url)
+    if entry and entry.get('size', 0) > jpeg_encoder.target_bytes():
+        # Encoded under an older, larger target; re-encode
+        entry = None
+    if entry and entry['fresh']:
+        image_cache.record_hit()
+        logger.debug(f"Image cache hit for {url} ({entry['width']}x{entry['height']})")
+        return entry['data']
+
+    headers = {**browser_headers(), **image_cache.conditional_headers(entry)}
+
+    def request():
+        response = session.get(url, headers=headers, stream=True, **request_kwargs)
+        if response.status_code in retry.SERVER_STATUS_CODES + (retry.RATE_LIMITED_STATUS,):
+            _drain_small_body(response)
+            response.close()
+            response.raise_for_status()
+        return response
+
+    with metrics.timed('image_download') as timer:
+        try:
+            response = retry.call(request, IMAGE_RETRY_POLICY, cancel=cancel, describe=f"Fetching image {url}")
+        except requests.exceptions.RequestException as e:
+            if entry:
+                timer.outcome = 'stale'
+                image_cache.record_hit(revalidated=True)
+                logger.warning(f"Revalidating cached image failed ({e}); using stale copy for {url}")
+                return entry['data']
+            raise
+
+        try:
+            if response.status_code == 304 and entry:
+                timer.outcome = 'not_modified'
+                response.content  # empty; lets the connection return to the pool
+                image_cache.touch(url)
+                image_cache.record_hit(revalidated=True)
+                logger.debug(f"Image cache revalidated for {url}")
+                return entry['data']
+
+            if response.status_code >= 400:
+                _drain_small_body(response)
+            response.raise_for_status()
+            image_cache.record_miss()
+            body = _read_capped(response, _max_image_bytes(), cancel)
+        finally:
+            response.close()
+
+    if cancel is not None and cancel.is_set():
+        raise ImageFetchCancelled(url)
+    with metrics.timed('image_encode'):
+        img_bytes, width, height = _process_image(body)
+    image_cache.put(
+        url, img_bytes, width, height,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified')
+    )
+    return img_bytes
+
+
+def _max_image_bytes() -> int:
+    return int(os.getenv('IMAGE_MAX_BYTES', str(DEFAULT_MAX_IMAGE_BYTES)))
+
+
+def _max_image_pixels() -> int:
+    return int(os.getenv('IMAGE_MAX_PIXELS', str(DEFAULT_MAX_IMAGE_PIXELS)))
+
+
+def _read_capped(response, max_bytes: int, cancel=None) -> io.BytesIO:
+    """Stream a response body into memory, refusing anything over `max_bytes`.
+
+    A declared Content-Length over the cap is rejected before any body is read;
+    otherwise the cap is enforced while streaming (the header may be absent or wrong).
+
+    Raises:
+        ValueError if the body exceeds `max_bytes`.
+        ImageFetchCancelled if `cancel` is set while streaming.
+    """
+    declared = response.headers.get('Content-Length')
+    if declared and declared.isdigit() and int(declared) > max_bytes:
+        raise ValueError(f"Image is {declared} bytes, over the {max_bytes}-byte limit")
+
+    body = io.BytesIO()
+    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+        if cancel is not None and cancel.is_set():
+            raise ImageFetchCancelled("download cancelled")
+        body.write(chunk)
+        if body.tell() > max_bytes:
+            raise ValueError(f"Image exceeded the {max_bytes}-byte limit while downloading")
+    body.seek(0)
+    return body
+
+
+def _drain_small_body(response) -> None:
+    """Read a small error body so the keep-alive connection can be reused;
+    a large or unsized one is left for close() to drop with its connection."""
+    declared = response.headers.get('Content-Length')
+    if declared and declared.isdigit() and int(declared) <= DOWNLOAD_CHUNK_BYTES:
+        response.content
+
+
+def _process_image(fp) -> Tuple[bytes, int, int]:
+    """Decode, thumbnail and re-encode an image as JPEG; returns (bytes, width, height).
+
+    Raises:
+        ValueError if the image is over the pixel budget even at reduced scale,
+        or can't be encoded under the blob size target.
+    """
+    image = Image.open(fp)
+    logger.debug(f"Original image opened. Dimensions: {image.width}x{image.height}")
+
+    # JPEG can decode at 1/2, 1/4 or 1/8 scale; ask for no less than twice the
+    # thumbnail size (thumbnail()'s own reducing gap) so quality is unchanged.
+    # This only reconfigures the decoder — nothing has been decoded yet.
+    if image.format == 'JPEG':
+        scale = min(1.0, MAX_IMAGE_SIZE[0] / image.width, MAX_IMAGE_SIZE[1] / image.height)
+        image.draft('RGB', (int(image.width * scale * 2), int(image.height * scale * 2)))
+        logger.debug(f"JPEG draft decode size: {image.width}x{image.height}")
+
+    pixels = image.width * image.height
+    if pixels > _max_image_pixels():
+        raise ValueError(f"Image is {image.width}x{image.height} ({pixels} px), over the {_max_image_pixels()} px budget")
+
+    # Process the image (resize if necessary)
+    image.thumbnail(MAX_IMAGE_SIZE)
+    logger.debug(f"Image processed. New dimensions: {image.width}x{image.height}")
+
+    # Encode under Bluesky's blob limit (may step quality and size down)
+    img_bytes, params = jpeg_encoder.encode_jpeg(image)
+    return img_bytes, params['width'], params['height']
@@ -1,97 +1,320 @@
 # src/raindrop_handler.py
 
-import requests
+import hashlib
 import json
-import time
+import logging
+import requests
+from src.utils import circuit_breaker, metrics, rate_limiter, retry
+from src.utils.http_client import get_session
 from src.utils.logging_config import get_logger
-from src.utils.posted_tracker import is_already_posted
+from src.utils.posted_tracker import is_already_posted_many
+from src.utils.watermark import clear_watermark, is_unchanged, save_watermark
 
 logger = get_logger(__name__)
 
-# Retry configuration for transient failures
+RAINDROP_API_BASE = "https://api.raindrop.io/rest/v1"
+
+# Retry configuration for transient failures. Tag edits are idempotent, so
+# dropped connections are retried as well as timeouts, 429s and 502-504s.
 MAX_RETRIES = 3
-RETRY_DELAY_SECONDS = 2  # Base delay, will use exponential backoff
+RETRY_DELAY_SECONDS = 2  # Base delay for jittered exponential backoff
+RETRY_BUDGET_SECONDS = 60
+RETRY_POLICY = retry.RetryPolicy(
+    'raindrop',
+    {'timeout': MAX_RETRIES, 'network': MAX_RETRIES, 'rate_limited': MAX_RETRIES, 'server': MAX_RETRIES},
+    base_delay=RETRY_DELAY_SECONDS,
+    budget_seconds=RETRY_BUDGET_SECONDS,
+)
+
 
+# Raindrop caps perpage at 50
+MAX_PERPAGE = 50
 
-def get_latest_raindrop_to_skeet(token, tag="toskeet"):
+# Extra items fetched beyond what we want to post, in case some are already posted
+PERPAGE_HEADROOM = 4
+
+# Upper bound on listing pages walked per run, so a large pile of stuck
+# (already-posted) items can't turn one poll into an unbounded crawl
+DEFAULT_MAX_PAGES = 10
+
+
+def _api_request(session, method, url, headers, **kwargs):
     """
-    Get the latest Raindrop with the trigger tag (default 'toskeet').
+    Send one Raindrop API request paced by the shared rate limiter.
 
-    Filters out items that have already been posted (tracked locally)
-    to prevent double-posting when tag removal fails.
+    Raindrop limits each user's token, so the limit key is the token; the
+    X-RateLimit-* and Retry-After headers of every response (errors
+    included) update that key's budget before the caller sees it. The
+    outcome feeds the token's "raindrop" circuit breaker.
+
+    Raises:
+        CircuitOpenError if Raindrop's circuit is open for this token.
+    """
+    authorization = headers.get("Authorization", "")
+    endpoint = circuit_breaker.endpoint_for("raindrop", authorization.removeprefix("Bearer "))
+    circuit_breaker.check(endpoint)
+    key = rate_limiter.key_for("raindrop", authorization)
+    rate_limiter.acquire(key)
+    try:
+        response = getattr(session, method)(url, headers=headers, **kwargs)
+    except Exception as e:
+        circuit_breaker.record(endpoint, retry.classify_error(e), e)
+        raise
+    status_code = getattr(response, 'status_code', None)
+    rate_limiter.observe(key, status_code, getattr(response, 'headers', None))
+    circuit_breaker.record(endpoint, 'server' if status_code in retry.SERVER_STATUS_CODES else None,
+                           f"HTTP {status_code}")
+    return response
+
+
+@metrics.timed('raindrop_probe')
+def probe_tagged(token, tag="toskeet", session=None):
+    """
+    Cheaply summarize the tagged set: one request for a single listing page.
+
+    Raindrop has no documented lastUpdate sort, so a one-item probe cannot
+    see an older item being tagged while another is untagged (the count and
+    the newest item stay the same). Instead the probe reads one full page
+    and fingerprints every item's ID and `lastUpdate`: any tag change
+    touches the item's `lastUpdate` or the set of IDs.
 
     Args:
         token: API Bearer token for authentication.
         tag: The trigger tag to search for (default 'toskeet').
+        session: HTTP session to use (default: the shared pooled session).
     Returns:
-        The latest Raindrop object or None if not found.
+        (count, signature): number of Raindrops with the tag and a digest of
+        their IDs and `lastUpdate`s. The signature is None when there are
+        more items than one page holds, so the probe cannot vouch for them.
+    Raises:
+        requests.exceptions.RequestException if the request fails.
+        ValueError if the response carries no item count.
     """
     headers = {
         "Authorization": f"Bearer {token}"
     }
+    session = session or get_session()
     params = {
         "search": json.dumps([{"key": "tag", "val": tag}]),
         "sort": "-created",
-        "perpage": 5  # Fetch a few in case some are already posted
+        "perpage": MAX_PERPAGE,
+        "page": 0
     }
+    response = _api_request(
+        session, 'get',
+        f"{RAINDROP_API_BASE}/raindrops/0",
+        headers=headers,
+        params=params
+    )
+    response.raise_for_status()
 
-    logger.debug(f"Requesting latest Raindrop with '{tag}' tag. Params: {params}")
+    payload = response.json()
+    count = payload.get('count')
+    if not isinstance(count, int):
+        raise ValueError(f"Raindrop listing returned no item count: {count!r}")
+    items = payload.get('items', [])
+    if count > len(items):
+        return count, None
+    seen = sorted((str(r.get('_id')), str(r.get('lastUpdate'))) for r in items)
+    return count, hashlib.sha256(json.dumps(seen).encode('utf-8')).hexdigest()
 
-    try:
-        response = requests.get(
-            "https://api.raindrop.io/rest/v1/raindrops/0",
+
+def iter_pending_raindrops(token, tag="toskeet", perpage=5, max_pages=DEFAULT_MAX_PAGES,
+                           session=None, stuck=None, namespace=None):
+    """
+    Lazily yield unposted Raindrops with the trigger tag, newest first.
+
+    Pages are fetched only as the caller consumes items, so stopping early
+    (e.g. once a batch is full) skips the remaining requests. Items already
+    posted (tracked locally) are not yielded; they are appended to `stuck`
+    so the caller can retry their tag removal once the hunt is over.
+
+    Args:
+        token: API Bearer token for authentication.
+        tag: The trigger tag to search for (default 'toskeet').
+        perpage: Listing page size (capped at MAX_PERPAGE).
+        max_pages: Maximum number of pages to request.
+        session: HTTP session to use (default: the shared pooled session).
+        stuck: Optional list that collects already-posted Raindrops.
+        namespace: Tenant whose posted tracker to consult (None: single-account).
+    Yields:
+        Raindrop objects in '-created' order.
+    Raises:
+        requests.exceptions.RequestException if a page request fails.
+    """
+    headers = {
+        "Authorization": f"Bearer {token}"
+    }
+    perpage = max(1, min(MAX_PERPAGE, perpage))
+    session = session or get_session()
+
+    for page in range(max_pages):
+        params = {
+            "search": json.dumps([{"key": "tag", "val": tag}]),
+            "sort": "-created",
+            "perpage": perpage,
+            "page": page
+        }
+        logger.debug("Requesting page %s of Raindrops with '%s' tag. Params: %s", page, tag, params)
+
+        response = _api_request(
+            session, 'get',
+            f"{RAINDROP_API_BASE}/raindrops/0",
             headers=headers,
-            params=params,
-            timeout=15
+            params=params
         )
         response.raise_for_status()
-        
-        # Log response content for debugging
-        logger.debug(f"Response from Raindrop API: {response.text}")
 
-        raindrops = response.json().get('items', [])
-        
-        # Find the first raindrop that hasn't been posted yet
+        # Log response content for debugging (decoding the body isn't free: only at DEBUG)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response from Raindrop API: %s", response.text)
+
+        payload = response.json()
+        raindrops = payload.get('items', [])
+
+        # One tracker lookup for the whole page (safety net for failed tag removal)
+        already_posted = is_already_posted_many((r['_id'] for r in raindrops if '_id' in r), namespace=namespace)
+
         for raindrop in raindrops:
-            if '_id' in raindrop:
-                raindrop_id = raindrop['_id']
-                
-                # Check if already posted (safety net for failed tag removal)
-                if is_already_posted(raindrop_id):
-                    logger.info(f"Skipping Raindrop {raindrop_id} - already posted previously")
-                    # The tag is still present (or it wouldn't be in this fetch),
-                    # so a previous removal failed — retry it now (self-healing).
-                    try:
-                        if remove_toskeet_tag(token, raindrop_id, tag=tag):
-                            logger.info(f"Self-healed: removed stuck '{tag}' tag from Raindrop {raindrop_id}")
-                        else:
-                            logger.warning(f"Retry of '{tag}' tag removal failed for Raindrop {raindrop_id}")
-                    except Exception:
-                        logger.exception(f"Error retrying tag removal for Raindrop {raindrop_id}")
-                    continue
-
-                logger.info(f"Latest Raindrop with '{tag}': {raindrop}")
-                return raindrop
+            if '_id' not in raindrop:
+                continue
+            if raindrop['_id'] in already_posted:
+                logger.info(f"Skipping Raindrop {raindrop['_id']} - already posted previously")
+                if stuck is not None:
+                    stuck.append(raindrop)
+                continue
+            yield raindrop
+
+        # Last page: short page, or we've walked past the reported total
+        total = payload.get('count')
+        if len(raindrops) < perpage or (isinstance(total, int) and (page + 1) * perpage >= total):
+            return
+
+    logger.warning(f"Stopped after {max_pages} page(s) of '{tag}' Raindrops (RAINDROP_MAX_PAGES)")
+
+
+def get_pending_raindrops(token, tag="toskeet", limit=1, session=None, perpage=None,
+                          max_pages=DEFAULT_MAX_PAGES, watermark_max_age=None, namespace=None):
+    """
+    Get up to `limit` Raindrops with the trigger tag (default 'toskeet'),
+    newest first, paging through results only as far as needed.
+
+    Filters out items that have already been posted (tracked locally)
+    to prevent double-posting when tag removal fails. Their stuck tags are
+    retried after the search, so self-healing never delays finding new items.
 
+    Args:
+        token: API Bearer token for authentication.
+        tag: The trigger tag to search for (default 'toskeet').
+        limit: Maximum number of postable Raindrops to return.
+        session: HTTP session to use (default: the shared pooled session).
+        perpage: Listing page size (default: `limit` plus a little headroom).
+        max_pages: Maximum number of listing pages to request.
+        watermark_max_age: If set, probe the tagged set first and skip the
+            full fetch when it matches the mark left by the last idle fetch
+            and that mark is at most this many seconds old.
+        namespace: Tenant whose tracker and watermark to use (None: single-account).
+    Returns:
+        A list of Raindrop objects in '-created' order (empty if none found).
+    """
+    if perpage is None:
+        perpage = limit + PERPAGE_HEADROOM
+    session = session or get_session()
+
+    probe = None
+    if watermark_max_age:
+        try:
+            probe = probe_tagged(token, tag=tag, session=session)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.warning(f"Watermark probe failed, running a full fetch: {e}")
+        if probe is not None:
+            count, signature = probe
+            if count == 0:
+                logger.info(f"No Raindrops with the '{tag}' tag found.")
+                return []
+            if is_unchanged(tag, count, signature, watermark_max_age, namespace=namespace):
+                logger.info(f"'{tag}' Raindrops unchanged since the last poll ({count} item(s)) - skipping fetch")
+                return []
+
+    logger.debug(f"Looking for up to {limit} Raindrops with '{tag}' tag")
+
+    pending = []
+    stuck = []
+    fetch_failed = False
+    with metrics.timed('raindrop_fetch') as timer:
+        try:
+            for raindrop in iter_pending_raindrops(token, tag=tag, perpage=perpage, max_pages=max_pages,
+                                                   session=session, stuck=stuck, namespace=namespace):
+                logger.info(f"Pending Raindrop with '{tag}': {raindrop}")
+                pending.append(raindrop)
+                if len(pending) >= limit:
+                    break
+        except requests.exceptions.RequestException as e:
+            # Keep whatever earlier pages produced; the rest waits for the next run
+            fetch_failed = True
+            timer.outcome = 'error'
+            logger.exception(f"Error fetching Raindrops: {str(e)}")
+        if not pending and not fetch_failed:
+            timer.outcome = 'empty'
+
+    if stuck:
+        _self_heal(token, stuck, tag, session)
+
+    # Only an idle, complete fetch may vouch for the probe it followed; any
+    # pending item means the next poll must look again.
+    if pending:
+        clear_watermark(tag, namespace=namespace)
+    elif probe is not None and probe[1] is not None and not fetch_failed:
+        save_watermark(tag, *probe, namespace=namespace)
+
+    if not pending:
         logger.info(f"No Raindrops with the '{tag}' tag found.")
-        return None
+    return pending
 
-    except requests.exceptions.RequestException as e:
-        logger.exception(f"Error fetching Raindrops: {str(e)}")
-        return None
+
+@metrics.timed('self_heal')
+def _self_heal(token, stuck, tag, session):
+    """Retry tag removal for already-posted Raindrops whose tag is still present."""
+    try:
+        # The listing was fetched moments ago in this same pass: its tags are current
+        results = remove_tag_bulk(token, stuck, tag=tag, session=session, fresh=True)
+    except Exception:
+        logger.exception(f"Error retrying tag removal for {len(stuck)} stuck Raindrop(s)")
+        return
+    for raindrop_id, removed in results.items():
+        if removed:
+            logger.info(f"Self-healed: removed stuck '{tag}' tag from Raindrop {raindrop_id}")
+        else:
+            logger.warning(f"Retry of '{tag}' tag removal failed for Raindrop {raindrop_id}")
 
 
-def remove_toskeet_tag(access_token, raindrop_id, tag="toskeet"):
+def get_latest_raindrop_to_skeet(token, tag="toskeet", session=None):
+    """
+    Get the latest Raindrop with the trigger tag (default 'toskeet').
+
+    Args:
+        token: API Bearer token for authentication.
+        tag: The trigger tag to search for (default 'toskeet').
+        session: HTTP session to use (default: the shared pooled session).
+    Returns:
+        The latest Raindrop object or None if not found.
+    """
+    pending = get_pending_raindrops(token, tag=tag, limit=1, session=session)
+    return pending[0] if pending else None
+
+
+def remove_toskeet_tag(access_token, raindrop_id, tag="toskeet", session=None):
     """
     Remove the trigger tag (default 'toskeet') from a Raindrop by first
     retrieving the existing tags.
 
-    Includes retry logic with exponential backoff for transient failures.
+    Transient failures are retried under RETRY_POLICY.
 
     Args:
         access_token: Raindrop API access token.
         raindrop_id: The numeric ID of the Raindrop to update.
         tag: The trigger tag to remove (default 'toskeet').
+        session: HTTP session to use (default: the shared pooled session).
 
     Returns:
         True if tag was successfully removed, False otherwise.
@@ -99,68 +322,235 @@ def remove_toskeet_tag(access_token, raindrop_id, tag="toskeet"):
     headers = {
         "Authorization": f"Bearer {access_token}"
     }
+    session = session or get_session()
+
+    def attempt():
+        # First, get the current Raindrop data
+        logger.debug(f"Fetching current tags for Raindrop ID {raindrop_id}")
+        get_url = f"{RAINDROP_API_BASE}/raindrop/{raindrop_id}"
+        get_response = _api_request(session, 'get', get_url, headers=headers)
+        get_response.raise_for_status()
+        raindrop_data = get_response.json().get('item', {})
+
+        # Extract current tags
+        current_tags = raindrop_data.get('tags', [])
+        logger.info(f"Current tags for Raindrop ID {raindrop_id}: {current_tags}")
+
+        # Remove the trigger tag if present
+        if tag in current_tags:
+            current_tags.remove(tag)
+            logger.info(f"Removing '{tag}' tag from Raindrop ID {raindrop_id}. New tags: {current_tags}")
+
+            # Update the Raindrop with the new tag list
+            update_url = f"{RAINDROP_API_BASE}/raindrop/{raindrop_id}"
+            update_data = {"tags": current_tags}
+            update_response = _api_request(session, 'put', update_url, headers=headers, json=update_data)
+            update_response.raise_for_status()
+
+            # Parse response for success
+            update_result = update_response.json()
+            logger.debug("Tag removal API response: %s", update_result)
+            if update_result.get('result', False):
+                logger.info(f"'{tag}' tag successfully removed from Raindrop ID {raindrop_id}")
+                return True
+            else:
+                logger.error(f"Failed to update tags for Raindrop ID {raindrop_id}. Response: {update_result}")
+                return False
+        else:
+            # Tag already removed - this is success, not an error
+            logger.info(f"'{tag}' tag already removed from Raindrop ID {raindrop_id}. No action needed.")
+            return True
+
+    try:
+        return retry.call(attempt, RETRY_POLICY, describe=f"Removing '{tag}' tag from Raindrop ID {raindrop_id}")
+    except circuit_breaker.CircuitOpenError as e:
+        logger.warning(f"Not removing '{tag}' tag from Raindrop ID {raindrop_id}: {e}")
+        return False
+    except requests.exceptions.RequestException as e:
+        logger.exception(f"HTTP error while removing '{tag}' tag for Raindrop ID {raindrop_id}: {str(e)}")
+        return False
+    except Exception as e:
+        logger.exception(f"Unexpected error while removing '{tag}' tag: {str(e)}")
+        return False
+
+
+def _refresh_tags(session, headers, raindrop_ids, tag, max_pages=DEFAULT_MAX_PAGES):
+    """
+    Re-read the current tags of `raindrop_ids` from the tagged listing.
+
+    Posted items are the newest tagged ones, so one page of MAX_PERPAGE
+    normally covers a whole batch; further pages are requested only while
+    IDs are still missing.
+
+    Returns:
+        (tags, pages): current tags by Raindrop ID for the items still
+        carrying `tag`, and the number of listing requests made.
+    Raises:
+        requests.exceptions.RequestException or CircuitOpenError.
+    """
+    wanted = set(raindrop_ids)
+    current = {}
+    pages = 0
+    for page in range(max_pages):
+        params = {
+            "search": json.dumps([{"key": "tag", "val": tag}]),
+            "sort": "-created",
+            "perpage": MAX_PERPAGE,
+            "page": page
+        }
+        pages += 1
+        response = _api_request(
+            session, 'get',
+            f"{RAINDROP_API_BASE}/raindrops/0",
+            headers=headers,
+            params=params
+        )
+        response.raise_for_status()
+        items = response.json().get('items', [])
+        for item in items:
+            if item.get('_id') in wanted and isinstance(item.get('tags'), list):
+                current[item['_id']] = item['tags']
+        if len(current) == len(wanted) or len(items) < MAX_PERPAGE:
+            break
+    return current, pages
+
+
+def _bulk_clear_tags(session, headers, raindrop_ids):
+    """
+    Clear all tags from many Raindrops in one request.
+
+    Raindrop's multi-item update (`PUT /raindrops/{collectionId}` with `ids`)
+    *appends* the tags it is given — it has no "remove one tag" operation —
+    but an empty `tags` list removes every tag. So this is only correct for
+    items whose sole tag is the trigger tag.
+
+    Returns:
+        True if the API reported success for the whole set.
+    """
+    response = _api_request(
+        session, 'put',
+        f"{RAINDROP_API_BASE}/raindrops/0",
+        headers=headers,
+        json={"ids": list(raindrop_ids), "tags": []}
+    )
+    response.raise_for_status()
+    result = response.json()
+    logger.debug("Bulk tag update API response: %s", result)
+    return bool(result.get('result', False))
+
+
+def _put_tags(session, headers, raindrop_id, tags):
+    """Replace one Raindrop's tags with `tags` (already known from the listing)."""
+    response = _api_request(
+        session, 'put',
+        f"{RAINDROP_API_BASE}/raindrop/{raindrop_id}",
+        headers=headers,
+        json={"tags": tags}
+    )
+    response.raise_for_status()
+    return bool(response.json().get('result', False))
+
+
+@metrics.timed('tag_removal')
+def remove_tag_bulk(access_token, raindrops, tag="toskeet", session=None, fresh=False):
+    """
+    Remove the trigger tag from many Raindrops with as few requests as possible.
+
+    Works from listing `tags` instead of fetching each item:
+      - items tagged only with the trigger tag are cleared together in one
+        multi-item update request;
+      - items with other tags get a single PUT of their remaining tags;
+      - anything that fails (or has no known tags) falls back to the
+        per-item GET+PUT path in `remove_toskeet_tag`, which retries.
+
+    Both writes replace the item's tags, so they must not be based on a
+    stale listing: after a batch has been posted (minutes, with
+    POST_SPACING_SECONDS) tags the user added meanwhile would be dropped.
+    Unless `fresh` is set, the tags are first re-read with one paged listing
+    request (see _refresh_tags); items it doesn't find take the per-item path.
+
+    Args:
+        access_token: Raindrop API access token.
+        raindrops: Raindrop dicts from a listing (with '_id' and 'tags'),
+            or bare Raindrop IDs (these always take the per-item path).
+        tag: The trigger tag to remove (default 'toskeet').
+        session: HTTP session to use (default: the shared pooled session).
+        fresh: True if `raindrops` come from a listing fetched in this same
+            pass, so their tags can be written back without re-reading.
+
+    Returns:
+        Dict mapping each Raindrop ID to True (tag removed) or False.
+    """
+    headers = {
+        "Authorization": f"Bearer {access_token}"
+    }
+    session = session or get_session()
 
-    for attempt in range(MAX_RETRIES):
+    requests_made = 0
+    listed = [raindrop['_id'] for raindrop in raindrops if isinstance(raindrop, dict)]
+    if listed and not fresh:
         try:
-            # First, get the current Raindrop data
-            logger.debug(f"Fetching current tags for Raindrop ID {raindrop_id} (attempt {attempt + 1}/{MAX_RETRIES})")
-            get_url = f"https://api.raindrop.io/rest/v1/raindrop/{raindrop_id}"
-            get_response = requests.get(get_url, headers=headers, timeout=15)
-            get_response.raise_for_status()
-            raindrop_data = get_response.json().get('item', {})
-
-            # Extract current tags
-            current_tags = raindrop_data.get('tags', [])
-            logger.info(f"Current tags for Raindrop ID {raindrop_id}: {current_tags}")
-
-            # Remove the trigger tag if present
-            if tag in current_tags:
-                current_tags.remove(tag)
-                logger.info(f"Removing '{tag}' tag from Raindrop ID {raindrop_id}. New tags: {current_tags}")
-
-                # Update the Raindrop with the new tag list
-                update_url = f"https://api.raindrop.io/rest/v1/raindrop/{raindrop_id}"
-                update_data = {"tags": current_tags}
-                update_response = requests.put(update_url, headers=headers, json=update_data, timeout=15)
-                update_response.raise_for_status()
-
-                # Parse response for success
-                update_result = update_response.json()
-                logger.debug(f"Tag removal API response: {update_result}")
-                if update_result.get('result', False):
-                    logger.info(f"'{tag}' tag successfully removed from Raindrop ID {raindrop_id}")
-                    return True
-                else:
-                    logger.error(f"Failed to update tags for Raindrop ID {raindrop_id}. Response: {update_result}")
-                    return False
+            current, requests_made = _refresh_tags(session, headers, listed, tag)
+        except (requests.exceptions.RequestException, ValueError, circuit_breaker.CircuitOpenError) as e:
+            logger.warning(f"Could not re-read tags before removing '{tag}' ({e}); using per-item removal")
+            current, requests_made = {}, 1
+        raindrops = [
+            {'_id': raindrop['_id'], 'tags': current.get(raindrop['_id'])} if isinstance(raindrop, dict) else raindrop
+            for raindrop in raindrops
+        ]
+
+    results = {}
+    trigger_only = []
+    with_other_tags = []
+    per_item = []
+    for raindrop in raindrops:
+        if not isinstance(raindrop, dict):
+            per_item.append(raindrop)
+            continue
+        tags = raindrop.get('tags')
+        if not isinstance(tags, list):
+            per_item.append(raindrop['_id'])
+        elif tags == [tag]:
+            trigger_only.append(raindrop['_id'])
+        elif tag not in tags:
+            # Listing says the tag is already gone — nothing to do
+            results[raindrop['_id']] = True
+        else:
+            with_other_tags.append((raindrop['_id'], [t for t in tags if t != tag]))
+
+    if trigger_only:
+        requests_made += 1
+        try:
+            if _bulk_clear_tags(session, headers, trigger_only):
+                logger.info(f"Removed '{tag}' tag from {len(trigger_only)} Raindrop(s) in one bulk request")
+                results.update({rid: True for rid in trigger_only})
             else:
-                # Tag already removed - this is success, not an error
-                logger.info(f"'{tag}' tag already removed from Raindrop ID {raindrop_id}. No action needed.")
-                return True
+                logger.warning(f"Bulk '{tag}' tag removal was not accepted; falling back to per-item removal")
+                per_item.extend(trigger_only)
+        except (requests.exceptions.RequestException, ValueError, circuit_breaker.CircuitOpenError) as e:
+            logger.warning(f"Bulk '{tag}' tag removal failed ({e}); falling back to per-item removal")
+            per_item.extend(trigger_only)
 
-        except requests.exceptions.RequestException as e:
-            delay = RETRY_DELAY_SECONDS * (2 ** attempt)  # Exponential backoff
-            
-            # Check if this is a transient error worth retrying
-            is_transient = (
-                isinstance(e, requests.exceptions.Timeout) or
-                (hasattr(e, 'response') and e.response is not None and 
-                 e.response.status_code in (502, 503, 504, 429))
-            )
-            
-            if is_transient and attempt < MAX_RETRIES - 1:
-                logger.warning(
-                    f"Transient error removing tag (attempt {attempt + 1}/{MAX_RETRIES}): {e}. "
-                    f"Retrying in {delay}s..."
-                )
-                time.sleep(delay)
+    for raindrop_id, remaining_tags in with_other_tags:
+        requests_made += 1
+        try:
+            if _put_tags(session, headers, raindrop_id, remaining_tags):
+                logger.info(f"'{tag}' tag successfully removed from Raindrop ID {raindrop_id}")
+                results[raindrop_id] = True
                 continue
-            else:
-                logger.exception(f"HTTP error while removing '{tag}' tag for Raindrop ID {raindrop_id}: {str(e)}")
-                return False
+        except (requests.exceptions.RequestException, ValueError, circuit_breaker.CircuitOpenError) as e:
+            logger.warning(f"Tag update for Raindrop ID {raindrop_id} failed ({e}); retrying per-item")
+        per_item.append(raindrop_id)
 
-        except Exception as e:
-            logger.exception(f"Unexpected error while removing '{tag}' tag: {str(e)}")
-            return False
+    for raindrop_id in per_item:
+        requests_made += 2  # GET + PUT on the happy path
+        results[raindrop_id] = remove_toskeet_tag(access_token, raindrop_id, tag=tag, session=session)
 
-    return False
\ No newline at end of file
+    # Baseline: the per-item path costs a GET and a PUT for every item
+    saved = 2 * len(results) - requests_made
+    if results:
+        logger.info(
+            f"Tag removal for {len(results)} Raindrop(s): {sum(results.values())} succeeded, "
+            f"~{requests_made} request(s), saved ~{saved} round trip(s) vs per-item GET+PUT"
+        )
+    return results
@@ -0,0 +1,348 @@
+"""Grapheme segmentation tables — generated, do not edit.
+
+Generated by scripts/gen_grapheme_data.py from Unicode 18.0.0:
+GraphemeBreakProperty.txt, emoji-data.txt (Extended_Pictographic) and
+DerivedCoreProperties.txt (InCB). Copyright (c) Unicode, Inc.; see
+https://www.unicode.org/terms_of_use.html
+
+RANGE_STARTS[i] is the first code point of a run whose value is
+RANGE_VALUES[i]: the Grapheme_Cluster_Break code in the low 4 bits, plus
+EXT_PICT and INCB_* flag bits (constants in src/utils/graphemes.py).
+"""
+
+UNICODE_VERSION = "18.0.0"
+
+RANGE_STARTS = (
+    0x0, 0xA, 0xB, 0xD, 0xE, 0x20, 0x7F, 0xA0, 0xA9, 0xAA,
+    0xAD, 0xAE, 0xAF, 0x300, 0x370, 0x483, 0x48A, 0x591, 0x5BE, 0x5BF,
+    0x5C0, 0x5C1, 0x5C3, 0x5C4, 0x5C6, 0x5C7, 0x5CA, 0x600, 0x606, 0x610,
+    0x61B, 0x61C, 0x61D, 0x64B, 0x660, 0x670, 0x671, 0x6D6, 0x6DD, 0x6DE,
+    0x6DF, 0x6E5, 0x6E7, 0x6E9, 0x6EA, 0x6EE, 0x70F, 0x710, 0x711, 0x712,
+    0x730, 0x74B, 0x7A6, 0x7B1, 0x7EB, 0x7F4, 0x7FD, 0x7FE, 0x816, 0x81A,
+    0x81B, 0x824, 0x825, 0x828, 0x829, 0x82E, 0x859, 0x85C, 0x890, 0x892,
+    0x897, 0x8A0, 0x8CA, 0x8E2, 0x8E3, 0x903, 0x904, 0x915, 0x93A, 0x93B,
+    0x93C, 0x93D, 0x93E, 0x941, 0x949, 0x94D, 0x94E, 0x950, 0x951, 0x958,
+    0x960, 0x962, 0x964, 0x978, 0x980, 0x981, 0x982, 0x984, 0x995, 0x9A9,
+    0x9AA, 0x9B1, 0x9B2, 0x9B3, 0x9B6, 0x9BA, 0x9BC, 0x9BD, 0x9BE, 0x9BF,
+    0x9C1, 0x9C5, 0x9C7, 0x9C9, 0x9CB, 0x9CD, 0x9CE, 0x9D7, 0x9D8, 0x9DC,
+    0x9DE, 0x9DF, 0x9E0, 0x9E2, 0x9E4, 0x9F0, 0x9F2, 0x9FE, 0x9FF, 0xA01,
+    0xA03, 0xA04, 0xA3C, 0xA3D, 0xA3E, 0xA41, 0xA43, 0xA47, 0xA49, 0xA4B,
+    0xA4E, 0xA51, 0xA52, 0xA70, 0xA72, 0xA75, 0xA76, 0xA81, 0xA83, 0xA84,
+    0xA95, 0xAA9, 0xAAA, 0xAB1, 0xAB2, 0xAB4, 0xAB5, 0xABA, 0xABC, 0xABD,
+    0xABE, 0xAC1, 0xAC6, 0xAC7, 0xAC9, 0xACA, 0xACB, 0xACD, 0xACE, 0xAE2,
+    0xAE4, 0xAF9, 0xAFA, 0xB00, 0xB01, 0xB02, 0xB04, 0xB15, 0xB29, 0xB2A,
+    0xB31, 0xB32, 0xB34, 0xB35, 0xB3A, 0xB3C, 0xB3D, 0xB3E, 0xB40, 0xB41,
+    0xB45, 0xB47, 0xB49, 0xB4B, 0xB4D, 0xB4E, 0xB53, 0xB58, 0xB5C, 0xB5E,
+    0xB5F, 0xB60, 0xB62, 0xB64, 0xB71, 0xB72, 0xB82, 0xB83, 0xBBE, 0xBBF,
+    0xBC0, 0xBC1, 0xBC3, 0xBC6, 0xBC9, 0xBCA, 0xBCD, 0xBCE, 0xBD7, 0xBD8,
+    0xC00, 0xC01, 0xC04, 0xC05, 0xC15, 0xC29, 0xC2A, 0xC3A, 0xC3C, 0xC3D,
+    0xC3E, 0xC41, 0xC45, 0xC46, 0xC49, 0xC4A, 0xC4D, 0xC4E, 0xC55, 0xC57,
+    0xC58, 0xC5B, 0xC62, 0xC64, 0xC81, 0xC82, 0xC84, 0xCBC, 0xCBD, 0xCBE,
+    0xCBF, 0xCC1, 0xCC2, 0xCC3, 0xCC5, 0xCC6, 0xCC9, 0xCCA, 0xCCE, 0xCD5,
+    0xCD7, 0xCE2, 0xCE4, 0xCF3, 0xCF4, 0xD00, 0xD02, 0xD04, 0xD15, 0xD3B,
+    0xD3D, 0xD3E, 0xD3F, 0xD41, 0xD45, 0xD46, 0xD49, 0xD4A, 0xD4D, 0xD4E,
+    0xD4F, 0xD57, 0xD58, 0xD62, 0xD64, 0xD81, 0xD82, 0xD84, 0xDCA, 0xDCB,
+    0xDCF, 0xDD0, 0xDD2, 0xDD5, 0xDD6, 0xDD7, 0xDD8, 0xDDF, 0xDE0, 0xDF2,
+    0xDF4, 0xE31, 0xE32, 0xE33, 0xE34, 0xE3B, 0xE47, 0xE4F, 0xEB1, 0xEB2,
+    0xEB3, 0xEB4, 0xEBD, 0xEC8, 0xECF, 0xF18, 0xF1A, 0xF35, 0xF36, 0xF37,
+    0xF38, 0xF39, 0xF3A, 0xF3E, 0xF40, 0xF71, 0xF7F, 0xF80, 0xF85, 0xF86,
+    0xF88, 0xF8D, 0xF98, 0xF99, 0xFBD, 0xFC6, 0xFC7, 0x1000, 0x102B, 0x102D,
+    0x1031, 0x1032, 0x1038, 0x1039, 0x103A, 0x103B, 0x103D, 0x103F, 0x1040, 0x1050,
+    0x1056, 0x1058, 0x105A, 0x105E, 0x1061, 0x1062, 0x1065, 0x1067, 0x106E, 0x1071,
+    0x1075, 0x1082, 0x1083, 0x1084, 0x1085, 0x1087, 0x108D, 0x108E, 0x108F, 0x109D,
+    0x109E, 0x1100, 0x1160, 0x11A8, 0x1200, 0x135D, 0x1360, 0x1712, 0x1716, 0x1732,
+    0x1735, 0x1752, 0x1754, 0x1772, 0x1774, 0x1780, 0x17B4, 0x17B6, 0x17B7, 0x17BE,
+    0x17C6, 0x17C7, 0x17C9, 0x17D2, 0x17D3, 0x17D4, 0x17DD, 0x17DE, 0x180B, 0x180E,
+    0x180F, 0x1810, 0x1885, 0x1887, 0x18A9, 0x18AA, 0x1920, 0x1923, 0x1927, 0x1929,
+    0x192C, 0x1930, 0x1932, 0x1933, 0x1939, 0x193C, 0x1A17, 0x1A19, 0x1A1B, 0x1A1C,
+    0x1A20, 0x1A55, 0x1A56, 0x1A57, 0x1A58, 0x1A5F, 0x1A60, 0x1A61, 0x1A62, 0x1A63,
+    0x1A65, 0x1A6D, 0x1A73, 0x1A7D, 0x1A7F, 0x1A80, 0x1AB0, 0x1AF1, 0x1B00, 0x1B04,
+    0x1B05, 0x1B0B, 0x1B0D, 0x1B13, 0x1B34, 0x1B3E, 0x1B42, 0x1B44, 0x1B45, 0x1B4D,
+    0x1B6B, 0x1B74, 0x1B80, 0x1B82, 0x1B83, 0x1BA1, 0x1BA2, 0x1BA6, 0x1BA8, 0x1BAB,
+    0x1BAC, 0x1BAE, 0x1BB0, 0x1BBB, 0x1BBE, 0x1BE6, 0x1BE7, 0x1BE8, 0x1BEA, 0x1BED,
+    0x1BEE, 0x1BEF, 0x1BF4, 0x1C24, 0x1C2C, 0x1C34, 0x1C36, 0x1C38, 0x1CD0, 0x1CD3,
+    0x1CD4, 0x1CE1, 0x1CE2, 0x1CE9, 0x1CED, 0x1CEE, 0x1CF4, 0x1CF5, 0x1CF7, 0x1CF8,
+    0x1CFA, 0x1DC0, 0x1E00, 0x200B, 0x200C, 0x200D, 0x200E, 0x2010, 0x2028, 0x202F,
+    0x203C, 0x203D, 0x2049, 0x204A, 0x2060, 0x2070, 0x20D0, 0x20F1, 0x2122, 0x2123,
+    0x2139, 0x213A, 0x2194, 0x219A, 0x21A9, 0x21AB, 0x231A, 0x231C, 0x2328, 0x2329,
+    0x23CF, 0x23D0, 0x23E9, 0x23F4, 0x23F8, 0x23FB, 0x24C2, 0x24C3, 0x25AA, 0x25AC,
+    0x25B6, 0x25B7, 0x25C0, 0x25C1, 0x25FB, 0x25FF, 0x2600, 0x2605, 0x260E, 0x260F,
+    0x2611, 0x2612, 0x2614, 0x2616, 0x2618, 0x2619, 0x261D, 0x261E, 0x2620, 0x2621,
+    0x2622, 0x2624, 0x2626, 0x2627, 0x262A, 0x262B, 0x262E, 0x2630, 0x2638, 0x263B,
+    0x2640, 0x2641, 0x2642, 0x2643, 0x2648, 0x2654, 0x265F, 0x2661, 0x2663, 0x2664,
+    0x2665, 0x2667, 0x2668, 0x2669, 0x267B, 0x267C, 0x267E, 0x2680, 0x2692, 0x2698,
+    0x2699, 0x269A, 0x269B, 0x269D, 0x26A0, 0x26A2, 0x26A7, 0x26A8, 0x26AA, 0x26AC,
+    0x26B0, 0x26B2, 0x26BD, 0x26BF, 0x26C4, 0x26C6, 0x26C8, 0x26C9, 0x26CE, 0x26D0,
+    0x26D1, 0x26D2, 0x26D3, 0x26D5, 0x26E9, 0x26EB, 0x26F0, 0x26F6, 0x26F7, 0x26FB,
+    0x26FD, 0x26FE, 0x2702, 0x2703, 0x2705, 0x2706, 0x2708, 0x270E, 0x270F, 0x2710,
+    0x2712, 0x2713, 0x2714, 0x2715, 0x2716, 0x2717, 0x271D, 0x271E, 0x2721, 0x2722,
+    0x2728, 0x2729, 0x2733, 0x2735, 0x2744, 0x2745, 0x2747, 0x2748, 0x274C, 0x274D,
+    0x274E, 0x274F, 0x2753, 0x2756, 0x2757, 0x2758, 0x2763, 0x2765, 0x2795, 0x2798,
+    0x27A1, 0x27A2, 0x27B0, 0x27B1, 0x27BF, 0x27C0, 0x2934, 0x2936, 0x2B05, 0x2B08,
+    0x2B1B, 0x2B1D, 0x2B50, 0x2B51, 0x2B55, 0x2B56, 0x2CEF, 0x2CF2, 0x2D7F, 0x2D80,
+    0x2DE0, 0x2E00, 0x302A, 0x3030, 0x3031, 0x303D, 0x303E, 0x3099, 0x309B, 0x3297,
+    0x3298, 0x3299, 0x329A, 0xA66F, 0xA673, 0xA674, 0xA67E, 0xA69E, 0xA6A0, 0xA6F0,
+    0xA6F2, 0xA802, 0xA803, 0xA806, 0xA807, 0xA80B, 0xA80C, 0xA823, 0xA825, 0xA827,
+    0xA828, 0xA82C, 0xA82D, 0xA880, 0xA882, 0xA8B4, 0xA8C4, 0xA8C6, 0xA8E0, 0xA8F2,
+    0xA8FF, 0xA900, 0xA926, 0xA92E, 0xA947, 0xA952, 0xA953, 0xA954, 0xA960, 0xA97D,
+    0xA980, 0xA983, 0xA984, 0xA989, 0xA98C, 0xA98F, 0xA9B3, 0xA9B4, 0xA9B6, 0xA9BA,
+    0xA9BC, 0xA9BE, 0xA9C0, 0xA9C1, 0xA9E0, 0xA9E5, 0xA9E6, 0xA9E7, 0xA9F0, 0xA9FA,
+    0xA9FF, 0xAA29, 0xAA2F, 0xAA31, 0xAA33, 0xAA35, 0xAA37, 0xAA43, 0xAA44, 0xAA4C,
+    0xAA4D, 0xAA4E, 0xAA60, 0xAA70, 0xAA71, 0xAA74, 0xAA7A, 0xAA7B, 0xAA7C, 0xAA7D,
+    0xAA7E, 0xAA80, 0xAAB0, 0xAAB1, 0xAAB2, 0xAAB5, 0xAAB7, 0xAAB9, 0xAABE, 0xAAC0,
+    0xAAC1, 0xAAC2, 0xAAE0, 0xAAEB, 0xAAEC, 0xAAEE, 0xAAF0, 0xAAF5, 0xAAF6, 0xAAF7,
+    0xABC0, 0xABDB, 0xABE3, 0xABE5, 0xABE6, 0xABE8, 0xABE9, 0xABEB, 0xABEC, 0xABED,
+    0xABEE, 0xAC00, 0xAC01, 0xAC1C, 0xAC1D, 0xAC38, 0xAC39, 0xAC54, 0xAC55, 0xAC70,
+    0xAC71, 0xAC8C, 0xAC8D, 0xACA8, 0xACA9, 0xACC4, 0xACC5, 0xACE0, 0xACE1, 0xACFC,
+    0xACFD, 0xAD18, 0xAD19, 0xAD34, 0xAD35, 0xAD50, 0xAD51, 0xAD6C, 0xAD6D, 0xAD88,
+    0xAD89, 0xADA4, 0xADA5, 0xADC0, 0xADC1, 0xADDC, 0xADDD, 0xADF8, 0xADF9, 0xAE14,
+    0xAE15, 0xAE30, 0xAE31, 0xAE4C, 0xAE4D, 0xAE68, 0xAE69, 0xAE84, 0xAE85, 0xAEA0,
+    0xAEA1, 0xAEBC, 0xAEBD, 0xAED8, 0xAED9, 0xAEF4, 0xAEF5, 0xAF10, 0xAF11, 0xAF2C,
+    0xAF2D, 0xAF48, 0xAF49, 0xAF64, 0xAF65, 0xAF80, 0xAF81, 0xAF9C, 0xAF9D, 0xAFB8,
+    0xAFB9, 0xAFD4, 0xAFD5, 0xAFF0, 0xAFF1, 0xB00C, 0xB00D, 0xB028, 0xB029, 0xB044,
+    0xB045, 0xB060, 0xB061, 0xB07C, 0xB07D, 0xB098, 0xB099, 0xB0B4, 0xB0B5, 0xB0D0,
+    0xB0D1, 0xB0EC, 0xB0ED, 0xB108, 0xB109, 0xB124, 0xB125, 0xB140, 0xB141, 0xB15C,
+    0xB15D, 0xB178, 0xB179, 0xB194, 0xB195, 0xB1B0, 0xB1B1, 0xB1CC, 0xB1CD, 0xB1E8,
+    0xB1E9, 0xB204, 0xB205, 0xB220, 0xB221, 0xB23C, 0xB23D, 0xB258, 0xB259, 0xB274,
+    0xB275, 0xB290, 0xB291, 0xB2AC, 0xB2AD, 0xB2C8, 0xB2C9, 0xB2E4, 0xB2E5, 0xB300,
+    0xB301, 0xB31C, 0xB31D, 0xB338, 0xB339, 0xB354, 0xB355, 0xB370, 0xB371, 0xB38C,
+    0xB38D, 0xB3A8, 0xB3A9, 0xB3C4, 0xB3C5, 0xB3E0, 0xB3E1, 0xB3FC, 0xB3FD, 0xB418,
+    0xB419, 0xB434, 0xB435, 0xB450, 0xB451, 0xB46C, 0xB46D, 0xB488, 0xB489, 0xB4A4,
+    0xB4A5, 0xB4C0, 0xB4C1, 0xB4DC, 0xB4DD, 0xB4F8, 0xB4F9, 0xB514, 0xB515, 0xB530,
+    0xB531, 0xB54C, 0xB54D, 0xB568, 0xB569, 0xB584, 0xB585, 0xB5A0, 0xB5A1, 0xB5BC,
+    0xB5BD, 0xB5D8, 0xB5D9, 0xB5F4, 0xB5F5, 0xB610, 0xB611, 0xB62C, 0xB62D, 0xB648,
+    0xB649, 0xB664, 0xB665, 0xB680, 0xB681, 0xB69C, 0xB69D, 0xB6B8, 0xB6B9, 0xB6D4,
+    0xB6D5, 0xB6F0, 0xB6F1, 0xB70C, 0xB70D, 0xB728, 0xB729, 0xB744, 0xB745, 0xB760,
+    0xB761, 0xB77C, 0xB77D, 0xB798, 0xB799, 0xB7B4, 0xB7B5, 0xB7D0, 0xB7D1, 0xB7EC,
+    0xB7ED, 0xB808, 0xB809, 0xB824, 0xB825, 0xB840, 0xB841, 0xB85C, 0xB85D, 0xB878,
+    0xB879, 0xB894, 0xB895, 0xB8B0, 0xB8B1, 0xB8CC, 0xB8CD, 0xB8E8, 0xB8E9, 0xB904,
+    0xB905, 0xB920, 0xB921, 0xB93C, 0xB93D, 0xB958, 0xB959, 0xB974, 0xB975, 0xB990,
+    0xB991, 0xB9AC, 0xB9AD, 0xB9C8, 0xB9C9, 0xB9E4, 0xB9E5, 0xBA00, 0xBA01, 0xBA1C,
+    0xBA1D, 0xBA38, 0xBA39, 0xBA54, 0xBA55, 0xBA70, 0xBA71, 0xBA8C, 0xBA8D, 0xBAA8,
+    0xBAA9, 0xBAC4, 0xBAC5, 0xBAE0, 0xBAE1, 0xBAFC, 0xBAFD, 0xBB18, 0xBB19, 0xBB34,
+    0xBB35, 0xBB50, 0xBB51, 0xBB6C, 0xBB6D, 0xBB88, 0xBB89, 0xBBA4, 0xBBA5, 0xBBC0,
+    0xBBC1, 0xBBDC, 0xBBDD, 0xBBF8, 0xBBF9, 0xBC14, 0xBC15, 0xBC30, 0xBC31, 0xBC4C,
+    0xBC4D, 0xBC68, 0xBC69, 0xBC84, 0xBC85, 0xBCA0, 0xBCA1, 0xBCBC, 0xBCBD, 0xBCD8,
+    0xBCD9, 0xBCF4, 0xBCF5, 0xBD10, 0xBD11, 0xBD2C, 0xBD2D, 0xBD48, 0xBD49, 0xBD64,
+    0xBD65, 0xBD80, 0xBD81, 0xBD9C, 0xBD9D, 0xBDB8, 0xBDB9, 0xBDD4, 0xBDD5, 0xBDF0,
+    0xBDF1, 0xBE0C, 0xBE0D, 0xBE28, 0xBE29, 0xBE44, 0xBE45, 0xBE60, 0xBE61, 0xBE7C,
+    0xBE7D, 0xBE98, 0xBE99, 0xBEB4, 0xBEB5, 0xBED0, 0xBED1, 0xBEEC, 0xBEED, 0xBF08,
+    0xBF09, 0xBF24, 0xBF25, 0xBF40, 0xBF41, 0xBF5C, 0xBF5D, 0xBF78, 0xBF79, 0xBF94,
+    0xBF95, 0xBFB0, 0xBFB1, 0xBFCC, 0xBFCD, 0xBFE8, 0xBFE9, 0xC004, 0xC005, 0xC020,
+    0xC021, 0xC03C, 0xC03D, 0xC058, 0xC059, 0xC074, 0xC075, 0xC090, 0xC091, 0xC0AC,
+    0xC0AD, 0xC0C8, 0xC0C9, 0xC0E4, 0xC0E5, 0xC100, 0xC101, 0xC11C, 0xC11D, 0xC138,
+    0xC139, 0xC154, 0xC155, 0xC170, 0xC171, 0xC18C, 0xC18D, 0xC1A8, 0xC1A9, 0xC1C4,
+    0xC1C5, 0xC1E0, 0xC1E1, 0xC1FC, 0xC1FD, 0xC218, 0xC219, 0xC234, 0xC235, 0xC250,
+    0xC251, 0xC26C, 0xC26D, 0xC288, 0xC289, 0xC2A4, 0xC2A5, 0xC2C0, 0xC2C1, 0xC2DC,
+    0xC2DD, 0xC2F8, 0xC2F9, 0xC314, 0xC315, 0xC330, 0xC331, 0xC34C, 0xC34D, 0xC368,
+    0xC369, 0xC384, 0xC385, 0xC3A0, 0xC3A1, 0xC3BC, 0xC3BD, 0xC3D8, 0xC3D9, 0xC3F4,
+    0xC3F5, 0xC410, 0xC411, 0xC42C, 0xC42D, 0xC448, 0xC449, 0xC464, 0xC465, 0xC480,
+    0xC481, 0xC49C, 0xC49D, 0xC4B8, 0xC4B9, 0xC4D4, 0xC4D5, 0xC4F0, 0xC4F1, 0xC50C,
+    0xC50D, 0xC528, 0xC529, 0xC544, 0xC545, 0xC560, 0xC561, 0xC57C, 0xC57D, 0xC598,
+    0xC599, 0xC5B4, 0xC5B5, 0xC5D0, 0xC5D1, 0xC5EC, 0xC5ED, 0xC608, 0xC609, 0xC624,
+    0xC625, 0xC640, 0xC641, 0xC65C, 0xC65D, 0xC678, 0xC679, 0xC694, 0xC695, 0xC6B0,
+    0xC6B1, 0xC6CC, 0xC6CD, 0xC6E8, 0xC6E9, 0xC704, 0xC705, 0xC720, 0xC721, 0xC73C,
+    0xC73D, 0xC758, 0xC759, 0xC774, 0xC775, 0xC790, 0xC791, 0xC7AC, 0xC7AD, 0xC7C8,
+    0xC7C9, 0xC7E4, 0xC7E5, 0xC800, 0xC801, 0xC81C, 0xC81D, 0xC838, 0xC839, 0xC854,
+    0xC855, 0xC870, 0xC871, 0xC88C, 0xC88D, 0xC8A8, 0xC8A9, 0xC8C4, 0xC8C5, 0xC8E0,
+    0xC8E1, 0xC8FC, 0xC8FD, 0xC918, 0xC919, 0xC934, 0xC935, 0xC950, 0xC951, 0xC96C,
+    0xC96D, 0xC988, 0xC989, 0xC9A4, 0xC9A5, 0xC9C0, 0xC9C1, 0xC9DC, 0xC9DD, 0xC9F8,
+    0xC9F9, 0xCA14, 0xCA15, 0xCA30, 0xCA31, 0xCA4C, 0xCA4D, 0xCA68, 0xCA69, 0xCA84,
+    0xCA85, 0xCAA0, 0xCAA1, 0xCABC, 0xCABD, 0xCAD8, 0xCAD9, 0xCAF4, 0xCAF5, 0xCB10,
+    0xCB11, 0xCB2C, 0xCB2D, 0xCB48, 0xCB49, 0xCB64, 0xCB65, 0xCB80, 0xCB81, 0xCB9C,
+    0xCB9D, 0xCBB8, 0xCBB9, 0xCBD4, 0xCBD5, 0xCBF0, 0xCBF1, 0xCC0C, 0xCC0D, 0xCC28,
+    0xCC29, 0xCC44, 0xCC45, 0xCC60, 0xCC61, 0xCC7C, 0xCC7D, 0xCC98, 0xCC99, 0xCCB4,
+    0xCCB5, 0xCCD0, 0xCCD1, 0xCCEC, 0xCCED, 0xCD08, 0xCD09, 0xCD24, 0xCD25, 0xCD40,
+    0xCD41, 0xCD5C, 0xCD5D, 0xCD78, 0xCD79, 0xCD94, 0xCD95, 0xCDB0, 0xCDB1, 0xCDCC,
+    0xCDCD, 0xCDE8, 0xCDE9, 0xCE04, 0xCE05, 0xCE20, 0xCE21, 0xCE3C, 0xCE3D, 0xCE58,
+    0xCE59, 0xCE74, 0xCE75, 0xCE90, 0xCE91, 0xCEAC, 0xCEAD, 0xCEC8, 0xCEC9, 0xCEE4,
+    0xCEE5, 0xCF00, 0xCF01, 0xCF1C, 0xCF1D, 0xCF38, 0xCF39, 0xCF54, 0xCF55, 0xCF70,
+    0xCF71, 0xCF8C, 0xCF8D, 0xCFA8, 0xCFA9, 0xCFC4, 0xCFC5, 0xCFE0, 0xCFE1, 0xCFFC,
+    0xCFFD, 0xD018, 0xD019, 0xD034, 0xD035, 0xD050, 0xD051, 0xD06C, 0xD06D, 0xD088,
+    0xD089, 0xD0A4, 0xD0A5, 0xD0C0, 0xD0C1, 0xD0DC, 0xD0DD, 0xD0F8, 0xD0F9, 0xD114,
+    0xD115, 0xD130, 0xD131, 0xD14C, 0xD14D, 0xD168, 0xD169, 0xD184, 0xD185, 0xD1A0,
+    0xD1A1, 0xD1BC, 0xD1BD, 0xD1D8, 0xD1D9, 0xD1F4, 0xD1F5, 0xD210, 0xD211, 0xD22C,
+    0xD22D, 0xD248, 0xD249, 0xD264, 0xD265, 0xD280, 0xD281, 0xD29C, 0xD29D, 0xD2B8,
+    0xD2B9, 0xD2D4, 0xD2D5, 0xD2F0, 0xD2F1, 0xD30C, 0xD30D, 0xD328, 0xD329, 0xD344,
+    0xD345, 0xD360, 0xD361, 0xD37C, 0xD37D, 0xD398, 0xD399, 0xD3B4, 0xD3B5, 0xD3D0,
+    0xD3D1, 0xD3EC, 0xD3ED, 0xD408, 0xD409, 0xD424, 0xD425, 0xD440, 0xD441, 0xD45C,
+    0xD45D, 0xD478, 0xD479, 0xD494, 0xD495, 0xD4B0, 0xD4B1, 0xD4CC, 0xD4CD, 0xD4E8,
+    0xD4E9, 0xD504, 0xD505, 0xD520, 0xD521, 0xD53C, 0xD53D, 0xD558, 0xD559, 0xD574,
+    0xD575, 0xD590, 0xD591, 0xD5AC, 0xD5AD, 0xD5C8, 0xD5C9, 0xD5E4, 0xD5E5, 0xD600,
+    0xD601, 0xD61C, 0xD61D, 0xD638, 0xD639, 0xD654, 0xD655, 0xD670, 0xD671, 0xD68C,
+    0xD68D, 0xD6A8, 0xD6A9, 0xD6C4, 0xD6C5, 0xD6E0, 0xD6E1, 0xD6FC, 0xD6FD, 0xD718,
+    0xD719, 0xD734, 0xD735, 0xD750, 0xD751, 0xD76C, 0xD76D, 0xD788, 0xD789, 0xD7A4,
+    0xD7B0, 0xD7C7, 0xD7CB, 0xD7FC, 0xFB1E, 0xFB1F, 0xFE00, 0xFE10, 0xFE20, 0xFE30,
+    0xFEFF, 0xFF00, 0xFF9E, 0xFFA0, 0xFFF0, 0xFFFC, 0x101FD, 0x101FE, 0x102E0, 0x102E1,
+    0x10376, 0x1037B, 0x10A00, 0x10A01, 0x10A04, 0x10A05, 0x10A07, 0x10A0C, 0x10A10, 0x10A14,
+    0x10A15, 0x10A18, 0x10A19, 0x10A36, 0x10A38, 0x10A3B, 0x10A3F, 0x10A40, 0x10AE5, 0x10AE7,
+    0x10D24, 0x10D28, 0x10D69, 0x10D6E, 0x10EAB, 0x10EAD, 0x10ECB, 0x10ED0, 0x10EF0, 0x10F00,
+    0x10F46, 0x10F51, 0x10F82, 0x10F86, 0x11000, 0x11001, 0x11002, 0x11003, 0x11038, 0x11047,
+    0x11070, 0x11071, 0x11073, 0x11075, 0x1107F, 0x11082, 0x11083, 0x110B0, 0x110B3, 0x110B7,
+    0x110B9, 0x110BB, 0x110BD, 0x110BE, 0x110C2, 0x110C3, 0x110CD, 0x110CE, 0x11100, 0x11103,
+    0x11127, 0x1112C, 0x1112D, 0x11133, 0x11134, 0x11135, 0x11144, 0x11145, 0x11147, 0x11148,
+    0x11173, 0x11174, 0x11180, 0x11182, 0x11183, 0x111B3, 0x111B6, 0x111BF, 0x111C0, 0x111C1,
+    0x111C2, 0x111C4, 0x111C9, 0x111CD, 0x111CE, 0x111CF, 0x111D0, 0x1122C, 0x1122F, 0x11232,
+    0x11234, 0x11238, 0x1123E, 0x1123F, 0x11241, 0x11242, 0x112DF, 0x112E0, 0x112E3, 0x112EB,
+    0x11300, 0x11302, 0x11304, 0x1133B, 0x1133D, 0x1133E, 0x1133F, 0x11340, 0x11341, 0x11345,
+    0x11347, 0x11349, 0x1134B, 0x1134D, 0x1134E, 0x11357, 0x11358, 0x11362, 0x11364, 0x11366,
+    0x1136D, 0x11370, 0x11375, 0x11380, 0x1138A, 0x1138B, 0x1138C, 0x1138E, 0x1138F, 0x11390,
+    0x113B6, 0x113B8, 0x113B9, 0x113BB, 0x113C1, 0x113C2, 0x113C3, 0x113C5, 0x113C6, 0x113C7,
+    0x113CA, 0x113CB, 0x113CC, 0x113CE, 0x113D0, 0x113D1, 0x113D2, 0x113D3, 0x113E1, 0x113E3,
+    0x11435, 0x11438, 0x11440, 0x11442, 0x11445, 0x11446, 0x11447, 0x1145E, 0x1145F, 0x114B0,
+    0x114B1, 0x114B3, 0x114B9, 0x114BA, 0x114BB, 0x114BD, 0x114BE, 0x114BF, 0x114C1, 0x114C2,
+    0x114C4, 0x115AF, 0x115B0, 0x115B2, 0x115B6, 0x115B8, 0x115BC, 0x115BE, 0x115BF, 0x115C1,
+    0x115DC, 0x115DE, 0x11630, 0x11633, 0x1163B, 0x1163D, 0x1163E, 0x1163F, 0x11641, 0x116AB,
+    0x116AC, 0x116AD, 0x116AE, 0x116B0, 0x116B8, 0x1171D, 0x1171E, 0x1171F, 0x11720, 0x11722,
+    0x11726, 0x11727, 0x1172C, 0x1182C, 0x1182F, 0x11838, 0x11839, 0x1183B, 0x11900, 0x11907,
+    0x11909, 0x1190A, 0x1190C, 0x11914, 0x11915, 0x11917, 0x11918, 0x11930, 0x11931, 0x11936,
+    0x11937, 0x11939, 0x1193B, 0x1193E, 0x1193F, 0x11940, 0x11941, 0x11942, 0x11943, 0x11944,
+    0x119D1, 0x119D4, 0x119D8, 0x119DA, 0x119DC, 0x119E0, 0x119E1, 0x119E4, 0x119E5, 0x11A00,
+    0x11A01, 0x11A0B, 0x11A33, 0x11A39, 0x11A3A, 0x11A3B, 0x11A3F, 0x11A47, 0x11A48, 0x11A50,
+    0x11A51, 0x11A57, 0x11A59, 0x11A5C, 0x11A84, 0x11A8A, 0x11A97, 0x11A98, 0x11A99, 0x11A9A,
+    0x11B0A, 0x11B0B, 0x11B60, 0x11B61, 0x11B62, 0x11B65, 0x11B66, 0x11B67, 0x11B68, 0x11C2F,
+    0x11C30, 0x11C37, 0x11C38, 0x11C3E, 0x11C3F, 0x11C40, 0x11C92, 0x11CA8, 0x11CA9, 0x11CAA,
+    0x11CB1, 0x11CB2, 0x11CB4, 0x11CB5, 0x11CB7, 0x11D31, 0x11D37, 0x11D3A, 0x11D3B, 0x11D3C,
+    0x11D3E, 0x11D3F, 0x11D46, 0x11D47, 0x11D48, 0x11D8A, 0x11D8F, 0x11D90, 0x11D92, 0x11D93,
+    0x11D95, 0x11D96, 0x11D97, 0x11D98, 0x11DF0, 0x11DF1, 0x11DF2, 0x11EF3, 0x11EF5, 0x11EF7,
+    0x11F00, 0x11F02, 0x11F03, 0x11F04, 0x11F11, 0x11F12, 0x11F34, 0x11F36, 0x11F3B, 0x11F3E,
+    0x11F40, 0x11F42, 0x11F43, 0x11F5A, 0x11F5B, 0x13430, 0x13440, 0x13441, 0x13447, 0x13456,
+    0x1611E, 0x1612A, 0x1612D, 0x16130, 0x16AF0, 0x16AF5, 0x16B30, 0x16B37, 0x16D63, 0x16D64,
+    0x16D67, 0x16D6B, 0x16F4F, 0x16F50, 0x16F51, 0x16F88, 0x16F8F, 0x16F93, 0x16FE4, 0x16FE5,
+    0x16FF0, 0x16FF2, 0x1BC9D, 0x1BC9F, 0x1BCA0, 0x1BCA4, 0x1CF00, 0x1CF2E, 0x1CF30, 0x1CF47,
+    0x1D127, 0x1D129, 0x1D165, 0x1D16A, 0x1D16D, 0x1D173, 0x1D17B, 0x1D183, 0x1D185, 0x1D18C,
+    0x1D1AA, 0x1D1AE, 0x1D242, 0x1D245, 0x1D250, 0x1D253, 0x1D25B, 0x1D25D, 0x1D25F, 0x1D260,
+    0x1D280, 0x1D282, 0x1DA00, 0x1DA37, 0x1DA3B, 0x1DA6D, 0x1DA75, 0x1DA76, 0x1DA84, 0x1DA85,
+    0x1DA9B, 0x1DAA0, 0x1DAA1, 0x1DAB0, 0x1E000, 0x1E007, 0x1E008, 0x1E019, 0x1E01B, 0x1E022,
+    0x1E023, 0x1E025, 0x1E026, 0x1E02B, 0x1E08F, 0x1E090, 0x1E130, 0x1E137, 0x1E2AE, 0x1E2AF,
+    0x1E2EC, 0x1E2F0, 0x1E4EC, 0x1E4F0, 0x1E5EE, 0x1E5F0, 0x1E6E3, 0x1E6E4, 0x1E6E6, 0x1E6E7,
+    0x1E6EE, 0x1E6F0, 0x1E6F5, 0x1E6F6, 0x1E8D0, 0x1E8D7, 0x1E944, 0x1E94B, 0x1F004, 0x1F005,
+    0x1F02C, 0x1F030, 0x1F094, 0x1F0A0, 0x1F0AF, 0x1F0B1, 0x1F0C0, 0x1F0C1, 0x1F0CF, 0x1F0D1,
+    0x1F0F6, 0x1F100, 0x1F170, 0x1F172, 0x1F17E, 0x1F180, 0x1F18E, 0x1F18F, 0x1F191, 0x1F19B,
+    0x1F1AF, 0x1F1E6, 0x1F200, 0x1F201, 0x1F210, 0x1F21A, 0x1F21B, 0x1F22F, 0x1F230, 0x1F232,
+    0x1F23B, 0x1F23C, 0x1F240, 0x1F249, 0x1F260, 0x1F266, 0x1F322, 0x1F324, 0x1F394, 0x1F396,
+    0x1F398, 0x1F399, 0x1F39C, 0x1F39E, 0x1F3F1, 0x1F3F3, 0x1F3F6, 0x1F3F7, 0x1F3FB, 0x1F400,
+    0x1F4FE, 0x1F4FF, 0x1F53E, 0x1F549, 0x1F54F, 0x1F550, 0x1F568, 0x1F56F, 0x1F571, 0x1F573,
+    0x1F57B, 0x1F587, 0x1F588, 0x1F58A, 0x1F58E, 0x1F590, 0x1F591, 0x1F595, 0x1F597, 0x1F5A4,
+    0x1F5A6, 0x1F5A8, 0x1F5A9, 0x1F5B1, 0x1F5B3, 0x1F5BC, 0x1F5BD, 0x1F5C2, 0x1F5C5, 0x1F5D1,
+    0x1F5D4, 0x1F5DC, 0x1F5DF, 0x1F5E1, 0x1F5E2, 0x1F5E3, 0x1F5E4, 0x1F5E8, 0x1F5E9, 0x1F5EF,
+    0x1F5F0, 0x1F5F3, 0x1F5F4, 0x1F5FA, 0x1F650, 0x1F680, 0x1F6C6, 0x1F6CB, 0x1F6D3, 0x1F6D5,
+    0x1F6E6, 0x1F6E9, 0x1F6EA, 0x1F6EB, 0x1F6F1, 0x1F6F3, 0x1F700, 0x1F7DC, 0x1F7F1, 0x1F80C,
+    0x1F810, 0x1F848, 0x1F850, 0x1F85A, 0x1F860, 0x1F888, 0x1F890, 0x1F8AE, 0x1F8B0, 0x1F8BC,
+    0x1F8C0, 0x1F8C2, 0x1F8D0, 0x1F8D9, 0x1F900, 0x1F90C, 0x1F93B, 0x1F93C, 0x1F946, 0x1F947,
+    0x1FA00, 0x1FA58, 0x1FA60, 0x1FA6E, 0x1FB00, 0x1FC00, 0x1FFFE, 0xE0000, 0xE0020, 0xE0080,
+    0xE0100, 0xE01F0, 0xE1000,
+)
+
+RANGE_VALUES = (
+    3, 2, 3, 1, 3, 0, 3, 0, 16, 0, 3, 16, 0, 68, 0, 68, 0, 68, 0, 68,
+    0, 68, 0, 68, 0, 68, 0, 7, 0, 68, 0, 3, 0, 68, 0, 68, 0, 68, 7, 0,
+    68, 0, 68, 0, 68, 0, 7, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0,
+    68, 0, 68, 0, 68, 0, 68, 0, 7, 0, 68, 0, 68, 7, 68, 8, 0, 32, 68, 8,
+    68, 0, 8, 68, 8, 132, 8, 0, 68, 32, 0, 68, 0, 32, 0, 68, 8, 0, 32, 0,
+    32, 0, 32, 0, 32, 0, 68, 0, 68, 8, 68, 0, 8, 0, 8, 132, 0, 68, 0, 32,
+    0, 32, 0, 68, 0, 32, 0, 68, 0, 68, 8, 0, 68, 0, 8, 68, 0, 68, 0, 68,
+    0, 68, 0, 68, 0, 68, 0, 68, 8, 0, 32, 0, 32, 0, 32, 0, 32, 0, 68, 0,
+    8, 68, 0, 68, 8, 0, 8, 132, 0, 68, 0, 32, 68, 0, 68, 8, 0, 32, 0, 32,
+    0, 32, 0, 32, 0, 68, 0, 68, 8, 68, 0, 8, 0, 8, 132, 0, 68, 0, 32, 0,
+    32, 0, 68, 0, 32, 0, 68, 0, 68, 8, 68, 8, 0, 8, 0, 8, 68, 0, 68, 0,
+    68, 8, 68, 0, 32, 0, 32, 0, 68, 0, 68, 8, 0, 68, 0, 68, 132, 0, 68, 0,
+    32, 0, 68, 0, 68, 8, 0, 68, 0, 8, 68, 8, 68, 8, 0, 68, 0, 68, 0, 68,
+    0, 68, 0, 8, 0, 68, 8, 0, 32, 68, 0, 68, 8, 68, 0, 8, 0, 8, 132, 7,
+    0, 68, 0, 68, 0, 68, 8, 0, 68, 0, 68, 8, 68, 0, 68, 0, 8, 68, 0, 8,
+    0, 68, 0, 8, 68, 0, 68, 0, 68, 0, 8, 68, 0, 68, 0, 68, 0, 68, 0, 68,
+    0, 68, 0, 8, 0, 68, 8, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 32, 0, 68,
+    8, 68, 0, 132, 68, 8, 68, 32, 0, 32, 8, 68, 32, 68, 32, 0, 32, 0, 32, 68,
+    32, 68, 0, 8, 68, 0, 68, 32, 0, 68, 0, 9, 10, 11, 0, 68, 0, 68, 0, 68,
+    0, 68, 0, 68, 0, 32, 68, 8, 68, 8, 68, 8, 68, 132, 68, 0, 68, 0, 68, 3,
+    68, 0, 68, 0, 68, 0, 68, 8, 68, 8, 0, 8, 68, 8, 68, 0, 68, 8, 68, 0,
+    32, 8, 68, 8, 68, 0, 132, 0, 68, 0, 68, 8, 68, 0, 68, 0, 68, 0, 68, 8,
+    0, 32, 0, 32, 68, 8, 68, 132, 32, 0, 68, 0, 68, 8, 32, 8, 68, 8, 68, 132,
+    68, 32, 0, 32, 0, 68, 8, 68, 8, 68, 8, 68, 0, 8, 68, 8, 68, 0, 68, 0,
+    68, 8, 68, 0, 68, 0, 68, 128, 8, 68, 0, 68, 0, 3, 4, 69, 3, 0, 3, 0,
+    16, 0, 16, 0, 3, 0, 68, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0,
+    16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0,
+    16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0,
+    16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0,
+    16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0,
+    16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0,
+    16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0,
+    16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0,
+    16, 0, 16, 0, 16, 0, 68, 0, 68, 0, 68, 0, 68, 16, 0, 16, 0, 68, 0, 16,
+    0, 16, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 8, 68, 8,
+    0, 68, 0, 8, 0, 8, 68, 0, 68, 0, 68, 0, 68, 0, 68, 8, 68, 0, 9, 0,
+    68, 8, 0, 32, 0, 32, 68, 8, 68, 8, 68, 8, 132, 0, 32, 68, 0, 32, 0, 32,
+    0, 68, 8, 68, 8, 68, 0, 68, 0, 68, 8, 0, 32, 0, 32, 0, 32, 0, 68, 0,
+    32, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 32, 8, 68, 8, 0, 8, 132, 0,
+    32, 0, 8, 68, 8, 68, 8, 0, 8, 68, 0, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12, 13, 12,
+    13, 12, 13, 12, 13, 12, 13, 12, 13, 0, 10, 0, 11, 0, 68, 0, 68, 0, 68, 0,
+    3, 0, 68, 0, 3, 0, 68, 0, 68, 0, 68, 0, 32, 68, 0, 68, 0, 68, 32, 0,
+    32, 0, 32, 0, 68, 0, 132, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0,
+    68, 0, 68, 0, 8, 68, 8, 0, 68, 0, 68, 0, 68, 0, 68, 8, 0, 8, 68, 8,
+    68, 0, 7, 0, 68, 0, 7, 0, 68, 32, 68, 8, 68, 132, 68, 0, 32, 8, 32, 0,
+    68, 0, 68, 8, 0, 8, 68, 8, 68, 0, 7, 0, 68, 0, 8, 68, 0, 8, 68, 8,
+    68, 0, 68, 0, 68, 0, 68, 8, 68, 0, 68, 8, 0, 68, 0, 68, 8, 68, 8, 0,
+    8, 0, 8, 68, 0, 68, 0, 8, 0, 68, 0, 68, 0, 32, 0, 32, 0, 32, 0, 32,
+    0, 68, 8, 68, 0, 68, 0, 68, 0, 68, 8, 0, 8, 68, 132, 7, 68, 0, 68, 0,
+    8, 68, 8, 68, 8, 68, 0, 68, 0, 68, 8, 68, 8, 68, 8, 68, 8, 68, 8, 68,
+    0, 68, 8, 68, 0, 8, 68, 8, 68, 0, 68, 0, 8, 68, 8, 68, 8, 68, 0, 68,
+    8, 68, 8, 68, 0, 68, 8, 68, 0, 68, 8, 68, 0, 8, 68, 8, 68, 0, 32, 0,
+    32, 0, 32, 0, 32, 0, 32, 68, 8, 0, 8, 0, 68, 132, 7, 8, 7, 8, 68, 0,
+    8, 68, 0, 68, 8, 68, 0, 8, 0, 32, 68, 32, 68, 8, 128, 68, 0, 132, 0, 32,
+    68, 8, 68, 32, 7, 68, 8, 68, 132, 0, 32, 0, 68, 8, 68, 8, 68, 8, 0, 8,
+    68, 0, 68, 8, 68, 0, 68, 0, 8, 68, 8, 68, 8, 68, 0, 68, 0, 68, 0, 68,
+    0, 68, 7, 68, 0, 8, 0, 68, 0, 8, 68, 8, 68, 0, 68, 32, 0, 68, 8, 0,
+    68, 7, 8, 32, 0, 32, 8, 68, 0, 8, 68, 132, 0, 68, 0, 3, 68, 0, 68, 0,
+    68, 8, 68, 0, 68, 0, 68, 0, 10, 0, 10, 0, 68, 0, 8, 0, 68, 0, 68, 0,
+    68, 0, 68, 0, 3, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 3, 68, 0, 68, 0,
+    68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0,
+    68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0,
+    68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 68, 0, 16, 0,
+    16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0,
+    16, 6, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16,
+    0, 16, 0, 16, 0, 16, 0, 16, 68, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16,
+    0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16,
+    0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16,
+    0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16,
+    0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 16, 0, 3, 68, 3,
+    68, 3, 0,
+)
@@ -0,0 +1,264 @@
+"""
+Deduplicated admin alerts, delivered from a background queue.
+
+send_error_alert() used to email synchronously from the failing code path,
+once per failure on every run, re-reading the whole log each time. Now:
+
+  dedup      errors are grouped by fingerprint (the message with numbers
+             masked, so "Failed to post Raindrop 123" and "... 456" match).
+             The first occurrence of a fingerprint is mailed; repeats within
+             ALERT_INTERVAL_SECONDS (default 3600) are only counted, and go
+             out as one digest ("N similar errors since ...") once the
+             interval has passed, with the next occurrence or at the end of a
+             run (flush_due). State is kept in a JSON state file (see
+             state_file) in the logs directory, so consecutive cron runs
+             share it.
+  delivery   alert() only enqueues. A worker thread folds what arrives within
+             ALERT_BATCH_SECONDS (default 2) of an alert into one email with a
+             single log tail, and sends it over a reused SMTP connection
+             (closed after ALERT_SMTP_IDLE_SECONDS idle). shutdown() flushes
+             due digests and waits for the queue to drain; it also runs at
+             interpreter exit.
+
+A delivery failure is logged, never raised: alerting must not break a run.
+"""
+
+import atexit
+import os
+import queue
+import re
+import threading
+import time
+from datetime import datetime
+from src.utils import email_handler, state_file
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+ALERT_STATE_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    'logs',
+    'alert_state.json'
+)
+
+DEFAULT_INTERVAL_SECONDS = 3600
+DEFAULT_SMTP_IDLE_SECONDS = 30
+DEFAULT_BATCH_SECONDS = 2
+DEFAULT_LOG_LINES = 50
+
+# Distinct example messages kept per fingerprint for its digest
+MAX_SAMPLES = 5
+
+# Fingerprints not seen for this many intervals are dropped from the state file
+FORGET_AFTER_INTERVALS = 24
+
+_DIGITS = re.compile(r'\d+')
+
+_clock = time.time
+
+_lock = threading.Lock()
+_queue: queue.Queue = queue.Queue()
+_worker = None
+_STOP = object()
+_counters = {"alerts": 0, "queued": 0, "suppressed": 0, "emails": 0, "failed": 0}
+_mailer_stats = {"connections": 0}
+
+
+def _interval() -> float:
+    return float(os.getenv('ALERT_INTERVAL_SECONDS', str(DEFAULT_INTERVAL_SECONDS)))
+
+
+def fingerprint(message: str) -> str:
+    """Key under which repeats of `message` are coalesced."""
+    return _DIGITS.sub('#', message.strip())[:300]
+
+
+def _timestamp(seconds: float) -> str:
+    return datetime.fromtimestamp(seconds).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _digest(entry: dict, message: str | None) -> dict:
+    """A queued email section: `message` now, plus what was held back since the last one."""
+    return {
+        "message": message or entry['samples'][-1],
+        "suppressed": entry['suppressed'],
+        "samples": [sample for sample in entry['samples'] if sample != message],
+        "since": entry['last_sent'],
+    }
+
+
+def _send_digest(entry: dict, message: str | None, now: float) -> dict:
+    digest = _digest(entry, message)
+    entry.update(last_sent=now, suppressed=0, samples=[])
+    return digest
+
+
+def _prune(state: dict, now: float) -> None:
+    horizon = _interval() * FORGET_AFTER_INTERVALS
+    for key in [key for key, entry in state.items()
+                if not entry['suppressed'] and now - entry['last_seen'] > horizon]:
+        del state[key]
+
+
+def alert(message: str) -> bool:
+    """
+    Report an error to the admin, coalescing repeats (see module docstring).
+
+    Returns:
+        True if an email was queued, False if the error was only counted
+        toward a later digest.
+    """
+    now = _clock()
+    key = fingerprint(message)
+    with _lock:
+        _counters["alerts"] += 1
+    with state_file.update(ALERT_STATE_FILE, 'alert state') as state:
+        entry = state.get(key)
+        if entry is None or now - entry['last_sent'] >= _interval():
+            entry = entry or {"last_sent": None, "suppressed": 0, "samples": []}
+            digest = _send_digest(entry, message, now)
+            queued = True
+        else:
+            entry['suppressed'] += 1
+            if message not in entry['samples']:
+                entry['samples'] = (entry['samples'] + [message])[-MAX_SAMPLES:]
+            with _lock:
+                _counters["suppressed"] += 1
+            queued = False
+        entry['last_seen'] = now
+        state[key] = entry
+        _prune(state, now)
+    if queued:
+        _enqueue(digest)
+    else:
+        logger.info(f"Alert held back ({entry['suppressed']} similar since {_timestamp(entry['last_sent'])}): {message}")
+    return queued
+
+
+def flush_due() -> int:
+    """
+    Queue digests for held-back errors whose interval has passed.
+
+    Returns:
+        Number of digests queued.
+    """
+    now = _clock()
+    digests = []
+    with state_file.update(ALERT_STATE_FILE, 'alert state') as state:
+        for entry in state.values():
+            if entry['suppressed'] and now - entry['last_sent'] >= _interval():
+                digests.append(_send_digest(entry, None, now))
+    for digest in digests:
+        _enqueue(digest)
+    return len(digests)
+
+
+def _enqueue(digest: dict) -> None:
+    global _worker
+    with _lock:
+        _counters["queued"] += 1
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run_worker, daemon=True, name="alert-sender")
+            _worker.start()
+    _queue.put(digest)
+
+
+def _compose(batch: list) -> tuple:
+    """Subject and body of one email covering every digest in `batch`."""
+    sections = []
+    for digest in batch:
+        section = digest["message"]
+        if digest["suppressed"]:
+            section += (f"\n  ({digest['suppressed']} similar error(s) held back since "
+                        f"{_timestamp(digest['since'])})")
+            section += ''.join(f"\n  - {sample}" for sample in digest["samples"])
+        sections.append(section)
+    subject = email_handler.SUBJECT if len(batch) == 1 else f"{email_handler.SUBJECT} ({len(batch)} errors)"
+    log_lines = int(os.getenv('ALERT_LOG_LINES', str(DEFAULT_LOG_LINES)))
+    body = (
+        "An error occurred in the Bluesky Raindrop Poster:\n\n"
+        + "\n\n".join(sections)
+        + f"\n\nRecent log entries:\n\n{email_handler.get_last_log_entries(log_lines)}"
+    )
+    return subject, body
+
+
+def _run_worker() -> None:
+    mailer = email_handler.Mailer()
+    idle = float(os.getenv('ALERT_SMTP_IDLE_SECONDS', str(DEFAULT_SMTP_IDLE_SECONDS)))
+    batch_window = float(os.getenv('ALERT_BATCH_SECONDS', str(DEFAULT_BATCH_SECONDS)))
+    stopping = False
+    while not stopping:
+        try:
+            item = _queue.get(timeout=idle)
+        except queue.Empty:
+            mailer.close()
+            continue
+        items = [item]
+        # Fold a burst of errors (a failed post, then its tag removal) into one email
+        deadline = time.monotonic() + batch_window
+        while item is not _STOP:
+            try:
+                item = _queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            items.append(item)
+        stopping = any(item is _STOP for item in items)
+        batch = [item for item in items if item is not _STOP]
+        try:
+            if batch:
+                subject, body = _compose(batch)
+                mailer.send(subject, body)
+                with _lock:
+                    _counters["emails"] += 1
+                logger.info(f"Error alert email sent ({len(batch)} alert(s))")
+        except Exception as e:
+            with _lock:
+                _counters["failed"] += 1
+            logger.error(f"Failed to send error alert email: {e}")
+            mailer.close()
+        finally:
+            with _lock:
+                _mailer_stats["connections"] = mailer.connections
+            for _ in items:
+                _queue.task_done()
+    mailer.close()
+
+
+def shutdown(timeout: float = 30.0) -> bool:
+    """
+    Queue due digests, then wait up to `timeout` seconds for delivery to finish.
+
+    Returns:
+        True if the queue was drained (or there was nothing to send).
+    """
+    global _worker
+    flush_due()
+    with _lock:
+        worker = _worker
+        _worker = None
+    if worker is None or not worker.is_alive():
+        return True
+    _queue.put(_STOP)
+    worker.join(timeout)
+    if worker.is_alive():
+        logger.warning(f"Alert delivery still running after {timeout:.0f}s; unsent alerts may be lost")
+        return False
+    return True
+
+
+atexit.register(shutdown)
+
+
+def stats() -> dict:
+    """Snapshot: alerts reported, emails queued/sent/failed, repeats held back, SMTP connections."""
+    with _lock:
+        return {**_counters, "pending": _queue.qsize(), **_mailer_stats}
+
+
+def reset() -> None:
+    """Forget this process's counters (tests)."""
+    with _lock:
+        for key in _counters:
+            _counters[key] = 0
+        _mailer_stats["connections"] = 0
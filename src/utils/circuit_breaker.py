@@ -0,0 +1,198 @@
+"""
+Per-endpoint circuit breakers that survive process restarts.
+
+When Bluesky or Raindrop is down, every cron run would otherwise log in, time
+out and walk the whole retry ladder, then send an alert. A breaker per
+endpoint (one API as seen by one account, see endpoint_for) counts
+consecutive infrastructure failures (timeouts, dropped connections,
+502/503/504) seen by that endpoint's transport:
+
+  closed      calls go through; CIRCUIT_FAILURE_THRESHOLD failures in a row
+              (default 5) open the circuit
+  open        calls fail at once with CircuitOpenError and polls are skipped
+              until CIRCUIT_COOLDOWN_SECONDS (default 300) have passed
+  half_open   after the cool-down one call is let through as a probe; its
+              success closes the circuit, its failure opens it again
+
+Any answer from the server (including 4xx and 429) counts as the endpoint
+being up. State is kept in a JSON state file (see state_file) in the logs
+directory, so consecutive cron runs share it. Tenants use different
+accounts, so one tenant's failures never trip another tenant's breaker. A
+threshold of 0 disables the breakers.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from src.utils import state_file
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+BREAKER_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    'logs',
+    'circuit_breakers.json'
+)
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_COOLDOWN_SECONDS = 300
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+# Error classes (see retry.classify_error) that mean the endpoint is down
+FAILURE_CLASSES = ('timeout', 'network', 'server')
+
+_clock = time.time
+
+# Guards the in-process counters; the state file has its own lock
+_lock = threading.Lock()
+_counters: dict = {}
+
+
+class CircuitOpenError(Exception):
+    """A call was refused because its endpoint's circuit is open."""
+
+    def __init__(self, endpoint: str, retry_in: float):
+        super().__init__(f"{endpoint} circuit open; next probe in {retry_in:.0f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def _threshold() -> int:
+    return int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', str(DEFAULT_FAILURE_THRESHOLD)))
+
+
+def _cooldown() -> float:
+    return float(os.getenv('CIRCUIT_COOLDOWN_SECONDS', str(DEFAULT_COOLDOWN_SECONDS)))
+
+
+def endpoint_for(api: str, account: str) -> str:
+    """
+    Breaker name for `api` ('raindrop', 'bluesky') as used by one account.
+
+    The account (a Raindrop token, a Bluesky identifier) is hashed so names
+    are safe to log and to store.
+    """
+    digest = hashlib.sha256(account.encode('utf-8')).hexdigest()[:12]
+    return f"{api}:{digest}"
+
+
+def _count(endpoint: str, name: str) -> None:
+    with _lock:
+        row = _counters.setdefault(endpoint, {"trips": 0, "rejected": 0, "probes": 0})
+        row[name] += 1
+
+
+def _blocked_for(entry: dict, now: float) -> float:
+    """Seconds until `entry` lets a call through (0 when it does now)."""
+    if entry['state'] == OPEN:
+        return max(0.0, entry['opened_at'] + _cooldown() - now)
+    if entry['state'] == HALF_OPEN:
+        # A probe that never reported back (crashed run) is retried after a cool-down
+        return max(0.0, entry['probe_at'] + _cooldown() - now)
+    return 0.0
+
+
+def seconds_until_probe(endpoint: str) -> float:
+    """How long `endpoint` will keep refusing calls (0.0 if it accepts them now)."""
+    if _threshold() <= 0:
+        return 0.0
+    entry = state_file.load(BREAKER_FILE, 'circuit breaker').get(endpoint)
+    return _blocked_for(entry, _clock()) if entry else 0.0
+
+
+def check(endpoint: str) -> None:
+    """
+    Let a call to `endpoint` through, or refuse it.
+
+    In the half-open state the first caller becomes the probe; others are
+    refused until it reports back via record().
+
+    Raises:
+        CircuitOpenError if the circuit is open.
+    """
+    if _threshold() <= 0:
+        return
+    with state_file.update(BREAKER_FILE, 'circuit breaker') as states:
+        entry = states.get(endpoint)
+        if not entry or entry['state'] == CLOSED:
+            return
+        now = _clock()
+        wait = _blocked_for(entry, now)
+        if wait <= 0:
+            entry['state'] = HALF_OPEN
+            entry['probe_at'] = now
+            _count(endpoint, "probes")
+            logger.info(f"Circuit for {endpoint} half-open: letting one call through as a probe")
+            return
+        _count(endpoint, "rejected")
+    raise CircuitOpenError(endpoint, wait)
+
+
+def record(endpoint: str, error_class: str | None = None, detail=None) -> None:
+    """
+    Report how a call to `endpoint` went.
+
+    Args:
+        endpoint: Breaker name (see endpoint_for).
+        error_class: None on success, else the call's error class; only
+            FAILURE_CLASSES count against the endpoint.
+        detail: The error, for the log line when the circuit opens.
+    """
+    threshold = _threshold()
+    if threshold <= 0:
+        return
+    failed = error_class in FAILURE_CLASSES
+    with state_file.update(BREAKER_FILE, 'circuit breaker') as states:
+        entry = states.get(endpoint)
+        if not failed:
+            if not entry or (entry['state'] == CLOSED and not entry['failures']):
+                return  # already healthy: no write
+            was = entry['state']
+            states[endpoint] = {"state": CLOSED, "failures": 0, "opened_at": None,
+                                "probe_at": None, "last_error": None}
+            if was != CLOSED:
+                logger.info(f"Circuit for {endpoint} closed: the endpoint is answering again")
+            return
+
+        entry = states.setdefault(endpoint, {"state": CLOSED, "failures": 0, "opened_at": None,
+                                             "probe_at": None, "last_error": None})
+        entry['failures'] += 1
+        entry['last_error'] = repr(detail)[:200] if detail is not None else error_class
+        opened = entry['state'] == HALF_OPEN or (entry['state'] == CLOSED and entry['failures'] >= threshold)
+        if opened:
+            entry['state'] = OPEN
+            entry['opened_at'] = _clock()
+            entry['probe_at'] = None
+            _count(endpoint, "trips")
+        failures = entry['failures']
+    if opened:
+        logger.warning(
+            f"Circuit for {endpoint} opened after {failures} consecutive failure(s) "
+            f"(last: {entry['last_error']}); skipping calls for {_cooldown():.0f}s"
+        )
+
+
+def stats() -> dict:
+    """Per-endpoint snapshot: persisted state plus this process's trip/rejection counters."""
+    states = state_file.load(BREAKER_FILE, 'circuit breaker')
+    now = _clock()
+    with _lock:
+        snapshot = {}
+        for endpoint in set(states) | set(_counters):
+            entry = states.get(endpoint) or {"state": CLOSED, "failures": 0}
+            snapshot[endpoint] = {
+                "state": entry['state'],
+                "failures": entry['failures'],
+                "seconds_until_probe": _blocked_for(entry, now) if entry['state'] != CLOSED else 0.0,
+                **_counters.get(endpoint, {"trips": 0, "rejected": 0, "probes": 0}),
+            }
+        return snapshot
+
+
+def reset() -> None:
+    """Forget this process's counters (tests)."""
+    with _lock:
+        _counters.clear()
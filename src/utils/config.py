@@ -1,12 +1,37 @@
 # src/utils/config.py
 
+import json
 import os
+import re
 from dotenv import load_dotenv
 import logging
 
+# Account credentials: required unless TENANTS_FILE supplies them per tenant
+ACCOUNT_VARS = ('RAINDROP_TOKEN', 'BLUESKY_IDENTIFIER', 'BLUESKY_PASSWORD')
+
+# Tenant keys in TENANTS_FILE and the config entries they set for that tenant
+TENANT_KEYS = {
+    'raindrop_token': 'RAINDROP_TOKEN',
+    'bluesky_identifier': 'BLUESKY_IDENTIFIER',
+    'bluesky_password': 'BLUESKY_PASSWORD',
+    'tag': 'RAINDROP_TAG',
+    'max_posts_per_run': 'MAX_POSTS_PER_RUN',
+    'post_spacing_seconds': 'POST_SPACING_SECONDS',
+}
+_TENANT_REQUIRED = ('raindrop_token', 'bluesky_identifier', 'bluesky_password')
+
+# Tenant names become directory names under logs/tenants/
+_TENANT_NAME = re.compile(r'[A-Za-z0-9][A-Za-z0-9_.-]{0,63}')
+
+# "${VAR}" values in TENANTS_FILE are read from the environment
+_ENV_REFERENCE = re.compile(r'\$\{(\w+)\}')
+
 def load_config():
     load_dotenv()
     
+    # Multi-tenant mode: the account pairs come from TENANTS_FILE instead
+    tenants_file = os.getenv('TENANTS_FILE') or None
+
     required_vars = [
         'RAINDROP_TOKEN',
         'BLUESKY_IDENTIFIER',
@@ -22,6 +47,9 @@ def load_config():
     config = {}
     for var in required_vars:
         value = os.getenv(var)
+        if not value and tenants_file and var in ACCOUNT_VARS:
+            config[var] = None
+            continue
         if not value:
             raise ValueError(f"Missing required environment variable: {var}")
         config[var] = value
@@ -30,10 +58,100 @@ def load_config():
     # no .env change. Set RAINDROP_TAG to adopt the tool with your own tag.
     config['RAINDROP_TAG'] = os.getenv('RAINDROP_TAG', 'toskeet')
 
+    # Poll interval for --daemon mode (ignored by cron-driven runs).
+    config['POLL_INTERVAL_SECONDS'] = int(os.getenv('POLL_INTERVAL_SECONDS', '600'))
+
+    # Batch posting: how many pending Raindrops one run may post, and the
+    # minimum gap between consecutive posts so a backlog doesn't flood the feed.
+    config['MAX_POSTS_PER_RUN'] = max(1, int(os.getenv('MAX_POSTS_PER_RUN', '5')))
+    config['POST_SPACING_SECONDS'] = max(0.0, float(os.getenv('POST_SPACING_SECONDS', '30')))
+
+    # Run deadline: once a poll has run this long its retries give up and
+    # rate-limit waits are cut short, whatever each call's own budget. 0 disables.
+    config['RUN_DEADLINE_SECONDS'] = max(0.0, float(os.getenv('RUN_DEADLINE_SECONDS', '300')))
+
+    # Raindrop listing pagination. Page size defaults to the batch size plus a
+    # little headroom; pages are fetched lazily up to RAINDROP_MAX_PAGES.
+    perpage = os.getenv('RAINDROP_PERPAGE')
+    config['RAINDROP_PERPAGE'] = int(perpage) if perpage else None
+    config['RAINDROP_MAX_PAGES'] = max(1, int(os.getenv('RAINDROP_MAX_PAGES', '10')))
+
+    # Idle-poll watermark: a one-page probe is compared with the mark left by
+    # the last empty fetch; a full fetch is still forced once the mark is this
+    # old (retries stuck-tag self-heal). 0 disables the probe.
+    config['WATERMARK_MAX_AGE_SECONDS'] = max(0, int(os.getenv('WATERMARK_MAX_AGE_SECONDS', '3600')))
+
+    # Multi-tenant mode: one process serves every tenant in TENANTS_FILE on a
+    # pool of TENANT_WORKERS threads (see load_tenants and tenant_pool).
+    config['TENANTS_FILE'] = tenants_file
+    config['TENANT_WORKERS'] = max(1, int(os.getenv('TENANT_WORKERS', '4')))
+
     # Convert SMTP_PORT to integer
     config['SMTP_PORT'] = int(config['SMTP_PORT'])
     
     # Convert LOG_LEVEL to logging level
     config['LOG_LEVEL'] = getattr(logging, config['LOG_LEVEL'].upper(), logging.INFO)
     
-    return config
\ No newline at end of file
+    return config
+
+
+def load_tenants(config):
+    """
+    Build one config per tenant listed in config['TENANTS_FILE'].
+
+    The file is JSON: {"tenants": [{"name": ..., "raindrop_token": ...,
+    "bluesky_identifier": ..., "bluesky_password": ..., "tag": ...}, ...]}.
+    Each tenant starts from `config` and overrides the keys in TENANT_KEYS;
+    credentials are required, the rest fall back to the global settings. A
+    value written as "${VAR}" is read from the environment so secrets can
+    stay in .env. The tenant's name is stored as config['TENANT'] and
+    namespaces its posted tracker and watermark.
+
+    Returns:
+        A list of tenant configs, or [] when TENANTS_FILE is not set.
+    Raises:
+        ValueError if the file can't be read or a tenant entry is invalid.
+    """
+    path = config.get('TENANTS_FILE')
+    if not path:
+        return []
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Could not read TENANTS_FILE {path}: {e}")
+
+    entries = data.get('tenants') if isinstance(data, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"TENANTS_FILE {path} must list at least one tenant under 'tenants'")
+
+    tenants = []
+    for entry in entries:
+        name = entry.get('name') if isinstance(entry, dict) else None
+        if not isinstance(name, str) or not _TENANT_NAME.fullmatch(name):
+            raise ValueError(f"Invalid tenant name {name!r} in {path}: use up to 64 letters, digits, '.', '_' or '-'")
+        if any(t['TENANT'] == name for t in tenants):
+            raise ValueError(f"Duplicate tenant name {name!r} in {path}")
+        unknown = set(entry) - set(TENANT_KEYS) - {'name'}
+        if unknown:
+            raise ValueError(f"Unknown key(s) {sorted(unknown)} for tenant {name!r} in {path}")
+
+        tenant = dict(config)
+        tenant['TENANT'] = name
+        for key, config_key in TENANT_KEYS.items():
+            value = entry.get(key)
+            if isinstance(value, str):
+                reference = _ENV_REFERENCE.fullmatch(value)
+                if reference:
+                    value = os.getenv(reference.group(1))
+                    if not value:
+                        raise ValueError(f"Tenant {name!r}: environment variable {reference.group(1)} for {key} is not set")
+            if value in (None, ''):
+                if key in _TENANT_REQUIRED:
+                    raise ValueError(f"Tenant {name!r} in {path} is missing {key}")
+                continue
+            tenant[config_key] = value
+        tenant['MAX_POSTS_PER_RUN'] = max(1, int(tenant['MAX_POSTS_PER_RUN']))
+        tenant['POST_SPACING_SECONDS'] = max(0.0, float(tenant['POST_SPACING_SECONDS']))
+        tenants.append(tenant)
+    return tenants
@@ -1,51 +1,156 @@
 # src/utils/email_handler.py
+"""
+SMTP delivery for admin alerts, and the log tail attached to them.
+
+get_last_log_entries() seeks backwards from the end of the log in blocks
+instead of reading the whole file, so its cost doesn't grow with the log.
+A Mailer keeps one SMTP connection open across messages (the alert worker in
+`alerting` sends through one) and reconnects when the server has dropped it.
+
+SMTP settings are read from the environment when a connection is opened;
+SMTP_SECURITY picks the transport: 'ssl' (default, implicit TLS as on port
+465), 'starttls' (port 587) or 'none' (local relays).
+"""
+import os
 import smtplib
+import ssl
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from src.utils.config import load_config
-from src.utils.logging_config import get_logger
-import os
+from src.utils.logging_config import LOG_FILE, get_logger
 
 logger = get_logger(__name__)
 
+SUBJECT = "Error in Bluesky Raindrop Poster"
+
+# Bytes read per backwards step when tailing the log
+TAIL_BLOCK_SIZE = 8192
+
+SMTP_TIMEOUT_SECONDS = 30
+
+
+def tail_lines(path: str, num_lines: int, block_size: int = TAIL_BLOCK_SIZE) -> str:
+    """Return the last `num_lines` lines of `path`, reading backwards from EOF."""
+    if num_lines <= 0:
+        return ''
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        position = f.tell()
+        chunks = []
+        newlines = 0
+        # One extra newline: the file's own trailing one doesn't start a line
+        while position > 0 and newlines <= num_lines:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            chunk = f.read(step)
+            chunks.append(chunk)
+            newlines += chunk.count(b'\n')
+    data = b''.join(reversed(chunks))
+    lines = data.splitlines(keepends=True)[-num_lines:]
+    return b''.join(lines).decode('utf-8', errors='replace')
+
+
 def get_last_log_entries(num_lines=50):
-    log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs')
-    log_file = os.path.join(log_dir, 'bluesky_raindrops.log')
-    
     try:
-        with open(log_file, 'r') as f:
-            lines = f.readlines()
-            return ''.join(lines[-num_lines:])
+        return tail_lines(LOG_FILE, num_lines)
     except Exception as e:
         logger.error(f"Error reading log file: {str(e)}")
         return "Unable to retrieve log entries."
 
-def send_email(error_message):
-    config = load_config()
-    
-    # Email configuration
-    sender_email = config['SMTP_LOGIN']
-    receiver_email = config['ADMIN_EMAIL']
-    password = config['SMTP_PASSWORD']
-
-    # Create message
-    message = MIMEMultipart()
-    message["From"] = sender_email
-    message["To"] = receiver_email
-    message["Subject"] = "Error in Bluesky Raindrop Poster"
 
-    # Get the last 50 log entries
-    log_entries = get_last_log_entries(50)
+def smtp_settings() -> dict:
+    """SMTP and recipient settings from the environment (see load_config)."""
+    return {
+        'server': os.getenv('SMTP_SERVER'),
+        'port': int(os.getenv('SMTP_PORT', '465')),
+        'login': os.getenv('SMTP_LOGIN'),
+        'password': os.getenv('SMTP_PASSWORD'),
+        'admin': os.getenv('ADMIN_EMAIL'),
+        'security': os.getenv('SMTP_SECURITY', 'ssl').lower(),
+    }
+
 
-    # Add body to email
-    body = f"An error occurred in the Bluesky Raindrop Poster:\n\n{error_message}\n\nRecent log entries:\n\n{log_entries}"
+def build_message(sender: str, receiver: str, subject: str, body: str) -> MIMEMultipart:
+    message = MIMEMultipart()
+    message["From"] = sender
+    message["To"] = receiver
+    message["Subject"] = subject
     message.attach(MIMEText(body, "plain"))
+    return message
+
+
+class Mailer:
+    """Sends messages over one reused SMTP connection."""
+
+    __slots__ = ('connections', '_server', '_settings')
+
+    def __init__(self):
+        self.connections = 0
+        self._server = None
+        self._settings = None
+
+    def _connect(self) -> None:
+        settings = self._settings = smtp_settings()
+        if settings['security'] == 'ssl':
+            server = smtplib.SMTP_SSL(settings['server'], settings['port'], timeout=SMTP_TIMEOUT_SECONDS)
+        else:
+            server = smtplib.SMTP(settings['server'], settings['port'], timeout=SMTP_TIMEOUT_SECONDS)
+            if settings['security'] == 'starttls':
+                server.starttls(context=ssl.create_default_context())
+        try:
+            if settings['login'] and settings['password']:
+                server.login(settings['login'], settings['password'])
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        self.connections += 1
 
-    # Create SMTP session
+    def _alive(self) -> bool:
+        try:
+            return self._server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def send(self, subject: str, body: str) -> None:
+        """
+        Send one message to ADMIN_EMAIL, opening or reopening the connection as needed.
+
+        Raises:
+            smtplib.SMTPException or OSError if it can't be delivered.
+        """
+        if self._server is not None and not self._alive():
+            self.close()
+        if self._server is None:
+            self._connect()
+        settings = self._settings
+        message = build_message(settings['login'], settings['admin'], subject, body)
+        try:
+            self._server.send_message(message)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            # Dropped between the health check and the send: one fresh connection
+            self.close()
+            self._connect()
+            self._server.send_message(message)
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+
+
+def send_email(error_message):
+    """Send one alert right away on its own connection (see alerting for the queued path)."""
+    body = f"An error occurred in the Bluesky Raindrop Poster:\n\n{error_message}\n\nRecent log entries:\n\n{get_last_log_entries(50)}"
+    mailer = Mailer()
     try:
-        with smtplib.SMTP_SSL(config['SMTP_SERVER'], config['SMTP_PORT']) as server:
-            server.login(sender_email, password)
-            server.send_message(message)
+        mailer.send(SUBJECT, body)
         logger.info("Error alert email sent successfully")
     except Exception as e:
         logger.error(f"Failed to send error alert email: {str(e)}")
+    finally:
+        mailer.close()
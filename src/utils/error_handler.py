@@ -1,12 +1,13 @@
 # src/utils/error_handler.py
 
-from src.utils.email_handler import send_email
+from src.utils import alerting
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 def send_error_alert(error_message):
+    """Queue an admin alert; repeats are coalesced and mail goes out in the background (see alerting)."""
     try:
-        send_email(error_message)
+        alerting.alert(error_message)
     except Exception as e:
-        logger.exception(f"Failed to send error alert email: {str(e)}")
\ No newline at end of file
+        logger.exception(f"Failed to queue error alert: {str(e)}")
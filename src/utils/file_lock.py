@@ -4,6 +4,10 @@ Simple file-based lock to prevent concurrent script execution.
 
 Uses a lock file with the PID of the running process. Stale locks
 (from crashed processes) are automatically detected and cleaned up.
+
+Besides the script lock, each tenant's poll in multi-tenant mode holds its
+own lock (tenant_lock_file), so a tenant still polling in one process is
+skipped by any other process that would poll it too.
 """
 
 import os
@@ -21,11 +25,16 @@ LOCK_FILE = os.path.join(
     'raindrop_bot.lock'
 )
 
-# Maximum age of a lock file before considering it stale (seconds)
-# Set to 10 minutes - longer than any reasonable run
+# Maximum age of a lock file before considering it stale (seconds).
+# A run longer than this (a big batch) restamps its lock with refresh_lock().
 STALE_LOCK_SECONDS = 600
 
 
+def tenant_lock_file(namespace: str) -> str:
+    """Lock file for one tenant's poll, next to its tracker under logs/tenants/."""
+    return os.path.join(os.path.dirname(LOCK_FILE), 'tenants', namespace, 'poll.lock')
+
+
 def _is_process_running(pid: int) -> bool:
     """Check if a process with the given PID is still running."""
     try:
@@ -35,11 +44,11 @@ def _is_process_running(pid: int) -> bool:
         return False
 
 
-def _read_lock() -> tuple[int | None, float | None]:
+def _read_lock(path: str) -> tuple[int | None, float | None]:
     """Read the lock file and return (pid, timestamp) or (None, None)."""
     try:
-        if os.path.exists(LOCK_FILE):
-            with open(LOCK_FILE, 'r') as f:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
                 content = f.read().strip()
                 if content:
                     parts = content.split(':')
@@ -50,35 +59,42 @@ def _read_lock() -> tuple[int | None, float | None]:
     return None, None
 
 
-def _write_lock() -> bool:
+def _write_lock(path: str) -> bool:
     """Write current PID and timestamp to lock file."""
     try:
-        os.makedirs(os.path.dirname(LOCK_FILE), exist_ok=True)
-        with open(LOCK_FILE, 'w') as f:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Replaced whole, so a concurrent reader never sees a half-written lock
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
             f.write(f"{os.getpid()}:{time.time()}")
+        os.replace(tmp_path, path)
         return True
     except IOError as e:
         logger.error(f"Could not write lock file: {e}")
         return False
 
 
-def _remove_lock() -> None:
+def _remove_lock(path: str) -> None:
     """Remove the lock file."""
     try:
-        if os.path.exists(LOCK_FILE):
-            os.remove(LOCK_FILE)
+        if os.path.exists(path):
+            os.remove(path)
     except IOError as e:
         logger.warning(f"Could not remove lock file: {e}")
 
 
-def acquire_lock() -> bool:
+def acquire_lock(path: str | None = None) -> bool:
     """
     Attempt to acquire the lock.
-    
+
+    Args:
+        path: Lock file (default: the script lock, LOCK_FILE).
+
     Returns:
         True if lock acquired, False if another instance is running.
     """
-    pid, timestamp = _read_lock()
+    path = path or LOCK_FILE
+    pid, timestamp = _read_lock(path)
     
     if pid is not None:
         # Check if the lock is stale
@@ -86,27 +102,44 @@ def acquire_lock() -> bool:
         
         if lock_age > STALE_LOCK_SECONDS:
             logger.warning(f"Found stale lock (age: {lock_age:.0f}s), removing it")
-            _remove_lock()
+            _remove_lock(path)
         elif _is_process_running(pid):
             logger.warning(f"Another instance is already running (PID: {pid})")
             return False
         else:
             logger.warning(f"Found orphaned lock from dead process (PID: {pid}), removing it")
-            _remove_lock()
+            _remove_lock(path)
     
-    return _write_lock()
+    return _write_lock(path)
+
+
+def refresh_lock(path: str | None = None) -> bool:
+    """
+    Restamp a lock this process holds, so a long run never looks stale.
+
+    Args:
+        path: Lock file (default: the script lock, LOCK_FILE).
+
+    Returns:
+        True if the lock was ours and has been restamped.
+    """
+    path = path or LOCK_FILE
+    pid, _ = _read_lock(path)
+    if pid != os.getpid():
+        return False
+    return _write_lock(path)
 
 
-def release_lock() -> None:
+def release_lock(path: str | None = None) -> None:
     """Release the lock (remove the lock file)."""
-    _remove_lock()
+    _remove_lock(path or LOCK_FILE)
     logger.debug("Lock released")
 
 
 @contextmanager
-def script_lock():
+def script_lock(path: str | None = None):
     """
-    Context manager for script locking.
+    Context manager for script locking (or, given `path`, any other lock file).
     
     Usage:
         with script_lock() as acquired:
@@ -114,9 +147,9 @@ def script_lock():
                 return  # Another instance is running
             # ... do work ...
     """
-    acquired = acquire_lock()
+    acquired = acquire_lock(path)
     try:
         yield acquired
     finally:
         if acquired:
-            release_lock()
+            release_lock(path)
@@ -0,0 +1,188 @@
+"""
+Extended grapheme cluster segmentation (Unicode UAX #29).
+
+Bluesky's 300-character limit counts grapheme clusters, so a flag, a ZWJ
+family emoji or a Devanagari conjunct each count once. grapheme_boundaries()
+walks a string once, applies the GB3–GB999 rules and returns the end offset
+of every cluster; counting and truncation are then plain lookups into that
+tuple. Results are cached per string, because the formatter measures the
+same text several times while fitting a post.
+
+Pure-ASCII text takes a fast path: every character is its own cluster
+except CR LF, so no per-character work is needed.
+
+Property data lives in _grapheme_data.py, generated from the UCD by
+scripts/gen_grapheme_data.py.
+"""
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from src.utils._grapheme_data import RANGE_STARTS, RANGE_VALUES, UNICODE_VERSION
+
+# Grapheme_Cluster_Break codes (low 4 bits of RANGE_VALUES)
+OTHER = 0
+CR = 1
+LF = 2
+CONTROL = 3
+EXTEND = 4
+ZWJ = 5
+REGIONAL_INDICATOR = 6
+PREPEND = 7
+SPACING_MARK = 8
+L = 9
+V = 10
+T = 11
+LV = 12
+LVT = 13
+
+GCB_MASK = 0x0F
+EXT_PICT = 0x10
+INCB_CONSONANT = 0x20
+INCB_EXTEND = 0x40
+INCB_LINKER = 0x80
+
+__all__ = ["UNICODE_VERSION", "grapheme_boundaries", "count_graphemes", "truncate_graphemes"]
+
+_CONTROLS = (CR, LF, CONTROL)
+_HANGUL_AFTER_L = (L, V, LV, LVT)
+_HANGUL_V_T = (V, T)
+_HANGUL_LV_V = (LV, V)
+_HANGUL_LVT_T = (LVT, T)
+
+class _PropsTable(dict):
+    """str.translate() table mapping each character to its property byte.
+
+    Filled on demand (a bisect into the range table) and capped, since real
+    text reuses a small alphabet.
+    """
+
+    MAX_ENTRIES = 8192
+
+    def __missing__(self, cp: int) -> int:
+        value = RANGE_VALUES[bisect_right(RANGE_STARTS, cp) - 1]
+        if len(self) < self.MAX_ENTRIES:
+            self[cp] = value
+        return value
+
+
+_PROPS = _PropsTable()
+
+# Characters with property byte 0 (GCB=Other, no emoji/InCB flags) always
+# start a new cluster unless they follow a Prepend, and reset every rule's
+# state; only runs of other characters need the rule machine.
+_COMPLEX_RUN = re.compile('[^\x00]+')
+
+
+def _segment_run(codes: str, start: int, stop: int, ends: list) -> None:
+    """Append cluster breaks inside codes[start:stop], a run of non-Other characters."""
+    if start == 0:
+        prev = ord(codes[0])
+        start = 1
+    else:
+        prev = ord(codes[start - 1])
+    prev_gcb = prev & GCB_MASK
+    # GB9c: prev ends a Linker [Extend Linker]* run
+    linked = bool(prev & INCB_LINKER)
+    # GB11: 0 = none, 1 = ExtPict Extend*, 2 = ExtPict Extend* ZWJ
+    emoji = 1 if prev & EXT_PICT else 0
+    # GB12/13: count of consecutive Regional_Indicators ending at prev
+    ri = 1 if prev_gcb == REGIONAL_INDICATOR else 0
+
+    for i in range(start, stop):
+        cur = ord(codes[i])
+        gcb = cur & GCB_MASK
+
+        if prev_gcb == CR and gcb == LF:                       # GB3
+            boundary = False
+        elif prev_gcb in _CONTROLS or gcb in _CONTROLS:        # GB4, GB5
+            boundary = True
+        elif prev_gcb == L and gcb in _HANGUL_AFTER_L:         # GB6
+            boundary = False
+        elif prev_gcb in _HANGUL_LV_V and gcb in _HANGUL_V_T:  # GB7
+            boundary = False
+        elif prev_gcb in _HANGUL_LVT_T and gcb == T:           # GB8
+            boundary = False
+        elif gcb == EXTEND or gcb == ZWJ or gcb == SPACING_MARK or prev_gcb == PREPEND:  # GB9, GB9a, GB9b
+            boundary = False
+        elif linked and cur & INCB_CONSONANT:                  # GB9c
+            boundary = False
+        elif emoji == 2 and cur & EXT_PICT:                    # GB11
+            boundary = False
+        elif gcb == REGIONAL_INDICATOR and ri % 2 == 1:        # GB12, GB13
+            boundary = False
+        else:                                                  # GB999
+            boundary = True
+
+        if boundary:
+            ends.append(i)
+
+        linked = bool(cur & INCB_LINKER or (linked and cur & INCB_EXTEND))
+
+        if cur & EXT_PICT:
+            emoji = 1
+        elif emoji == 1 and gcb == ZWJ:
+            emoji = 2
+        elif not (emoji == 1 and gcb == EXTEND):
+            emoji = 0
+
+        ri = ri + 1 if gcb == REGIONAL_INDICATOR else 0
+        prev_gcb = gcb
+
+
+def _segment(text: str) -> tuple:
+    codes = text.translate(_PROPS)
+    ends = []
+    pos = 0  # start of the pending run of Other characters
+    for match in _COMPLEX_RUN.finditer(codes):
+        start, stop = match.span()
+        if pos < start:
+            first = pos if pos and ord(codes[pos - 1]) & GCB_MASK != PREPEND else pos + 1
+            ends.extend(range(max(first, 1), start))
+        _segment_run(codes, start, stop, ends)
+        pos = stop
+    if pos < len(codes):
+        first = pos if pos and ord(codes[pos - 1]) & GCB_MASK != PREPEND else pos + 1
+        ends.extend(range(max(first, 1), len(codes)))
+    ends.append(len(codes))
+    return tuple(ends)
+
+
+@lru_cache(maxsize=1024)
+def grapheme_boundaries(text: str) -> tuple:
+    """
+    End offsets of each grapheme cluster in `text`.
+
+    Cluster n is text[ends[n-1]:ends[n]] (starting at 0), so len(ends) is the
+    grapheme count and text[:ends[k-1]] is the first k clusters. Returns ()
+    for an empty string.
+    """
+    if not text:
+        return ()
+    if text.isascii() and '\r\n' not in text:
+        return tuple(range(1, len(text) + 1))
+    return _segment(text)
+
+
+def count_graphemes(text: str) -> int:
+    """Number of extended grapheme clusters in `text`."""
+    if text.isascii():
+        return len(text) - text.count('\r\n')
+    return len(grapheme_boundaries(text))
+
+
+def truncate_graphemes(text: str, limit: int, suffix: str = "") -> str:
+    """
+    Cut `text` to at most `limit` grapheme clusters, suffix included.
+
+    Text that already fits is returned unchanged (without the suffix).
+    Clusters are never split, so a flag or ZWJ sequence is kept or dropped
+    whole.
+    """
+    ends = grapheme_boundaries(text)
+    if len(ends) <= limit:
+        return text
+    keep = limit - count_graphemes(suffix)
+    if keep <= 0:
+        return suffix
+    return text[:ends[keep - 1]] + suffix
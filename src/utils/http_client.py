@@ -0,0 +1,126 @@
+"""
+Shared, pooled HTTP session for Raindrop API and image traffic.
+
+Module-level `requests.get`/`requests.put` open a fresh TCP+TLS connection
+per call. Routing every request through one `requests.Session` keeps
+connections alive and reuses them across the listing, tag GET/PUT, cover
+download and rdl.ink fallback — and, in --daemon mode, across polls.
+
+Settings (all optional, read from the environment on first use):
+    HTTP_TIMEOUT_SECONDS   default timeout for every request (15)
+    HTTP_POOL_MAXSIZE      max keep-alive connections per host (4); raised to
+                           TENANT_WORKERS in multi-tenant mode, since every
+                           tenant worker talks to api.raindrop.io at once
+    HTTP_USER_AGENT        User-Agent sent to APIs (project identifier)
+"""
+
+import os
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 15
+
+# Number of distinct hosts to keep pools for (Raindrop API, rdl.ink, and a
+# handful of image hosts) and connections allowed per host.
+POOL_HOSTS = 10
+DEFAULT_POOL_MAXSIZE = 4
+
+DEFAULT_USER_AGENT = "bluesky-raindrops (+https://github.com/billallison/bluesky_raindrops)"
+
+# Image hosts and CDNs often refuse obvious bot User-Agents, so cover-image
+# downloads present a browser UA instead of DEFAULT_USER_AGENT.
+BROWSER_USER_AGENTS = [
+    'Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1'
+]
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _pool_maxsize() -> int:
+    """Per-host pool size: HTTP_POOL_MAXSIZE, but at least one connection per tenant worker."""
+    pool_maxsize = int(os.getenv('HTTP_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE))
+    if os.getenv('TENANTS_FILE'):
+        workers = max(1, int(os.getenv('TENANT_WORKERS', '4')))
+        if workers > pool_maxsize:
+            # With pool_block=True, workers beyond the pool size would wait for a
+            # connection, and that wait would count toward their timeouts
+            logger.info(f"HTTP_POOL_MAXSIZE={pool_maxsize} is below TENANT_WORKERS={workers}; "
+                        f"using {workers} connections per host")
+            pool_maxsize = workers
+    return pool_maxsize
+
+
+class PooledSession(requests.Session):
+    """A `requests.Session` that applies a default timeout to every request."""
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT_SECONDS):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+def create_session(
+    timeout: float | None = None,
+    pool_maxsize: int | None = None,
+    user_agent: str | None = None,
+) -> PooledSession:
+    """
+    Build a pooled session. Arguments default to the HTTP_* environment settings.
+
+    `pool_block=True` makes the per-host limit a hard cap: extra concurrent
+    requests wait for a free connection instead of opening (and discarding)
+    overflow connections. The cap is sized so tenant workers never queue
+    for one (see _pool_maxsize).
+    """
+    if timeout is None:
+        timeout = float(os.getenv('HTTP_TIMEOUT_SECONDS', DEFAULT_TIMEOUT_SECONDS))
+    if pool_maxsize is None:
+        pool_maxsize = _pool_maxsize()
+    if user_agent is None:
+        user_agent = os.getenv('HTTP_USER_AGENT', DEFAULT_USER_AGENT)
+
+    session = PooledSession(timeout=timeout)
+    # Retries are handled by the callers' own backoff logic, not urllib3's
+    adapter = HTTPAdapter(
+        pool_connections=POOL_HOSTS,
+        pool_maxsize=pool_maxsize,
+        pool_block=True,
+        max_retries=0,
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = user_agent
+    return session
+
+
+def get_session() -> PooledSession:
+    """Return the process-wide shared session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def close_session() -> None:
+    """Close the shared session's pooled connections (e.g. on daemon shutdown)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def browser_headers() -> dict:
+    """Request headers for fetching images from arbitrary publisher hosts."""
+    return {'User-Agent': random.choice(BROWSER_USER_AGENTS)}
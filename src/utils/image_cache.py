@@ -0,0 +1,218 @@
+"""
+On-disk cache of processed cover images.
+
+create_image_embed downloads, decodes, thumbnails and re-encodes the cover on
+every call — again on the next run after a failed post, and again for every
+link that shares a publisher's artwork. The final JPEG bytes are cached here,
+keyed by the normalized image URL, with the dimensions and the origin's
+ETag/Last-Modified validators alongside.
+
+An entry younger than IMAGE_CACHE_FRESH_SECONDS is served without a request;
+older entries are revalidated with a conditional GET (a 304 reuses the bytes)
+and refetched when they carry no validators. The directory is bounded by
+IMAGE_CACHE_MAX_BYTES and evicts least-recently-used entries (by mtime, which
+every hit refreshes). Settings are read on each call so values from `.env`
+(loaded after import) apply. IMAGE_CACHE_MAX_BYTES=0 disables the cache.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    'logs',
+    'image_cache'
+)
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_FRESH_SECONDS = 24 * 60 * 60
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "revalidated": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+
+def _cache_dir() -> str:
+    return os.getenv('IMAGE_CACHE_DIR') or DEFAULT_CACHE_DIR
+
+
+def _max_bytes() -> int:
+    return int(os.getenv('IMAGE_CACHE_MAX_BYTES', str(DEFAULT_MAX_BYTES)))
+
+
+def _fresh_seconds() -> float:
+    return float(os.getenv('IMAGE_CACHE_FRESH_SECONDS', str(DEFAULT_FRESH_SECONDS)))
+
+
+def enabled() -> bool:
+    """Whether caching is on (IMAGE_CACHE_MAX_BYTES > 0)."""
+    return _max_bytes() > 0
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used as the cache key: lowercase scheme/host, no default
+    port, no fragment, sorted query parameters."""
+    try:
+        parts = urlsplit(url.strip())
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or '').lower()
+        if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+            host = f"{host}:{parts.port}"
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        return urlunsplit((scheme, host, parts.path or '/', query, ''))
+    except ValueError:
+        return url.strip()
+
+
+def _paths(url: str) -> tuple:
+    key = hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+    base = os.path.join(_cache_dir(), key)
+    return base + '.jpg', base + '.json'
+
+
+def _count(name: str) -> None:
+    with _lock:
+        _stats[name] += 1
+
+
+def record_hit(revalidated: bool = False) -> None:
+    """Count a served entry; `revalidated` when it took a 304 to confirm it."""
+    _count("revalidated" if revalidated else "hits")
+
+
+def record_miss() -> None:
+    _count("misses")
+
+
+def stats() -> dict:
+    """Snapshot of the hit/miss counters for this process."""
+    with _lock:
+        return dict(_stats)
+
+
+def get(url: str) -> dict | None:
+    """
+    Look up a cached image.
+
+    Returns:
+        The entry metadata (url, width, height, size, etag, last_modified,
+        stored_at) plus `data` (the JPEG bytes) and `fresh`, or None.
+    """
+    if not enabled():
+        return None
+    data_path, meta_path = _paths(url)
+    try:
+        with open(meta_path, 'r') as f:
+            entry = json.load(f)
+        with open(data_path, 'rb') as f:
+            entry['data'] = f.read()
+        # Refresh recency for LRU eviction
+        os.utime(data_path)
+    except (OSError, json.JSONDecodeError, TypeError):
+        return None
+    entry['fresh'] = time.time() - entry.get('stored_at', 0) < _fresh_seconds()
+    return entry
+
+
+def conditional_headers(entry: dict | None) -> dict:
+    """Request headers that revalidate `entry` against the origin."""
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def touch(url: str) -> None:
+    """Mark an entry fresh again after the origin confirmed it (304)."""
+    _, meta_path = _paths(url)
+    try:
+        with open(meta_path, 'r') as f:
+            entry = json.load(f)
+        entry['stored_at'] = time.time()
+        _write_atomic(meta_path, json.dumps(entry).encode('utf-8'))
+    except (OSError, json.JSONDecodeError) as e:
+        logger.debug(f"Could not refresh image cache entry for {url}: {e}")
+
+
+def put(url: str, data: bytes, width: int, height: int,
+        etag: str | None = None, last_modified: str | None = None) -> None:
+    """Store processed JPEG bytes for `url`, then evict down to the size cap."""
+    if not enabled():
+        return
+    data_path, meta_path = _paths(url)
+    entry = {
+        "url": normalize_url(url),
+        "width": width,
+        "height": height,
+        "size": len(data),
+        "etag": etag,
+        "last_modified": last_modified,
+        "stored_at": time.time()
+    }
+    try:
+        os.makedirs(_cache_dir(), exist_ok=True)
+        # Data first: a metadata file never points at a missing image
+        _write_atomic(data_path, data)
+        _write_atomic(meta_path, json.dumps(entry).encode('utf-8'))
+    except OSError as e:
+        logger.warning(f"Could not write image cache entry for {url}: {e}")
+        return
+    _count("stores")
+    _evict()
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _evict() -> None:
+    """Delete least-recently-used entries until the cache fits IMAGE_CACHE_MAX_BYTES."""
+    cache_dir = _cache_dir()
+    limit = _max_bytes()
+    entries = []
+    total = 0
+    try:
+        with os.scandir(cache_dir) as it:
+            for item in it:
+                if item.name.endswith('.jpg'):
+                    st = item.stat()
+                    entries.append((st.st_mtime, item.path, st.st_size))
+                    total += st.st_size
+    except OSError as e:
+        logger.warning(f"Could not scan image cache for eviction: {e}")
+        return
+    if total <= limit:
+        return
+
+    entries.sort()
+    for _, data_path, size in entries:
+        if total <= limit:
+            break
+        for path in (data_path, data_path[:-len('.jpg')] + '.json'):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= size
+        _count("evictions")
+        logger.debug(f"Evicted {os.path.basename(data_path)} from image cache ({size} bytes)")
@@ -0,0 +1,178 @@
+"""
+Size-targeted JPEG encoding for Bluesky image blobs.
+
+Bluesky rejects link-card thumbnails over 1,000,000 bytes at upload_blob, and
+a fixed `quality=85` either overshoots that (costing a full retry ladder) or
+produces a far larger file than needed. encode_jpeg() hits a byte target in as
+few passes as possible:
+
+1. Encode once at the maximum quality — most thumbnails already fit, so the
+   common case is still a single pass.
+2. Otherwise binary-search quality between IMAGE_JPEG_MIN_QUALITY and the
+   maximum, keeping the best encode that fits.
+3. If even the minimum quality overshoots, shrink the image in proportion to
+   the overshoot and encode once at the minimum quality, which the estimate
+   predicts will fit; only if it does, search upward from there (trying
+   the maximum first when the max/min size spread says it fits). A shrunk
+   image whose minimum-quality encode still overshoots is shrunk again
+   without a search.
+
+Settings are read on each call so values from `.env` (loaded after import)
+apply: IMAGE_TARGET_BYTES, IMAGE_JPEG_QUALITY, IMAGE_JPEG_MIN_QUALITY,
+IMAGE_JPEG_PROGRESSIVE.
+"""
+
+import io
+import math
+import os
+import threading
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# app.bsky.embed.external#external.thumb maxSize
+DEFAULT_TARGET_BYTES = 1_000_000
+DEFAULT_MAX_QUALITY = 85
+DEFAULT_MIN_QUALITY = 40
+
+# Hard bounds so a pathological image can't turn into an encode loop
+MAX_QUALITY_PASSES = 6
+MAX_DOWNSCALES = 3
+MIN_DIMENSION = 64
+
+_lock = threading.Lock()
+_stats = {"encodes": 0, "passes": 0, "quality_searches": 0, "downscales": 0}
+
+
+def target_bytes() -> int:
+    return int(os.getenv('IMAGE_TARGET_BYTES', str(DEFAULT_TARGET_BYTES)))
+
+
+def _settings() -> tuple:
+    max_quality = int(os.getenv('IMAGE_JPEG_QUALITY', str(DEFAULT_MAX_QUALITY)))
+    min_quality = min(max_quality, int(os.getenv('IMAGE_JPEG_MIN_QUALITY', str(DEFAULT_MIN_QUALITY))))
+    progressive = os.getenv('IMAGE_JPEG_PROGRESSIVE', 'true').strip().lower() not in ('0', 'false', 'no')
+    return max_quality, min_quality, progressive
+
+
+def stats() -> dict:
+    """Snapshot of the encoder counters for this process."""
+    with _lock:
+        return dict(_stats)
+
+
+def _encode(image, quality: int, progressive: bool) -> bytes:
+    buf = io.BytesIO()
+    image.save(buf, format='JPEG', quality=quality, optimize=progressive, progressive=progressive)
+    return buf.getvalue()
+
+
+def _search(image, low: int, high: int, target: int, progressive: bool) -> tuple:
+    """
+    Binary-search the highest quality in [low, high] whose encode fits `target`.
+
+    Returns:
+        (best, low_size, passes): best is (jpeg_bytes, quality) or None;
+        low_size is the size at `low` if that was encoded and overshot.
+    """
+    best = None
+    low_size = None
+    floor = low
+    passes = 0
+    for _ in range(MAX_QUALITY_PASSES):
+        if low > high:
+            break
+        mid = (low + high) // 2
+        candidate = _encode(image, mid, progressive)
+        passes += 1
+        if len(candidate) <= target:
+            best = (candidate, mid)
+            low = mid + 1
+        else:
+            if mid == floor:
+                low_size = len(candidate)
+            high = mid - 1
+    return best, low_size, passes
+
+
+def encode_jpeg(image, target: int | None = None) -> tuple:
+    """
+    Encode `image` as JPEG no larger than `target` bytes.
+
+    Args:
+        image: A Pillow image (converted to RGB if JPEG can't store its mode).
+        target: Byte limit (default: IMAGE_TARGET_BYTES).
+
+    Returns:
+        (jpeg_bytes, params) where params holds quality, width, height,
+        passes, progressive and bytes — the choices made, for logs/metrics.
+
+    Raises:
+        ValueError if no encode fits, even at minimum quality and size.
+    """
+    target = target or target_bytes()
+    max_quality, min_quality, progressive = _settings()
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    downscales = 0
+    searched = False
+    data = _encode(image, max_quality, progressive)
+    passes = 1
+    quality = max_quality
+    if len(data) > target:
+        searched = True
+        best, floor_size, search_passes = _search(image, min_quality, max_quality - 1, target, progressive)
+        passes += search_passes
+        # Size at max vs min quality; roughly the same at any scale
+        spread = len(data) / floor_size if floor_size else None
+        while best is None:
+            # Minimum quality overshoots: shrink in proportion (size ~ pixel count)
+            overshoot = (floor_size or len(data)) / target
+            if downscales >= MAX_DOWNSCALES or min(image.size) <= MIN_DIMENSION:
+                raise ValueError(f"Could not encode {image.width}x{image.height} image under {target} bytes")
+            factor = max(0.25, min(0.9, 0.95 / math.sqrt(overshoot)))
+            new_size = (max(MIN_DIMENSION, int(image.width * factor)),
+                        max(MIN_DIMENSION, int(image.height * factor)))
+            logger.debug(f"JPEG over {target} bytes at quality {min_quality}; downscaling to {new_size[0]}x{new_size[1]}")
+            image = image.resize(new_size)
+            downscales += 1
+            # The estimate predicts the minimum quality now fits: check that first
+            data = _encode(image, min_quality, progressive)
+            passes += 1
+            if len(data) > target:
+                floor_size = len(data)
+                continue
+            best = (data, min_quality)
+            high = max_quality
+            if spread and len(data) * spread <= target:
+                # Shrunk well below the target: full quality likely fits too
+                full = _encode(image, max_quality, progressive)
+                passes += 1
+                if len(full) <= target:
+                    best = (full, max_quality)
+                    break
+                high = max_quality - 1
+            higher, _, search_passes = _search(image, min_quality + 1, high, target, progressive)
+            passes += search_passes
+            best = higher or best
+        data, quality = best
+
+    params = {
+        "quality": quality,
+        "width": image.width,
+        "height": image.height,
+        "passes": passes,
+        "progressive": progressive,
+        "bytes": len(data),
+    }
+    with _lock:
+        _stats["encodes"] += 1
+        _stats["passes"] += passes
+        _stats["quality_searches"] += int(searched)
+        _stats["downscales"] += downscales
+    logger.info(
+        f"Encoded JPEG {image.width}x{image.height} at quality {quality} "
+        f"({len(data)} bytes, target {target}, {passes} pass(es), progressive={progressive})"
+    )
+    return data, params
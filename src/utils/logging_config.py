@@ -1,62 +1,206 @@
 # src/utils/logging_config.py
+"""
+Logging setup: an asynchronous, rotating pipeline.
 
+Loggers hand each record to a QueueHandler on the root logger; a
+QueueListener thread does the file and console I/O, so a log call on the
+hot path costs one queue put. The message is formatted in the calling
+thread (before its arguments can change), so pass large debug payloads as
+%-style arguments, or guard them with logger.isEnabledFor(logging.DEBUG):
+below the configured level they are never formatted at all.
+
+Settings (environment):
+  LOG_ROTATION       'size' (default), 'time' or 'none'
+  LOG_MAX_BYTES      size rotation threshold (default 10 MiB)
+  LOG_ROTATION_WHEN  time rotation interval, as TimedRotatingFileHandler's
+                     `when` (default 'midnight')
+  LOG_BACKUP_COUNT   rotated files kept (default 5)
+  LOG_FORMAT         'text' (default) or 'json': one JSON object per line
+                     with a run_id shared by every record of one poll
+
+The run_id lives in a context variable, so work started with a copy of the
+poll's context (TenantPool submits each tenant's poll that way) keeps its
+run_id even while the next poll is already running. Threads started without
+one fall back to the latest poll's ID.
+"""
+
+import atexit
+import contextvars
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import uuid
+from datetime import datetime
 
 _logging_configured = False
 
-def setup_logging():
+LOG_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    'logs',
+    'bluesky_raindrops.log'
+)
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+# Correlation ID stamped on every record; one per poll (see new_run_id)
+_run_id_var = contextvars.ContextVar('run_id', default=None)
+
+# The latest poll's ID, for threads that didn't inherit a context
+_run_id = uuid.uuid4().hex[:12]
+
+_listener = None
+_queue_handler = None
+
+
+def new_run_id() -> str:
+    """Start a new correlation ID for the records of the next poll (in this context)."""
+    global _run_id
+    run_id = uuid.uuid4().hex[:12]
+    _run_id = run_id
+    _run_id_var.set(run_id)
+    return run_id
+
+
+def current_run_id() -> str:
+    return _run_id_var.get() or _run_id
+
+
+class _RunIdFilter(logging.Filter):
+    def filter(self, record):
+        record.run_id = current_run_id()
+        return True
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Formats the message in the calling thread but keeps the traceback separate."""
+
+    def prepare(self, record):
+        message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, run_id, thread (and exception)."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "run_id": getattr(record, 'run_id', None),
+            "thread": record.threadName,
+        }
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _file_handler(log_file: str) -> logging.Handler:
+    rotation = os.getenv('LOG_ROTATION', 'size').lower()
+    backups = int(os.getenv('LOG_BACKUP_COUNT', str(DEFAULT_BACKUP_COUNT)))
+    if rotation == 'time':
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file, when=os.getenv('LOG_ROTATION_WHEN', 'midnight'), backupCount=backups, encoding='utf-8'
+        )
+    if rotation == 'size':
+        return logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=int(os.getenv('LOG_MAX_BYTES', str(DEFAULT_MAX_BYTES))),
+            backupCount=backups, encoding='utf-8'
+        )
+    return logging.FileHandler(log_file, encoding='utf-8')
+
+
+def setup_logging(level=None, log_file=None):
     """Configure logging once at application startup.
-    
+
     This should be called once from the main entry point.
     Subsequent calls are no-ops to prevent duplicate handlers.
+
+    Args:
+        level: Log level; defaults to LOG_LEVEL from the config.
+        log_file: Defaults to logs/bluesky_raindrops.log.
     """
-    global _logging_configured
-    
+    global _logging_configured, _listener, _queue_handler
+
     if _logging_configured:
         return
-    
-    # Import here to avoid circular imports
-    from src.utils.config import load_config
-    
-    config = load_config()
-    log_level = config['LOG_LEVEL']
+
+    if level is None:
+        # Import here to avoid circular imports
+        from src.utils.config import load_config
+        level = load_config()['LOG_LEVEL']
 
     # Create logs directory if it doesn't exist
-    log_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'logs')
-    os.makedirs(log_dir, exist_ok=True)
-    log_file = os.path.join(log_dir, 'bluesky_raindrops.log')
+    log_file = log_file or LOG_FILE
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
 
-    # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-    
-    # Clear any existing handlers to prevent duplicates
-    root_logger.handlers.clear()
-    
-    # Create formatter
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
-    # File handler
-    file_handler = logging.FileHandler(log_file)
+    if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(TEXT_FORMAT)
+
+    file_handler = _file_handler(log_file)
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
-    
-    # Console handler
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
-    
+
+    # Configure root logger: records are queued here and written by the listener thread
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+
+    # Clear any existing handlers to prevent duplicates
+    root_logger.handlers.clear()
+
+    _queue_handler = _QueueHandler(queue.SimpleQueue())
+    _queue_handler.addFilter(_RunIdFilter())
+    root_logger.addHandler(_queue_handler)
+    _listener = logging.handlers.QueueListener(
+        _queue_handler.queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(shutdown_logging)
+
     _logging_configured = True
 
 
+def shutdown_logging():
+    """Drain the queue and stop the listener thread.
+
+    Later records (e.g. from other exit handlers) are written directly by
+    the file and console handlers instead of being lost.
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    root_logger = logging.getLogger()
+    root_logger.removeHandler(_queue_handler)
+    _queue_handler = None
+    for handler in listener.handlers:
+        handler.addFilter(_RunIdFilter())
+        root_logger.addHandler(handler)
+
+
 def get_logger(name):
     """Get a logger for the given module name.
-    
+
     Args:
         name: Typically __name__ from the calling module.
-        
+
     Returns:
         A logger instance.
     """
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
@@ -0,0 +1,313 @@
+"""
+Per-stage latency histograms and counters, exported in Prometheus text format.
+
+Each step of a run is timed with `timed(stage)`: the Raindrop probe, fetch
+and self-heal, post formatting, image download and encode, Bluesky login,
+upload_blob and send_post, tag removal and the posted-tracker reads and
+writes. Every observation lands in the `raindrops_stage_duration_seconds`
+histogram labelled with its stage and outcome ('ok', 'error', or what the
+caller sets, e.g. 'cache_hit').
+
+render() adds the counters the other modules already keep (retry policy
+retries and give-ups, circuit breaker state, rate-limit pacing, image cache,
+JPEG encoder, post layout, URL rules, alerting, registered tenant pools) as gauges,
+so one scrape shows everything. A module that hasn't been imported yet
+(an idle poll never loads the image stack) is simply left out.
+
+Exports:
+  cron     write_textfile() writes METRICS_TEXTFILE atomically at the end of
+           a run, for node_exporter's textfile collector
+  daemon   start_server() serves GET /metrics on METRICS_PORT (bound to
+           METRICS_HOST, default 127.0.0.1) from a background thread
+"""
+
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PREFIX = 'raindrops'
+
+# Seconds; spans a cached tracker lookup up to a fully retried API call
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Module stats() exported on every render, when the module is loaded:
+# (module, metric name part, label for per-row stats)
+MODULE_STATS = (
+    ('src.utils.retry', 'retry', 'policy'),
+    ('src.utils.circuit_breaker', 'circuit', 'endpoint'),
+    ('src.utils.rate_limiter', 'rate_limiter', None),
+    ('src.utils.image_cache', 'image_cache', None),
+    ('src.utils.jpeg_encoder', 'jpeg_encoder', None),
+    ('src.utils.post_layout', 'post_layout', None),
+    ('src.utils.url_rules', 'url_rules', None),
+    ('src.utils.alerting', 'alerts', None),
+)
+
+# Label names for nested per-row counters (anything else is labelled 'key')
+_SUBLABELS = {'errors': 'error_class', 'give_up_reasons': 'reason'}
+
+_clock = time.perf_counter
+
+_lock = threading.Lock()
+_histograms: dict = {}
+_counters: dict = {}
+_collectors: dict = {}
+
+
+class _Histogram:
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+
+class _Timer:
+    """Yielded by timed(); set `outcome` to label the observation."""
+
+    __slots__ = ('outcome',)
+
+    def __init__(self):
+        self.outcome = 'ok'
+
+
+def observe(stage: str, seconds: float, outcome: str = 'ok') -> None:
+    """Record one `stage` taking `seconds` with `outcome`."""
+    with _lock:
+        histogram = _histograms.get((stage, outcome))
+        if histogram is None:
+            histogram = _histograms[(stage, outcome)] = _Histogram()
+        histogram.observe(seconds)
+
+
+@contextmanager
+def timed(stage: str):
+    """
+    Time the block as `stage`. The outcome is 'error' if it raises, else
+    'ok' unless the block sets `timer.outcome`. Also usable as a function
+    decorator (@timed('stage')), timing every call.
+    """
+    timer = _Timer()
+    started = _clock()
+    try:
+        yield timer
+    except BaseException:
+        timer.outcome = 'error'
+        raise
+    finally:
+        observe(stage, _clock() - started, timer.outcome)
+
+
+def count(name: str, value: float = 1, **labels) -> None:
+    """Add `value` to the counter raindrops_<name>_total{labels}."""
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def register_collector(name: str, collect, label: str | None = None) -> None:
+    """
+    Export collect()'s dict on every render as raindrops_<name>_<key> gauges.
+
+    With `label`, collect() returns {row: {key: value}} and each row becomes
+    a label value (e.g. one row per tenant).
+    """
+    with _lock:
+        _collectors[name] = (collect, label)
+
+
+def unregister_collector(name: str) -> None:
+    with _lock:
+        _collectors.pop(name, None)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs) -> str:
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _number(value) -> str:
+    if isinstance(value, float):
+        if math.isnan(value):
+            return 'NaN'
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(value)
+
+
+def _flatten(name: str, stats: dict, base_labels: tuple, samples: dict) -> None:
+    """Turn one stats() dict into gauge samples keyed by metric name."""
+    for key, value in stats.items():
+        metric = f"{PREFIX}_{name}_{key}"
+        if isinstance(value, bool):
+            value = int(value)
+        if isinstance(value, (int, float)):
+            samples.setdefault(metric, []).append((base_labels, value))
+        elif isinstance(value, str):
+            # An enum-like value (circuit state): 1 on the current value's series
+            samples.setdefault(metric, []).append((base_labels + ((key, value),), 1))
+        elif isinstance(value, dict):
+            sublabel = _SUBLABELS.get(key, 'key')
+            for sub, subvalue in value.items():
+                if isinstance(subvalue, (int, float)):
+                    samples.setdefault(metric, []).append((base_labels + ((sublabel, sub),), subvalue))
+
+
+def _collect_stats() -> dict:
+    sources = []
+    for module_name, name, label in MODULE_STATS:
+        module = sys.modules.get(module_name)
+        if module is not None:
+            sources.append((name, module.stats, label))
+    with _lock:
+        sources.extend((name, collect, label) for name, (collect, label) in _collectors.items())
+
+    samples: dict = {}
+    for name, collect, label in sources:
+        try:
+            stats = collect()
+        except Exception as e:
+            logger.warning(f"Metrics collector {name} failed: {e}")
+            continue
+        if label:
+            for row, row_stats in stats.items():
+                _flatten(name, row_stats, ((label, row),), samples)
+        else:
+            _flatten(name, stats, (), samples)
+    return samples
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    with _lock:
+        histograms = {key: (list(h.counts), h.sum, h.count) for key, h in _histograms.items()}
+        counters = dict(_counters)
+
+    if histograms:
+        metric = f"{PREFIX}_stage_duration_seconds"
+        lines.append(f"# HELP {metric} Time spent in each stage of a run, by outcome.")
+        lines.append(f"# TYPE {metric} histogram")
+        for (stage, outcome), (counts, total, observations) in sorted(histograms.items()):
+            base = (('stage', stage), ('outcome', outcome))
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS, counts):
+                cumulative += bucket_count
+                lines.append(f"{metric}_bucket{_labels(base + (('le', repr(bound)),))} {cumulative}")
+            lines.append(f"{metric}_bucket{_labels(base + (('le', '+Inf'),))} {observations}")
+            lines.append(f"{metric}_sum{_labels(base)} {_number(total)}")
+            lines.append(f"{metric}_count{_labels(base)} {observations}")
+
+    by_name: dict = {}
+    for (name, labels), value in counters.items():
+        by_name.setdefault(f"{PREFIX}_{name}_total", []).append((labels, value))
+    for metric, series in sorted(by_name.items()):
+        lines.append(f"# TYPE {metric} counter")
+        lines.extend(f"{metric}{_labels(labels)} {_number(value)}" for labels, value in sorted(series))
+
+    for metric, series in sorted(_collect_stats().items()):
+        lines.append(f"# TYPE {metric} gauge")
+        lines.extend(f"{metric}{_labels(labels)} {_number(value)}" for labels, value in series)
+
+    lines.append(f"# TYPE {PREFIX}_metrics_rendered_timestamp_seconds gauge")
+    lines.append(f"{PREFIX}_metrics_rendered_timestamp_seconds {_number(time.time())}")
+    return '\n'.join(lines) + '\n'
+
+
+def write_textfile(path: str | None = None) -> bool:
+    """
+    Write render() to `path` (default METRICS_TEXTFILE) atomically.
+
+    Returns:
+        True if a file was written (False when no path is configured or the
+        write failed — metrics never fail a run).
+    """
+    path = path or os.getenv('METRICS_TEXTFILE')
+    if not path:
+        return False
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            f.write(render())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.error(f"Could not write metrics textfile {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    logger.debug(f"Wrote metrics to {path}")
+    return True
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(f"Metrics request from {self.client_address[0]}: {format % args}")
+
+
+def start_server(port: int | None = None, host: str | None = None):
+    """
+    Serve /metrics from a daemon thread.
+
+    `port` defaults to METRICS_PORT and `host` to METRICS_HOST (127.0.0.1).
+    Returns:
+        The server (call shutdown() to stop it), or None when no port is set
+        or it can't be bound.
+    """
+    if port is None:
+        value = os.getenv('METRICS_PORT')
+        port = int(value) if value else None
+    if port is None:
+        return None
+    host = host or os.getenv('METRICS_HOST', '127.0.0.1')
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.error(f"Could not serve metrics on {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+    logger.info(f"Serving Prometheus metrics on http://{host}:{server.server_address[1]}/metrics")
+    return server
+
+
+def reset() -> None:
+    """Drop all recorded observations and counters (tests)."""
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
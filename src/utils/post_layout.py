@@ -0,0 +1,141 @@
+"""
+Single-pass layout of a `body\\nlink` Bluesky post.
+
+The old formatter built a TextBuilder, measured the result, shrank the body
+and rebuilt (up to three times), then fell back to a link-only post that
+dropped the title. The rendered length is in fact known before building:
+
+- TextBuilder writes display text verbatim as UTF-8 (no percent-encoding in
+  atproto 0.0.x), so the link renders as exactly `link`.
+- "\\n" is a control character, so it is always its own grapheme cluster
+  (UAX #29 GB4/GB5) and the lengths of body, separator and link simply add.
+
+layout_post() therefore picks the body cut point up front — at a word
+boundary when one is close enough, otherwise at a grapheme boundary — and
+builds the text and the link facet's UTF-8 byte range exactly once.
+"""
+
+import logging
+import re
+import threading
+# Suppress atproto's pydantic deprecation warnings before atproto loads
+from src.utils import warnings_setup  # noqa: F401
+from atproto import models
+from src.utils.graphemes import count_graphemes, grapheme_boundaries
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SEPARATOR = "\n"
+ELLIPSIS = "…"
+
+# A word-boundary cut may give up at most this share of the body budget;
+# past that (long words, CJK without spaces) the cut falls on a grapheme.
+WORD_CUT_MAX_LOSS = 0.25
+
+# Trailing characters dropped before the ellipsis so a cut doesn't end in "…,…"
+_TRAILING_JUNK = " \t\r\n,;:-–—([{"
+
+_WHITESPACE = re.compile(r"\s")
+
+_lock = threading.Lock()
+_stats = {"layouts": 0, "truncated": 0, "word_cuts": 0, "link_only": 0}
+
+
+def stats() -> dict:
+    """Snapshot of the layout counters for this process."""
+    with _lock:
+        return dict(_stats)
+
+
+def _count(key: str) -> None:
+    with _lock:
+        _stats[key] += 1
+
+
+def rendered_link_text(link: str) -> str:
+    """The display text TextBuilder renders for `link` (the link itself)."""
+    return link
+
+
+def fit_body(body: str, budget: int) -> tuple:
+    """
+    Cut `body` to at most `budget` graphemes, ellipsis included.
+
+    Returns:
+        (text, word_cut) — word_cut is True when the cut fell on whitespace.
+    """
+    ends = grapheme_boundaries(body)
+    if len(ends) <= budget:
+        return body, False
+    keep = budget - 1  # room for the ellipsis
+    if keep <= 0:
+        return ELLIPSIS, False
+
+    cut = ends[keep - 1]
+    word_cut = False
+    if not body[cut].isspace():
+        # Last whitespace inside the kept prefix, if it doesn't lose too much
+        last_space = None
+        for match in _WHITESPACE.finditer(body, 0, cut):
+            last_space = match.start()
+        if last_space is not None and count_graphemes(body[last_space:cut]) <= keep * WORD_CUT_MAX_LOSS:
+            cut = last_space
+            word_cut = True
+    else:
+        word_cut = True
+
+    text = body[:cut].rstrip(_TRAILING_JUNK)
+    if not text:
+        text, word_cut = body[:ends[keep - 1]], False
+    return text + ELLIPSIS, word_cut
+
+
+def _link_facet(byte_start: int, byte_end: int, uri: str):
+    return models.AppBskyRichtextFacet.Main(
+        features=[models.AppBskyRichtextFacet.Link(uri=uri)],
+        index=models.AppBskyRichtextFacet.ByteSlice(byte_start=byte_start, byte_end=byte_end),
+    )
+
+
+def layout_post(body: str, link: str, limit: int) -> tuple:
+    """
+    Lay out `body` and `link` as a post of at most `limit` graphemes.
+
+    The body is truncated only as far as needed; the link is never cut. When
+    the link leaves no room for even one character of body, the post is the
+    link alone.
+
+    Returns:
+        (text, facets) — the same shapes TextBuilder.build_text() and
+        build_facets() return, with one Link facet covering the link.
+    """
+    _count("layouts")
+    display = rendered_link_text(link)
+    budget = limit - count_graphemes(display) - count_graphemes(SEPARATOR)
+
+    if budget < 2 or not body:
+        if body:
+            logger.warning(f"Link is very long ({count_graphemes(display)} graphemes), posting link only")
+            _count("link_only")
+        prefix = ""
+    else:
+        fitted, word_cut = fit_body(body, budget)
+        if fitted != body:
+            _count("truncated")
+            if word_cut:
+                _count("word_cuts")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Body cut from %s to %s graphemes (%s boundary) to fit %s",
+                    count_graphemes(body), count_graphemes(fitted), 'word' if word_cut else 'grapheme', limit
+                )
+        prefix = fitted + SEPARATOR
+
+    text = prefix + display
+    byte_start = len(prefix.encode("utf-8"))
+    facets = [_link_facet(byte_start, byte_start + len(display.encode("utf-8")), link)]
+
+    if prefix and count_graphemes(text) > limit:
+        logger.error(f"Post layout produced {count_graphemes(text)} graphemes, over the {limit} limit")
+    return text, facets
@@ -1,134 +1,283 @@
-# src/utils/posted_tracker.py
 """
 Track successfully posted Raindrop IDs to prevent double-posting.
 
 This provides a safety net when tag removal fails due to transient errors.
-The tracker stores posted IDs in a JSON file that persists across runs.
+The tracker persists across runs in an SQLite database (WAL mode) indexed on
+raindrop_id and posted_at, so lookups and inserts are O(log n) and retention
+cleanup is an indexed range delete rather than a rewrite of the whole file.
+
+An existing `posted_raindrops.json` from older versions is imported once on
+first use and renamed to `posted_raindrops.json.migrated`. Setting
+TRACKER_BACKEND=json keeps using the JSON file instead.
+
+Every function takes an optional `namespace` (the tenant name in
+multi-tenant mode). A namespace gets its own database and JSON file under
+logs/tenants/<namespace>/; None uses the single-account files above.
 """
 
-import json
 import os
+import sqlite3
+import threading
 from datetime import datetime, timedelta
+from src.utils import metrics, state_file
 from src.utils.logging_config import get_logger
 
 logger = get_logger(__name__)
 
 # Store in the logs directory alongside the app
 TRACKER_FILE = os.path.join(
-    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 
-    'logs', 
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    'logs',
     'posted_raindrops.json'
 )
 
+DB_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    'logs',
+    'posted_raindrops.db'
+)
+
 # Keep records long enough to outlive a stuck 'toskeet' tag — if removal keeps
 # failing, expiring the entry would cause a double-post once it's forgotten.
 RETENTION_DAYS = 90
 
+# Stay well under SQLite's host-parameter limit in batch lookups
+_LOOKUP_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posted (
+    raindrop_id INTEGER PRIMARY KEY,
+    posted_at   TEXT NOT NULL,
+    bluesky_uri TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_posted_posted_at ON posted (posted_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# One connection per database path, reused for the life of the process
+_connections: dict = {}
+_connections_lock = threading.Lock()
+
+
+def _db_file(namespace: str | None = None) -> str:
+    """Database path for `namespace` (module paths are read at call time)."""
+    if not namespace:
+        return DB_FILE
+    return os.path.join(os.path.dirname(DB_FILE), 'tenants', namespace, os.path.basename(DB_FILE))
+
+
+def _tracker_file(namespace: str | None = None) -> str:
+    """JSON tracker path for `namespace`."""
+    if not namespace:
+        return TRACKER_FILE
+    return os.path.join(os.path.dirname(TRACKER_FILE), 'tenants', namespace, os.path.basename(TRACKER_FILE))
+
+
+def _use_json_backend() -> bool:
+    """Read on each call so a TRACKER_BACKEND set in .env (loaded after import) applies."""
+    return os.getenv('TRACKER_BACKEND', 'sqlite').strip().lower() == 'json'
+
 
-def _load_tracker() -> dict:
+# --- JSON backend (legacy; also the migration source) ---
+
+def _load_tracker(namespace: str | None = None) -> dict:
     """Load the tracker file, returning empty dict if not found."""
-    try:
-        if os.path.exists(TRACKER_FILE):
-            with open(TRACKER_FILE, 'r') as f:
-                return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        logger.warning(f"Could not load tracker file: {e}")
-    return {"posted": {}}
+    return state_file.load(_tracker_file(namespace), 'tracker') or {"posted": {}}
 
 
-def _save_tracker(data: dict) -> None:
-    """Save the tracker data atomically.
+# --- SQLite backend ---
+
+def _connect(namespace: str | None = None) -> sqlite3.Connection:
+    """Return the shared connection for the namespace's database, creating and migrating it on first use."""
+    db_file = _db_file(namespace)
+    with _connections_lock:
+        conn = _connections.get(db_file)
+        if conn is not None:
+            return conn
+        os.makedirs(os.path.dirname(db_file), exist_ok=True)
+        conn = sqlite3.connect(db_file, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _migrate_json(conn, namespace)
+        _connections[db_file] = conn
+        return conn
+
+
+def close() -> None:
+    """Close all open tracker connections."""
+    with _connections_lock:
+        for conn in _connections.values():
+            conn.close()
+        _connections.clear()
+
+
+def _migrate_json(conn: sqlite3.Connection, namespace: str | None = None) -> None:
+    """Import posted_raindrops.json into the database once, then set it aside."""
+    if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+        return
+    tracker_file = _tracker_file(namespace)
+    if not os.path.exists(tracker_file):
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                         (datetime.utcnow().isoformat(),))
+        return
+
+    posted = _load_tracker(namespace).get("posted", {})
+    now = datetime.utcnow().isoformat()
+    rows = []
+    for rid, info in posted.items():
+        try:
+            raindrop_id = int(rid)
+        except (TypeError, ValueError):
+            logger.warning(f"Skipping non-numeric raindrop ID {rid!r} during tracker migration")
+            continue
+        info = info if isinstance(info, dict) else {}
+        posted_at = info.get("posted_at") or ""
+        try:
+            posted_at = datetime.fromisoformat(posted_at).isoformat()
+        except (ValueError, TypeError):
+            # Keep entries with missing/malformed dates rather than losing
+            # them; stamping "now" gives them a full retention period.
+            logger.warning(f"Malformed date for raindrop {rid} during migration, keeping entry")
+            posted_at = now
+        rows.append((raindrop_id, posted_at, info.get("bluesky_uri")))
+
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO posted (raindrop_id, posted_at, bluesky_uri) VALUES (?, ?, ?)",
+            rows,
+        )
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)", (now,))
 
-    Writes to a temp file in the same directory, then os.replace() — a crash
-    mid-write must never truncate the existing file (that would erase the
-    posted history and allow double-posts).
-    """
-    tmp_path = TRACKER_FILE + '.tmp'
     try:
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(TRACKER_FILE), exist_ok=True)
-        with open(tmp_path, 'w') as f:
-            json.dump(data, f, indent=2)
-        os.replace(tmp_path, TRACKER_FILE)
+        os.replace(tracker_file, tracker_file + '.migrated')
     except OSError as e:
-        logger.error(f"Could not save tracker file: {e}")
-        try:
-            os.remove(tmp_path)
-        except OSError:
-            pass
+        logger.warning(f"Migrated tracker file but could not rename it: {e}")
+    logger.info(f"Migrated {len(rows)} entries from {tracker_file} to {_db_file(namespace)}")
+
 
+# --- Public API ---
 
-def is_already_posted(raindrop_id: int) -> bool:
+def is_already_posted(raindrop_id: int, namespace: str | None = None) -> bool:
     """
     Check if a Raindrop has already been successfully posted.
-    
+
     Args:
         raindrop_id: The Raindrop ID to check.
-        
+        namespace: Tenant whose history to check (None: single-account).
+
     Returns:
         True if already posted, False otherwise.
     """
-    data = _load_tracker()
-    posted = data.get("posted", {})
-    
-    if str(raindrop_id) in posted:
-        logger.info(f"Raindrop {raindrop_id} was already posted - skipping to prevent duplicate")
-        return True
-    return False
+    return raindrop_id in is_already_posted_many([raindrop_id], namespace=namespace)
+
+
+@metrics.timed('tracker_lookup')
+def is_already_posted_many(raindrop_ids, namespace: str | None = None) -> set:
+    """
+    Check many Raindrop IDs in one lookup.
+
+    Args:
+        raindrop_ids: Iterable of Raindrop IDs to check.
+        namespace: Tenant whose history to check (None: single-account).
+
+    Returns:
+        The subset of `raindrop_ids` (same values as passed in) already posted.
+    """
+    ids = list(raindrop_ids)
+    if not ids:
+        return set()
+
+    if _use_json_backend():
+        posted_keys = _load_tracker(namespace).get("posted", {}).keys()
+        found = {rid for rid in ids if str(rid) in posted_keys}
+    else:
+        by_int = {}
+        for rid in ids:
+            try:
+                by_int.setdefault(int(rid), []).append(rid)
+            except (TypeError, ValueError):
+                continue
+        conn = _connect(namespace)
+        keys = list(by_int)
+        found = set()
+        for start in range(0, len(keys), _LOOKUP_CHUNK):
+            chunk = keys[start:start + _LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            for (raindrop_id,) in conn.execute(
+                f"SELECT raindrop_id FROM posted WHERE raindrop_id IN ({placeholders})", chunk
+            ):
+                found.update(by_int[raindrop_id])
 
+    # Callers log the skips they act on (see iter_pending_raindrops)
+    return found
 
-def mark_as_posted(raindrop_id: int, bluesky_uri: str | None = None) -> None:
+
+@metrics.timed('tracker_mark')
+def mark_as_posted(raindrop_id: int, bluesky_uri: str | None = None, namespace: str | None = None) -> None:
     """
     Record that a Raindrop has been successfully posted.
-    
+
     Args:
         raindrop_id: The Raindrop ID that was posted.
         bluesky_uri: Optional URI of the Bluesky post created.
+        namespace: Tenant that posted it (None: single-account).
     """
-    data = _load_tracker()
-    if "posted" not in data:
-        data["posted"] = {}
-    
-    data["posted"][str(raindrop_id)] = {
-        "posted_at": datetime.utcnow().isoformat(),
-        "bluesky_uri": bluesky_uri
-    }
-    
-    _save_tracker(data)
+    posted_at = datetime.utcnow().isoformat()
+
+    if _use_json_backend():
+        # Written atomically (see state_file): a crash mid-write must never
+        # truncate the posted history and allow double-posts
+        with state_file.update(_tracker_file(namespace), 'tracker') as data:
+            data.setdefault("posted", {})[str(raindrop_id)] = {
+                "posted_at": posted_at,
+                "bluesky_uri": bluesky_uri
+            }
+    else:
+        conn = _connect(namespace)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO posted (raindrop_id, posted_at, bluesky_uri) VALUES (?, ?, ?)",
+                (int(raindrop_id), posted_at, bluesky_uri),
+            )
+
     logger.debug(f"Marked Raindrop {raindrop_id} as posted")
 
 
-def cleanup_old_entries() -> None:
+@metrics.timed('tracker_cleanup')
+def cleanup_old_entries(namespace: str | None = None) -> None:
     """Remove entries older than RETENTION_DAYS."""
-    data = _load_tracker()
-    posted = data.get("posted", {})
-    
-    if not posted:
-        return
-    
     cutoff = datetime.utcnow() - timedelta(days=RETENTION_DAYS)
-    original_count = len(posted)
-    
-    # Filter out old entries, handling malformed dates gracefully
-    new_posted = {}
-    for rid, info in posted.items():
-        try:
-            posted_at_str = info.get("posted_at", "")
-            if posted_at_str:
-                posted_at = datetime.fromisoformat(posted_at_str)
-                if posted_at > cutoff:
+
+    if not _use_json_backend():
+        conn = _connect(namespace)
+        with conn:
+            removed = conn.execute(
+                "DELETE FROM posted WHERE posted_at < ?", (cutoff.isoformat(),)
+            ).rowcount
+        if removed > 0:
+            logger.info(f"Cleaned up {removed} old entries from posted tracker")
+        return
+
+    with state_file.update(_tracker_file(namespace), 'tracker') as data:
+        posted = data.get("posted", {})
+        new_posted = {}
+        for rid, info in posted.items():
+            # Keep entries without dates or with malformed ones rather than losing them
+            try:
+                posted_at_str = info.get("posted_at", "")
+                if not posted_at_str or datetime.fromisoformat(posted_at_str) > cutoff:
                     new_posted[rid] = info
-            else:
-                # Keep entries without dates (shouldn't happen, but be safe)
+            except (ValueError, TypeError) as e:
+                logger.warning(f"Malformed date for raindrop {rid}, keeping entry: {e}")
                 new_posted[rid] = info
-        except (ValueError, TypeError) as e:
-            # Keep entries with malformed dates rather than losing them
-            logger.warning(f"Malformed date for raindrop {rid}, keeping entry: {e}")
-            new_posted[rid] = info
-    
-    data["posted"] = new_posted
-    
-    removed = original_count - len(data["posted"])
+        removed = len(posted) - len(new_posted)
+        if removed > 0:
+            data["posted"] = new_posted
+
     if removed > 0:
-        _save_tracker(data)
         logger.info(f"Cleaned up {removed} old entries from posted tracker")
@@ -0,0 +1,224 @@
+"""
+Profile a single run: CPU (cProfile), allocations (tracemalloc) and an
+optional wall-clock stack sampler.
+
+Used by `raindrop_to_bluesky.py --profile` (the cron wrapper passes it when
+PROFILE_RUN=1). Nothing here is imported on a normal run, so profiling costs
+nothing when it is off. Each profiled run writes, under logs/profiles/:
+
+  <stamp>-<name>.prof        cProfile stats (pstats, snakeviz, gprof2dot)
+  <stamp>-<name>.txt         top functions by cumulative time, top allocation
+                             sites and peak traced memory
+  <stamp>-<name>.collapsed   sampled stacks, one `frame;frame;frame count`
+                             line per stack (flamegraph.pl / speedscope input)
+
+The sampler wakes every PROFILE_SAMPLE_INTERVAL_MS (default 10; 0 disables
+it and the .collapsed file) and records every thread's stack, so it also
+shows time spent waiting on the network, which cProfile attributes poorly,
+and tenant worker threads, which cProfile (main thread only) doesn't see.
+Old runs are pruned to the newest PROFILE_KEEP (default 20) and at most
+PROFILE_MAX_MB (default 50) in total.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PROFILE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    'logs',
+    'profiles'
+)
+
+DEFAULT_SAMPLE_INTERVAL_MS = 10
+DEFAULT_KEEP = 20
+DEFAULT_MAX_MB = 50
+
+# Rows in the .txt summary
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+
+# Frames kept per allocation traceback
+TRACEMALLOC_FRAMES = 10
+
+SUFFIXES = ('.prof', '.txt', '.collapsed')
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', '?')
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class _StackSampler:
+    """Background thread counting every other thread's stack at a fixed interval."""
+
+    __slots__ = ('interval', 'stacks', 'samples', '_stop', '_thread')
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="profile-sampler")
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return ''.join(f"{stack} {hits}\n" for stack, hits in self.stacks.most_common())
+
+
+def _sample_interval() -> float:
+    return float(os.getenv('PROFILE_SAMPLE_INTERVAL_MS', str(DEFAULT_SAMPLE_INTERVAL_MS))) / 1000
+
+
+def _summary(profiler, snapshot, peak: int, elapsed: float, sampler) -> str:
+    out = io.StringIO()
+    out.write(f"Wall time: {elapsed:.3f}s\n")
+    out.write(f"Peak traced memory: {peak / 1024 / 1024:.2f} MiB\n")
+    if sampler is not None:
+        out.write(f"Stack samples: {sampler.samples} every {sampler.interval * 1000:.0f}ms\n")
+
+    out.write(f"\n== Top {TOP_FUNCTIONS} functions by cumulative time ==\n")
+    stats = pstats.Stats(profiler, stream=out)
+    stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+
+    out.write(f"\n== Top {TOP_ALLOCATIONS} allocation sites (live at the end of the run) ==\n")
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    ))
+    for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+        frame = stat.traceback[0]
+        out.write(f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  {frame.filename}:{frame.lineno}\n")
+    return out.getvalue()
+
+
+def _write(path: str, content: str) -> None:
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def prune(directory: str | None = None) -> int:
+    """
+    Delete the oldest profiled runs beyond PROFILE_KEEP runs or PROFILE_MAX_MB.
+
+    Returns:
+        Number of files removed.
+    """
+    directory = directory or PROFILE_DIR
+    keep = int(os.getenv('PROFILE_KEEP', str(DEFAULT_KEEP)))
+    max_bytes = float(os.getenv('PROFILE_MAX_MB', str(DEFAULT_MAX_MB))) * 1024 * 1024
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return 0
+
+    # Files of one run share the "<stamp>-<name>" stem; stamps sort by time
+    runs: dict = {}
+    for filename in names:
+        stem, ext = os.path.splitext(filename)
+        if ext in SUFFIXES:
+            runs.setdefault(stem, []).append(os.path.join(directory, filename))
+
+    removed = 0
+    total = 0
+    for index, stem in enumerate(sorted(runs, reverse=True)):
+        files = runs[stem]
+        size = sum(os.path.getsize(path) for path in files)
+        total += size
+        if index < keep and (total <= max_bytes or index == 0):
+            continue
+        for path in files:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError as e:
+                logger.warning(f"Could not remove old profile {path}: {e}")
+    return removed
+
+
+@contextmanager
+def profiled(name: str = 'run', directory: str | None = None):
+    """
+    Profile the block and write its reports to `directory` (default logs/profiles/).
+
+    Yields:
+        A dict that is filled with the written paths ('prof', 'txt' and, with
+        the sampler on, 'collapsed') once the block exits.
+    """
+    directory = directory or PROFILE_DIR
+    paths: dict = {}
+    interval = _sample_interval()
+    sampler = _StackSampler(interval) if interval > 0 else None
+    profiler = cProfile.Profile()
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    tracemalloc.reset_peak()
+    if sampler is not None:
+        sampler.start()
+    started = time.perf_counter()
+    profiler.enable()
+    try:
+        yield paths
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        if sampler is not None:
+            sampler.stop()
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        if not tracing:
+            tracemalloc.stop()
+
+        stem = os.path.join(directory, f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{name}")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            profiler.dump_stats(stem + '.prof')
+            paths['prof'] = stem + '.prof'
+            _write(stem + '.txt', _summary(profiler, snapshot, peak, elapsed, sampler))
+            paths['txt'] = stem + '.txt'
+            if sampler is not None:
+                _write(stem + '.collapsed', sampler.collapsed())
+                paths['collapsed'] = stem + '.collapsed'
+            logger.info(f"Profile of {name} ({elapsed:.2f}s, peak {peak / 1024 / 1024:.1f} MiB) written to {stem}.*")
+        except OSError as e:
+            logger.error(f"Could not write profile {stem}: {e}")
+        prune(directory)
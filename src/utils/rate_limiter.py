@@ -0,0 +1,248 @@
+"""
+Pace API calls with per-key token buckets that learn from response headers.
+
+Each limit key (one Raindrop token, or one Bluesky account and XRPC method)
+has a bucket refilled at a configured steady rate. acquire() reserves a
+token before a request and sleeps only as long as the bucket needs, so
+batch posts and concurrent tenants queue up ahead of time instead of
+running into 429s. observe() then feeds the response back:
+
+  X-RateLimit-* / RateLimit-*   the server's remaining budget and reset time;
+                                the bucket never holds more tokens than the
+                                server has left, and when the budget would
+                                run out before the reset, the rest is spread
+                                evenly over the window
+  Retry-After (or a 429)        no calls for that key until it has passed
+
+Reset values are accepted as epoch seconds (Raindrop, Bluesky) or as a delta.
+Steady rates default per API and can be set with RATE_LIMIT_<API>_PER_MINUTE
+(read when a key is first used). A single wait is capped at
+RATE_LIMIT_MAX_WAIT_SECONDS and at the run deadline (retry.run_deadline); past that the call goes ahead and the caller's
+error handling deals with any rejection. Waits are cut short when the
+process is stopping.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from src.utils import retry
+from src.utils.logging_config import get_logger
+from src.utils.retry import parse_retry_after
+
+logger = get_logger(__name__)
+
+# Documented limits: Raindrop 120 requests/minute per user; Bluesky 3000
+# requests per 5 minutes per client (writes are further limited per account).
+DEFAULT_PER_MINUTE = {'raindrop': 120, 'bluesky': 600}
+FALLBACK_PER_MINUTE = 60
+
+# Burst allowance: this many seconds of the steady rate
+BURST_SECONDS = 10
+
+DEFAULT_MAX_WAIT_SECONDS = 300
+
+_clock = time.monotonic
+# Waits end early on shutdown (SIGTERM) so a paced call can't hold the daemon
+_sleep = retry.sleep
+
+_lock = threading.Lock()
+_buckets: dict = {}
+_stats = {"acquired": 0, "delayed": 0, "delay_seconds": 0.0, "throttled": 0, "capped_waits": 0}
+
+
+class _Bucket:
+    """Token bucket for one key. `updated` may lie in the future while blocked."""
+
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated', 'window_rate', 'window_reset')
+
+    def __init__(self, per_minute: float, now: float):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * BURST_SECONDS)
+        self.tokens = self.capacity
+        self.updated = now
+        # Slower pace learned from the headers, in force until window_reset
+        self.window_rate = None
+        self.window_reset = 0.0
+
+    def _current_rate(self, now: float) -> float:
+        if self.window_rate is not None and now < self.window_reset:
+            return self.window_rate
+        return self.rate
+
+    def _refill(self, now: float) -> None:
+        if now <= self.updated:
+            return
+        if self.window_rate is not None:
+            until = min(now, self.window_reset)
+            if until > self.updated:
+                self.tokens += (until - self.updated) * self.window_rate
+                self.updated = until
+            if now >= self.window_reset:
+                self.window_rate = None
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Take a token (possibly one not yet refilled) and return the wait for it."""
+        self._refill(now)
+        self.tokens -= 1
+        wait = max(0.0, self.updated - now)
+        if self.tokens < 0:
+            wait += -self.tokens / self._current_rate(now)
+        return wait
+
+    def block(self, now: float, seconds: float) -> None:
+        """No calls until `seconds` from now (Retry-After, or an exhausted budget)."""
+        until = now + seconds
+        if until > self.updated:
+            self._refill(now)
+            # The server's budget is back when the block lifts: a full burst
+            # then, less any calls already promised a slot
+            self.tokens = min(self.tokens, 0.0) + self.capacity
+            self.updated = until
+
+    def learn(self, now: float, remaining: int, reset_in: float | None) -> None:
+        """Apply the server's budget: `remaining` calls until `reset_in` seconds from now."""
+        self._refill(now)
+        if reset_in is None or reset_in <= 0:
+            self.tokens = min(self.tokens, float(remaining))
+            return
+        if remaining <= 0:
+            self.block(now, reset_in)
+            return
+        pace = remaining / reset_in
+        if pace >= self.rate:
+            self.tokens = min(self.tokens, float(remaining))
+            return
+        # The steady rate would spend the budget before the reset: spread
+        # the remaining calls evenly over the window instead (no burst).
+        self.tokens = min(self.tokens, 0.0)
+        self.window_rate = pace
+        self.window_reset = now + reset_in
+
+
+def _per_minute(api: str) -> float:
+    value = os.getenv(f'RATE_LIMIT_{api.upper()}_PER_MINUTE')
+    if value:
+        return max(0.001, float(value))
+    return DEFAULT_PER_MINUTE.get(api, FALLBACK_PER_MINUTE)
+
+
+def _max_wait() -> float:
+    return float(os.getenv('RATE_LIMIT_MAX_WAIT_SECONDS', str(DEFAULT_MAX_WAIT_SECONDS)))
+
+
+def key_for(api: str, *parts: str) -> str:
+    """
+    Build a limit key: the API name plus what the server limits by.
+
+    Credentials (e.g. a Raindrop token) are hashed so keys are safe to log.
+    """
+    if not parts:
+        return api
+    digest = hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()[:12]
+    return f"{api}:{digest}"
+
+
+def _bucket(key: str, now: float) -> _Bucket:
+    bucket = _buckets.get(key)
+    if bucket is None:
+        bucket = _buckets[key] = _Bucket(_per_minute(key.split(':', 1)[0]), now)
+    return bucket
+
+
+def acquire(key: str) -> float:
+    """
+    Wait until a call under `key` fits its budget.
+
+    Returns:
+        The seconds slept (0.0 when a token was available).
+    """
+    with _lock:
+        now = _clock()
+        wait = _bucket(key, now).reserve(now)
+        _stats["acquired"] += 1
+        if wait > 0:
+            _stats["delayed"] += 1
+    if wait <= 0:
+        return 0.0
+    max_wait = _max_wait()
+    run_left = retry.remaining()
+    if run_left is not None and run_left < max_wait:
+        max_wait = run_left
+    if wait > max_wait:
+        logger.warning(f"Rate limit for {key} needs a {wait:.0f}s wait; waiting {max_wait:.0f}s and trying anyway")
+        with _lock:
+            _stats["capped_waits"] += 1
+        wait = max_wait
+    elif wait >= 1:
+        logger.info(f"Pacing {key}: waiting {wait:.1f}s for the rate limit")
+    with _lock:
+        _stats["delay_seconds"] += wait
+    _sleep(wait)
+    return wait
+
+
+def _header(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value not in (None, ''):
+            return value
+    return None
+
+
+def observe(key: str, status_code, headers) -> None:
+    """
+    Update `key`'s bucket from a response's status and headers.
+
+    Accepts any mapping of headers (case is ignored); missing or malformed
+    values are skipped, so fakes and non-HTTP results are harmless.
+    """
+    if not headers:
+        headers = {}
+    headers = {str(k).lower(): v for k, v in headers.items()}
+    now_epoch = time.time()
+    retry_after = parse_retry_after(headers.get('retry-after'), now_epoch)
+    remaining = _header(headers, 'x-ratelimit-remaining', 'ratelimit-remaining')
+    reset_in = retry.parse_reset(_header(headers, 'x-ratelimit-reset', 'ratelimit-reset'), now_epoch)
+    try:
+        remaining = int(float(remaining)) if remaining is not None else None
+    except (TypeError, ValueError):
+        remaining = None
+    throttled = status_code == 429
+
+    if remaining is None and retry_after is None and not throttled:
+        return
+
+    with _lock:
+        now = _clock()
+        bucket = _bucket(key, now)
+        if remaining is not None:
+            bucket.learn(now, remaining, reset_in)
+        if retry_after is not None:
+            bucket.block(now, retry_after)
+        elif throttled:
+            bucket.block(now, reset_in if reset_in else 0.0)
+        if throttled:
+            _stats["throttled"] += 1
+
+    if throttled:
+        wait = retry_after if retry_after is not None else reset_in
+        logger.warning(f"Rate limited on {key} (429); next call waits {wait or 0:.0f}s")
+    elif remaining is not None and remaining <= 1:
+        logger.info(f"Rate limit for {key} nearly spent ({remaining} left, resets in {reset_in or 0:.0f}s)")
+
+
+def stats() -> dict:
+    """Snapshot of the pacing counters for this process."""
+    with _lock:
+        snapshot = dict(_stats)
+        snapshot["keys"] = len(_buckets)
+        return snapshot
+
+
+def reset() -> None:
+    """Forget all learned state (tests, or after a configuration change)."""
+    with _lock:
+        _buckets.clear()
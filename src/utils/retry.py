@@ -0,0 +1,327 @@
+"""
+One retry policy for every outbound call that can fail transiently.
+
+A RetryPolicy says which error classes are worth retrying and how often,
+how long to back off, and how much time the whole call may take. call()
+runs a function under a policy:
+
+  error classes     classify_error() sorts an exception into 'timeout',
+                    'network', 'rate_limited' (429), 'server' (502/503/504),
+                    'http' (any other status) or 'other'; a policy can add
+                    its own (Bluesky's 'session'). Each class has its own
+                    attempt limit; a class with no rule is never retried.
+  backoff           full jitter: a random wait between 0 and
+                    min(max_delay, base_delay * 2**retry), so workers that
+                    failed together don't retry together.
+  Retry-After       a response's Retry-After (or the RateLimit-Reset of a
+                    429) replaces the backoff; for paced APIs the rate
+                    limiter has blocked the key just as long, so the retry
+                    then goes straight through.
+  budget            a retry whose wait would end past budget_seconds from
+                    the first attempt is not made; the last error is raised.
+  run deadline      run_deadline() bounds a whole poll: no retry wait may
+                    end past it, whatever the call's own budget, and rate
+                    limiter waits are cut at it. It is a context variable,
+                    so each tenant's poll has its own.
+
+Waits go through sleep(), which returns early when the process is stopping
+(cancel_sleeps(), called from the SIGTERM handler) or when the caller's own
+cancel Event is set; the call then gives up with the last error.
+
+Hooks registered with add_hook() see every retry, recovery and give-up, and
+stats() keeps per-policy counters for the process.
+"""
+
+import contextvars
+import random
+import threading
+import time
+import requests
+from contextlib import contextmanager
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+RATE_LIMITED_STATUS = 429
+SERVER_STATUS_CODES = (502, 503, 504)
+
+# Reset values above this are epoch timestamps, below it seconds from now
+_EPOCH_THRESHOLD = 1_000_000_000
+
+# Longest single wait on an Event, so a cancel is noticed promptly
+_WAIT_SLICE_SECONDS = 0.1
+
+_clock = time.monotonic
+_jitter = random.uniform
+
+_stop = threading.Event()
+_run_deadline = contextvars.ContextVar('retry_run_deadline', default=None)
+_lock = threading.Lock()
+_hooks: list = []
+_stats: dict = {}
+
+
+class RetryPolicy:
+    """
+    How one kind of call is retried.
+
+    Args:
+        name: Label for logs, hooks and stats().
+        rules: Maximum attempts per error class, e.g. {'timeout': 3}.
+            Classes not listed fail on the first error.
+        base_delay: Backoff cap for the first retry, doubled per retry.
+        max_delay: Upper bound on any backoff wait.
+        budget_seconds: Time allowed from the first attempt to the last retry.
+        classify: Maps an exception to its error class (default classify_error).
+    """
+
+    __slots__ = ('name', 'rules', 'base_delay', 'max_delay', 'budget_seconds', 'classify')
+
+    def __init__(self, name, rules, base_delay=2.0, max_delay=30.0, budget_seconds=60.0, classify=None):
+        self.name = name
+        self.rules = dict(rules)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_seconds = budget_seconds
+        self.classify = classify or classify_error
+
+
+def _status_code(error):
+    return getattr(getattr(error, 'response', None), 'status_code', None)
+
+
+def classify_error(error) -> str:
+    """Sort an exception from requests, httpx/atproto or the stdlib into an error class."""
+    status_code = _status_code(error)
+    if status_code is not None:
+        if status_code == RATE_LIMITED_STATUS:
+            return 'rate_limited'
+        if status_code in SERVER_STATUS_CODES:
+            return 'server'
+        return 'http'
+    if isinstance(error, (requests.exceptions.Timeout, TimeoutError)):
+        return 'timeout'
+    if isinstance(error, (requests.exceptions.ConnectionError, ConnectionError)):
+        return 'network'
+    return 'other'
+
+
+def parse_retry_after(value, now_epoch: float | None = None) -> float | None:
+    """Seconds to wait from a Retry-After value (delta-seconds or HTTP-date), or None."""
+    if value in (None, ''):
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        when = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now_epoch = time.time() if now_epoch is None else now_epoch
+    return max(0.0, when.timestamp() - now_epoch)
+
+
+def parse_reset(value, now_epoch: float | None = None) -> float | None:
+    """Seconds until a RateLimit-Reset value (epoch seconds or a delta), or None."""
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    if reset > _EPOCH_THRESHOLD:
+        now_epoch = time.time() if now_epoch is None else now_epoch
+        return max(0.0, reset - now_epoch)
+    return max(0.0, reset)
+
+
+def server_delay(error) -> float | None:
+    """The wait the server asked for in the error's response, if any."""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+    headers = {str(k).lower(): v for k, v in headers.items()}
+    delay = parse_retry_after(headers.get('retry-after'))
+    if delay is None and _status_code(error) == RATE_LIMITED_STATUS:
+        delay = parse_reset(headers.get('x-ratelimit-reset') or headers.get('ratelimit-reset'))
+    return delay
+
+
+def sleep(seconds: float, cancel=None) -> bool:
+    """
+    Wait up to `seconds`, returning early if the process is stopping or
+    `cancel` (a threading.Event) is set.
+
+    Returns:
+        True if the wait was cut short.
+    """
+    if seconds <= 0:
+        return _stop.is_set() or (cancel is not None and cancel.is_set())
+    if cancel is None:
+        return _stop.wait(seconds)
+    deadline = _clock() + seconds
+    while not (_stop.is_set() or cancel.is_set()):
+        remaining = deadline - _clock()
+        if remaining <= 0:
+            return False
+        cancel.wait(min(remaining, _WAIT_SLICE_SECONDS))
+    return True
+
+
+@contextmanager
+def run_deadline(seconds):
+    """
+    Bound every retry and rate-limit wait inside the block to end within
+    `seconds` from now (None or 0: no run deadline).
+    """
+    token = _run_deadline.set(_clock() + seconds if seconds else None)
+    try:
+        yield
+    finally:
+        _run_deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current run deadline (None if there is none)."""
+    deadline = _run_deadline.get()
+    return None if deadline is None else max(0.0, deadline - _clock())
+
+
+def cancel_sleeps() -> None:
+    """Cut every current and future wait short (process shutdown)."""
+    _stop.set()
+
+
+def stopping() -> bool:
+    """True once cancel_sleeps() has been called."""
+    return _stop.is_set()
+
+
+def add_hook(hook) -> None:
+    """
+    Register hook(event, policy_name, error_class, attempt, delay), called on
+    'retry', 'recovered' and 'give_up' events. Hook errors are logged and ignored.
+    """
+    with _lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook) -> None:
+    with _lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+def _record(policy, event, error_class=None, attempt=0, delay=0.0, reason=None, new_error=True) -> None:
+    with _lock:
+        row = _stats.setdefault(policy.name, {
+            "calls": 0, "retries": 0, "recovered": 0, "gave_up": 0,
+            "slept_seconds": 0.0, "errors": {}, "give_up_reasons": {},
+        })
+        if event == 'call':
+            row["calls"] += 1
+            return
+        if error_class is not None and new_error:
+            row["errors"][error_class] = row["errors"].get(error_class, 0) + 1
+        if event == 'retry':
+            row["retries"] += 1
+            row["slept_seconds"] += delay
+        elif event == 'recovered':
+            row["recovered"] += 1
+        elif event == 'give_up' and reason != 'not_retryable':
+            row["gave_up"] += 1
+            row["give_up_reasons"][reason] = row["give_up_reasons"].get(reason, 0) + 1
+        hooks = list(_hooks)
+    for hook in hooks:
+        try:
+            hook(event, policy.name, error_class, attempt, delay)
+        except Exception as e:
+            logger.warning(f"Retry hook {hook!r} failed: {e}")
+
+
+def _next_delay(policy, error, error_class, attempt, deadline, cancel):
+    """Return (delay, None) for a retry, or (None, reason) to give up."""
+    limit = policy.rules.get(error_class, 0)
+    if limit <= 1:
+        return None, 'not_retryable'
+    if attempt >= limit:
+        return None, 'attempts'
+    if _stop.is_set() or (cancel is not None and cancel.is_set()):
+        return None, 'cancelled'
+    delay = server_delay(error)
+    if delay is None:
+        delay = _jitter(0, min(policy.max_delay, policy.base_delay * 2 ** (attempt - 1)))
+    if _clock() + delay > deadline:
+        return None, 'budget'
+    run_deadline = _run_deadline.get()
+    if run_deadline is not None and _clock() + delay > run_deadline:
+        return None, 'run_deadline'
+    return delay, None
+
+
+def call(fn, policy: RetryPolicy, cancel=None, on_retry=None, describe=None):
+    """
+    Call fn() under `policy`, retrying the error classes it allows.
+
+    Args:
+        fn: Zero-argument callable; its result is returned.
+        policy: The RetryPolicy to apply.
+        cancel: Optional threading.Event that stops further retries.
+        on_retry: Called as on_retry(error, error_class, attempt) before each
+            retry's wait (e.g. to drop a rejected session).
+        describe: What is being attempted, for log messages.
+    Raises:
+        The last error once it isn't retryable, attempts, the budget or the
+        run deadline run out, or the wait is cancelled.
+    """
+    describe = describe or policy.name
+    deadline = _clock() + policy.budget_seconds
+    _record(policy, 'call')
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            result = fn()
+        except Exception as e:
+            error_class = policy.classify(e)
+            delay, reason = _next_delay(policy, e, error_class, attempt, deadline, cancel)
+            if reason is not None:
+                if reason != 'not_retryable':
+                    logger.debug(f"{describe}: giving up after {attempt} attempt(s) ({reason})")
+                _record(policy, 'give_up', error_class, attempt, reason=reason)
+                raise
+            logger.warning(
+                f"{describe} failed with a {error_class} error (attempt {attempt}/{policy.rules[error_class]}): "
+                f"{e!r}. Retrying in {delay:.1f}s..."
+            )
+            _record(policy, 'retry', error_class, attempt, delay)
+            if on_retry is not None:
+                on_retry(e, error_class, attempt)
+            if sleep(delay, cancel):
+                logger.info(f"{describe}: retry cancelled")
+                _record(policy, 'give_up', error_class, attempt, reason='cancelled', new_error=False)
+                raise
+            continue
+        if attempt > 1:
+            _record(policy, 'recovered', attempt=attempt)
+        return result
+
+
+def stats() -> dict:
+    """Per-policy snapshot: calls, retries, recoveries, give-ups and time spent waiting."""
+    with _lock:
+        return {
+            name: {**row, "errors": dict(row["errors"]), "give_up_reasons": dict(row["give_up_reasons"])}
+            for name, row in _stats.items()
+        }
+
+
+def reset() -> None:
+    """Clear the counters and the stop flag (tests)."""
+    with _lock:
+        _stats.clear()
+    _stop.clear()
@@ -0,0 +1,45 @@
+"""
+Persist Bluesky session strings so runs can resume instead of logging in.
+
+`com.atproto.server.createSession` is tightly rate limited by Bluesky, so a
+password login on every cron tick (or every retry) burns that budget. The
+session string exported by atproto holds the access and refresh JWTs; storing
+it lets the next run resume the session and refresh it only when expired.
+
+Sessions are stored per identifier in a JSON state file (see state_file) in
+the logs directory, readable only by the owner (it holds bearer tokens).
+"""
+
+import os
+from src.utils import state_file
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+SESSION_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    'logs',
+    'bluesky_session.json'
+)
+
+
+def load_session(identifier: str) -> str | None:
+    """Return the stored session string for `identifier`, or None."""
+    return state_file.load(SESSION_FILE, 'session').get(identifier)
+
+
+def save_session(identifier: str, session_string: str) -> None:
+    """Store (or replace) the session string for `identifier`."""
+    with state_file.update(SESSION_FILE, 'session', private=True) as sessions:
+        if sessions.get(identifier) == session_string:
+            return
+        sessions[identifier] = session_string
+    logger.debug(f"Saved Bluesky session for {identifier}")
+
+
+def clear_session(identifier: str) -> None:
+    """Forget the stored session for `identifier` (e.g. after it was revoked)."""
+    with state_file.update(SESSION_FILE, 'session', private=True) as sessions:
+        if sessions.pop(identifier, None) is None:
+            return
+    logger.debug(f"Cleared Bluesky session for {identifier}")
@@ -0,0 +1,105 @@
+"""
+Small JSON state files in the logs directory (watermarks, Bluesky sessions,
+circuit breakers, alert dedup, the JSON posted tracker).
+
+Cron runs and tenant threads share these files, so every write goes to a
+temp file in the same directory, is fsynced and then os.replace()d over the
+old one: a crash mid-write never truncates the state. update() serializes a
+load-modify-save per path in-process, so concurrent tenants never lose each
+other's entries, and skips the write when nothing changed.
+
+A missing or unreadable file reads as empty and a failed write is logged:
+losing a state file costs at most a redundant request, never a run.
+"""
+
+import copy
+import json
+import os
+import threading
+from contextlib import contextmanager
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+_locks: dict = {}
+_locks_guard = threading.Lock()
+
+
+def lock_for(path: str) -> threading.RLock:
+    """The in-process lock serializing updates of `path`."""
+    with _locks_guard:
+        lock = _locks.get(path)
+        if lock is None:
+            lock = _locks[path] = threading.RLock()
+        return lock
+
+
+def load(path: str, label: str) -> dict:
+    """
+    Read the JSON object in `path`.
+
+    Args:
+        path: State file path.
+        label: What the file holds, for log lines ('watermark').
+
+    Returns:
+        The stored dict, or an empty dict if the file is missing or unreadable.
+    """
+    try:
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                return data
+            logger.warning(f"Ignoring {label} file {path}: not a JSON object")
+    except (json.JSONDecodeError, OSError) as e:
+        logger.warning(f"Could not load {label} file: {e}")
+    return {}
+
+
+def save(path: str, data: dict, label: str, private: bool = False) -> bool:
+    """
+    Write `data` to `path` atomically.
+
+    Args:
+        path: State file path; its directory is created if needed.
+        data: JSON-serializable dict.
+        label: What the file holds, for log lines.
+        private: Create the file readable by the owner only (it holds secrets).
+
+    Returns:
+        True if the file was replaced, False if the write failed (logged).
+    """
+    tmp_path = path + '.tmp'
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600 if private else 0o666)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=None if private else 2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        return True
+    except OSError as e:
+        logger.error(f"Could not save {label} file: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+
+@contextmanager
+def update(path: str, label: str, private: bool = False):
+    """
+    Load `path`, yield its dict for in-place changes, then save it if it changed.
+
+    The whole block holds the path's lock; nothing is written if the block
+    raises.
+    """
+    with lock_for(path):
+        data = load(path, label)
+        before = copy.deepcopy(data)
+        yield data
+        if data != before:
+            save(path, data, label, private=private)
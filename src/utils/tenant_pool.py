@@ -0,0 +1,141 @@
+"""
+Run one poll per tenant on a bounded pool of worker threads.
+
+In multi-tenant mode (TENANTS_FILE) a round submits every tenant's poll to a
+ThreadPoolExecutor of TENANT_WORKERS threads, so a tenant stuck on a slow API
+call or failing outright only holds its own worker. A tenant whose previous
+poll is still running is skipped for the round rather than queued twice, and
+an exception is logged against its tenant without touching the others.
+main() handles its own errors (logging and alerting them), so for a tenant
+it raises PollFailed afterwards: the poll still counts as an error here.
+
+Per-tenant counters (polls, posts, errors, skips) and poll latency are kept
+for the life of the pool; `stats()` returns them with throughput in posts per
+hour, and every round logs a one-line summary per tenant.
+
+Each poll runs in a copy of the submitting context, so it keeps the round's
+run_id (see logging_config) even while it is still running in a later round.
+"""
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class PollFailed(Exception):
+    """A tenant's poll failed and the failure has already been logged and alerted."""
+
+
+class TenantPool:
+    """
+    Bounded worker pool that polls each tenant in isolation.
+
+    Args:
+        tenants: Tenant configs, each with a unique config['TENANT'] name.
+        run: Called as run(tenant_config) on a worker thread; returns the
+            number of Raindrops posted. Exceptions (PollFailed included)
+            count as errors.
+        max_workers: Pool size (capped at the number of tenants).
+    """
+
+    def __init__(self, tenants, run, max_workers=4):
+        self.tenants = list(tenants)
+        self._run = run
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers, len(self.tenants))),
+            thread_name_prefix="tenant",
+        )
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._stats = {
+            tenant['TENANT']: {"polls": 0, "posted": 0, "errors": 0, "skipped": 0,
+                               "busy_seconds": 0.0, "last_seconds": None, "max_seconds": 0.0}
+            for tenant in self.tenants
+        }
+
+    def _poll(self, tenant):
+        name = tenant['TENANT']
+        started = time.monotonic()
+        posted = 0
+        failed = False
+        try:
+            posted = self._run(tenant) or 0
+        except PollFailed as e:
+            failed = True
+            logger.warning(f"Tenant {name}: poll failed: {e}")
+        except Exception as e:
+            failed = True
+            logger.exception(f"Tenant {name}: poll failed: {e}")
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                row = self._stats[name]
+                row["polls"] += 1
+                row["posted"] += posted
+                row["errors"] += failed
+                row["busy_seconds"] += elapsed
+                row["last_seconds"] = elapsed
+                row["max_seconds"] = max(row["max_seconds"], elapsed)
+        return posted
+
+    def run_round(self, timeout=None) -> int:
+        """
+        Submit a poll for every tenant that isn't still busy and wait for them.
+
+        Args:
+            timeout: Seconds to wait for the round (None waits for all).
+                Polls still running afterwards carry on in the background
+                and their tenants are skipped until they finish.
+        Returns:
+            The number of polls submitted.
+        """
+        submitted = []
+        for tenant in self.tenants:
+            name = tenant['TENANT']
+            previous = self._in_flight.get(name)
+            if previous is not None and not previous.done():
+                logger.warning(f"Tenant {name}: previous poll still running - skipping this round")
+                with self._lock:
+                    self._stats[name]["skipped"] += 1
+                continue
+            future = self._executor.submit(contextvars.copy_context().run, self._poll, tenant)
+            self._in_flight[name] = future
+            submitted.append(future)
+
+        _, not_done = wait(submitted, timeout=timeout)
+        if not_done:
+            logger.warning(f"{len(not_done)} tenant poll(s) still running after {timeout:g}s; "
+                           "the other tenants carry on")
+        self.log_summary()
+        return len(submitted)
+
+    def stats(self) -> dict:
+        """Per-tenant snapshot: counters, poll latency and posts per hour."""
+        hours = max(time.monotonic() - self._started, 1e-9) / 3600
+        with self._lock:
+            snapshot = {}
+            for name, row in self._stats.items():
+                row = dict(row)
+                row["mean_seconds"] = row["busy_seconds"] / row["polls"] if row["polls"] else None
+                row["posts_per_hour"] = row["posted"] / hours
+                snapshot[name] = row
+            return snapshot
+
+    def log_summary(self) -> None:
+        for name, row in self.stats().items():
+            if not row["polls"]:
+                continue
+            logger.info(
+                f"Tenant {name}: {row['posted']} posted in {row['polls']} poll(s), "
+                f"{row['errors']} error(s), {row['skipped']} skipped; "
+                f"last {row['last_seconds']:.2f}s, mean {row['mean_seconds']:.2f}s, "
+                f"max {row['max_seconds']:.2f}s; {row['posts_per_hour']:.1f} posts/h"
+            )
+
+    def shutdown(self, wait=True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
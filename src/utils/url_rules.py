@@ -0,0 +1,230 @@
+"""
+Per-domain URL normalization for posted links.
+
+Rules live in a JSON file (url_rules.json next to this module, or the file
+named by URL_RULES_FILE) with a "global" section applied to every host and
+"domains" entries applied to their hosts and all subdomains. An entry can:
+
+  strip                  drop query params by exact name
+  strip_prefixes         drop query params whose name starts with a prefix
+  strip_path_segments    drop path segments starting with a prefix (Amazon /ref=...)
+  strip_path_prefixes    drop a leading path component (amp.cnn.com/cnn/...)
+  strip_path_suffixes    drop a trailing "/amp" or ".amp"
+  rewrite_host           replace the host (amp.theguardian.com -> www.)
+  unwrap                 [{"path": regex, "scheme": ...}] — the first group of
+                         the path is the real URL (Google AMP viewer, AMP cache)
+
+The file is compiled once per process (on first use, so idle polls never
+pay for it and `.env` is already loaded) into one lookup table per
+configured host: global rules merged with every matching domain entry. A
+lookup walks the host's labels, and checking a param is a set lookup
+however many rules exist. Normalized results are memoized in an LRU cache.
+A URL no rule changes is returned as the very same string; kept params are
+never re-encoded.
+"""
+
+import json
+import os
+import re
+import threading
+from functools import lru_cache
+from urllib.parse import unquote_plus, urlsplit, urlunsplit
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(__file__), 'url_rules.json')
+CACHE_SIZE = 4096
+
+# Unwrapped URLs are normalized again (an AMP cache URL can wrap an AMP page)
+MAX_UNWRAP_DEPTH = 2
+
+_RULE_KEYS = frozenset({
+    'strip', 'strip_prefixes', 'strip_path_segments', 'strip_path_prefixes',
+    'strip_path_suffixes', 'rewrite_host', 'unwrap',
+})
+
+
+class _HostRules:
+    """Compiled rules for one host: sets and tuples, ready for matching."""
+
+    __slots__ = ('strip', 'prefixes', 'path_segments', 'path_prefixes', 'path_suffixes', 'rewrite_host', 'unwrap')
+
+    def __init__(self, entries: list):
+        strip, prefixes = set(), set()
+        path_segments, path_prefixes, path_suffixes, unwrap = [], [], [], []
+        self.rewrite_host = None
+        for entry in entries:
+            unknown = set(entry) - _RULE_KEYS - {'name', 'hosts', '_comment'}
+            if unknown:
+                raise ValueError(f"Unknown URL rule key(s) {sorted(unknown)} in {entry.get('name', entry.get('hosts'))}")
+            strip.update(entry.get('strip', ()))
+            prefixes.update(entry.get('strip_prefixes', ()))
+            path_segments.extend(entry.get('strip_path_segments', ()))
+            path_prefixes.extend(entry.get('strip_path_prefixes', ()))
+            path_suffixes.extend(entry.get('strip_path_suffixes', ()))
+            unwrap.extend((re.compile(u['path']), u.get('scheme', 'https')) for u in entry.get('unwrap', ()))
+            self.rewrite_host = entry.get('rewrite_host', self.rewrite_host)
+        self.strip = frozenset(strip)
+        # Prefixes grouped by length: one slice + set lookup per distinct length
+        by_length: dict = {}
+        for prefix in prefixes:
+            by_length.setdefault(len(prefix), set()).add(prefix)
+        self.prefixes = tuple((length, frozenset(group)) for length, group in sorted(by_length.items()))
+        self.path_segments = tuple(path_segments)
+        self.path_prefixes = tuple(path_prefixes)
+        self.path_suffixes = tuple(path_suffixes)
+        self.unwrap = tuple(unwrap)
+
+    def strips(self, name: str) -> bool:
+        if name in self.strip:
+            return True
+        for length, group in self.prefixes:
+            if name[:length] in group:
+                return True
+        return False
+
+
+class _Engine:
+    def __init__(self, rules: dict, source: str):
+        self.source = source
+        global_entry = rules.get('global', {})
+        by_host: dict = {}
+        for entry in rules.get('domains', []):
+            hosts = entry.get('hosts')
+            if not hosts or not isinstance(hosts, list):
+                raise ValueError(f"URL rule {entry.get('name', entry)!r} needs a non-empty 'hosts' list")
+            for host in hosts:
+                by_host.setdefault(host.lower().rstrip('.'), []).append(entry)
+        self.default = _HostRules([global_entry])
+        # Each configured host inherits the entries of its configured parents
+        # (rules for amazon.com also apply to smile.amazon.com)
+        self.tables = {}
+        for host in by_host:
+            labels = host.split('.')
+            parents = ['.'.join(labels[i:]) for i in range(len(labels) - 1, 0, -1)]
+            entries = [e for parent in parents for e in by_host.get(parent, ())] + by_host[host]
+            self.tables[host] = _HostRules([global_entry] + entries)
+        self.domain_count = len(rules.get('domains', []))
+        self.normalize = lru_cache(maxsize=CACHE_SIZE)(self._normalize)
+
+    def for_host(self, host: str) -> _HostRules:
+        labels = host.rstrip('.').split('.')
+        for i in range(len(labels) - 1):
+            table = self.tables.get('.'.join(labels[i:]))
+            if table is not None:
+                return table
+        return self.default
+
+    def _normalize(self, url: str, depth: int = 0) -> str:
+        try:
+            parts = urlsplit(url)
+            host = parts.hostname or ''
+        except ValueError:
+            return url
+        rules = self.for_host(host)
+
+        if depth < MAX_UNWRAP_DEPTH:
+            for pattern, scheme in rules.unwrap:
+                match = pattern.match(parts.path)
+                if match:
+                    inner = f"{scheme}://{match.group(1)}"
+                    if parts.query:
+                        inner += f"?{parts.query}"
+                    if parts.fragment:
+                        inner += f"#{parts.fragment}"
+                    return self._normalize(inner, depth + 1)
+
+        changed = False
+        netloc = parts.netloc
+        if rules.rewrite_host:
+            netloc = rules.rewrite_host + (f":{parts.port}" if parts.port else "")
+            changed = netloc != parts.netloc
+
+        path = parts.path
+        if rules.path_segments and path:
+            segments = [s for s in path.split('/') if not s.startswith(rules.path_segments)]
+            if len(segments) != path.count('/') + 1:
+                path = '/'.join(segments) or '/'
+        for prefix in rules.path_prefixes:
+            if path.startswith(prefix + '/'):
+                path = path[len(prefix):]
+                break
+        for suffix in rules.path_suffixes:
+            trimmed = path[:-1] if path.endswith(suffix + '/') else path
+            if trimmed.endswith(suffix):
+                path = trimmed[:-len(suffix)] or '/'
+                break
+        changed = changed or path != parts.path
+
+        query = parts.query
+        if query:
+            params = query.split('&')
+            kept = []
+            for param in params:
+                name = param.split('=', 1)[0]
+                if '%' in name or '+' in name:
+                    name = unquote_plus(name)
+                if not rules.strips(name):
+                    kept.append(param)
+            if len(kept) != len(params):
+                query = '&'.join(kept)
+                changed = True
+
+        if not changed:
+            return url
+        return urlunsplit((parts.scheme, netloc, path, query, parts.fragment))
+
+
+_lock = threading.Lock()
+_engine = None
+
+
+def _read_rules(path: str) -> _Engine:
+    with open(path, encoding='utf-8') as f:
+        return _Engine(json.load(f), path)
+
+
+def load_rules(path: str | None = None) -> _Engine:
+    """
+    Compile the rules file and make it current (clearing the result cache).
+
+    `path` defaults to URL_RULES_FILE, then the bundled url_rules.json. A
+    custom file that can't be read or compiled is logged and the bundled
+    rules are used instead, so a typo never stops posting.
+    """
+    global _engine
+    path = path or os.getenv('URL_RULES_FILE') or DEFAULT_RULES_FILE
+    try:
+        engine = _read_rules(path)
+    except (OSError, ValueError, TypeError, re.error) as e:
+        if path == DEFAULT_RULES_FILE:
+            raise
+        logger.error(f"Could not load URL rules from {path}: {e}; using the bundled rules")
+        engine = _read_rules(DEFAULT_RULES_FILE)
+    logger.debug(f"Loaded {engine.domain_count} URL rule(s) for {len(engine.tables)} host(s) from {engine.source}")
+    with _lock:
+        _engine = engine
+    return engine
+
+
+def _current() -> _Engine:
+    return _engine or load_rules()
+
+
+def normalize_url(url: str) -> str:
+    """Apply the tracking-param and per-domain rules to `url` (memoized)."""
+    return _current().normalize(url)
+
+
+def stats() -> dict:
+    """Rule counts and result-cache counters for this process."""
+    engine = _current()
+    info = engine.normalize.cache_info()
+    return {
+        "domains": engine.domain_count,
+        "hosts": len(engine.tables),
+        "cache_hits": info.hits,
+        "cache_misses": info.misses,
+        "cache_size": info.currsize,
+    }
@@ -0,0 +1,83 @@
+"""
+Persist a high-water mark of the tagged Raindrop set between polls.
+
+Almost every poll finds nothing new. A mark records what the tag search looked
+like the last time a full fetch ran and came back with nothing to post: the
+item count and a signature of every tagged item's ID and `lastUpdate` (see
+raindrop_handler.probe_tagged). Tagging or untagging a Raindrop changes the
+signature even when the count stays the same, so a probe that still matches
+the mark means the full fetch can be skipped.
+
+Marks are stored per tag (per tenant and tag in multi-tenant mode) in a JSON
+state file (see state_file) in the logs directory.
+"""
+
+import os
+from datetime import datetime
+from src.utils import state_file
+from src.utils.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+WATERMARK_FILE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    'logs',
+    'raindrop_watermark.json'
+)
+
+
+def _key(tag: str, namespace: str | None) -> str:
+    return f"{namespace}/{tag}" if namespace else tag
+
+
+def load_watermark(tag: str, namespace: str | None = None) -> dict | None:
+    """Return the stored mark for `tag` ({count, signature, saved_at}), or None."""
+    return state_file.load(WATERMARK_FILE, 'watermark').get(_key(tag, namespace))
+
+
+def save_watermark(tag: str, count: int, signature: str, namespace: str | None = None) -> None:
+    """Record the tag search state seen by an idle full fetch."""
+    with state_file.update(WATERMARK_FILE, 'watermark') as marks:
+        marks[_key(tag, namespace)] = {
+            "count": count,
+            "signature": signature,
+            "saved_at": datetime.utcnow().isoformat()
+        }
+    logger.debug(f"Saved watermark for '{_key(tag, namespace)}': count={count}, signature={signature}")
+
+
+def clear_watermark(tag: str, namespace: str | None = None) -> None:
+    """Forget the mark for `tag` so the next poll runs a full fetch."""
+    with state_file.update(WATERMARK_FILE, 'watermark') as marks:
+        if marks.pop(_key(tag, namespace), None) is None:
+            return
+    logger.debug(f"Cleared watermark for '{_key(tag, namespace)}'")
+
+
+def is_unchanged(tag: str, count: int, signature: str | None, max_age_seconds: float,
+                 namespace: str | None = None) -> bool:
+    """
+    Check a probe against the stored mark.
+
+    Args:
+        tag: The trigger tag the probe searched for.
+        count: Number of Raindrops the probe reported for the tag.
+        signature: The probe's digest of the tagged items (None: the probe
+            could not see them all, so it cannot match).
+        max_age_seconds: Marks older than this are ignored, forcing a
+            periodic full fetch (which also retries stuck-tag self-heal).
+        namespace: Tenant the probe ran for (None: single-account).
+
+    Returns:
+        True if the probe matches a fresh mark and the full fetch can be skipped.
+    """
+    mark = load_watermark(tag, namespace)
+    if not mark or signature is None:
+        return False
+    try:
+        age = (datetime.utcnow() - datetime.fromisoformat(mark["saved_at"])).total_seconds()
+    except (KeyError, TypeError, ValueError):
+        return False
+    if age < 0 or age > max_age_seconds:
+        return False
+    return mark.get("count") == count and mark.get("signature") == signature